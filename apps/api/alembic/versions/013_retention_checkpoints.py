@@ -0,0 +1,67 @@
+"""Add retention_checkpoints for the batched retention purger.
+
+Retention runs delete in bounded primary-key batches, committing each batch
+together with its checkpoint row, so an interrupted run (deploy, timeout,
+lock_timeout) resumes from `last_id` with the same `cutoff` instead of
+starting over. One row per job (`job_key`), reused across runs.
+
+Re-entrant: environments that ran `Base.metadata.create_all` already have the
+table. Same idempotency contract as 007/009/012.
+
+Revision ID: 013_retention_checkpoints
+Revises: 012_user_spanish_formality
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "013_retention_checkpoints"
+down_revision = "012_user_spanish_formality"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if inspect(bind).has_table("retention_checkpoints"):
+        return
+
+    op.create_table(
+        "retention_checkpoints",
+        sa.Column(
+            "id",
+            (
+                sa.dialects.postgresql.UUID(as_uuid=True)
+                if dialect == "postgresql"
+                else sa.String(length=36)
+            ),
+            primary_key=True,
+        ),
+        sa.Column("job_key", sa.String(length=255), nullable=False),
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("cutoff", sa.DateTime(), nullable=False),
+        sa.Column("last_id", sa.String(length=64), nullable=True),
+        sa.Column("rows_deleted", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("batches", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "partitions_dropped",
+            sa.dialects.postgresql.JSONB() if dialect == "postgresql" else sa.Text(),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("job_key", name="uq_retention_checkpoints_job_key"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if inspect(bind).has_table("retention_checkpoints"):
+        op.drop_table("retention_checkpoints")
@@ -0,0 +1,186 @@
+"""Partition audit_logs by month on created_at; add organization_id.
+
+audit_logs is written on every audited action and read by the audit log API,
+compliance dashboards, SLA measurements and retention. As one heap table it
+degrades every query and every vacuum as it grows. On PostgreSQL this turns it
+into a table RANGE-partitioned by month on `created_at`:
+
+- one partition per month (`audit_logs_2026_10`), from the oldest existing row
+  through three months ahead, plus `audit_logs_default` so an insert outside
+  the created ranges never fails. The API keeps future months created
+  (app/services/audit_log_partitions.py, at startup and daily);
+- `(organization_id, created_at DESC)` and `(user_id, created_at DESC)` indexes
+  declared on the parent, which PostgreSQL creates on every partition;
+- primary key `(id, created_at)`: a partitioned table's unique constraints must
+  include the partition key. `id` stays a UUID and unique in practice;
+- retention drops whole expired partitions instead of deleting rows
+  (RetentionPurger.drop_expired_partitions).
+
+EXISTING DATA. The heap table is renamed to `audit_logs_unpartitioned`, its rows
+are copied into the partitioned table (NULL created_at becomes now), and it is
+dropped. The copy runs inside the migration transaction and holds the old
+table's lock for its duration, so on a very large table run this step in a
+maintenance window, or purge old rows first (DELETE /v1/audit-logs/cleanup).
+
+Other dialects (SQLite in tests) only get the column and the indexes.
+
+RE-ENTRANT: a table that is already partitioned is left alone, and the column
+and indexes are only added when missing. Same idempotency contract as 012/013.
+
+Revision ID: 014_partition_audit_logs
+Revises: 013_retention_checkpoints
+Create Date: 2026-10-18
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "014_partition_audit_logs"
+down_revision = "013_retention_checkpoints"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = {
+    "ix_audit_logs_org_created_at": "(organization_id, created_at DESC)",
+    "ix_audit_logs_user_created_at": "(user_id, created_at DESC)",
+}
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_indexes(bind) -> None:
+    existing = {ix["name"] for ix in inspect(bind).get_indexes("audit_logs")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.execute(f"CREATE INDEX {name} ON audit_logs {columns}")
+
+
+def _relkind(bind) -> str:
+    return bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE relname = 'audit_logs'")
+    ).scalar()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not inspect(bind).has_table("audit_logs"):
+        return
+
+    existing = {c["name"] for c in inspect(bind).get_columns("audit_logs")}
+    if "organization_id" not in existing:
+        op.add_column(
+            "audit_logs",
+            sa.Column(
+                "organization_id",
+                (
+                    sa.dialects.postgresql.UUID(as_uuid=True)
+                    if bind.dialect.name == "postgresql"
+                    else sa.String(length=36)
+                ),
+                nullable=True,
+            ),
+        )
+
+    if bind.dialect.name != "postgresql" or _relkind(bind) == "p":
+        _create_indexes(bind)
+        return
+
+    # Move the heap table aside; index and pkey names are schema-wide in PostgreSQL
+    for (name,) in bind.execute(
+        sa.text(
+            "SELECT i.relname FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "WHERE t.relname = 'audit_logs' AND NOT x.indisprimary"
+        )
+    ):
+        op.execute(f'DROP INDEX "{name}"')
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    pkey = bind.execute(
+        sa.text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = 'audit_logs_unpartitioned'::regclass AND contype = 'p'"
+        )
+    ).scalar()
+    if pkey:
+        op.execute(
+            f'ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT "{pkey}" '
+            "TO audit_logs_unpartitioned_pkey"
+        )
+
+    op.execute(
+        "CREATE TABLE audit_logs (LIKE audit_logs_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL, "
+        "ALTER COLUMN created_at SET DEFAULT (now() AT TIME ZONE 'utc')"
+    )
+    op.execute("ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id)"
+    )
+
+    now = datetime.utcnow()
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    month = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON audit_logs {columns}")
+
+    columns = [c["name"] for c in inspect(bind).get_columns("audit_logs_unpartitioned")]
+    select_list = ", ".join(
+        "COALESCE(created_at, now() AT TIME ZONE 'utc')" if c == "created_at" else f'"{c}"'
+        for c in columns
+    )
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    op.execute(
+        f"INSERT INTO audit_logs ({column_list}) SELECT {select_list} FROM audit_logs_unpartitioned"
+    )
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not inspect(bind).has_table("audit_logs"):
+        return
+
+    if bind.dialect.name == "postgresql" and _relkind(bind) == "p":
+        op.execute("CREATE TABLE audit_logs_heap (LIKE audit_logs INCLUDING DEFAULTS)")
+        op.execute("INSERT INTO audit_logs_heap SELECT * FROM audit_logs")
+        op.execute("DROP TABLE audit_logs CASCADE")
+        op.execute("ALTER TABLE audit_logs_heap RENAME TO audit_logs")
+        op.execute("ALTER TABLE audit_logs ALTER COLUMN created_at DROP NOT NULL")
+        op.execute("ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id)")
+        op.execute(
+            "ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_user_id_fkey "
+            "FOREIGN KEY (user_id) REFERENCES users (id)"
+        )
+
+    existing_indexes = {ix["name"] for ix in inspect(bind).get_indexes("audit_logs")}
+    for name in INDEXES:
+        if name in existing_indexes:
+            op.drop_index(name, table_name="audit_logs")
+
+    existing = {c["name"] for c in inspect(bind).get_columns("audit_logs")}
+    if "organization_id" in existing:
+        op.drop_column("audit_logs", "organization_id")
@@ -0,0 +1,63 @@
+"""Add metrics_rollup for per-minute counters.
+
+Request, authentication, uptime and compliance outcomes are counted at write
+time into one Redis hash per minute and moved into this table once the minute
+closes (app/services/metrics_rollup.py). SLA, uptime and compliance dashboard
+reads then sum at most one row per metric per minute in the window instead of
+counting audit_logs rows. Latencies are stored as histogram buckets
+(`http.requests.latency.le_250`, ...) plus a running `sum_ms`.
+
+`(metric, scope, bucket)` is unique: flushes upsert and add to `count`, and the
+unique index serves the range reads.
+
+Re-entrant: environments that ran `Base.metadata.create_all` already have the
+table. Same idempotency contract as 012/013.
+
+Revision ID: 015_metrics_rollup
+Revises: 014_partition_audit_logs
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "015_metrics_rollup"
+down_revision = "014_partition_audit_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if inspect(bind).has_table("metrics_rollup"):
+        return
+
+    op.create_table(
+        "metrics_rollup",
+        sa.Column(
+            "id",
+            (
+                sa.dialects.postgresql.UUID(as_uuid=True)
+                if bind.dialect.name == "postgresql"
+                else sa.String(length=36)
+            ),
+            primary_key=True,
+        ),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("metric", sa.String(length=100), nullable=False),
+        sa.Column("scope", sa.String(length=64), nullable=False, server_default="global"),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "metric", "scope", "bucket", name="uq_metrics_rollup_metric_scope_bucket"
+        ),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if inspect(bind).has_table("metrics_rollup"):
+        op.drop_table("metrics_rollup")
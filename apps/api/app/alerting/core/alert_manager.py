@@ -1,6 +1,12 @@
 """
 Alert Manager
 Main alert management system orchestrating evaluation, triggering, and lifecycle management.
+
+Each evaluation cycle fetches every (metric, window) pair once, however many
+rules use it, and evaluates rules concurrently: at most
+MAX_CONCURRENT_EVALUATIONS fetches or rule checks run at once, each under its
+own timeout, so a slow metric only delays the rules that read it. Alerts raised
+in a cycle are then sent as one batch per notification channel.
 """
 
 import asyncio
@@ -9,7 +15,7 @@ import time
 import uuid
 from collections import Counter
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import redis.asyncio as aioredis
 import structlog
@@ -25,6 +31,12 @@ from .notification_sender import NotificationSender
 
 logger = structlog.get_logger()
 
+EVALUATION_INTERVAL_SECONDS = 30
+MAX_CONCURRENT_EVALUATIONS = 50
+METRIC_FETCH_TIMEOUT_SECONDS = 10.0
+RULE_EVALUATION_TIMEOUT_SECONDS = 15.0
+NOTIFICATION_TIMEOUT_SECONDS = 30.0
+
 
 class AlertManager:
     """Main alert management system"""
@@ -217,7 +229,7 @@ class AlertManager:
         while True:
             try:
                 await self._evaluate_all_rules()
-                await asyncio.sleep(30)  # Evaluate every 30 seconds
+                await asyncio.sleep(EVALUATION_INTERVAL_SECONDS)
 
             except asyncio.CancelledError:
                 break
@@ -225,16 +237,74 @@ class AlertManager:
                 logger.error("Error in alert evaluation loop", error=str(e))
                 await asyncio.sleep(60)  # Wait longer on error
 
-    async def _evaluate_all_rules(self):
-        """Evaluate all alert rules"""
-        for rule_id, rule in self.alert_rules.items():
-            if not rule.enabled:
-                continue
-
+    async def _evaluate_all_rules(self) -> List[Alert]:
+        """Evaluate all alert rules, returning the alerts raised this cycle"""
+        groups: Dict[Tuple[str, int], List[AlertRule]] = {}
+        for rule in self.alert_rules.values():
+            if rule.enabled:
+                groups.setdefault((rule.metric_name, rule.evaluation_window), []).append(rule)
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EVALUATIONS)
+        results = await asyncio.gather(
+            *(
+                self._evaluate_group(metric_name, window, rules, semaphore)
+                for (metric_name, window), rules in groups.items()
+            )
+        )
+        raised = [pair for group in results for pair in group]
+        if raised:
+            await self._dispatch_alerts(raised)
+
+        logger.debug(
+            "Alert rules evaluated",
+            rules=sum(len(rules) for rules in groups.values()),
+            metrics=len(groups),
+            raised=len(raised),
+            duration_ms=round((time.monotonic() - started) * 1000, 1),
+        )
+        return [alert for alert, _ in raised]
+
+    async def _evaluate_group(
+        self,
+        metric_name: str,
+        window_seconds: int,
+        rules: List[AlertRule],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[Alert, AlertRule]]:
+        """Fetch one metric and check every rule that reads it"""
+        async with semaphore:
             try:
-                await self._evaluate_rule(rule)
-            except Exception as e:
-                logger.error("Failed to evaluate rule", rule_id=rule_id, error=str(e))
+                current_value = await asyncio.wait_for(
+                    self._get_metric_value(metric_name, window_seconds),
+                    METRIC_FETCH_TIMEOUT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Metric fetch timed out",
+                    metric=metric_name,
+                    rules=[rule.rule_id for rule in rules],
+                )
+                return []
+
+        if current_value is None:
+            logger.debug("No metric value available", metric=metric_name)
+            return []
+
+        async def check(rule: AlertRule) -> Optional[Alert]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._check_rule(rule, current_value), RULE_EVALUATION_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Rule evaluation timed out", rule_id=rule.rule_id)
+                except Exception as e:
+                    logger.error("Failed to evaluate rule", rule_id=rule.rule_id, error=str(e))
+                return None
+
+        alerts = await asyncio.gather(*(check(rule) for rule in rules))
+        return [(alert, rule) for alert, rule in zip(alerts, rules) if alert is not None]
 
     async def _evaluate_rule(self, rule: AlertRule):
         """Evaluate a single alert rule"""
@@ -245,34 +315,39 @@ class AlertManager:
             logger.debug("No metric value available", metric=rule.metric_name, rule_id=rule.rule_id)
             return
 
+        alert = await self._check_rule(rule, current_value)
+        if alert:
+            await self._trigger_alert(alert, rule)
+
+    async def _check_rule(self, rule: AlertRule, current_value: float) -> Optional[Alert]:
+        """The alert a rule raises for the current metric value, if any"""
         # Check if rule should trigger
         should_trigger = self.evaluator.evaluate_rule(rule, current_value)
 
-        if should_trigger:
-            # Check cooldown period
-            if await self._is_in_cooldown(rule.rule_id):
-                return
+        if not should_trigger:
+            return None
 
-            # Check if alert already exists
-            existing_alert = await self._get_active_alert(rule.rule_id)
-            if existing_alert:
-                return
+        # Check cooldown period
+        if await self._is_in_cooldown(rule.rule_id):
+            return None
 
-            # Create and trigger alert
-            alert = Alert(
-                alert_id=str(uuid.uuid4()),
-                rule_id=rule.rule_id,
-                severity=rule.severity,
-                status=AlertStatus.TRIGGERED,
-                title=rule.name,
-                description=rule.description,
-                metric_value=current_value,
-                threshold_value=rule.threshold_value,
-                triggered_at=datetime.now(),
-                context=await self._get_alert_context(rule, current_value),
-            )
+        # Check if alert already exists
+        existing_alert = await self._get_active_alert(rule.rule_id)
+        if existing_alert:
+            return None
 
-            await self._trigger_alert(alert, rule)
+        return Alert(
+            alert_id=str(uuid.uuid4()),
+            rule_id=rule.rule_id,
+            severity=rule.severity,
+            status=AlertStatus.TRIGGERED,
+            title=rule.name,
+            description=rule.description,
+            metric_value=current_value,
+            threshold_value=rule.threshold_value,
+            triggered_at=datetime.now(),
+            context=await self._get_alert_context(rule, current_value),
+        )
 
     async def _get_metric_value(self, metric_name: str, window_seconds: int) -> Optional[float]:
         """Get current metric value"""
@@ -336,18 +411,28 @@ class AlertManager:
 
     async def _trigger_alert(self, alert: Alert, rule: AlertRule):
         """Trigger an alert and send notifications"""
-        try:
-            # Store alert
-            await self._store_alert(alert)
-            self.active_alerts[alert.alert_id] = alert
+        await self._dispatch_alerts([(alert, rule)])
+
+    async def _dispatch_alerts(self, raised: List[Tuple[Alert, AlertRule]]):
+        """Store alerts raised together, then notify each channel once with all of its alerts"""
+        stored = await asyncio.gather(
+            *(self._store_and_cool_down(alert, rule) for alert, rule in raised)
+        )
+        raised = [pair for pair, ok in zip(raised, stored) if ok]
 
-            # Send notifications
+        batches: Dict[str, Tuple[NotificationChannel, List[Alert]]] = {}
+        for alert, rule in raised:
             for channel_type in rule.channels:
-                await self._send_notification(alert, channel_type)
+                for channel in self._channels_of_type(channel_type):
+                    _, alerts = batches.setdefault(channel.channel_id, (channel, []))
+                    if alert not in alerts:
+                        alerts.append(alert)
 
-            # Set cooldown
-            await self._set_cooldown(rule.rule_id, rule.cooldown_period)
+        await asyncio.gather(
+            *(self._send_batch(channel, alerts) for channel, alerts in batches.values())
+        )
 
+        for alert, rule in raised:
             logger.info(
                 "Alert triggered",
                 alert_id=alert.alert_id,
@@ -356,53 +441,70 @@ class AlertManager:
                 metric_value=alert.metric_value,
             )
 
+    async def _store_and_cool_down(self, alert: Alert, rule: AlertRule) -> bool:
+        try:
+            # Store alert
+            await self._store_alert(alert)
+            self.active_alerts[alert.alert_id] = alert
+
+            # Set cooldown
+            await self._set_cooldown(rule.rule_id, rule.cooldown_period)
+            return True
+
         except Exception as e:
             logger.error("Failed to trigger alert", alert_id=alert.alert_id, error=str(e))
+            return False
+
+    def _channels_of_type(self, channel_type: AlertChannel) -> List[NotificationChannel]:
+        # Find configured channels of this type
+        matching_channels = [
+            ch
+            for ch in self.notification_channels.values()
+            if ch.channel_type == channel_type and ch.enabled
+        ]
+        if not matching_channels:
+            logger.warning("No configured channels found", channel_type=channel_type.value)
+        return matching_channels
 
     async def _send_notification(self, alert: Alert, channel_type: AlertChannel):
         """Send notification through specified channel"""
-        try:
-            # Find configured channels of this type
-            matching_channels = [
-                ch
-                for ch in self.notification_channels.values()
-                if ch.channel_type == channel_type and ch.enabled
-            ]
-
-            if not matching_channels:
-                logger.warning("No configured channels found", channel_type=channel_type.value)
-                return
-
-            # Send to each matching channel
-            for channel in matching_channels:
-                # Check rate limiting
-                if not await self._check_rate_limit(channel):
-                    logger.warning("Rate limit exceeded for channel", channel_id=channel.channel_id)
-                    continue
-
-                success = False
-                if channel_type == AlertChannel.EMAIL:
-                    success = await self.notification_sender.send_email(channel, alert)
-                elif channel_type == AlertChannel.SLACK:
-                    success = await self.notification_sender.send_slack(channel, alert)
-                elif channel_type == AlertChannel.WEBHOOK:
-                    success = await self.notification_sender.send_webhook(channel, alert)
-                elif channel_type == AlertChannel.DISCORD:
-                    success = await self.notification_sender.send_discord(channel, alert)
-
-                if success:
-                    alert.notifications_sent.append(
-                        f"{channel.channel_type.value}:{channel.channel_id}"
-                    )
-                    await self._record_notification(channel)
+        await asyncio.gather(
+            *(
+                self._send_batch(channel, [alert])
+                for channel in self._channels_of_type(channel_type)
+            )
+        )
+
+    async def _send_batch(self, channel: NotificationChannel, alerts: List[Alert]):
+        """Send alerts to one channel as a single notification"""
+        # Check rate limiting
+        if not await self._check_rate_limit(channel):
+            logger.warning("Rate limit exceeded for channel", channel_id=channel.channel_id)
+            return
 
+        try:
+            success = await asyncio.wait_for(
+                self.notification_sender.send_batch(channel, alerts),
+                NOTIFICATION_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.error("Notification timed out", channel_id=channel.channel_id)
+            return
         except Exception as e:
             logger.error(
                 "Failed to send notification",
-                alert_id=alert.alert_id,
-                channel_type=channel_type.value,
+                channel_id=channel.channel_id,
+                alert_ids=[alert.alert_id for alert in alerts],
                 error=str(e),
             )
+            return
+
+        if success:
+            for alert in alerts:
+                alert.notifications_sent.append(
+                    f"{channel.channel_type.value}:{channel.channel_id}"
+                )
+            await self._record_notification(channel)
 
     async def _check_rate_limit(self, channel: NotificationChannel) -> bool:
         """Check if channel is within rate limit"""
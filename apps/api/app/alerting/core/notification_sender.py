@@ -1,17 +1,27 @@
 """
 Notification Sender
 Handles sending notifications through various channels (email, Slack, Discord, webhooks).
+
+``send_batch`` delivers the alerts raised in one evaluation cycle together: one
+Slack message, Discord messages of up to DISCORD_MAX_EMBEDS embeds, one SMTP
+session, and one webhook call for webhooks configured with ``"batch": true``.
 """
 
+import asyncio
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Any, Dict, List
 
 import httpx
 import structlog
 from jinja2 import Environment, select_autoescape
 
 from .alert_models import Alert, NotificationChannel
+from .alert_types import AlertChannel, AlertSeverity
+
+# Discord rejects messages with more embeds than this
+DISCORD_MAX_EMBEDS = 10
 
 logger = structlog.get_logger()
 
@@ -26,6 +36,11 @@ class NotificationSender:
 
     async def send_email(self, channel: NotificationChannel, alert: Alert) -> bool:
         """Send email notification"""
+        return await self._send_emails(channel, [alert])
+
+    async def _send_emails(self, channel: NotificationChannel, alerts: List[Alert]) -> bool:
+        """Send one email per alert over a single SMTP session"""
+        alert_ids = [alert.alert_id for alert in alerts]
         try:
             config = channel.config
             smtp_server = config.get("smtp_server")
@@ -38,87 +53,17 @@ class NotificationSender:
                 logger.error("Incomplete email configuration", channel_id=channel.channel_id)
                 return False
 
-            # Create email content
-            subject = f"[{alert.severity.value.upper()}] {alert.title}"
-
-            # HTML email template with autoescape enabled
-            html_template = self.jinja_env.from_string(
-                """
-            <html>
-            <head><title>Janua Alert</title></head>
-            <body>
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <div style="background-color: {{ severity_color }}; color: white; padding: 20px; text-align: center;">
-                        <h1>{{ severity.upper() }} ALERT</h1>
-                    </div>
-                    <div style="padding: 20px; background-color: #f9f9f9;">
-                        <h2>{{ title }}</h2>
-                        <p><strong>Description:</strong> {{ description }}</p>
-                        <p><strong>Triggered At:</strong> {{ triggered_at }}</p>
-                        <p><strong>Current Value:</strong> {{ metric_value }}</p>
-                        <p><strong>Threshold:</strong> {{ threshold_value }}</p>
-
-                        {% if context %}
-                        <h3>Additional Context:</h3>
-                        <ul>
-                        {% for key, value in context.items() %}
-                            <li><strong>{{ key }}:</strong> {{ value }}</li>
-                        {% endfor %}
-                        </ul>
-                        {% endif %}
-
-                        <div style="margin-top: 30px; padding: 15px; background-color: #e7f3ff; border-left: 4px solid #2196F3;">
-                            <p><strong>Alert ID:</strong> {{ alert_id }}</p>
-                            <p><strong>Rule ID:</strong> {{ rule_id }}</p>
-                        </div>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            )
+            messages = [self._email_message(alert, username, to_addresses) for alert in alerts]
 
-            # Color based on severity
-            severity_colors = {
-                "low": "#4CAF50",
-                "medium": "#FF9800",
-                "high": "#FF5722",
-                "critical": "#F44336",
-            }
-
-            html_body = html_template.render(
-                severity=alert.severity.value,
-                severity_color=severity_colors.get(alert.severity.value, "#666"),
-                title=alert.title,
-                description=alert.description,
-                triggered_at=alert.triggered_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
-                metric_value=alert.metric_value,
-                threshold_value=alert.threshold_value,
-                context=alert.context,
-                alert_id=alert.alert_id,
-                rule_id=alert.rule_id,
+            # smtplib blocks; keep it off the event loop
+            await asyncio.to_thread(
+                self._deliver_emails, smtp_server, smtp_port, username, password, messages
             )
 
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = username
-            msg["To"] = ", ".join(to_addresses)
-
-            # Add HTML part
-            html_part = MIMEText(html_body, "html")
-            msg.attach(html_part)
-
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(username, password)
-                server.send_message(msg)
-
             logger.info(
                 "Email alert sent successfully",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 recipients=len(to_addresses),
             )
             return True
@@ -127,72 +72,168 @@ class NotificationSender:
             logger.error(
                 "Failed to send email alert",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 error=str(e),
             )
             return False
 
+    def _email_message(self, alert: Alert, sender: str, to_addresses: List[str]) -> MIMEMultipart:
+        # Create email content
+        subject = f"[{alert.severity.value.upper()}] {alert.title}"
+
+        # HTML email template with autoescape enabled
+        html_template = self.jinja_env.from_string(
+            """
+        <html>
+        <head><title>Janua Alert</title></head>
+        <body>
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <div style="background-color: {{ severity_color }}; color: white; padding: 20px; text-align: center;">
+                    <h1>{{ severity.upper() }} ALERT</h1>
+                </div>
+                <div style="padding: 20px; background-color: #f9f9f9;">
+                    <h2>{{ title }}</h2>
+                    <p><strong>Description:</strong> {{ description }}</p>
+                    <p><strong>Triggered At:</strong> {{ triggered_at }}</p>
+                    <p><strong>Current Value:</strong> {{ metric_value }}</p>
+                    <p><strong>Threshold:</strong> {{ threshold_value }}</p>
+
+                    {% if context %}
+                    <h3>Additional Context:</h3>
+                    <ul>
+                    {% for key, value in context.items() %}
+                        <li><strong>{{ key }}:</strong> {{ value }}</li>
+                    {% endfor %}
+                    </ul>
+                    {% endif %}
+
+                    <div style="margin-top: 30px; padding: 15px; background-color: #e7f3ff; border-left: 4px solid #2196F3;">
+                        <p><strong>Alert ID:</strong> {{ alert_id }}</p>
+                        <p><strong>Rule ID:</strong> {{ rule_id }}</p>
+                    </div>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        )
+
+        # Color based on severity
+        severity_colors = {
+            "low": "#4CAF50",
+            "medium": "#FF9800",
+            "high": "#FF5722",
+            "critical": "#F44336",
+        }
+
+        html_body = html_template.render(
+            severity=alert.severity.value,
+            severity_color=severity_colors.get(alert.severity.value, "#666"),
+            title=alert.title,
+            description=alert.description,
+            triggered_at=alert.triggered_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+            metric_value=alert.metric_value,
+            threshold_value=alert.threshold_value,
+            context=alert.context,
+            alert_id=alert.alert_id,
+            rule_id=alert.rule_id,
+        )
+
+        # Create message
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = sender
+        msg["To"] = ", ".join(to_addresses)
+
+        # Add HTML part
+        html_part = MIMEText(html_body, "html")
+        msg.attach(html_part)
+        return msg
+
+    @staticmethod
+    def _deliver_emails(
+        smtp_server: str, smtp_port: int, username: str, password: str, messages: List
+    ):
+        with smtplib.SMTP(smtp_server, smtp_port) as server:
+            server.starttls()
+            server.login(username, password)
+            for msg in messages:
+                server.send_message(msg)
+
+    async def send(self, channel: NotificationChannel, alert: Alert) -> bool:
+        """Send one alert through the channel's type"""
+        if channel.channel_type == AlertChannel.EMAIL:
+            return await self.send_email(channel, alert)
+        if channel.channel_type == AlertChannel.SLACK:
+            return await self.send_slack(channel, alert)
+        if channel.channel_type == AlertChannel.WEBHOOK:
+            return await self.send_webhook(channel, alert)
+        if channel.channel_type == AlertChannel.DISCORD:
+            return await self.send_discord(channel, alert)
+        return False
+
+    async def send_batch(self, channel: NotificationChannel, alerts: List[Alert]) -> bool:
+        """Send the alerts raised in one evaluation cycle to a channel, together"""
+        if not alerts:
+            return True
+        if len(alerts) == 1:
+            return await self.send(channel, alerts[0])
+
+        if channel.channel_type == AlertChannel.EMAIL:
+            return await self._send_emails(channel, alerts)
+        if channel.channel_type == AlertChannel.SLACK:
+            return await self._send_slack(channel, alerts)
+        if channel.channel_type == AlertChannel.DISCORD:
+            results = await asyncio.gather(
+                *(
+                    self._send_discord(channel, alerts[i : i + DISCORD_MAX_EMBEDS])
+                    for i in range(0, len(alerts), DISCORD_MAX_EMBEDS)
+                )
+            )
+            return all(results)
+        if channel.channel_type == AlertChannel.WEBHOOK:
+            if channel.config.get("batch"):
+                return await self._send_webhook(
+                    channel,
+                    alerts,
+                    {"alerts": [self._webhook_payload(alert) for alert in alerts]},
+                )
+            # Receivers expect one alert per call unless they opted in to batches
+            results = await asyncio.gather(*(self.send_webhook(channel, alert) for alert in alerts))
+            return all(results)
+        return False
+
     async def send_slack(self, channel: NotificationChannel, alert: Alert) -> bool:
         """Send Slack notification"""
+        return await self._send_slack(channel, [alert])
+
+    async def _send_slack(self, channel: NotificationChannel, alerts: List[Alert]) -> bool:
+        alert_ids = [alert.alert_id for alert in alerts]
         try:
             webhook_url = channel.config.get("webhook_url")
             if not webhook_url:
                 logger.error("Slack webhook URL not configured", channel_id=channel.channel_id)
                 return False
 
-            # Color based on severity
-            severity_colors = {
-                "low": "good",
-                "medium": "warning",
-                "high": "danger",
-                "critical": "#FF0000",
-            }
-
             # Create Slack payload
+            if len(alerts) == 1:
+                alert = alerts[0]
+                text = f"🚨 {alert.severity.value.upper()} Alert: {alert.title}"
+            else:
+                highest = _highest_severity(alerts)
+                text = f"🚨 {len(alerts)} alerts (highest: {highest.value.upper()})"
             payload = {
-                "text": f"🚨 {alert.severity.value.upper()} Alert: {alert.title}",
-                "attachments": [
-                    {
-                        "color": severity_colors.get(alert.severity.value, "good"),
-                        "fields": [
-                            {"title": "Description", "value": alert.description, "short": False},
-                            {
-                                "title": "Current Value",
-                                "value": str(alert.metric_value),
-                                "short": True,
-                            },
-                            {
-                                "title": "Threshold",
-                                "value": str(alert.threshold_value),
-                                "short": True,
-                            },
-                            {
-                                "title": "Triggered At",
-                                "value": alert.triggered_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
-                                "short": True,
-                            },
-                            {"title": "Alert ID", "value": alert.alert_id, "short": True},
-                        ],
-                        "footer": "Janua Alert System",
-                        "ts": int(alert.triggered_at.timestamp()),
-                    }
-                ],
+                "text": text,
+                "attachments": [self._slack_attachment(alert) for alert in alerts],
             }
 
-            # Add context fields if available
-            if alert.context:
-                for key, value in alert.context.items():
-                    payload["attachments"][0]["fields"].append(
-                        {"title": key, "value": str(value), "short": True}
-                    )
-
             response = await self.http_client.post(webhook_url, json=payload)
             response.raise_for_status()
 
             logger.info(
                 "Slack alert sent successfully",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
             )
             return True
 
@@ -200,13 +241,60 @@ class NotificationSender:
             logger.error(
                 "Failed to send Slack alert",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 error=str(e),
             )
             return False
 
+    @staticmethod
+    def _slack_attachment(alert: Alert) -> Dict[str, Any]:
+        # Color based on severity
+        severity_colors = {
+            "low": "good",
+            "medium": "warning",
+            "high": "danger",
+            "critical": "#FF0000",
+        }
+
+        attachment = {
+            "color": severity_colors.get(alert.severity.value, "good"),
+            "fields": [
+                {"title": "Description", "value": alert.description, "short": False},
+                {
+                    "title": "Current Value",
+                    "value": str(alert.metric_value),
+                    "short": True,
+                },
+                {
+                    "title": "Threshold",
+                    "value": str(alert.threshold_value),
+                    "short": True,
+                },
+                {
+                    "title": "Triggered At",
+                    "value": alert.triggered_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+                    "short": True,
+                },
+                {"title": "Alert ID", "value": alert.alert_id, "short": True},
+            ],
+            "footer": "Janua Alert System",
+            "ts": int(alert.triggered_at.timestamp()),
+        }
+
+        # Add context fields if available
+        if alert.context:
+            for key, value in alert.context.items():
+                attachment["fields"].append({"title": key, "value": str(value), "short": True})
+        return attachment
+
     async def send_webhook(self, channel: NotificationChannel, alert: Alert) -> bool:
         """Send webhook notification"""
+        return await self._send_webhook(channel, [alert], self._webhook_payload(alert))
+
+    async def _send_webhook(
+        self, channel: NotificationChannel, alerts: List[Alert], payload: Dict[str, Any]
+    ) -> bool:
+        alert_ids = [alert.alert_id for alert in alerts]
         try:
             webhook_url = channel.config.get("webhook_url")
             headers = channel.config.get("headers", {})
@@ -216,20 +304,6 @@ class NotificationSender:
                 logger.error("Webhook URL not configured", channel_id=channel.channel_id)
                 return False
 
-            # Create webhook payload
-            payload = {
-                "alert_id": alert.alert_id,
-                "rule_id": alert.rule_id,
-                "severity": alert.severity.value,
-                "status": alert.status.value,
-                "title": alert.title,
-                "description": alert.description,
-                "metric_value": alert.metric_value,
-                "threshold_value": alert.threshold_value,
-                "triggered_at": alert.triggered_at.isoformat(),
-                "context": alert.context,
-            }
-
             if method == "POST":
                 response = await self.http_client.post(webhook_url, json=payload, headers=headers)
             elif method == "PUT":
@@ -243,7 +317,7 @@ class NotificationSender:
             logger.info(
                 "Webhook alert sent successfully",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 webhook_url=webhook_url,
             )
             return True
@@ -252,48 +326,39 @@ class NotificationSender:
             logger.error(
                 "Failed to send webhook alert",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 error=str(e),
             )
             return False
 
+    @staticmethod
+    def _webhook_payload(alert: Alert) -> Dict[str, Any]:
+        return {
+            "alert_id": alert.alert_id,
+            "rule_id": alert.rule_id,
+            "severity": alert.severity.value,
+            "status": alert.status.value,
+            "title": alert.title,
+            "description": alert.description,
+            "metric_value": alert.metric_value,
+            "threshold_value": alert.threshold_value,
+            "triggered_at": alert.triggered_at.isoformat(),
+            "context": alert.context,
+        }
+
     async def send_discord(self, channel: NotificationChannel, alert: Alert) -> bool:
         """Send Discord notification"""
+        return await self._send_discord(channel, [alert])
+
+    async def _send_discord(self, channel: NotificationChannel, alerts: List[Alert]) -> bool:
+        alert_ids = [alert.alert_id for alert in alerts]
         try:
             webhook_url = channel.config.get("webhook_url")
             if not webhook_url:
                 logger.error("Discord webhook URL not configured", channel_id=channel.channel_id)
                 return False
 
-            # Color based on severity
-            severity_colors = {
-                "low": 0x4CAF50,
-                "medium": 0xFF9800,
-                "high": 0xFF5722,
-                "critical": 0xF44336,
-            }
-
-            # Create Discord embed
-            embed = {
-                "title": f"🚨 {alert.severity.value.upper()} Alert",
-                "description": alert.title,
-                "color": severity_colors.get(alert.severity.value, 0x666666),
-                "fields": [
-                    {"name": "Description", "value": alert.description, "inline": False},
-                    {"name": "Current Value", "value": str(alert.metric_value), "inline": True},
-                    {"name": "Threshold", "value": str(alert.threshold_value), "inline": True},
-                    {"name": "Alert ID", "value": alert.alert_id, "inline": True},
-                ],
-                "timestamp": alert.triggered_at.isoformat(),
-                "footer": {"text": "Janua Alert System"},
-            }
-
-            # Add context fields
-            if alert.context:
-                for key, value in list(alert.context.items())[:5]:  # Limit to 5 additional fields
-                    embed["fields"].append({"name": key, "value": str(value), "inline": True})
-
-            payload = {"embeds": [embed]}
+            payload = {"embeds": [self._discord_embed(alert) for alert in alerts]}
 
             response = await self.http_client.post(webhook_url, json=payload)
             response.raise_for_status()
@@ -301,7 +366,7 @@ class NotificationSender:
             logger.info(
                 "Discord alert sent successfully",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
             )
             return True
 
@@ -309,11 +374,47 @@ class NotificationSender:
             logger.error(
                 "Failed to send Discord alert",
                 channel_id=channel.channel_id,
-                alert_id=alert.alert_id,
+                alert_ids=alert_ids,
                 error=str(e),
             )
             return False
 
+    @staticmethod
+    def _discord_embed(alert: Alert) -> Dict[str, Any]:
+        # Color based on severity
+        severity_colors = {
+            "low": 0x4CAF50,
+            "medium": 0xFF9800,
+            "high": 0xFF5722,
+            "critical": 0xF44336,
+        }
+
+        # Create Discord embed
+        embed = {
+            "title": f"🚨 {alert.severity.value.upper()} Alert",
+            "description": alert.title,
+            "color": severity_colors.get(alert.severity.value, 0x666666),
+            "fields": [
+                {"name": "Description", "value": alert.description, "inline": False},
+                {"name": "Current Value", "value": str(alert.metric_value), "inline": True},
+                {"name": "Threshold", "value": str(alert.threshold_value), "inline": True},
+                {"name": "Alert ID", "value": alert.alert_id, "inline": True},
+            ],
+            "timestamp": alert.triggered_at.isoformat(),
+            "footer": {"text": "Janua Alert System"},
+        }
+
+        # Add context fields
+        if alert.context:
+            for key, value in list(alert.context.items())[:5]:  # Limit to 5 additional fields
+                embed["fields"].append({"name": key, "value": str(value), "inline": True})
+        return embed
+
     async def close(self):
         """Close HTTP client"""
         await self.http_client.aclose()
+
+
+def _highest_severity(alerts: List[Alert]) -> AlertSeverity:
+    order = list(AlertSeverity)
+    return max((alert.severity for alert in alerts), key=order.index)
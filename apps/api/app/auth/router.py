@@ -11,7 +11,7 @@ logger = structlog.get_logger(__name__)
 
 from app.config import settings
 from app.core.database import get_db
-from app.core.redis import RateLimiter, SessionStore, get_redis
+from app.core.redis import RateLimiter, SessionStore, get_read_redis, get_redis
 
 # Import services with error handling for production stability
 try:
@@ -277,7 +277,7 @@ async def signout(
             user_id = None
 
         # Create session store instance
-        session_store = SessionStore(redis)
+        session_store = SessionStore(redis, read_client=await get_read_redis())
 
         # Delete session from Redis if user ID available
         if user_id:
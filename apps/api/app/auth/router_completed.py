@@ -15,7 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.core.database import get_db
-from app.core.redis import SessionStore, get_redis
+from app.core.redis import SessionStore, get_read_redis, get_redis
 from app.exceptions import AuthenticationError, ValidationError
 from app.models.user import Session, User
 from app.services.auth_service import AuthService
@@ -184,7 +184,7 @@ async def signout(
                 await db.commit()
 
                 # Delete session from Redis if using session store
-                session_store = SessionStore(redis)
+                session_store = SessionStore(redis, read_client=await get_read_redis())
                 await session_store.delete(str(session.id))
 
         return {"message": "Successfully signed out"}
@@ -21,6 +21,7 @@ from app.core.config import get_settings
 from app.core.database import get_session
 from app.models.audit import AuditLog
 from app.models.compliance import ComplianceFramework
+from app.services.metrics_rollup import record_compliance_event
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -227,6 +228,9 @@ class AuditLogger:
             session.add(audit_log)
             await session.commit()
 
+        # Per-minute counters for the compliance dashboard
+        record_compliance_event(compliance_event.organization_id, event_type.value, outcome)
+
         # Cache for real-time monitoring
         if self.redis:
             await self.redis.lpush(
@@ -25,6 +25,7 @@ from app.models.compliance import (
     DataSubjectRequest,
     RequestStatus,
 )
+from app.services.metrics_rollup import metrics_rollup
 
 from .audit import AuditLogger
 from .monitor import ComplianceMonitor, ControlStatus
@@ -207,17 +208,26 @@ class ComplianceDashboard:
             )
             events = recent_events.scalars().all()
 
-            # Event statistics
+            # Event statistics from the per-minute rollups
+            counts = await metrics_rollup.totals(
+                [
+                    "compliance.events",
+                    "compliance.events.failure",
+                    "compliance.security_event",
+                    "compliance.user_access.failure",
+                    "compliance.privileged_access",
+                    "compliance.system_change",
+                ],
+                start_time,
+                current_time,
+                scope=organization_id,
+            )
             event_stats = {
-                "total_events": len(events),
-                "security_events": len([e for e in events if e.event_type == "security_event"]),
-                "failed_logins": len(
-                    [e for e in events if e.event_type == "user_access" and e.outcome == "failure"]
-                ),
-                "privileged_access": len(
-                    [e for e in events if e.event_type == "privileged_access"]
-                ),
-                "system_changes": len([e for e in events if e.event_type == "system_change"]),
+                "total_events": counts["compliance.events"],
+                "security_events": counts["compliance.security_event"],
+                "failed_logins": counts["compliance.user_access.failure"],
+                "privileged_access": counts["compliance.privileged_access"],
+                "system_changes": counts["compliance.system_change"],
             }
 
             # Active incidents
@@ -246,8 +256,8 @@ class ComplianceDashboard:
 
         # System health indicators
         health_metrics = {
-            "event_rate": len(events) / 15,  # Events per minute
-            "error_rate": len([e for e in events if e.outcome == "failure"]) / max(len(events), 1),
+            "event_rate": counts["compliance.events"] / 15,  # Events per minute
+            "error_rate": counts["compliance.events.failure"] / max(counts["compliance.events"], 1),
             "security_alert_rate": event_stats["security_events"] / 15,
             "active_incidents": incident_count,
             "pending_dsr": pending_count,
@@ -679,22 +689,11 @@ class ComplianceDashboard:
             )
             incident_count = incidents.scalar() or 0
 
-            # Failed login attempts
-            failed_logins = await session.execute(
-                select(func.count(AuditLog.id)).where(
-                    and_(
-                        AuditLog.created_at >= start_time,
-                        AuditLog.event_type == "user_access",
-                        AuditLog.outcome == "failure",
-                        func.coalesce(
-                            AuditLog.metadata["compliance_event"]["organization_id"].astext,
-                            "default",
-                        )
-                        == organization_id,
-                    )
-                )
-            )
-            failed_login_count = failed_logins.scalar() or 0
+        # Failed login attempts
+        counts = await metrics_rollup.totals(
+            ["compliance.user_access.failure"], start_time, scope=organization_id
+        )
+        failed_login_count = counts["compliance.user_access.failure"]
 
         # Calculate security posture score
         security_score = 100
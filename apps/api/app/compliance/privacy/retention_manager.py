@@ -8,13 +8,14 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_session
 from app.models.audit import AuditLog
 from app.models.compliance import ComplianceFramework, DataCategory, DataRetentionPolicy
 from app.models.users import User
+from app.services.retention_purger import RetentionPurger
 
 from ..audit import AuditEventType, AuditLogger
 from .privacy_types import RetentionAction
@@ -25,8 +26,9 @@ logger = logging.getLogger(__name__)
 class RetentionManager:
     """Manages automated data retention and deletion policies"""
 
-    def __init__(self, audit_logger: AuditLogger):
+    def __init__(self, audit_logger: AuditLogger, purger: Optional[RetentionPurger] = None):
         self.audit_logger = audit_logger
+        self.purger = purger or RetentionPurger()
 
     async def execute_retention_policies(
         self, organization_id: Optional[str] = None, dry_run: bool = False
@@ -200,14 +202,17 @@ class RetentionManager:
                 select(func.count()).select_from(User).where(User.created_at < cutoff_date)
             )
             affected_count = (await session.execute(users_query)).scalar()
+            # End the read transaction: its lock on the table would block the
+            # purger's DETACH PARTITION for as long as the purge runs
+            await session.commit()
             result["affected"] += affected_count
 
             if not dry_run and affected_count > 0:
                 if policy.retention_action == RetentionAction.DELETE.value:
-                    delete_result = await session.execute(
-                        delete(User).where(User.created_at < cutoff_date)
+                    purge = await self.purger.purge(
+                        User, User.created_at, cutoff_date, job_key=f"{policy.id}:users"
                     )
-                    result["deleted"] += delete_result.rowcount
+                    result["deleted"] += purge.rows_deleted
                 elif policy.retention_action == RetentionAction.ANONYMIZE.value:
                     # Anonymize user data (implementation specific)
                     result["anonymized"] += affected_count
@@ -228,17 +233,23 @@ class RetentionManager:
         # Find audit logs older than cutoff date
         if "audit_logs" in policy.data_sources:
             logs_query = (
-                select(func.count()).select_from(AuditLog).where(AuditLog.timestamp < cutoff_date)
+                select(func.count()).select_from(AuditLog).where(AuditLog.created_at < cutoff_date)
             )
             affected_count = (await session.execute(logs_query)).scalar()
+            # End the read transaction: its lock on the table would block the
+            # purger's DETACH PARTITION for as long as the purge runs
+            await session.commit()
             result["affected"] += affected_count
 
             if not dry_run and affected_count > 0:
                 if policy.retention_action == RetentionAction.DELETE.value:
-                    delete_result = await session.execute(
-                        delete(AuditLog).where(AuditLog.timestamp < cutoff_date)
+                    purge = await self.purger.purge(
+                        AuditLog,
+                        AuditLog.created_at,
+                        cutoff_date,
+                        job_key=f"{policy.id}:audit_logs",
                     )
-                    result["deleted"] += delete_result.rowcount
+                    result["deleted"] += purge.rows_deleted
                 elif policy.retention_action == RetentionAction.ARCHIVE.value:
                     # Archive logs (implementation specific)
                     result["archived"] += affected_count
@@ -3,10 +3,10 @@ Enterprise SLA monitoring and reporting infrastructure for compliance and custom
 Tracks service level objectives, uptime guarantees, and enterprise performance requirements.
 """
 
-import asyncio
 import json
 import logging
 import statistics
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -15,10 +15,10 @@ from typing import Any, Dict, List, Optional
 
 import psutil
 import redis.asyncio as aioredis
-from sqlalchemy import and_, func, select
+from sqlalchemy import select
 
 from app.core.database import get_session
-from app.models.audit import AuditLog
+from app.services.metrics_rollup import bucket_start, metrics_rollup, minute_of
 
 logger = logging.getLogger(__name__)
 
@@ -524,21 +524,20 @@ class SLAMonitor:
             return 0.0
 
     async def _measure_response_time(self, slo: ServiceLevelObjective) -> float:
-        """Measure API response time"""
+        """Measure response time (ms) from recorded request latencies"""
         try:
-            # Simulate API response time measurement
-            # In real implementation, this would make actual API calls
-            import time
-
-            start_time = time.time()
-
-            # Mock API health check
-            await asyncio.sleep(0.1)  # Simulate API call
-
-            end_time = time.time()
-            response_time_ms = (end_time - start_time) * 1000
-
-            return response_time_ms
+            if slo.slo_id == "database-response-time":
+                # Time a real round trip to the database
+                start_time = time.perf_counter()
+                async with get_session() as session:
+                    await session.execute(select(1))
+                return (time.perf_counter() - start_time) * 1000
+
+            # p95 of the request latency histogram over the last five minutes
+            latency = await metrics_rollup.latency(
+                "http.requests", datetime.utcnow() - timedelta(minutes=5)
+            )
+            return latency["p95_ms"] or 0.0
 
         except Exception as e:
             logger.error(f"Error measuring response time: {e}")
@@ -547,35 +546,16 @@ class SLAMonitor:
     async def _measure_error_rate(self, slo: ServiceLevelObjective) -> float:
         """Measure API error rate"""
         try:
-            async with get_session() as session:
-                # Count total requests and errors in the last hour
-                one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-
-                total_requests_query = select(func.count(AuditLog.id)).where(
-                    and_(
-                        AuditLog.action.in_(["api_request", "authentication", "api_success"]),
-                        AuditLog.created_at >= one_hour_ago,
-                    )
-                )
-
-                error_requests_query = select(func.count(AuditLog.id)).where(
-                    and_(
-                        AuditLog.action.in_(["api_error", "authentication_failed"]),
-                        AuditLog.created_at >= one_hour_ago,
-                    )
-                )
-
-                total_result = await session.execute(total_requests_query)
-                error_result = await session.execute(error_requests_query)
+            # Requests and server errors counted over the last hour
+            one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+            counts = await metrics_rollup.totals(["http.requests", "http.errors"], one_hour_ago)
 
-                total_requests = total_result.scalar() or 0
-                error_requests = error_result.scalar() or 0
+            total_requests = counts["http.requests"]
+            if total_requests == 0:
+                return 0.0
 
-                if total_requests == 0:
-                    return 0.0
-
-                error_rate = (error_requests / total_requests) * 100
-                return error_rate
+            error_rate = (counts["http.errors"] / total_requests) * 100
+            return error_rate
 
         except Exception as e:
             logger.error(f"Error measuring error rate: {e}")
@@ -584,23 +564,16 @@ class SLAMonitor:
     async def _measure_throughput(self, slo: ServiceLevelObjective) -> float:
         """Measure system throughput (requests per second)"""
         try:
-            async with get_session() as session:
-                # Count requests in the last minute
-                one_minute_ago = datetime.utcnow() - timedelta(minutes=1)
-
-                requests_query = select(func.count(AuditLog.id)).where(
-                    and_(
-                        AuditLog.action.in_(["api_request", "authentication"]),
-                        AuditLog.created_at >= one_minute_ago,
-                    )
-                )
-
-                result = await session.execute(requests_query)
-                requests_per_minute = result.scalar() or 0
+            # Count requests in the last complete minute; rollups are per whole
+            # minute, so a window starting mid-minute would cover up to two
+            current = minute_of()
+            counts = await metrics_rollup.totals(
+                ["http.requests"], bucket_start(current - 1), bucket_start(current)
+            )
 
-                # Convert to requests per second
-                requests_per_second = requests_per_minute / 60.0
-                return requests_per_second
+            # Convert to requests per second
+            requests_per_second = counts["http.requests"] / 60.0
+            return requests_per_second
 
         except Exception as e:
             logger.error(f"Error measuring throughput: {e}")
@@ -849,6 +822,10 @@ class UptimeTracker:
         if timestamp is None:
             timestamp = datetime.utcnow()
 
+        metrics_rollup.record("uptime.checks")
+        if is_up:
+            metrics_rollup.record("uptime.up")
+
         if self.redis_client:
             try:
                 # Store uptime status with timestamp
@@ -868,28 +845,15 @@ class UptimeTracker:
 
     async def get_uptime_percentage(self, hours: int = 24) -> float:
         """Get uptime percentage for specified period"""
-        if not self.redis_client:
-            return 99.9  # Default high uptime if Redis unavailable
-
         try:
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(hours=hours)
-
-            # Get status checks in time range
-            status_checks = await self.redis_client.zrangebyscore(
-                f"{self.uptime_key}:status",
-                start_time.timestamp(),
-                end_time.timestamp(),
-                withscores=True,
-            )
+            start_time = datetime.utcnow() - timedelta(hours=hours)
+            counts = await metrics_rollup.totals(["uptime.checks", "uptime.up"], start_time)
 
-            if not status_checks:
+            total_checks = counts["uptime.checks"]
+            if not total_checks:
                 return 99.9  # Assume up if no data
 
-            total_checks = len(status_checks)
-            up_checks = sum(1 for value, _ in status_checks if int(value) == 1)
-
-            return (up_checks / total_checks) * 100.0
+            return (counts["uptime.up"] / total_checks) * 100.0
 
         except Exception as e:
             logger.error(f"Error calculating uptime percentage: {e}")
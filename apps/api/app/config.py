@@ -81,6 +81,23 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = Field(default=5)
     DATABASE_MAX_OVERFLOW: int = Field(default=5)
     DATABASE_POOL_TIMEOUT: int = Field(default=30)
+    # Read replicas (app/core/db_routing.py). Each replica gets its own pool of
+    # the size above, on its own server, so they do not eat into the primary's
+    # connection budget.
+    DATABASE_REPLICA_URLS: Optional[str] = Field(
+        default=None,
+        description="Comma-separated read replica URLs; append #<weight> to weight one (default 100)",
+    )
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = Field(
+        default=5.0, description="Replicas lagging more than this are taken out of rotation"
+    )
+    DATABASE_REPLICA_HEALTH_CHECK_SECONDS: float = Field(
+        default=5.0, description="Interval between replica lag checks"
+    )
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = Field(
+        default=60,
+        description="How long a client's reads must observe its last write's WAL position",
+    )
     AUTO_MIGRATE: bool = Field(default=False)
 
     # Database SSL Configuration
@@ -111,6 +128,25 @@ class Settings(BaseSettings):
     REDIS_CONNECTION_TIMEOUT: int = Field(
         default=5000, description="Redis connection timeout in milliseconds"
     )
+    # Sentinel and replicas (app/core/redis.py). With Sentinel hosts set, the
+    # master is discovered through Sentinel and followed across failovers;
+    # database and credentials still come from REDIS_URL.
+    REDIS_SENTINEL_HOSTS: Optional[str] = Field(
+        default=None, description="Comma-separated Sentinel host:port list"
+    )
+    REDIS_SENTINEL_MASTER: str = Field(
+        default="mymaster", description="Sentinel service name of the master"
+    )
+    REDIS_SENTINEL_PASSWORD: Optional[str] = Field(default=None)
+    REDIS_REPLICA_URL: Optional[str] = Field(
+        default=None, description="Read replica URL when not using Sentinel"
+    )
+    REDIS_READ_FROM_REPLICAS: bool = Field(
+        default=True, description="Send lag-tolerant reads to replicas when there are any"
+    )
+    REDIS_REPLICA_POOL_SIZE: int = Field(
+        default=20, description="Connection pool size for replica reads"
+    )
 
     # JWT
     JWT_SECRET_KEY: Optional[str] = Field(default=None)
@@ -175,6 +211,58 @@ class Settings(BaseSettings):
         default="127.0.0.1,::1",
         description="Comma-separated list of trusted proxy IPs that can set X-Forwarded-For",
     )
+    API_KEY_CACHE_TTL_SECONDS: int = Field(
+        default=60, description="How long a verified API key is served from cache"
+    )
+    API_KEY_LAST_USED_FLUSH_SECONDS: float = Field(
+        default=30.0, description="How often coalesced API key last_used updates are written"
+    )
+
+    # IP intelligence (threat-intel CIDR feeds)
+    IP_INTEL_FEED_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory of CIDR feed files named <category>.txt (tor, vpn, datacenter, ...)",
+    )
+    IP_INTEL_SNAPSHOT_PATH: str = Field(
+        default="/tmp/janua-ip-intel.bin",
+        description="Compiled binary snapshot of the feeds, memory-mapped by every worker",
+    )
+
+    # GraphQL query limits
+    GRAPHQL_MAX_DEPTH: int = Field(default=10, description="Maximum selection depth")
+    GRAPHQL_MAX_COST: int = Field(
+        default=10000, description="Maximum estimated rows a single document may resolve"
+    )
+    GRAPHQL_MAX_PAGE_SIZE: int = Field(default=100, description="Upper bound for `limit` args")
+    GRAPHQL_PERSISTED_QUERY_TTL: int = Field(
+        default=86400 * 7, description="Seconds a registered persisted query stays in Redis"
+    )
+
+    # Logging pipeline (app/logging/pipeline.py)
+    LOG_QUEUE_SIZE: int = Field(
+        default=10000, description="Records buffered for the log writer thread before dropping"
+    )
+    LOG_SAMPLE_RATES: str = Field(
+        default="", description="Per-level sample rates for debug/info, e.g. 'debug=0.1,info=0.5'"
+    )
+    LOG_ROUTE_SAMPLE_RATES: str = Field(
+        default="",
+        description="Per-route-prefix sample rates for debug/info, e.g. '/api/v1/health=0.01'",
+    )
+    LOG_DUPLICATE_WINDOW_SECONDS: float = Field(
+        default=10.0, description="Window for suppressing identical warning/error records"
+    )
+    LOG_DUPLICATE_MAX_PER_WINDOW: int = Field(
+        default=5, description="Identical warning/error records kept per window (0 disables)"
+    )
+
+    # WebSocket fan-out
+    WEBSOCKET_OUTBOUND_QUEUE_SIZE: int = Field(
+        default=256, description="Messages buffered per connection before the slow-consumer policy"
+    )
+    WEBSOCKET_SLOW_CONSUMER_POLICY: str = Field(
+        default="drop_oldest", description="drop_oldest or disconnect when a client's queue is full"
+    )
 
     # Account Lockout
     ACCOUNT_LOCKOUT_ENABLED: bool = Field(
@@ -189,6 +277,12 @@ class Settings(BaseSettings):
     ACCOUNT_LOCKOUT_RESET_ON_SUCCESS: bool = Field(
         default=True, description="Reset failed attempt counter on successful login"
     )
+    ACCOUNT_LOCKOUT_WINDOW_MINUTES: int = Field(
+        default=15, description="Sliding window in which failed attempts count toward a lockout"
+    )
+    ACCOUNT_LOCKOUT_IP_THRESHOLD: int = Field(
+        default=20, description="Failed attempts from one IP, across accounts, before it is blocked"
+    )
 
     # Email Verification Enforcement
     REQUIRE_EMAIL_VERIFICATION: bool = Field(
@@ -208,6 +302,12 @@ class Settings(BaseSettings):
     CLIENT_SECRET_MAX_AGE_DAYS: int = Field(
         default=90, description="Maximum age in days for client secrets before requiring rotation"
     )
+    CLIENT_SECRET_VERIFY_CACHE_SECONDS: int = Field(
+        default=60, description="Seconds a successful client secret check is reused per worker"
+    )
+    CLIENT_SECRET_LAST_USED_FLUSH_SECONDS: float = Field(
+        default=30.0, description="Interval for batched last_used_at writes of client secrets"
+    )
 
     # Email
     EMAIL_ENABLED: bool = Field(default=False)
@@ -336,6 +436,18 @@ class Settings(BaseSettings):
     ALERT_WEBHOOK_URL: Optional[str] = Field(
         default=None, description="Webhook URL for sending alerts"
     )
+    METRICS_ROLLUP_FLUSH_SECONDS: float = Field(
+        default=1.0, description="How often in-process metric counters are flushed to Redis"
+    )
+    METRICS_ROLLUP_PERSIST_SECONDS: float = Field(
+        default=60.0, description="How often closed minute buckets move from Redis to the database"
+    )
+    HEALTH_CHECK_CACHE_SECONDS: float = Field(
+        default=5.0, description="How long health check results are reused across probes"
+    )
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = Field(
+        default=3.0, description="Deadline for each individual health check"
+    )
 
     # Features
     ENABLE_DOCS: bool = Field(default=True)
@@ -474,6 +586,23 @@ class Settings(BaseSettings):
     GDPR_BREACH_NOTIFICATION_HOURS: int = Field(
         default=72, description="GDPR breach notification period"
     )
+    RETENTION_BATCH_SIZE: int = Field(
+        default=5000, description="Rows deleted per retention purge transaction"
+    )
+    RETENTION_THROTTLE_SECONDS: float = Field(
+        default=0.05, description="Pause between retention purge batches"
+    )
+    RETENTION_MAX_BATCH_SECONDS: float = Field(
+        default=1.0, description="Batch duration above which the purge batch size is halved"
+    )
+    RETENTION_LOCK_TIMEOUT_MS: int = Field(
+        default=2000,
+        description="Give up on dropping a partition if its lock is not granted in time",
+    )
+    RETENTION_REQUEST_MAX_BATCHES: int = Field(
+        default=20,
+        description="Purge batches run by one cleanup request; the rest resumes on the next call",
+    )
 
     # Consent management
     CONSENT_COOKIE_LIFETIME_DAYS: int = Field(default=365, description="Consent cookie lifetime")
@@ -492,6 +621,13 @@ class Settings(BaseSettings):
         default=7, description="Compliance audit log retention period"
     )
     AUDIT_LOG_ENCRYPTION: bool = Field(default=True, description="Enable audit log encryption")
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = Field(
+        default=3, description="Monthly audit_logs partitions kept created ahead of time"
+    )
+    AUDIT_LOG_PARTITION_LOCK_TIMEOUT_MS: int = Field(
+        default=2000,
+        description="Skip creating an audit_logs partition if its lock is not granted in time",
+    )
 
     # Data export settings
     DATA_EXPORT_MAX_RECORDS: int = Field(
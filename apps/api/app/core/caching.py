@@ -4,21 +4,48 @@ Caching utilities with circuit-breaker protected Redis
 Provides decorators and utilities for caching hot paths with:
 - Circuit breaker protection (graceful degradation)
 - Configurable TTL
-- Cache invalidation patterns
-- Performance monitoring
+- Cache invalidation patterns (keys, tags, SCAN patterns)
+- Single-flight recomputes and stale-while-revalidate
+- An in-process L1 in front of Redis
+- Performance monitoring (hit ratio, recomputes, invalidation lag on /metrics)
 """
 
+import asyncio
+import fnmatch
 import hashlib
 import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import structlog
 
-from app.core.redis import ResilientRedisClient, get_redis
+from app.core.invalidation import invalidation_bus
+from app.core.redis import ResilientRedisClient, get_read_redis, get_redis
 
 logger = structlog.get_logger()
 
+# Invalidation bus topic for key and tag invalidations (drops L1 entries on every worker)
+CACHE_INVALIDATION_TOPIC = "cache"
+
+TAG_KEY_PREFIX = "janua:cache:tag:"
+TAG_KEY_TTL_SECONDS = 7 * 24 * 3600  # Longer than any entry; an expired tag only causes misses
+TAG_VERSION_TTL_SECONDS = 5  # Re-read interval when invalidation events are unavailable
+TAG_VERSION_MAX_AGE_SECONDS = 3600  # Safety re-read while the invalidation bus is listening
+MAX_TRACKED_TAGS = 10000
+
+LOCAL_CACHE_MAX_ENTRIES = 2048
+DEFAULT_LOCK_TIMEOUT = 10  # Seconds a recompute may hold a key's lock
+LOCK_POLL_INTERVAL = 0.05
+
+ENVELOPE_MARKER = "__janua_cache__"
+
+# Upper bounds (seconds) of the invalidation lag histogram
+INVALIDATION_LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
 
 def cache_key(*args, **kwargs) -> str:
     """
@@ -43,23 +70,413 @@ def cache_key(*args, **kwargs) -> str:
     return key_hash
 
 
+@dataclass
+class CacheEntry:
+    """A cached value, when it goes stale, and the tag versions it was computed under"""
+
+    value: Any
+    fresh_until: float  # Epoch seconds; after this the value is only served while revalidating
+    tags: Optional[Dict[str, str]] = None  # None: plain JSON written outside ``cached``
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+    def matches(self, tag_versions: Dict[str, str]) -> bool:
+        """False if any of the entry's tags was invalidated after it was computed"""
+        if self.tags is None:
+            return True
+        return all(self.tags.get(tag) == version for tag, version in tag_versions.items())
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                ENVELOPE_MARKER: 1,
+                "value": self.value,
+                "fresh_until": self.fresh_until,
+                "tags": self.tags or {},
+            },
+            default=str,
+        )
+
+    @classmethod
+    def loads(cls, raw: Any) -> "CacheEntry":
+        data = json.loads(raw)
+        if isinstance(data, dict) and data.get(ENVELOPE_MARKER):
+            return cls(data.get("value"), float(data.get("fresh_until", 0)), data.get("tags") or {})
+        # Plain JSON (warm_cache, or values written before entries carried metadata)
+        return cls(data, math.inf)
+
+
+class LocalCache:
+    """
+    Small in-process LRU in front of Redis.
+
+    Entries are indexed by tag so a tag invalidation drops exactly the keys that
+    carry it. Every worker applies key and tag invalidations from the bus.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[CacheEntry, float]] = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, expires_at = item
+        if time.monotonic() >= expires_at:
+            self.discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry, ttl: float):
+        self.discard(key)
+        while len(self._entries) >= self.max_entries:
+            self.discard(next(iter(self._entries)))
+        self._entries[key] = (entry, time.monotonic() + ttl)
+        for tag in entry.tags or ():
+            self._by_tag.setdefault(tag, set()).add(key)
+
+    def discard(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for tag in item[0].tags or ():
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def discard_tag(self, tag: str):
+        for key in list(self._by_tag.get(tag, ())):
+            self.discard(key)
+
+    def discard_matching(self, pattern: str):
+        for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+            self.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_tag.clear()
+
+
+class TagVersions:
+    """
+    This worker's view of each tag's current version.
+
+    Versions are read from Redis once and then kept up to date by invalidation
+    bus messages, so checking an entry's tags costs no I/O. While the bus is
+    down they are re-read after ``TAG_VERSION_TTL_SECONDS``.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, Tuple[str, float]] = {}
+
+    def set(self, tag: str, version: str):
+        if len(self._versions) >= MAX_TRACKED_TAGS and tag not in self._versions:
+            self._versions.clear()
+        self._versions[tag] = (version, time.monotonic())
+
+    def clear(self):
+        self._versions.clear()
+
+    async def get(self, client: ResilientRedisClient, tags: Iterable[str]) -> Dict[str, str]:
+        max_age = (
+            TAG_VERSION_MAX_AGE_SECONDS if invalidation_bus.listening else TAG_VERSION_TTL_SECONDS
+        )
+        now = time.monotonic()
+        versions = {}
+        for tag in tags:
+            known = self._versions.get(tag)
+            if known is not None and now - known[1] < max_age:
+                versions[tag] = known[0]
+                continue
+            raw = await client.get(f"{TAG_KEY_PREFIX}{tag}")
+            versions[tag] = _as_str(raw) if raw is not None else "0"
+            self.set(tag, versions[tag])
+        return versions
+
+
+class CacheStats:
+    """Lookup outcomes, recomputes and invalidation lag, exported on /metrics"""
+
+    def __init__(self):
+        self.lookups: Dict[Tuple[str, str], int] = {}  # (cache, result) -> count
+        self.recomputes: Dict[str, int] = {}
+        self.lag_buckets = [0] * len(INVALIDATION_LAG_BUCKETS)
+        self.lag_count = 0
+        self.lag_sum = 0.0
+
+    def record(self, cache: str, result: str):
+        """result: ``local_hit``, ``hit``, ``stale`` or ``miss``"""
+        key = (cache, result)
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+
+    def recomputed(self, cache: str):
+        self.recomputes[cache] = self.recomputes.get(cache, 0) + 1
+
+    def observe_invalidation_lag(self, seconds: float):
+        self.lag_count += 1
+        self.lag_sum += seconds
+        for index, bound in enumerate(INVALIDATION_LAG_BUCKETS):
+            if seconds <= bound:
+                self.lag_buckets[index] += 1
+
+    def hit_ratio(self, cache: Optional[str] = None) -> Optional[float]:
+        hits = total = 0
+        for (name, result), count in self.lookups.items():
+            if cache is not None and name != cache:
+                continue
+            total += count
+            if result != "miss":
+                hits += count
+        return hits / total if total else None
+
+    def metric_families(self):
+        """Prometheus metric families for the /metrics collector"""
+        from prometheus_client.core import (
+            CounterMetricFamily,
+            GaugeMetricFamily,
+            HistogramMetricFamily,
+        )
+
+        lookups = CounterMetricFamily(
+            "janua_cache_lookups", "Cache lookups by outcome", labels=["cache", "result"]
+        )
+        for (cache, result), count in sorted(self.lookups.items()):
+            lookups.add_metric([cache, result], count)
+        yield lookups
+
+        hit_ratio = GaugeMetricFamily(
+            "janua_cache_hit_ratio", "Share of lookups answered from cache", labels=["cache"]
+        )
+        for cache in sorted({cache for cache, _ in self.lookups}):
+            hit_ratio.add_metric([cache], self.hit_ratio(cache) or 0.0)
+        yield hit_ratio
+
+        recomputes = CounterMetricFamily(
+            "janua_cache_recomputes", "Cached values recomputed", labels=["cache"]
+        )
+        for cache, count in sorted(self.recomputes.items()):
+            recomputes.add_metric([cache], count)
+        yield recomputes
+
+        lag = HistogramMetricFamily(
+            "janua_cache_invalidation_lag_seconds",
+            "Delay between publishing a cache invalidation and applying it",
+        )
+        buckets = [
+            (str(bound), count) for bound, count in zip(INVALIDATION_LAG_BUCKETS, self.lag_buckets)
+        ]
+        buckets.append(("+Inf", self.lag_count))
+        lag.add_metric([], buckets, sum_value=self.lag_sum)
+        yield lag
+
+
+local_cache = LocalCache()
+tag_versions = TagVersions()
+cache_stats = CacheStats()
+
+# In-flight recomputes in this process, so concurrent callers share one
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(compute())
+        _inflight[key] = future
+        future.add_done_callback(lambda done: _forget_inflight(key, done))
+    # Shielded: one caller being cancelled must not cancel the others' recompute
+    return await asyncio.shield(future)
+
+
+def _forget_inflight(key: str, future: asyncio.Future):
+    if _inflight.get(key) is future:
+        del _inflight[key]
+
+
+async def _read_entry(
+    client: ResilientRedisClient, key: str, reader: Optional[Any] = None
+) -> Optional[CacheEntry]:
+    # Entries are checked against tag versions read from the master, so a
+    # lagging replica cannot serve an entry that a tag bump invalidated
+    if reader is not None:
+        try:
+            raw = await reader.get(key)
+            return CacheEntry.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.debug("Cache replica read failed, using master", key=key, error=str(e))
+    try:
+        raw = await client.get(key)
+        return CacheEntry.loads(raw) if raw is not None else None
+    except Exception as e:
+        logger.warning("Cache lookup failed, proceeding without cache", key=key, error=str(e))
+        return None
+
+
+class _Lookup:
+    """One cached call: its key, options and how to recompute it"""
+
+    def __init__(
+        self,
+        cache: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        local_ttl: int,
+        lock_timeout: int,
+        cache_none: bool = True,
+    ):
+        self.cache = cache
+        self.key = key
+        self.compute = compute
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.local_ttl = local_ttl
+        self.lock_timeout = lock_timeout
+        self.cache_none = cache_none
+
+    def remember_locally(self, entry: CacheEntry):
+        if self.local_ttl > 0:
+            remaining = entry.fresh_until - time.time()
+            local_cache.set(self.key, entry, min(self.local_ttl, remaining))
+
+    async def run(
+        self, client: ResilientRedisClient, tags: List[str], reader: Optional[Any] = None
+    ) -> Any:
+        if self.local_ttl > 0:
+            entry = local_cache.get(self.key)
+            if entry is not None and entry.is_fresh():
+                cache_stats.record(self.cache, "local_hit")
+                return entry.value
+
+        try:
+            versions = await tag_versions.get(client, tags) if tags else {}
+        except Exception as e:
+            logger.warning("Cache tag lookup failed", key=self.key, error=str(e))
+            cache_stats.record(self.cache, "miss")
+            return await self.compute()
+
+        entry = await _read_entry(client, self.key, reader)
+        if entry is not None and entry.matches(versions):
+            if entry.is_fresh():
+                logger.debug("Cache hit", key=self.key)
+                cache_stats.record(self.cache, "hit")
+                self.remember_locally(entry)
+                return entry.value
+            # Serve the stale value while one worker refreshes it
+            cache_stats.record(self.cache, "stale")
+            if self.key not in _inflight:
+                asyncio.get_running_loop().create_task(self._refresh(client, versions))
+            return entry.value
+
+        logger.debug("Cache miss", key=self.key)
+        cache_stats.record(self.cache, "miss")
+        return await _single_flight(self.key, lambda: self.recompute(client, versions))
+
+    async def _refresh(self, client: ResilientRedisClient, versions: Dict[str, str]):
+        try:
+            await _single_flight(self.key, lambda: self.recompute(client, versions, wait=False))
+        except Exception as e:
+            logger.warning("Background cache refresh failed", key=self.key, error=str(e))
+
+    async def recompute(
+        self, client: ResilientRedisClient, versions: Dict[str, str], wait: bool = True
+    ) -> Any:
+        """Compute and store the value, with at most one process computing per key"""
+        lock_key = f"{self.key}:lock"
+        try:
+            locked = await client.acquire_lock(lock_key, self.lock_timeout)
+        except Exception:
+            locked = None
+        if locked is None:
+            locked = True  # No Redis to coordinate with; compute here
+
+        if not locked:
+            if not wait:
+                return None  # Another process is already refreshing
+            # Another process is computing: wait for its result
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                entry = await _read_entry(client, self.key)
+                if entry is not None and entry.matches(versions) and entry.is_fresh():
+                    cache_stats.record(self.cache, "hit")
+                    self.remember_locally(entry)
+                    return entry.value
+            logger.warning("Timed out waiting for cache recompute", key=self.key)
+
+        try:
+            if locked and wait:
+                # Filled by another process between our lookup and taking the lock
+                entry = await _read_entry(client, self.key)
+                if entry is not None and entry.matches(versions) and entry.is_fresh():
+                    self.remember_locally(entry)
+                    return entry.value
+
+            cache_stats.recomputed(self.cache)
+            result = await self.compute()
+            if result is None and not self.cache_none:
+                return result
+
+            entry = CacheEntry(result, time.time() + self.ttl, versions)
+            try:
+                await client.set(self.key, entry.dumps(), ex=self.ttl + self.stale_ttl)
+                logger.debug("Cached result", key=self.key, ttl=self.ttl)
+            except Exception as e:
+                logger.warning(
+                    "Failed to cache result, returning uncached", key=self.key, error=str(e)
+                )
+            self.remember_locally(entry)
+            return result
+        finally:
+            if locked:
+                try:
+                    await client.delete(lock_key)
+                except Exception:
+                    pass
+
+
 def cached(
     ttl: int = 300,  # 5 minutes default
     key_prefix: Optional[str] = None,
     key_builder: Optional[Callable] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    stale_ttl: int = 0,
+    local_ttl: int = 0,
+    lock_timeout: int = DEFAULT_LOCK_TIMEOUT,
+    cache_none: bool = True,
 ):
     """
     Decorator for caching function results with circuit-breaker protected Redis.
 
     Automatically handles:
-    - Cache hits: Return cached value
-    - Cache misses: Call function, cache result
+    - Cache hits: Return cached value (from the in-process L1 when ``local_ttl`` is set)
+    - Cache misses: One caller per key recomputes, across coroutines (shared
+      future) and processes (Redis lock); the others wait for its result
+    - Stale values: Within ``stale_ttl`` after expiry the old value is returned
+      while one worker refreshes it in the background
+    - Tags: Entries record the version of each tag; ``cache_manager.invalidate_tags``
+      bumps the versions and every entry carrying those tags becomes a miss
     - Redis failures: Fall back to calling function (no caching)
 
     Args:
         ttl: Time-to-live in seconds (default: 300 = 5 minutes)
         key_prefix: Optional prefix for cache keys (default: function name)
         key_builder: Optional function to build cache key from args
+        tags: Optional function returning the tags of an entry from args
+        stale_ttl: Seconds a value may be served stale while it is recomputed
+        local_ttl: Seconds a value is kept in the in-process L1 (0 disables it)
+        lock_timeout: Longest a recompute holds the key's lock
+        cache_none: Whether a ``None`` result is cached (False recomputes it every call)
 
     Example:
         @cached(ttl=600)  # Cache for 10 minutes
@@ -70,6 +487,11 @@ def cached(
         @cached(ttl=3600, key_prefix="org", key_builder=lambda org_id: f"org:{org_id}")
         async def get_organization(org_id: str) -> Organization:
             return await db.query(Organization).filter(Organization.id == org_id).first()
+
+        # Dropped by cache_manager.invalidate_tags(f"org:{org_id}")
+        @cached(ttl=600, tags=lambda org_id: [f"org:{org_id}"])
+        async def get_org_settings(org_id: str) -> dict:
+            ...
     """
 
     def decorator(func: Callable) -> Callable:
@@ -85,53 +507,66 @@ def cached(
 
             full_key = f"{prefix}:{key_suffix}"
 
-            # Try to get from cache
             try:
                 redis_client = await get_redis()
-                cached_value = await redis_client.get(full_key)
-
-                if cached_value is not None:
-                    logger.debug("Cache hit", key=full_key, function=func.__name__)
-                    return json.loads(cached_value)
-
-                logger.debug("Cache miss", key=full_key, function=func.__name__)
-
+                reader = await get_read_redis()
             except Exception as e:
-                # If cache lookup fails, just proceed with function call
                 logger.warning(
                     "Cache lookup failed, proceeding without cache",
                     key=full_key,
                     function=func.__name__,
                     error=str(e),
                 )
+                return await func(*args, **kwargs)
+
+            lookup = _Lookup(
+                cache=prefix,
+                key=full_key,
+                compute=lambda: func(*args, **kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                local_ttl=local_ttl,
+                lock_timeout=lock_timeout,
+                cache_none=cache_none,
+            )
+            if reader is getattr(redis_client, "redis", None):
+                reader = None  # No replica; the resilient client already reads the master
+            return await lookup.run(
+                redis_client, list(tags(*args, **kwargs)) if tags else [], reader
+            )
 
-            # Call the actual function
-            result = await func(*args, **kwargs)
+        return wrapper
 
-            # Try to cache the result
-            try:
-                redis_client = await get_redis()
-                # Serialize result
-                serialized = json.dumps(result, default=str)
+    return decorator
 
-                await redis_client.set(full_key, serialized, ex=ttl)
 
-                logger.debug("Cached result", key=full_key, function=func.__name__, ttl=ttl)
+def _apply_invalidation(payload: str):
+    """Apply a key/tag invalidation from any worker to this worker's L1 and tag versions"""
+    if not payload:
+        # (Re)subscribed: messages may have been missed, so forget everything local
+        local_cache.clear()
+        tag_versions.clear()
+        return
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        return
+    for tag, version in (message.get("tags") or {}).items():
+        tag_versions.set(tag, version)
+        local_cache.discard_tag(tag)
+    for key in message.get("keys") or ():
+        local_cache.discard(key)
+    if message.get("pattern"):
+        local_cache.discard_matching(message["pattern"])
+    if message.get("at"):
+        cache_stats.observe_invalidation_lag(max(0.0, time.time() - float(message["at"])))
 
-            except Exception as e:
-                # If caching fails, we still have the result
-                logger.warning(
-                    "Failed to cache result, returning uncached",
-                    key=full_key,
-                    function=func.__name__,
-                    error=str(e),
-                )
 
-            return result
+invalidation_bus.subscribe(CACHE_INVALIDATION_TOPIC, _apply_invalidation)
 
-        return wrapper
 
-    return decorator
+def _as_str(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
 
 
 class CacheManager:
@@ -139,7 +574,7 @@ class CacheManager:
     Manager for cache operations with invalidation patterns.
 
     Provides methods for:
-    - Bulk cache invalidation
+    - Key and tag invalidation (applied to every worker's L1 via the invalidation bus)
     - Pattern-based invalidation
     - Cache warming
     """
@@ -153,6 +588,12 @@ class CacheManager:
             self.redis_client = await get_redis()
         return self.redis_client
 
+    def _broadcast(self, **message):
+        """Apply an invalidation locally now and on every other worker via the bus"""
+        payload = json.dumps({**message, "at": time.time()})
+        _apply_invalidation(payload)
+        invalidation_bus.publish_nowait(CACHE_INVALIDATION_TOPIC, payload)
+
     async def invalidate(self, key: str) -> bool:
         """
         Invalidate a specific cache key.
@@ -166,6 +607,7 @@ class CacheManager:
         try:
             client = await self._get_client()
             deleted = await client.delete(key)
+            self._broadcast(keys=[key])
 
             logger.info("Cache invalidated", key=key, deleted=bool(deleted))
 
@@ -175,12 +617,45 @@ class CacheManager:
             logger.error("Cache invalidation failed", key=key, error=str(e))
             return False
 
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every entry carrying any of the given tags.
+
+        Costs one write per tag, however many keys carry it: each tag gets a new
+        version, and entries computed under an older version read as misses.
+
+        Args:
+            *tags: Tags to invalidate (e.g., "org:abc123", "user:42")
+
+        Returns:
+            int: Number of tags invalidated
+
+        Example:
+            # Drop everything cached for an organization
+            await cache_manager.invalidate_tags(f"org:{org_id}")
+        """
+        if not tags:
+            return 0
+        version = str(time.time_ns())
+        try:
+            client = await self._get_client()
+            for tag in tags:
+                await client.set(f"{TAG_KEY_PREFIX}{tag}", version, ex=TAG_KEY_TTL_SECONDS)
+        except Exception as e:
+            logger.error("Tag invalidation failed", tags=list(tags), error=str(e))
+            return 0
+
+        self._broadcast(tags=dict.fromkeys(tags, version))
+        logger.info("Cache tags invalidated", tags=list(tags))
+        return len(tags)
+
     async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching a pattern.
 
         NOTE: This uses SCAN which is safe for production but may be slow
-        for large keyspaces. Consider using more specific invalidation.
+        for large keyspaces. Prefer tags (``invalidate_tags``) for groups of
+        keys that are invalidated together.
 
         Args:
             pattern: Redis key pattern (e.g., "user:*", "org:123:*")
@@ -196,17 +671,25 @@ class CacheManager:
             await cache_manager.invalidate_pattern("org:abc123:*")
         """
         try:
-            await self._get_client()
-
-            # Note: This requires access to raw Redis for SCAN operation
-            # For now, we'll log a warning
-            logger.warning(
-                "Pattern invalidation requires raw Redis access",
-                pattern=pattern,
-                message="Consider invalidating specific keys instead",
-            )
-
-            return 0
+            client = await self._get_client()
+            raw = getattr(client, "redis", None)
+            if raw is None:
+                logger.warning("Pattern invalidation requires Redis", pattern=pattern)
+                return 0
+
+            deleted = 0
+            batch = []
+            async for key in raw.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await raw.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await raw.delete(*batch)
+
+            self._broadcast(pattern=pattern)
+            logger.info("Cache pattern invalidated", pattern=pattern, deleted=deleted)
+            return deleted
 
         except Exception as e:
             logger.error("Pattern invalidation failed", pattern=pattern, error=str(e))
@@ -239,6 +722,7 @@ class CacheManager:
             serialized = json.dumps(value, default=str)
 
             await client.set(key, serialized, ex=ttl)
+            self._broadcast(keys=[key])
 
             logger.info("Cache warmed", key=key, ttl=ttl)
 
@@ -260,34 +744,48 @@ cache_manager = CacheManager()
 
 
 def cache_user(ttl: int = 600):
-    """Cache user lookups (10 minutes default)"""
+    """Cache user lookups (10 minutes default); tagged ``user:<id>``"""
     return cached(
-        ttl=ttl, key_prefix="user", key_builder=lambda user_id, *args, **kwargs: f"{user_id}"
+        ttl=ttl,
+        key_prefix="user",
+        key_builder=lambda user_id, *args, **kwargs: f"{user_id}",
+        tags=lambda user_id, *args, **kwargs: [f"user:{user_id}"],
+        local_ttl=10,
     )
 
 
 def cache_organization(ttl: int = 3600):
-    """Cache organization lookups (1 hour default)"""
+    """Cache organization lookups (1 hour default); tagged ``org:<id>``"""
     return cached(
-        ttl=ttl, key_prefix="org", key_builder=lambda org_id, *args, **kwargs: f"{org_id}"
+        ttl=ttl,
+        key_prefix="org",
+        key_builder=lambda org_id, *args, **kwargs: f"{org_id}",
+        tags=lambda org_id, *args, **kwargs: [f"org:{org_id}"],
+        stale_ttl=300,
+        local_ttl=60,
     )
 
 
 def cache_permissions(ttl: int = 300):
-    """Cache permission checks (5 minutes default)"""
+    """Cache permission checks (5 minutes default); tagged ``user:<id>`` and ``permissions``"""
     return cached(
         ttl=ttl,
         key_prefix="perms",
         key_builder=lambda user_id, resource, action, *args, **kwargs: f"{user_id}:{resource}:{action}",
+        tags=lambda user_id, *args, **kwargs: [f"user:{user_id}", "permissions"],
+        local_ttl=10,
     )
 
 
 def cache_sso_config(ttl: int = 1800):
-    """Cache SSO configurations (30 minutes default)"""
+    """Cache SSO configurations (30 minutes default); tagged ``org:<id>``"""
     return cached(
         ttl=ttl,
         key_prefix="sso",
         key_builder=lambda org_id, provider, *args, **kwargs: f"{org_id}:{provider}",
+        tags=lambda org_id, *args, **kwargs: [f"org:{org_id}"],
+        stale_ttl=300,
+        local_ttl=60,
     )
 
 
@@ -307,10 +805,10 @@ async def get_user_by_id(user_id: str, db: AsyncSession) -> Optional[User]:
     )
     return result.scalar_one_or_none()
 
-# After updating user, invalidate cache
+# After updating user, invalidate everything cached for them
 async def update_user(user_id: str, data: dict):
     user = await update_user_in_db(user_id, data)
-    await cache_manager.invalidate(f"user:{user_id}")
+    await cache_manager.invalidate_tags(f"user:{user_id}")
     return user
 
 
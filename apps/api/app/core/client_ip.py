@@ -0,0 +1,37 @@
+"""
+Client IP address of an inbound request.
+
+Behind a load balancer every connection comes from the proxy, so anything keyed
+on ``request.client.host`` (rate limits, IP lockouts, read-your-writes pins)
+would lump all clients together. ``X-Forwarded-For`` / ``X-Real-IP`` are only
+believed when the direct peer is one of ``TRUSTED_PROXIES``; from anyone else
+they are attacker-controlled and ignored.
+"""
+
+from typing import Optional
+
+from fastapi import Request
+
+from app.config import settings
+
+
+def client_ip_from_request(request: Request, trusted_proxies: Optional[str] = None) -> str:
+    """Originating client IP, or ``"unknown"`` when the request has no peer."""
+    direct_ip = request.client.host if request.client else "unknown"
+
+    if trusted_proxies is None:
+        trusted_proxies = settings.TRUSTED_PROXIES
+    trusted = {ip.strip() for ip in (trusted_proxies or "").split(",") if ip.strip()}
+
+    # Only trust forwarded headers if the direct connection is from a trusted proxy
+    if direct_ip in trusted:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            # Take the first (client) IP from the chain
+            return forwarded.split(",")[0].strip()
+
+        real_ip = request.headers.get("X-Real-IP")
+        if real_ip:
+            return real_ip
+
+    return direct_ip
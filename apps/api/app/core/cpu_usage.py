@@ -0,0 +1,46 @@
+"""
+System-wide CPU utilisation between successive readings.
+
+``psutil.cpu_percent(interval=None)`` measures against the previous call made
+from the same thread. Monitors sample through ``asyncio.to_thread``, which runs
+on whichever pool worker is free, so that baseline belongs to some unrelated
+earlier call (or none at all). CpuUsageMeter keeps its own ``cpu_times()``
+baseline, so each monitor gets the utilisation since its own previous reading
+whatever thread takes it.
+"""
+
+import threading
+from typing import Any, Optional
+
+import psutil
+
+
+def _busy_and_total(times: Any) -> "tuple[float, float]":
+    total = sum(times)
+    # Linux already counts guest time inside user/nice (same as psutil does)
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+
+class CpuUsageMeter:
+    """CPU percent since the previous ``percent()`` call on this meter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last: Optional[Any] = None
+
+    def percent(self) -> float:
+        """Blocking psutil read; the first call only sets the baseline and returns 0.0"""
+        current = psutil.cpu_times()
+        with self._lock:
+            last, self._last = self._last, current
+        if last is None:
+            return 0.0
+
+        busy_now, total_now = _busy_and_total(current)
+        busy_then, total_then = _busy_and_total(last)
+        elapsed = total_now - total_then
+        if elapsed <= 0:
+            return 0.0
+        return round(min(100.0, max(0.0, (busy_now - busy_then) / elapsed * 100)), 1)
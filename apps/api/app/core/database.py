@@ -5,10 +5,13 @@ from contextlib import asynccontextmanager
 from typing import Optional
 
 import structlog
+from fastapi import Request
 from sqlalchemy import MetaData, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
+from app.core.db_routing import RoutingSession, replica_router
+
 # Import config with error handling
 try:
     from app.config import settings
@@ -136,7 +139,12 @@ try:
 
     # Create async session maker
     AsyncSessionLocal = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False, autocommit=False, autoflush=False
+        engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
     )
 except Exception as e:
     import logging
@@ -317,12 +325,14 @@ async def bootstrap_admin_user():
         # Don't raise - this is a non-critical bootstrap operation
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session"""
+async def get_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get database session (GET-like requests may read from a replica)"""
     async with AsyncSessionLocal() as session:
         try:
+            await replica_router.prepare(session, request)
             yield session
             await session.commit()
+            await replica_router.finish(session, request)
         except Exception:
             await session.rollback()
             raise
@@ -0,0 +1,330 @@
+"""
+Read/write routing for SQLAlchemy async sessions.
+
+With ``DATABASE_REPLICA_URLS`` set, sessions from the app's session makers send
+reads to a PostgreSQL read replica and everything else to the primary:
+
+- Only sessions marked read-only read from replicas: ``get_db`` marks the
+  sessions of GET/HEAD/OPTIONS requests, and ``get_read_db`` is for read-only
+  dependencies of any request. Every other session uses the primary as before.
+- Inserts, updates, deletes, ``SELECT ... FOR UPDATE``, raw non-SELECT SQL and
+  flushes always go to the primary, and once a session has written, all of its
+  later reads do too.
+- A session keeps the replica it first picked, so its reads never go back in
+  time by hopping to a replica that is further behind.
+- Read-your-writes across requests: after a request writes, the primary's WAL
+  position (LSN) is remembered for the client (by credential and by client
+  IP, in Redis) for ``DATABASE_READ_YOUR_WRITES_SECONDS``. That client's reads only go
+  to replicas that have replayed up to it, and to the primary otherwise.
+- A background task polls each replica's replay LSN and lag. Replicas that
+  fail the check or lag more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` leave the
+  rotation until they catch up. Healthy replicas are picked by weight, less a
+  lag penalty (the scheme from app.infrastructure.database_replication).
+
+Without replicas every session uses the primary and nothing else changes.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import structlog
+from sqlalchemy import Select, TextClause, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.config import settings
+from app.core.client_ip import client_ip_from_request
+
+logger = structlog.get_logger()
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+LSN_KEY_PREFIX = "janua:db:lsn:"
+MAX_LOCAL_WRITES = 10000
+
+# Session.info keys
+READ_ONLY = "db_routing.read_only"
+MIN_LSN = "db_routing.min_lsn"
+REPLICA = "db_routing.replica"
+WROTE = "db_routing.wrote"
+
+# Remembered when the primary cannot report an LSN: no replica qualifies
+UNKNOWN_LSN = 2**64
+
+REPLICA_STATUS_SQL = text(
+    "SELECT pg_last_wal_replay_lsn()::text AS replay_lsn, "
+    "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END AS lag_seconds"
+)
+
+
+def parse_lsn(value: Any) -> Optional[int]:
+    """PostgreSQL ``pg_lsn`` text (``16/B374D848``) as a comparable integer"""
+    if not value:
+        return None
+    high, _, low = str(value).partition("/")
+    try:
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+def is_write(clause: Any) -> bool:
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, Select):
+        return clause._for_update_arg is not None
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].lower() != "select"
+    return False
+
+
+@dataclass
+class Replica:
+    """A read replica and its last observed replication state"""
+
+    name: str
+    engine: AsyncEngine
+    weight: int = 100
+    healthy: bool = False
+    lag_seconds: float = 0.0
+    replay_lsn: Optional[int] = None
+    last_check: Optional[datetime] = None
+
+    def has_replayed(self, lsn: Optional[int]) -> bool:
+        return lsn is None or (self.replay_lsn is not None and self.replay_lsn >= lsn)
+
+
+class RoutingSession(Session):
+    """Session that picks the primary or a replica per statement"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or is_write(clause):
+            self.info[WROTE] = True
+        elif clause is not None and self.info.get(READ_ONLY) and not self.info.get(WROTE):
+            replica = self.info.get(REPLICA) or replica_router.choose(self.info.get(MIN_LSN))
+            if replica is not None:
+                self.info[REPLICA] = replica
+                return replica.engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+class ReplicaRouter:
+    """Replica engines, their health, and per-client read-your-writes positions"""
+
+    def __init__(self):
+        self.replicas: List[Replica] = []
+        self._recent_writes: Dict[str, tuple] = {}  # consistency key -> (lsn, expires at)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def configure(self, urls: Optional[str] = None, **engine_kwargs):
+        """
+        Create an engine per replica from comma-separated URLs; a ``#<weight>``
+        suffix sets a replica's share of reads (default 100).
+        """
+        for index, entry in enumerate(u.strip() for u in (urls or "").split(",") if u.strip()):
+            url, _, weight = entry.partition("#")
+            if url.startswith("postgresql://"):
+                url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+            kwargs = engine_kwargs
+            if not kwargs and not url.startswith("sqlite"):
+                kwargs = {
+                    "pool_size": settings.DATABASE_POOL_SIZE,
+                    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+                    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+                    "pool_recycle": 3600,
+                }
+            parsed = make_url(url)
+            self.replicas.append(
+                Replica(
+                    name=f"replica_{index + 1}:{parsed.host or parsed.database}",
+                    engine=create_async_engine(url, pool_pre_ping=True, **kwargs),
+                    weight=int(weight or 100),
+                )
+            )
+
+    async def start(self):
+        if not self.replicas:
+            self.configure(settings.DATABASE_REPLICA_URLS)
+        if not self.replicas or self._task is not None:
+            return
+        await self.check_all()
+        self._task = asyncio.create_task(self._check_loop())
+        logger.info("Read replica routing enabled", replicas=[r.name for r in self.replicas])
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
+
+    # Replica selection
+
+    def choose(self, min_lsn: Optional[int] = None) -> Optional[Replica]:
+        """Weighted pick among healthy replicas that have replayed ``min_lsn``"""
+        candidates = [r for r in self.replicas if r.healthy and r.has_replayed(min_lsn)]
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        weights = [max(1, r.weight - min(50, r.lag_seconds * 2)) for r in candidates]
+        return random.choices(candidates, weights=weights)[0]
+
+    # Health
+
+    async def check_all(self):
+        await asyncio.gather(*(self.check(r) for r in self.replicas))
+
+    async def check(self, replica: Replica):
+        try:
+            async with replica.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    row = (await conn.execute(REPLICA_STATUS_SQL)).one()
+                    replay_lsn, lag_seconds = parse_lsn(row.replay_lsn), float(row.lag_seconds)
+                else:
+                    await conn.execute(text("SELECT 1"))
+                    replay_lsn, lag_seconds = None, 0.0
+            self.update(replica, replay_lsn, lag_seconds)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Read replica out of rotation", replica=replica.name, error=str(e))
+            replica.healthy = False
+        replica.last_check = datetime.utcnow()
+
+    def update(self, replica: Replica, replay_lsn: Optional[int], lag_seconds: float):
+        replica.replay_lsn = replay_lsn
+        replica.lag_seconds = lag_seconds
+        healthy = lag_seconds <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info("Read replica in rotation", replica=replica.name)
+            else:
+                logger.warning(
+                    "Read replica out of rotation: lagging",
+                    replica=replica.name,
+                    lag_seconds=lag_seconds,
+                )
+        replica.healthy = healthy
+
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(settings.DATABASE_REPLICA_HEALTH_CHECK_SECONDS)
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error("Read replica health check failed", error=str(e))
+
+    # Read-your-writes
+
+    def consistency_keys(self, request) -> List[str]:
+        """Keys identifying the client: its credential and its IP address (behind
+        TRUSTED_PROXIES, the forwarded one, so clients of one proxy are not pooled)"""
+        keys = []
+        credential = (
+            request.headers.get("authorization")
+            or request.cookies.get("janua_access_token")
+            or request.cookies.get("access_token")
+        )
+        if credential:
+            keys.append("c:" + hashlib.sha256(credential.encode()).hexdigest()[:32])
+        ip = client_ip_from_request(request)
+        if ip != "unknown":
+            keys.append("ip:" + ip)
+        return keys
+
+    async def required_lsn(self, request) -> Optional[int]:
+        """The highest LSN this client has written within the read-your-writes window"""
+        keys = self.consistency_keys(request)
+        now = time.monotonic()
+        lsns = [
+            lsn
+            for lsn, expires_at in (self._recent_writes.get(k, (None, 0)) for k in keys)
+            if lsn is not None and expires_at > now
+        ]
+        redis = await self._get_redis()
+        if redis is not None and keys:
+            try:
+                values = await redis.mget([LSN_KEY_PREFIX + k for k in keys])
+                lsns.extend(int(v) for v in values if v)
+            except Exception as e:
+                logger.warning("Failed to read client write positions", error=str(e))
+        return max(lsns, default=None)
+
+    async def remember_write(self, request, lsn: Optional[int]):
+        keys = self.consistency_keys(request)
+        if not keys:
+            return
+        lsn = UNKNOWN_LSN if lsn is None else lsn
+        ttl = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        if len(self._recent_writes) >= MAX_LOCAL_WRITES:
+            now = time.monotonic()
+            self._recent_writes = {k: v for k, v in self._recent_writes.items() if v[1] > now}
+            if len(self._recent_writes) >= MAX_LOCAL_WRITES:
+                self._recent_writes.clear()
+        for key in keys:
+            self._recent_writes[key] = (lsn, time.monotonic() + ttl)
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                pipe = redis.pipeline(transaction=False)
+                for key in keys:
+                    pipe.set(LSN_KEY_PREFIX + key, lsn, ex=ttl)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning("Failed to store client write position", error=str(e))
+
+    # Session hooks
+
+    async def prepare(self, session: AsyncSession, request=None, read_only: Optional[bool] = None):
+        """Mark a session read-only (GET-like request, or explicitly) with its minimum LSN"""
+        if not self.replicas:
+            return
+        if read_only is None:
+            read_only = request is not None and request.method in SAFE_METHODS
+        if not read_only:
+            return
+        session.info[READ_ONLY] = True
+        if request is not None:
+            session.info[MIN_LSN] = await self.required_lsn(request)
+
+    async def finish(self, session: AsyncSession, request=None):
+        """After a request's session has written, remember the primary's LSN for the client"""
+        if not self.replicas or request is None or not session.info.get(WROTE):
+            return
+        lsn = None
+        try:
+            if session.bind.dialect.name == "postgresql":
+                result = await session.execute(text("SELECT pg_current_wal_lsn()::text"))
+                lsn = parse_lsn(result.scalar())
+        except Exception as e:
+            logger.warning("Failed to read primary WAL position", error=str(e))
+        await self.remember_write(request, lsn)
+
+    async def _get_redis(self):
+        try:
+            from app.core.redis import get_raw_redis
+
+            return await get_raw_redis()
+        except Exception:
+            return None
+
+
+replica_router = ReplicaRouter()
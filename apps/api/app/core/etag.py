@@ -0,0 +1,36 @@
+"""
+Conditional GET support: matching ``If-None-Match`` against a response ETag.
+
+RFC 9110 (section 13.1.2) compares ``If-None-Match`` with the weak comparison
+function, so ``W/"abc"`` matches ``"abc"``, and ``*`` matches any current
+representation. Entity tags are quoted strings that may themselves contain
+commas, so the header can't simply be split on ``,``.
+"""
+
+import re
+from typing import List, Optional
+
+# entity-tag = [ "W/" ] DQUOTE *etagc DQUOTE
+_ENTITY_TAG = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+def _opaque_tag(etag: str) -> str:
+    match = _ENTITY_TAG.fullmatch(etag.strip())
+    return match.group(1) if match else etag.strip()
+
+
+def parse_if_none_match(header: str) -> Optional[List[str]]:
+    """Opaque tags listed in ``header``, or None when it is ``*``."""
+    if header.strip() == "*":
+        return None
+    return _ENTITY_TAG.findall(header)
+
+
+def if_none_match_hit(header: Optional[str], etag: str) -> bool:
+    """True when ``header`` weakly matches ``etag``, i.e. the client copy is current."""
+    if not header:
+        return False
+    tags = parse_if_none_match(header)
+    if tags is None:
+        return True
+    return _opaque_tag(etag) in tags
@@ -0,0 +1,161 @@
+"""
+Cross-process cache invalidation over Redis pub/sub.
+
+Process-local caches (CORS origins, settings snapshots, ...) register a handler
+for a topic; writers publish to that topic after committing a change and every
+worker drops its copy within one pub/sub round trip. When Redis is unavailable
+the bus reports ``listening = False`` and callers fall back to their TTLs.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger()
+
+CHANNEL_PREFIX = "janua:invalidate:"
+
+InvalidationHandler = Callable[[str], None]
+
+# Strong references to publishes scheduled by publish_nowait until they finish
+_pending_publishes: Set[asyncio.Task] = set()
+
+
+def _publish_done(task: asyncio.Task):
+    _pending_publishes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Scheduled invalidation publish failed", error=str(task.exception()))
+
+
+class InvalidationBus:
+    """Fan invalidation messages out to every API worker via Redis pub/sub."""
+
+    def __init__(self, channel_prefix: str = CHANNEL_PREFIX, reconnect_delay: float = 1.0):
+        self.channel_prefix = channel_prefix
+        self.reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+        self._stopping = False
+
+    @property
+    def listening(self) -> bool:
+        """True while subscribed; consumers may then trust events over TTLs."""
+        return self._listening
+
+    def subscribe(self, topic: str, handler: InvalidationHandler):
+        """Register a synchronous handler called with the message payload."""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def unsubscribe(self, topic: str, handler: InvalidationHandler):
+        """Remove a previously registered handler"""
+        if handler in self._handlers.get(topic, []):
+            self._handlers[topic].remove(handler)
+
+    def dispatch(self, topic: str, payload: str = ""):
+        """Run local handlers for a topic (used for messages from other workers)."""
+        for handler in list(self._handlers.get(topic, [])):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error("Invalidation handler failed", topic=topic, error=str(e))
+
+    async def publish(self, topic: str, payload: str = "") -> bool:
+        """Publish an invalidation to every worker. Returns False if Redis is down."""
+        from app.core.redis import get_raw_redis
+
+        try:
+            client = await get_raw_redis()
+            if client is None:
+                return False
+            await client.publish(f"{self.channel_prefix}{topic}", payload)
+            return True
+        except Exception as e:
+            logger.warning("Failed to publish invalidation", topic=topic, error=str(e))
+            return False
+
+    def publish_nowait(self, topic: str, payload: str = ""):
+        """Schedule a publish from synchronous code running inside the event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.publish(topic, payload))
+        _pending_publishes.add(task)
+        task.add_done_callback(_publish_done)
+
+    async def start(self):
+        """Start the background subscriber task"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the background subscriber task"""
+        self._stopping = True
+        self._listening = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        from app.core.redis import get_raw_redis
+
+        while not self._stopping:
+            pubsub = None
+            try:
+                client = await get_raw_redis()
+                if client is None:
+                    self._listening = False
+                    await asyncio.sleep(self.reconnect_delay * 10)
+                    continue
+
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(f"{self.channel_prefix}*")
+                self._listening = True
+                logger.info("Invalidation bus subscribed", pattern=f"{self.channel_prefix}*")
+
+                # Messages published while we were disconnected are lost, so
+                # every (re)subscribe drops all registered caches once.
+                for topic in list(self._handlers):
+                    self.dispatch(topic)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = _as_str(message.get("channel"))
+                    topic = channel[len(self.channel_prefix) :]
+                    self.dispatch(topic, _as_str(message.get("data")))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Invalidation bus disconnected", error=str(e))
+            finally:
+                self._listening = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+
+def _as_str(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+# Global invalidation bus instance
+invalidation_bus = InvalidationBus()
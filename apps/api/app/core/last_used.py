@@ -0,0 +1,119 @@
+"""
+Coalesced "last used" timestamp writes.
+
+Stamping a ``last_used`` column on every authenticated request turns each
+credential check into a row write. LastUsedRecorder only remembers the latest
+use per row (no I/O on the request path); every flush interval the pending
+timestamps are written in one batched UPDATE per table, which never moves a
+stored timestamp backwards. Uses that could not be written are kept for the
+next flush.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_LAST_USED = 50000
+
+
+def last_used_update(column: Any):
+    """Batched UPDATE of ``column`` by ``row_id`` that only ever moves it forward"""
+    table = column.table
+    return (
+        update(table)
+        .where(
+            table.c.id == bindparam("row_id"),
+            or_(column.is_(None), column < bindparam("used_at")),
+        )
+        .values({column.name: bindparam("used_at")})
+    )
+
+
+class LastUsedRecorder:
+    """
+    Pending last-used timestamps for one or more tables, flushed in batches.
+
+    ``columns`` maps a target name (used in :meth:`record`) to the timestamp
+    column it updates; ``flush_seconds`` is read on every cycle so it follows
+    the settings.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        columns: Dict[str, Any],
+        flush_seconds: Callable[[], float],
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.label = label
+        self.columns = columns
+        self.flush_seconds = flush_seconds
+        self._session_factory = session_factory
+        self._pending: Dict[Tuple[str, uuid.UUID], datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, target: str, row_id: uuid.UUID, when: Optional[datetime] = None):
+        key = (target, row_id)
+        if key not in self._pending and len(self._pending) >= MAX_PENDING_LAST_USED:
+            return  # Flushing has stalled; drop rather than grow without bound
+        self._pending[key] = when or datetime.utcnow()
+
+    async def flush(self) -> int:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            async with self._sessions()() as session:
+                for target, column in self.columns.items():
+                    rows = [
+                        {"row_id": row_id, "used_at": used_at}
+                        for (name, row_id), used_at in pending.items()
+                        if name == target
+                    ]
+                    if rows:
+                        await session.execute(last_used_update(column), rows)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"{self.label} flush failed: {e}")
+            for key, used_at in pending.items():
+                if used_at > self._pending.get(key, datetime.min):
+                    self._pending[key] = used_at
+            return 0
+        return len(pending)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds())
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"{self.label} flush failed: {e}")
+
+    def _sessions(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import AsyncSessionLocal
+
+            return AsyncSessionLocal
+        return self._session_factory
@@ -21,6 +21,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
+from app.core.redis import MASTER, REPLICA, create_redis_client
+from app.services.metrics_rollup import metrics_rollup
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +86,12 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
                 f"Request error: {request.method} {request.url.path} "
                 f"failed after {request_time * 1000:.2f}ms: {str(e)}"
             )
+            self._record_performance_metric(
+                method=request.method,
+                path=request.url.path,
+                duration_ms=request_time * 1000,
+                status_code=500,
+            )
             raise
 
     def _record_performance_metric(
@@ -110,6 +118,11 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
         if status_code >= 400:
             metrics["error_count"] += 1
 
+        # Per-minute rollups feed the SLA and compliance dashboards
+        metrics_rollup.observe("http.requests", duration_ms)
+        if status_code >= 500:
+            metrics_rollup.record("http.errors")
+
 
 class QueryOptimizer:
     """Database query optimization utilities"""
@@ -182,6 +195,7 @@ class CachingManager:
 
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        self.read_client: Optional[redis.Redis] = None  # Replica for L2 reads, if any
         self.local_cache = {}  # L1 cache for ultra-fast access
         self.cache_ttl = {
             "user_profile": 300,  # 5 minutes
@@ -194,14 +208,15 @@ class CachingManager:
         """Initialize Redis connection"""
         try:
             if settings.REDIS_URL:
-                self.redis_client = redis.from_url(
-                    settings.REDIS_URL,
-                    decode_responses=True,
-                    socket_timeout=1.0,
-                    socket_connect_timeout=1.0,
-                )
+                options = {
+                    "decode_responses": True,
+                    "socket_timeout": 1.0,
+                    "socket_connect_timeout": 1.0,
+                }
+                self.redis_client = create_redis_client(MASTER, **options)
                 # Test connection
                 await self.redis_client.ping()
+                self.read_client = create_redis_client(REPLICA, **options)
                 logger.info("✅ Redis cache initialized")
             else:
                 logger.warning("⚠️ Redis URL not configured, using memory cache only")
@@ -213,6 +228,8 @@ class CachingManager:
         """Close Redis connection"""
         if self.redis_client:
             await self.redis_client.close()
+        if self.read_client:
+            await self.read_client.close()
 
     def _generate_cache_key(self, namespace: str, key: str) -> str:
         """Generate standardized cache key"""
@@ -234,7 +251,7 @@ class CachingManager:
         # Try L2 cache (Redis)
         if self.redis_client:
             try:
-                cached = await self.redis_client.get(cache_key)
+                cached = await (self.read_client or self.redis_client).get(cache_key)
                 if cached:
                     value = json.loads(cached)
                     # Store in L1 cache for next access
@@ -1,41 +1,147 @@
-from typing import Optional
+"""
+Redis clients for the app.
+
+Plain mode connects to ``REDIS_URL``. With ``REDIS_SENTINEL_HOSTS`` set, clients
+are Sentinel-managed instead: the master client resolves the current master on
+every new connection, so a failover is followed without a restart, and
+connection errors during the switch are retried with backoff rather than
+surfacing as a burst of failures. ``get_redis()`` always reads the master, so
+security checks such as the token blacklist see every write. Reads that
+tolerate replication lag (session lookups, cached entries, APM summaries) use
+``get_read_redis()``, which goes to replicas (Sentinel-discovered, or
+``REDIS_REPLICA_URL``) when there are any, and to the master otherwise.
+Master and replica pools are sized separately (``REDIS_POOL_SIZE`` /
+``REDIS_REPLICA_POOL_SIZE``).
+"""
+
+import time
+from typing import Any, Optional
 
 import redis.asyncio as redis
 import structlog
+from redis.asyncio.connection import parse_url
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import ExponentialBackoff
 
 from app.config import settings
 from app.core.redis_circuit_breaker import ResilientRedisClient
 
 logger = structlog.get_logger()
 
+MASTER = "master"
+REPLICA = "replica"
+
+# While Redis is down, callers asking for the raw client retry the connection
+# at most this often instead of paying a connect timeout on every call
+RECONNECT_INTERVAL_SECONDS = 30
+
 # Global Redis clients
 _raw_redis_client: Optional[redis.Redis] = None
+_replica_redis_client: Optional[redis.Redis] = None
 _resilient_redis_client: Optional[ResilientRedisClient] = None
+_sentinel: Optional[Sentinel] = None
+_last_init_attempt: Optional[float] = None
+
+
+def _sentinel_hosts() -> list:
+    hosts = []
+    for entry in (settings.REDIS_SENTINEL_HOSTS or "").split(","):
+        if entry.strip():
+            host, _, port = entry.strip().partition(":")
+            hosts.append((host, int(port or 26379)))
+    return hosts
+
+
+def _get_sentinel() -> Optional[Sentinel]:
+    global _sentinel
+    hosts = _sentinel_hosts()
+    if not hosts:
+        return None
+    if _sentinel is None:
+        _sentinel = Sentinel(
+            hosts,
+            sentinel_kwargs={
+                "password": settings.REDIS_SENTINEL_PASSWORD,
+                "socket_timeout": 0.5,
+                "socket_connect_timeout": 0.5,
+            },
+        )
+    return _sentinel
+
+
+def create_redis_client(role: str = MASTER, **options: Any) -> Optional[redis.Redis]:
+    """
+    Create a client for the master or for the read replicas.
+
+    ``options`` are passed to the client (``decode_responses``, ``db``, socket
+    timeouts, ...); database and credentials default to those in ``REDIS_URL``.
+    Returns None for ``REPLICA`` when no replicas are configured or replica
+    reads are disabled.
+    """
+    pool_size = settings.REDIS_REPLICA_POOL_SIZE if role == REPLICA else settings.REDIS_POOL_SIZE
+    options.setdefault("max_connections", pool_size)
+    options.setdefault("retry", Retry(ExponentialBackoff(cap=1.0, base=0.05), 3))
+    if role == REPLICA and not settings.REDIS_READ_FROM_REPLICAS:
+        return None
+
+    sentinel = _get_sentinel()
+    if sentinel is not None:
+        url_options = parse_url(settings.REDIS_URL)
+        for key in ("host", "port"):
+            url_options.pop(key, None)
+        kwargs = {**url_options, **options}
+        if role == REPLICA:
+            return sentinel.slave_for(settings.REDIS_SENTINEL_MASTER, **kwargs)
+        return sentinel.master_for(settings.REDIS_SENTINEL_MASTER, **kwargs)
+
+    url = settings.REDIS_REPLICA_URL if role == REPLICA else settings.REDIS_URL
+    if not url:
+        return None
+    return redis.from_url(url, **options)
 
 
 async def init_redis():
     """Initialize Redis connection with circuit breaker protection"""
-    global _raw_redis_client, _resilient_redis_client
+    global _raw_redis_client, _replica_redis_client, _resilient_redis_client, _last_init_attempt
 
+    _last_init_attempt = time.monotonic()
+    options = {"encoding": "utf-8", "decode_responses": settings.REDIS_DECODE_RESPONSES}
     try:
         # Create raw Redis client
-        _raw_redis_client = redis.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=settings.REDIS_DECODE_RESPONSES,
-            max_connections=settings.REDIS_POOL_SIZE,
-        )
+        _raw_redis_client = create_redis_client(MASTER, **options)
 
         # Test connection
         await _raw_redis_client.ping()
-        logger.info("Redis initialized successfully")
+        logger.info("Redis initialized successfully", sentinel=bool(_sentinel_hosts()))
 
     except Exception as e:
         logger.warning("Failed to initialize Redis - running in degraded mode", error=str(e))
         _raw_redis_client = None
 
-    # Create resilient client (works with or without raw client)
-    _resilient_redis_client = ResilientRedisClient(_raw_redis_client)
+    try:
+        _replica_redis_client = create_redis_client(REPLICA, **options)
+        if _replica_redis_client is not None:
+            await _replica_redis_client.ping()
+            logger.info("Redis replica reads enabled")
+    except Exception as e:
+        logger.warning("Redis replicas unavailable - reading from master", error=str(e))
+        _replica_redis_client = None
+
+    # Create resilient client (works with or without raw client); it always
+    # talks to the master, so blacklist and tag-version reads are never stale.
+    # A reconnect swaps its client but keeps its circuit breaker state.
+    if _resilient_redis_client is None:
+        _resilient_redis_client = ResilientRedisClient(_raw_redis_client)
+    else:
+        _resilient_redis_client.redis = _raw_redis_client
+
+
+def _reconnect_due() -> bool:
+    return (
+        _last_init_attempt is None
+        or time.monotonic() - _last_init_attempt >= RECONNECT_INTERVAL_SECONDS
+    )
 
 
 async def get_redis() -> ResilientRedisClient:
@@ -46,12 +152,19 @@ async def get_redis() -> ResilientRedisClient:
 
 
 async def get_raw_redis() -> Optional[redis.Redis]:
-    """Get raw Redis client for cases requiring direct access"""
-    if _raw_redis_client is None:
+    """Get raw Redis client for cases requiring direct access (None while Redis is down)"""
+    if _raw_redis_client is None and _reconnect_due():
         await init_redis()
     return _raw_redis_client
 
 
+async def get_read_redis() -> Optional[redis.Redis]:
+    """Raw client for reads that tolerate replication lag (replica, else master)"""
+    if _resilient_redis_client is None:
+        await init_redis()
+    return _replica_redis_client or _raw_redis_client
+
+
 class RateLimiter:
     """Simple rate limiter using Redis"""
 
@@ -97,8 +210,10 @@ class RateLimiter:
 class SessionStore:
     """Session storage using Redis"""
 
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: redis.Redis, read_client: Optional[redis.Redis] = None):
         self.redis = redis_client
+        # Session lookups tolerate replication lag (see get_read_redis)
+        self.read_redis = read_client
         self.prefix = "session:"
         self.ttl = 60 * 60 * 24  # 24 hours
 
@@ -114,7 +229,7 @@ class SessionStore:
     async def get(self, session_id: str) -> Optional[dict]:
         """Get session data"""
         key = f"{self.prefix}{session_id}"
-        data = await self.redis.hgetall(key)
+        data = await (self.read_redis or self.redis).hgetall(key)
         return data if data else None
 
     async def delete(self, session_id: str):
@@ -235,6 +235,22 @@ class ResilientRedisClient:
         )
         return bool(result)
 
+    async def acquire_lock(self, key: str, ttl: int) -> Optional[bool]:
+        """
+        Take a short-lived ``SET NX`` lock.
+
+        Returns True if taken, False if another holder has it, and None when
+        Redis is unavailable (no client, open circuit or an error), so callers
+        can tell "someone else is working" from "there is nobody to ask".
+        """
+
+        async def operation():
+            if self.redis is None:
+                raise redis.RedisError("Redis client not initialized")
+            return bool(await self.redis.set(key, "1", ex=ttl, nx=True))
+
+        return await self.circuit_breaker.execute(operation, fallback_value=None)
+
     async def setex(
         self,
         key: str,
@@ -8,24 +8,38 @@ Implements:
 - Resource optimization
 - Multi-region deployment readiness
 - Enterprise monitoring hooks
+
+Host readings (CPU, memory, disk, file descriptors, TCP connections) are taken
+by ResourceMonitor in a worker thread, never on the event loop, and kept as a
+rolling window of snapshots. A separate probe measures event-loop lag, the
+signal scaling decisions key on. Status endpoints, scaling checks and metrics
+scrapes only read the latest snapshot.
 """
 
 import asyncio
 import json
 import logging
 import time
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import psutil
 
 from app.config import settings
+from app.core.cpu_usage import CpuUsageMeter
 from app.core.performance import cache_manager
 
 logger = logging.getLogger(__name__)
 
+# Event-loop lag probe: how often it wakes, and how many readings are kept (~1 minute)
+LAG_PROBE_INTERVAL_SECONDS = 0.5
+LAG_WINDOW_SAMPLES = 120
+EVENT_LOOP_LAG_SCALE_UP_MS = 100
+EVENT_LOOP_LAG_SCALE_DOWN_MS = 20
+
 
 @dataclass
 class ScalabilityMetrics:
@@ -39,20 +53,46 @@ class ScalabilityMetrics:
     cache_hit_rate: float
     average_response_time_ms: float
     error_rate_percent: float
+    open_file_descriptors: int = 0
+    disk_free_bytes: int = 0
+    event_loop_lag_ms: float = 0.0  # Worst lag over the lag window
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
 
+def _sample_host(cpu: CpuUsageMeter) -> Dict[str, Any]:
+    """Blocking psutil reads; run in a worker thread"""
+    try:
+        connections = len(psutil.net_connections(kind="tcp"))
+    except (psutil.AccessDenied, psutil.NoSuchProcess):
+        connections = 0
+    try:
+        open_fds = psutil.Process().num_fds()
+    except (AttributeError, psutil.Error):
+        open_fds = 0  # num_fds is POSIX-only
+    return {
+        # Since the monitor's previous sample, so it never sleeps
+        "cpu_percent": cpu.percent(),
+        "memory_percent": psutil.virtual_memory().percent,
+        "disk_free_bytes": psutil.disk_usage("/").free,
+        "connections": connections,
+        "open_fds": open_fds,
+    }
+
+
 class ResourceMonitor:
     """Real-time system resource monitoring for auto-scaling decisions"""
 
     def __init__(self, sampling_interval: int = 30):
         self.sampling_interval = sampling_interval
-        self.metrics_history: List[ScalabilityMetrics] = []
         self.max_history = 100  # Keep last 100 samples (~50 minutes at 30s intervals)
+        self.metrics_history: Deque[ScalabilityMetrics] = deque(maxlen=self.max_history)
+        self.loop_lag_samples: Deque[float] = deque(maxlen=LAG_WINDOW_SAMPLES)
         self.monitoring_active = False
         self._monitoring_task: Optional[asyncio.Task] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._cpu = CpuUsageMeter()
 
     async def start_monitoring(self):
         """Start continuous resource monitoring"""
@@ -60,18 +100,23 @@ class ResourceMonitor:
             return
 
         self.monitoring_active = True
+        # CPU is measured from the previous sample; set the baseline
+        await asyncio.to_thread(self._cpu.percent)
+        self._lag_task = asyncio.create_task(self._lag_loop())
         self._monitoring_task = asyncio.create_task(self._monitoring_loop())
         logger.info(f"✅ Resource monitoring started (interval: {self.sampling_interval}s)")
 
     async def stop_monitoring(self):
         """Stop resource monitoring"""
         self.monitoring_active = False
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
-            try:
-                await self._monitoring_task
-            except asyncio.CancelledError:
-                pass  # Expected when task is cancelled during graceful shutdown
+        for task in (self._monitoring_task, self._lag_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass  # Expected when task is cancelled during graceful shutdown
+        self._monitoring_task = self._lag_task = None
         logger.info("🛑 Resource monitoring stopped")
 
     async def _monitoring_loop(self):
@@ -81,10 +126,6 @@ class ResourceMonitor:
                 metrics = await self.collect_metrics()
                 self.metrics_history.append(metrics)
 
-                # Trim history to max size
-                if len(self.metrics_history) > self.max_history:
-                    self.metrics_history.pop(0)
-
                 # Check for scaling triggers
                 await self._check_scaling_conditions(metrics)
 
@@ -94,18 +135,22 @@ class ResourceMonitor:
                 logger.error(f"Error in resource monitoring: {e}")
                 await asyncio.sleep(self.sampling_interval)
 
+    async def _lag_loop(self):
+        """Measure how late the event loop wakes a sleeping task"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_INTERVAL_SECONDS)
+            lag = time.perf_counter() - started - LAG_PROBE_INTERVAL_SECONDS
+            self.loop_lag_samples.append(max(0.0, lag * 1000))
+
+    def event_loop_lag_ms(self) -> float:
+        """Worst event-loop lag over the lag window"""
+        return max(self.loop_lag_samples, default=0.0)
+
     async def collect_metrics(self) -> ScalabilityMetrics:
         """Collect current system metrics"""
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-
-        # Network connections (approximation of active connections)
-        try:
-            connections = len(psutil.net_connections(kind="tcp"))
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            connections = 0
+        # System metrics, off the event loop
+        host = await asyncio.to_thread(_sample_host, self._cpu)
 
         # Application metrics (from performance cache if available)
         cache_stats = cache_manager.get_stats()
@@ -118,13 +163,16 @@ class ResourceMonitor:
 
         return ScalabilityMetrics(
             timestamp=datetime.now(),
-            cpu_usage_percent=cpu_percent,
-            memory_usage_percent=memory_percent,
-            active_connections=connections,
+            cpu_usage_percent=host["cpu_percent"],
+            memory_usage_percent=host["memory_percent"],
+            active_connections=host["connections"],
             requests_per_second=requests_per_second,
             cache_hit_rate=cache_hit_rate,
             average_response_time_ms=average_response_time,
             error_rate_percent=error_rate,
+            open_file_descriptors=host["open_fds"],
+            disk_free_bytes=host["disk_free_bytes"],
+            event_loop_lag_ms=self.event_loop_lag_ms(),
         )
 
     async def _check_scaling_conditions(self, metrics: ScalabilityMetrics):
@@ -134,16 +182,18 @@ class ResourceMonitor:
             metrics.cpu_usage_percent > 70
             or metrics.memory_usage_percent > 80
             or metrics.average_response_time_ms > 200
+            or metrics.event_loop_lag_ms > EVENT_LOOP_LAG_SCALE_UP_MS
         ):
             await self._trigger_scale_up_alert(metrics)
 
         # Scale-down conditions (check if consistently low)
         if len(self.metrics_history) >= 10:  # At least 10 samples
-            recent_metrics = self.metrics_history[-10:]
+            recent_metrics = list(self.metrics_history)[-10:]
             avg_cpu = sum(m.cpu_usage_percent for m in recent_metrics) / len(recent_metrics)
             avg_memory = sum(m.memory_usage_percent for m in recent_metrics) / len(recent_metrics)
+            max_lag = max(m.event_loop_lag_ms for m in recent_metrics)
 
-            if avg_cpu < 30 and avg_memory < 40:
+            if avg_cpu < 30 and avg_memory < 40 and max_lag < EVENT_LOOP_LAG_SCALE_DOWN_MS:
                 await self._trigger_scale_down_alert(metrics)
 
     async def _trigger_scale_up_alert(self, metrics: ScalabilityMetrics):
@@ -152,7 +202,8 @@ class ResourceMonitor:
             f"🔺 Scale-up conditions detected: "
             f"CPU: {metrics.cpu_usage_percent}%, "
             f"Memory: {metrics.memory_usage_percent}%, "
-            f"Response Time: {metrics.average_response_time_ms}ms"
+            f"Response Time: {metrics.average_response_time_ms}ms, "
+            f"Event Loop Lag: {metrics.event_loop_lag_ms:.1f}ms"
         )
 
         # In production, this would trigger auto-scaling actions
@@ -179,8 +230,10 @@ class ResourceMonitor:
                 "cpu_scale_up": 70,
                 "memory_scale_up": 80,
                 "response_time_scale_up": 200,
+                "event_loop_lag_ms_scale_up": EVENT_LOOP_LAG_SCALE_UP_MS,
                 "cpu_scale_down": 30,
                 "memory_scale_down": 40,
+                "event_loop_lag_ms_scale_down": EVENT_LOOP_LAG_SCALE_DOWN_MS,
             },
         }
 
@@ -264,15 +317,16 @@ class HorizontalScalingManager:
             cache_stats = cache_manager.get_stats()
             redis_healthy = cache_stats.get("redis_connected", False)
 
-            # Check system resources
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory_percent = psutil.virtual_memory().percent
+            # Check system resources (latest snapshot; no blocking reads here)
+            snapshot = resource_monitor.get_current_metrics()
+            cpu_percent = snapshot.cpu_usage_percent if snapshot else None
+            memory_percent = snapshot.memory_usage_percent if snapshot else None
 
             # Determine overall health
             healthy = (
                 redis_healthy
-                and cpu_percent < 90
-                and memory_percent < 95  # Not critically overloaded  # Not out of memory
+                and (cpu_percent is None or cpu_percent < 90)  # Not critically overloaded
+                and (memory_percent is None or memory_percent < 95)  # Not out of memory
             )
 
             basic_health.update(
@@ -281,6 +335,7 @@ class HorizontalScalingManager:
                     "cache_connected": redis_healthy,
                     "cpu_usage_percent": cpu_percent,
                     "memory_usage_percent": memory_percent,
+                    "event_loop_lag_ms": resource_monitor.event_loop_lag_ms(),
                     "load_balancer_ready": healthy,
                 }
             )
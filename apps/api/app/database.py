@@ -2,12 +2,14 @@
 import os
 from contextlib import asynccontextmanager
 
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.config import settings
+from app.core.db_routing import RoutingSession, replica_router
 
 # Create async engine for production
 if hasattr(settings, "DATABASE_URL") and settings.DATABASE_URL:
@@ -126,18 +128,39 @@ else:
     )
 
 # Create session factories
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(
+    engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
 
 # Dependency for FastAPI routes
-async def get_db() -> AsyncSession:
+async def get_db(request: Request = None) -> AsyncSession:
     """
     Dependency that provides a database session for FastAPI routes.
+
+    With read replicas configured, GET/HEAD/OPTIONS requests read from a
+    replica that has caught up with the client's own writes (see
+    app/core/db_routing.py); everything else uses the primary.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            await replica_router.prepare(session, request)
+            yield session
+            await replica_router.finish(session, request)
+        finally:
+            await session.close()
+
+
+async def get_read_db(request: Request = None) -> AsyncSession:
+    """
+    Dependency for read-only work: reads from a replica whatever the request
+    method. Writes through this session still go to the primary.
     """
     async with AsyncSessionLocal() as session:
         try:
+            await replica_router.prepare(session, request, read_only=True)
             yield session
         finally:
             await session.close()
@@ -201,6 +224,7 @@ __all__ = [
     "AsyncSessionLocal",
     "SessionLocal",
     "get_db",
+    "get_read_db",
     "get_sync_db",
     "get_async_db",
     "init_db",
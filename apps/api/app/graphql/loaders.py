@@ -0,0 +1,138 @@
+"""
+Per-request DataLoaders for the GraphQL schema.
+
+Nested fields such as ``Organization.members`` or ``Invitation.inviter`` resolve
+once per parent object. Going to the database from each resolver turns
+``{ organizations { members { organizations { id } } } }`` into one query per
+row at every level. Resolvers instead ask a loader for their key; the loader
+collects every key requested in the same tick and issues a single ``IN`` query.
+
+Loaders are keyed by (entity, foreign key column) and live for one request, so
+results are never shared between users. All of them run over the request's
+``AsyncSession``, which cannot run statements concurrently; strawberry
+dispatches batches from different loaders as separate tasks, so statements are
+serialized with a per-request lock.
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+# Keeps the IN list well under driver bind-parameter limits
+MAX_BATCH_SIZE = 500
+
+
+def _as_uuid(key: Any) -> Optional[uuid.UUID]:
+    if isinstance(key, uuid.UUID):
+        return key
+    try:
+        return uuid.UUID(str(key))
+    except (TypeError, ValueError):
+        return None
+
+
+def _uuid_keys(keys: Sequence[Any]) -> List[uuid.UUID]:
+    return list({k for k in map(_as_uuid, keys) if k is not None})
+
+
+class GraphQLLoaders:
+    """DataLoader registry for a single GraphQL request."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self._loaders: Dict[Hashable, DataLoader] = {}
+
+    async def execute(self, statement):
+        """Run a statement on the request session, one at a time."""
+        async with self._lock:
+            return await self.db.execute(statement)
+
+    def _get(self, name: Hashable, load_fn) -> DataLoader:
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = DataLoader(load_fn=load_fn, max_batch_size=MAX_BATCH_SIZE)
+            self._loaders[name] = loader
+        return loader
+
+    def one(self, model, column: str = "id") -> DataLoader:
+        """Loader returning the ``model`` row whose ``column`` equals the key, or None."""
+        col = getattr(model, column)
+
+        async def load(keys: List[str]) -> List[Optional[Any]]:
+            ids = _uuid_keys(keys)
+            rows = []
+            if ids:
+                result = await self.execute(select(model).where(col.in_(ids)))
+                rows = result.scalars().all()
+            by_key = {str(getattr(row, column)): row for row in rows}
+            return [by_key.get(str(key)) for key in keys]
+
+        return self._get(("one", model.__tablename__, column), load)
+
+    def many(self, model, column: str) -> DataLoader:
+        """Loader returning all ``model`` rows whose ``column`` equals the key."""
+        col = getattr(model, column)
+
+        async def load(keys: List[str]) -> List[List[Any]]:
+            ids = _uuid_keys(keys)
+            grouped: Dict[str, List[Any]] = defaultdict(list)
+            if ids:
+                result = await self.execute(select(model).where(col.in_(ids)))
+                for row in result.scalars().all():
+                    grouped[str(getattr(row, column))].append(row)
+            return [grouped.get(str(key), []) for key in keys]
+
+        return self._get(("many", model.__tablename__, column), load)
+
+    def through(self, model, link, key: str, target: str) -> DataLoader:
+        """Loader returning ``model`` rows reached from the key via a link table.
+
+        ``link.key`` holds the key and ``link.target`` points at ``model.id``;
+        e.g. ``through(Organization, OrganizationMember, "user_id",
+        "organization_id")`` loads a user's organizations.
+        """
+        key_col = getattr(link, key)
+        target_col = getattr(link, target)
+
+        async def load(keys: List[str]) -> List[List[Any]]:
+            ids = _uuid_keys(keys)
+            grouped: Dict[str, List[Any]] = defaultdict(list)
+            if ids:
+                result = await self.execute(
+                    select(key_col, model)
+                    .join(model, model.id == target_col)
+                    .where(key_col.in_(ids))
+                )
+                for owner_id, row in result.all():
+                    grouped[str(owner_id)].append(row)
+            return [grouped.get(str(k), []) for k in keys]
+
+        return self._get(("through", model.__tablename__, link.__tablename__, key), load)
+
+    def count(self, model, column: str) -> DataLoader:
+        """Loader returning how many ``model`` rows have ``column`` equal to the key."""
+        col = getattr(model, column)
+
+        async def load(keys: List[str]) -> List[int]:
+            ids = _uuid_keys(keys)
+            counts: Dict[str, int] = {}
+            if ids:
+                result = await self.execute(
+                    select(col, func.count()).where(col.in_(ids)).group_by(col)
+                )
+                counts = {str(owner_id): total for owner_id, total in result.all()}
+            return [counts.get(str(key), 0) for key in keys]
+
+        return self._get(("count", model.__tablename__, column), load)
+
+    def prime(self, model, rows: Sequence[Any]):
+        """Seed the by-id loader with rows a root resolver already fetched."""
+        loader = self.one(model)
+        for row in rows:
+            loader.prime(str(row.id), row)
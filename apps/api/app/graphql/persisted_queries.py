@@ -0,0 +1,140 @@
+"""
+Automatic persisted queries (APQ) for the GraphQL endpoint.
+
+Clients send ``extensions.persistedQuery.sha256Hash`` instead of the query
+text. The first time a hash is seen the server answers
+``PERSISTED_QUERY_NOT_FOUND`` and the client retries with both the query and
+the hash; the query is verified against the hash and stored. From then on the
+hash alone is enough, which keeps request bodies small and, together with
+``ParserCache``/``ValidationCache``, means a known query is parsed and
+validated once per worker.
+
+Queries are kept in a small per-process LRU backed by Redis, so a hash
+registered on one worker resolves on every other.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+from strawberry.extensions import SchemaExtension
+
+from graphql import GraphQLError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "graphql:pq:"
+LOCAL_MAXSIZE = 1000
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryStore:
+    """sha256 -> query text, in a local LRU in front of Redis."""
+
+    def __init__(self, maxsize: int = LOCAL_MAXSIZE, client=None):
+        self.maxsize = maxsize
+        self._client_override = client
+        self._local: OrderedDict[str, str] = OrderedDict()
+
+    async def _client(self):
+        if self._client_override is not None:
+            return self._client_override
+        from app.core.redis import get_raw_redis
+
+        return await get_raw_redis()
+
+    def _remember(self, digest: str, query: str):
+        self._local[digest] = query
+        self._local.move_to_end(digest)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def get(self, digest: str) -> Optional[str]:
+        query = self._local.get(digest)
+        if query is not None:
+            self._local.move_to_end(digest)
+            return query
+
+        try:
+            client = await self._client()
+            if client is None:
+                return None
+            query = await client.get(KEY_PREFIX + digest)
+        except Exception as e:
+            logger.warning(f"Persisted query lookup failed: {e}")
+            return None
+
+        if query is None:
+            return None
+        if isinstance(query, bytes):
+            query = query.decode("utf-8")
+        self._remember(digest, query)
+        return query
+
+    async def register(self, digest: str, query: str):
+        if self._local.get(digest) == query:
+            return
+        self._remember(digest, query)
+
+        from app.config import settings
+
+        try:
+            client = await self._client()
+            if client is not None:
+                await client.set(
+                    KEY_PREFIX + digest, query, ex=settings.GRAPHQL_PERSISTED_QUERY_TTL
+                )
+        except Exception as e:
+            logger.warning(f"Persisted query registration failed: {e}")
+
+    def clear(self):
+        self._local.clear()
+
+
+persisted_query_store = PersistedQueryStore()
+
+
+class PersistedQueries(SchemaExtension):
+    """Resolve ``extensions.persistedQuery`` hashes to query text before parsing."""
+
+    def __init__(self, store: Optional[PersistedQueryStore] = None):
+        super().__init__()
+        self.store = store or persisted_query_store
+
+    async def on_operation(self) -> AsyncIterator[None]:
+        execution_context = self.execution_context
+        persisted = (execution_context.operation_extensions or {}).get("persistedQuery")
+        digest = persisted.get("sha256Hash") if isinstance(persisted, dict) else None
+        register = False
+
+        if digest:
+            if persisted.get("version", 1) != 1:
+                raise GraphQLError(
+                    "Unsupported persisted query version",
+                    extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+                )
+            if execution_context.query:
+                if query_hash(execution_context.query) != digest:
+                    raise GraphQLError(
+                        "provided sha does not match query",
+                        extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"},
+                    )
+                register = True
+            else:
+                query = await self.store.get(digest)
+                if query is None:
+                    raise GraphQLError(
+                        "PersistedQueryNotFound",
+                        extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    )
+                execution_context.query = query
+
+        yield
+
+        # Only keep documents that parsed and validated
+        if register and not execution_context.pre_execution_errors:
+            await self.store.register(digest, execution_context.query)
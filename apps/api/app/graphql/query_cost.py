@@ -0,0 +1,145 @@
+"""
+Static cost analysis for GraphQL documents.
+
+Depth alone does not bound the work a query causes: ``organizations(limit: 100)
+{ members { organizations { ... } } }`` is only three levels deep but can
+resolve hundreds of thousands of rows. The rule here estimates how many objects
+a document resolves before anything executes and rejects it if the estimate
+exceeds the configured budget.
+
+Every object field costs one; scalars come with their parent row and are free.
+A list field multiplies that by its expected size: the literal ``limit``
+argument (clamped to the page size), the page size when ``limit`` comes from a
+variable, the argument's default when it is omitted, or ``DEFAULT_LIST_SIZE``
+for unpaginated relations. Validation results are cached per document by
+``ValidationCache``, so the analysis runs once per distinct query.
+"""
+
+from typing import Dict, Optional, Set, Type
+
+from graphql.language import (
+    FieldNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+)
+from graphql.validation import ValidationContext, ValidationRule
+
+from graphql import (
+    GraphQLError,
+    GraphQLList,
+    get_named_type,
+    get_nullable_type,
+)
+
+# Expected size of a list field that takes no ``limit`` (e.g. Organization.members)
+DEFAULT_LIST_SIZE = 20
+
+
+def _list_size(node: FieldNode, field, max_page_size: int) -> int:
+    for argument in node.arguments or ():
+        if argument.name.value != "limit":
+            continue
+        if isinstance(argument.value, IntValueNode):
+            return max(1, min(int(argument.value.value), max_page_size))
+        if isinstance(argument.value, VariableNode):
+            return max_page_size
+    limit = field.args.get("limit")
+    if limit is not None and isinstance(limit.default_value, int):
+        return max(1, min(limit.default_value, max_page_size))
+    return DEFAULT_LIST_SIZE
+
+
+def create_cost_rule(max_cost: int, max_page_size: int) -> Type[ValidationRule]:
+    """Build a validation rule rejecting documents estimated above ``max_cost``.
+
+    Create the rule once and pass the same class on every request (e.g. via
+    ``AddValidationRules``): ``ValidationCache`` keys on the rule classes.
+    """
+
+    class CostLimitRule(ValidationRule):
+        def __init__(self, validation_context: ValidationContext):
+            super().__init__(validation_context)
+            self.fragment_costs: Dict[str, int] = {}
+
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+            schema = self.context.schema
+            root = schema.get_root_type(node.operation)
+            if root is None:
+                return
+            cost = self.selection_cost(node.selection_set, root, set())
+            if cost > max_cost:
+                name = node.name.value if node.name else "anonymous"
+                self.report_error(
+                    GraphQLError(
+                        f"'{name}' has an estimated cost of {cost}, "
+                        f"which exceeds the maximum of {max_cost}",
+                        node,
+                        extensions={"code": "QUERY_TOO_COSTLY", "cost": cost},
+                    )
+                )
+
+        def selection_cost(
+            self,
+            selection_set: Optional[SelectionSetNode],
+            parent_type,
+            visited: Set[str],
+        ) -> int:
+            if selection_set is None:
+                return 0
+            cost = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    cost += self.field_cost(selection, parent_type, visited)
+                elif isinstance(selection, InlineFragmentNode):
+                    fragment_type = parent_type
+                    if selection.type_condition:
+                        fragment_type = self.context.schema.get_type(
+                            selection.type_condition.name.value
+                        )
+                    cost += self.selection_cost(selection.selection_set, fragment_type, visited)
+                elif isinstance(selection, FragmentSpreadNode):
+                    cost += self.fragment_cost(selection.name.value, visited)
+            return cost
+
+        def fragment_cost(self, name: str, visited: Set[str]) -> int:
+            if name in self.fragment_costs:
+                return self.fragment_costs[name]
+            # Cycles are reported by NoFragmentCyclesRule; just stop recursing
+            if name in visited:
+                return 0
+            fragment = self.context.get_fragment(name)
+            if fragment is None:
+                return 0
+            fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+            cost = self.selection_cost(fragment.selection_set, fragment_type, visited | {name})
+            self.fragment_costs[name] = cost
+            return cost
+
+        def field_cost(self, node: FieldNode, parent_type, visited: Set[str]) -> int:
+            name = node.name.value
+            if name.startswith("__"):
+                return 0
+            fields = getattr(parent_type, "fields", None) or {}
+            field = fields.get(name)
+            if field is None:
+                # Unknown fields are reported by FieldsOnCorrectTypeRule
+                return 0
+
+            if node.selection_set is None:
+                # Scalars come back with their parent row
+                return 0
+
+            multiplier = 1
+            if isinstance(get_nullable_type(field.type), GraphQLList):
+                multiplier = _list_size(node, field, max_page_size)
+
+            child_cost = self.selection_cost(
+                node.selection_set, get_named_type(field.type), visited
+            )
+            return multiplier * (1 + child_cost)
+
+    return CostLimitRule
@@ -1,5 +1,11 @@
 """
 GraphQL schema definition for Janua API.
+
+Nested fields resolve through the per-request loaders in
+``app.graphql.loaders`` so each level of a query costs one batched query rather
+than one per parent row. Documents are checked for depth and estimated cost
+before execution, and clients may send persisted query hashes instead of the
+full query text.
 """
 
 import json
@@ -7,16 +13,44 @@ from datetime import datetime
 from typing import AsyncGenerator, List, Optional
 
 import strawberry
-from app.models.organization import Organization as OrgModel
+from sqlalchemy import select
+from strawberry.extensions import AddValidationRules, ParserCache, ValidationCache
+from strawberry.extensions.query_depth_limiter import create_validator
 from strawberry.types import Info
 
+from app.config import settings
+from app.graphql.loaders import GraphQLLoaders
+from app.graphql.persisted_queries import PersistedQueries
+from app.graphql.query_cost import create_cost_rule
+from app.models import AuditLog as AuditLogModel
+from app.models import Organization as OrgModel
+from app.models import OrganizationMember
+from app.models import Session as SessionModel
 from app.models.invitation import Invitation as InvitationModel
 from app.models.policy import Policy as PolicyModel
+from app.models.policy import PolicyEvaluation as PolicyEvaluationModel
 from app.models.policy import Role as RoleModel
+from app.models.policy import UserRole
 from app.models.user import User as UserModel
 from app.services.auth_service import AuthService
 from app.services.policy_engine import PolicyEngine
 
+
+def _loaders(info: Info) -> GraphQLLoaders:
+    loaders = info.context.get("loaders")
+    if loaders is None:
+        loaders = info.context["loaders"] = GraphQLLoaders(info.context["db"])
+    return loaders
+
+
+def _page(limit: int, offset: int):
+    return max(0, offset), max(0, min(limit, settings.GRAPHQL_MAX_PAGE_SIZE))
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
 # GraphQL Types
 
 
@@ -28,20 +62,40 @@ class User:
     email_verified: bool
     created_at: datetime
     updated_at: datetime
-    organization_ids: List[str]
-    roles: List[str]
+
+    @classmethod
+    def from_model(cls, user: UserModel) -> "User":
+        return cls(
+            id=str(user.id),
+            email=user.email,
+            name=user.name,
+            email_verified=bool(user.email_verified),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
 
     @strawberry.field
     async def organizations(self, info: Info) -> List["Organization"]:
-        db = info.context["db"]
-        orgs = db.query(OrgModel).filter(OrgModel.members.any(user_id=self.id)).all()
-        return [Organization.from_orm(org) for org in orgs]
+        loader = _loaders(info).through(OrgModel, OrganizationMember, "user_id", "organization_id")
+        return [Organization.from_model(org) for org in await loader.load(self.id)]
+
+    @strawberry.field
+    async def organization_ids(self, info: Info) -> List[str]:
+        loader = _loaders(info).through(OrgModel, OrganizationMember, "user_id", "organization_id")
+        return [str(org.id) for org in await loader.load(self.id)]
+
+    @strawberry.field
+    async def roles(self, info: Info) -> List[str]:
+        loader = _loaders(info).through(RoleModel, UserRole, "user_id", "role_id")
+        return [role.name for role in await loader.load(self.id)]
 
     @strawberry.field
     async def permissions(self, info: Info) -> List[str]:
-        db = info.context["db"]
-        engine = PolicyEngine(db)
-        return engine.get_user_permissions(self.id, info.context["tenant_id"])
+        loader = _loaders(info).through(RoleModel, UserRole, "user_id", "role_id")
+        permissions = set()
+        for role in await loader.load(self.id):
+            permissions.update(role.permissions or [])
+        return sorted(permissions)
 
 
 @strawberry.type
@@ -52,22 +106,33 @@ class Organization:
     description: Optional[str]
     created_at: datetime
     updated_at: datetime
-    member_count: int
+
+    @classmethod
+    def from_model(cls, org: OrgModel) -> "Organization":
+        return cls(
+            id=str(org.id),
+            name=org.name,
+            slug=org.slug,
+            description=org.description,
+            created_at=org.created_at,
+            updated_at=org.updated_at,
+        )
+
+    @strawberry.field
+    async def member_count(self, info: Info) -> int:
+        return await _loaders(info).count(OrganizationMember, "organization_id").load(self.id)
 
     @strawberry.field
     async def members(self, info: Info) -> List[User]:
-        db = info.context["db"]
-        members = db.query(UserModel).filter(UserModel.organizations.any(id=self.id)).all()
-        return [User.from_orm(member) for member in members]
+        loader = _loaders(info).through(UserModel, OrganizationMember, "organization_id", "user_id")
+        return [User.from_model(member) for member in await loader.load(self.id)]
 
     @strawberry.field
     async def invitations(self, info: Info, status: Optional[str] = None) -> List["Invitation"]:
-        db = info.context["db"]
-        query = db.query(InvitationModel).filter(InvitationModel.organization_id == self.id)
+        invitations = await _loaders(info).many(InvitationModel, "organization_id").load(self.id)
         if status:
-            query = query.filter(InvitationModel.status == status)
-        invitations = query.all()
-        return [Invitation.from_orm(inv) for inv in invitations]
+            invitations = [inv for inv in invitations if inv.status == status]
+        return [Invitation.from_model(inv) for inv in invitations]
 
 
 @strawberry.type
@@ -86,12 +151,27 @@ class Policy:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_model(cls, policy: PolicyModel) -> "Policy":
+        return cls(
+            id=str(policy.id),
+            name=policy.name,
+            description=policy.description,
+            effect=policy.effect,
+            priority=policy.priority,
+            enabled=policy.enabled,
+            target_type=policy.target_type,
+            target_id=policy.target_id,
+            resource_type=policy.resource_type,
+            resource_pattern=policy.resource_pattern,
+            actions=list(policy.actions or []),
+            created_at=policy.created_at,
+            updated_at=policy.updated_at,
+        )
+
     @strawberry.field
     async def evaluations_count(self, info: Info) -> int:
-        db = info.context["db"]
-        from app.models.policy import PolicyEvaluation
-
-        return db.query(PolicyEvaluation).filter(PolicyEvaluation.policy_id == self.id).count()
+        return await _loaders(info).count(PolicyEvaluationModel, "policy_id").load(self.id)
 
 
 @strawberry.type
@@ -104,12 +184,21 @@ class Role:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_model(cls, role: RoleModel) -> "Role":
+        return cls(
+            id=str(role.id),
+            name=role.name,
+            description=role.description,
+            permissions=list(role.permissions or []),
+            is_system=bool(role.is_system),
+            created_at=role.created_at,
+            updated_at=role.updated_at,
+        )
+
     @strawberry.field
     async def users_count(self, info: Info) -> int:
-        db = info.context["db"]
-        from app.models.policy import UserRole
-
-        return db.query(UserRole).filter(UserRole.role_id == self.id).count()
+        return await _loaders(info).count(UserRole, "role_id").load(self.id)
 
 
 @strawberry.type
@@ -123,20 +212,34 @@ class Invitation:
     expires_at: datetime
     created_at: datetime
     email_sent: bool
+    invited_by: strawberry.Private[Optional[str]]
+
+    @classmethod
+    def from_model(cls, invitation: InvitationModel) -> "Invitation":
+        return cls(
+            id=str(invitation.id),
+            email=invitation.email,
+            organization_id=str(invitation.organization_id),
+            role_name=invitation.role,
+            status=invitation.status,
+            message=invitation.message,
+            expires_at=invitation.expires_at,
+            created_at=invitation.created_at,
+            email_sent=bool(invitation.email_sent),
+            invited_by=_str(invitation.created_by),
+        )
 
     @strawberry.field
-    async def organization(self, info: Info) -> Organization:
-        db = info.context["db"]
-        org = db.query(OrgModel).filter(OrgModel.id == self.organization_id).first()
-        return Organization.from_orm(org)
+    async def organization(self, info: Info) -> Optional[Organization]:
+        org = await _loaders(info).one(OrgModel).load(self.organization_id)
+        return Organization.from_model(org) if org else None
 
     @strawberry.field
     async def inviter(self, info: Info) -> Optional[User]:
-        db = info.context["db"]
-        if self.invited_by:
-            user = db.query(UserModel).filter(UserModel.id == self.invited_by).first()
-            return User.from_orm(user) if user else None
-        return None
+        if not self.invited_by:
+            return None
+        user = await _loaders(info).one(UserModel).load(self.invited_by)
+        return User.from_model(user) if user else None
 
 
 @strawberry.type
@@ -149,11 +252,22 @@ class Session:
     ip_address: Optional[str]
     user_agent: Optional[str]
 
+    @classmethod
+    def from_model(cls, session: SessionModel) -> "Session":
+        return cls(
+            id=str(session.id),
+            user_id=str(session.user_id),
+            token=session.token,
+            expires_at=session.expires_at,
+            created_at=session.created_at,
+            ip_address=session.ip_address,
+            user_agent=session.user_agent,
+        )
+
     @strawberry.field
-    async def user(self, info: Info) -> User:
-        db = info.context["db"]
-        user = db.query(UserModel).filter(UserModel.id == self.user_id).first()
-        return User.from_orm(user)
+    async def user(self, info: Info) -> Optional[User]:
+        user = await _loaders(info).one(UserModel).load(self.user_id)
+        return User.from_model(user) if user else None
 
 
 @strawberry.type
@@ -167,13 +281,25 @@ class AuditLog:
     ip_address: Optional[str]
     timestamp: datetime
 
+    @classmethod
+    def from_model(cls, log: AuditLogModel) -> "AuditLog":
+        return cls(
+            id=str(log.id),
+            action=log.action,
+            user_id=_str(log.user_id),
+            resource_type=log.resource_type,
+            resource_id=_str(log.resource_id),
+            details=json.dumps(log.details) if log.details is not None else None,
+            ip_address=_str(log.ip_address),
+            timestamp=log.created_at,
+        )
+
     @strawberry.field
     async def user(self, info: Info) -> Optional[User]:
         if not self.user_id:
             return None
-        db = info.context["db"]
-        user = db.query(UserModel).filter(UserModel.id == self.user_id).first()
-        return User.from_orm(user) if user else None
+        user = await _loaders(info).one(UserModel).load(self.user_id)
+        return User.from_model(user) if user else None
 
 
 @strawberry.type
@@ -248,10 +374,9 @@ class Mutation:
     async def sign_up(self, info: Info, input: SignUpInput) -> User:
         """Create a new user account."""
         db = info.context["db"]
-        auth_service = AuthService(db)
 
-        user = await auth_service.sign_up(
-            email=input.email, password=input.password, name=input.name
+        user = await AuthService.create_user(
+            db, email=input.email, password=input.password, name=input.name
         )
 
         if input.organization_name:
@@ -260,27 +385,29 @@ class Mutation:
                 name=input.organization_name,
                 slug=input.organization_name.lower().replace(" ", "-"),
                 owner_id=user.id,
-                tenant_id=user.tenant_id,
             )
             db.add(org)
-            db.commit()
+            await db.commit()
 
-        return User.from_orm(user)
+        return User.from_model(user)
 
     @strawberry.mutation
     async def sign_in(self, info: Info, input: SignInInput) -> Session:
         """Authenticate user and create session."""
         db = info.context["db"]
-        auth_service = AuthService(db)
 
-        session = await auth_service.sign_in(
-            email=input.email,
-            password=input.password,
+        user = await AuthService.authenticate_user(db, input.email, input.password)
+        if not user:
+            raise Exception("Invalid credentials")
+
+        _, _, session = await AuthService.create_session(
+            db,
+            user,
             ip_address=info.context.get("ip_address"),
             user_agent=info.context.get("user_agent"),
         )
 
-        return Session.from_orm(session)
+        return Session.from_model(session)
 
     @strawberry.mutation
     async def create_organization(self, info: Info, input: CreateOrganizationInput) -> Organization:
@@ -296,14 +423,13 @@ class Mutation:
             slug=input.slug,
             description=input.description,
             owner_id=user.id,
-            tenant_id=user.tenant_id,
         )
 
         db.add(org)
-        db.commit()
-        db.refresh(org)
+        await db.commit()
+        await db.refresh(org)
 
-        return Organization.from_orm(org)
+        return Organization.from_model(org)
 
     @strawberry.mutation
     async def create_invitation(self, info: Info, input: CreateInvitationInput) -> Invitation:
@@ -332,7 +458,7 @@ class Mutation:
             invitation_data=invitation_data, invited_by=user, tenant_id=user.tenant_id
         )
 
-        return Invitation.from_orm(invitation)
+        return Invitation.from_model(invitation)
 
     @strawberry.mutation
     async def create_policy(self, info: Info, input: CreatePolicyInput) -> Policy:
@@ -344,7 +470,7 @@ class Mutation:
             raise Exception("Admin access required")
 
         policy = PolicyModel(
-            tenant_id=user.tenant_id,
+            organization_id=user.tenant_id,
             name=input.name,
             description=input.description,
             rules=json.loads(input.rules) if input.rules else {},
@@ -358,10 +484,10 @@ class Mutation:
         )
 
         db.add(policy)
-        db.commit()
-        db.refresh(policy)
+        await db.commit()
+        await db.refresh(policy)
 
-        return Policy.from_orm(policy)
+        return Policy.from_model(policy)
 
     @strawberry.mutation
     async def evaluate_policy(self, info: Info, input: EvaluatePolicyInput) -> PolicyEvaluation:
@@ -373,7 +499,6 @@ class Mutation:
             raise Exception("Authentication required")
 
         from app.models.policy import PolicyEvaluateRequest
-        from app.services.policy_engine import PolicyEngine
 
         engine = PolicyEngine(db)
 
@@ -384,7 +509,7 @@ class Mutation:
             context=json.loads(input.context) if input.context else None,
         )
 
-        result = await engine.evaluate(request=request, tenant_id=user.tenant_id)
+        result = await engine.evaluate(request=request, organization_id=str(user.tenant_id))
 
         return PolicyEvaluation(
             allowed=result.allowed,
@@ -403,58 +528,70 @@ class Query:
     async def me(self, info: Info) -> Optional[User]:
         """Get current authenticated user."""
         user = info.context.get("user")
-        return User.from_orm(user) if user else None
+        return User.from_model(user) if user else None
 
     @strawberry.field
     async def user(self, info: Info, id: str) -> Optional[User]:
         """Get user by ID."""
-        db = info.context["db"]
-        user = db.query(UserModel).filter(UserModel.id == id).first()
-        return User.from_orm(user) if user else None
+        user = await _loaders(info).one(UserModel).load(id)
+        return User.from_model(user) if user else None
 
     @strawberry.field
     async def users(self, info: Info, limit: int = 100, offset: int = 0) -> List[User]:
         """List users."""
-        db = info.context["db"]
-        users = db.query(UserModel).offset(offset).limit(limit).all()
-        return [User.from_orm(user) for user in users]
+        offset, limit = _page(limit, offset)
+        loaders = _loaders(info)
+        result = await loaders.execute(
+            select(UserModel).order_by(UserModel.created_at).offset(offset).limit(limit)
+        )
+        users = result.scalars().all()
+        loaders.prime(UserModel, users)
+        return [User.from_model(user) for user in users]
 
     @strawberry.field
     async def organization(self, info: Info, id: str) -> Optional[Organization]:
         """Get organization by ID."""
-        db = info.context["db"]
-        org = db.query(OrgModel).filter(OrgModel.id == id).first()
-        return Organization.from_orm(org) if org else None
+        org = await _loaders(info).one(OrgModel).load(id)
+        return Organization.from_model(org) if org else None
 
     @strawberry.field
     async def organizations(
         self, info: Info, limit: int = 100, offset: int = 0
     ) -> List[Organization]:
         """List organizations."""
-        db = info.context["db"]
-        orgs = db.query(OrgModel).offset(offset).limit(limit).all()
-        return [Organization.from_orm(org) for org in orgs]
+        offset, limit = _page(limit, offset)
+        loaders = _loaders(info)
+        result = await loaders.execute(
+            select(OrgModel).order_by(OrgModel.created_at).offset(offset).limit(limit)
+        )
+        orgs = result.scalars().all()
+        loaders.prime(OrgModel, orgs)
+        return [Organization.from_model(org) for org in orgs]
 
     @strawberry.field
     async def policies(
         self, info: Info, enabled: Optional[bool] = None, limit: int = 100, offset: int = 0
     ) -> List[Policy]:
         """List policies."""
-        db = info.context["db"]
-        query = db.query(PolicyModel)
+        offset, limit = _page(limit, offset)
+        query = select(PolicyModel)
 
         if enabled is not None:
-            query = query.filter(PolicyModel.enabled == enabled)
+            query = query.where(PolicyModel.enabled == enabled)
 
-        policies = query.offset(offset).limit(limit).all()
-        return [Policy.from_orm(policy) for policy in policies]
+        result = await _loaders(info).execute(
+            query.order_by(PolicyModel.created_at).offset(offset).limit(limit)
+        )
+        return [Policy.from_model(policy) for policy in result.scalars().all()]
 
     @strawberry.field
     async def roles(self, info: Info, limit: int = 100, offset: int = 0) -> List[Role]:
         """List roles."""
-        db = info.context["db"]
-        roles = db.query(RoleModel).offset(offset).limit(limit).all()
-        return [Role.from_orm(role) for role in roles]
+        offset, limit = _page(limit, offset)
+        result = await _loaders(info).execute(
+            select(RoleModel).order_by(RoleModel.created_at).offset(offset).limit(limit)
+        )
+        return [Role.from_model(role) for role in result.scalars().all()]
 
     @strawberry.field
     async def invitations(
@@ -466,17 +603,19 @@ class Query:
         offset: int = 0,
     ) -> List[Invitation]:
         """List invitations."""
-        db = info.context["db"]
-        query = db.query(InvitationModel)
+        offset, limit = _page(limit, offset)
+        query = select(InvitationModel)
 
         if organization_id:
-            query = query.filter(InvitationModel.organization_id == organization_id)
+            query = query.where(InvitationModel.organization_id == organization_id)
 
         if status:
-            query = query.filter(InvitationModel.status == status)
+            query = query.where(InvitationModel.status == status)
 
-        invitations = query.offset(offset).limit(limit).all()
-        return [Invitation.from_orm(inv) for inv in invitations]
+        result = await _loaders(info).execute(
+            query.order_by(InvitationModel.created_at.desc()).offset(offset).limit(limit)
+        )
+        return [Invitation.from_model(inv) for inv in result.scalars().all()]
 
     @strawberry.field
     async def audit_logs(
@@ -488,19 +627,19 @@ class Query:
         offset: int = 0,
     ) -> List[AuditLog]:
         """Query audit logs."""
-        db = info.context["db"]
-        from app.models import AuditLog as AuditLogModel
-
-        query = db.query(AuditLogModel)
+        offset, limit = _page(limit, offset)
+        query = select(AuditLogModel)
 
         if user_id:
-            query = query.filter(AuditLogModel.user_id == user_id)
+            query = query.where(AuditLogModel.user_id == user_id)
 
         if action:
-            query = query.filter(AuditLogModel.action == action)
+            query = query.where(AuditLogModel.action == action)
 
-        logs = query.order_by(AuditLogModel.timestamp.desc()).offset(offset).limit(limit).all()
-        return [AuditLog.from_orm(log) for log in logs]
+        result = await _loaders(info).execute(
+            query.order_by(AuditLogModel.created_at.desc()).offset(offset).limit(limit)
+        )
+        return [AuditLog.from_model(log) for log in result.scalars().all()]
 
 
 # Subscriptions
@@ -539,12 +678,21 @@ class Subscription:
             )
 
 
+# Depth and cost rules are built once: ValidationCache keys on the rule classes
+QUERY_LIMIT_RULES = [
+    create_validator(settings.GRAPHQL_MAX_DEPTH, None, None),
+    create_cost_rule(settings.GRAPHQL_MAX_COST, settings.GRAPHQL_MAX_PAGE_SIZE),
+]
+
 # Create schema
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
     subscription=Subscription,
     extensions=[
-        # Add any GraphQL extensions here
+        PersistedQueries,
+        lambda: ParserCache(maxsize=512),
+        lambda: AddValidationRules(QUERY_LIMIT_RULES),
+        lambda: ValidationCache(maxsize=512),
     ],
 )
@@ -0,0 +1,367 @@
+"""
+Non-blocking log pipeline.
+
+Request-path log calls only build a dict and put it on a bounded queue; a
+background thread serializes records (orjson when installed) and does all
+stdout/file I/O. Before a record is queued it passes through:
+
+- ``LogSampler``: per-level and per-route sample rates for DEBUG/INFO records
+  (WARNING and above are always kept),
+- ``DuplicateSuppressor``: at most N identical WARNING+ records per window
+  (same level, logger, message and error/route fields); the next one that
+  gets through carries ``suppressed_count``.
+
+When the queue is full the record is dropped and counted instead of blocking
+the caller; the writer thread reports drops as a log record of its own.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    ORJSON_AVAILABLE = False
+
+LEVELS = {
+    "trace": 5,
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+_STOP = object()
+
+
+def dumps(record: Dict[str, Any]) -> str:
+    """Serialize a record to a single JSON line."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(record, default=str, separators=(",", ":"))
+
+
+def parse_rates(spec: Optional[str]) -> Dict[str, float]:
+    """Parse ``"debug=0.1,/api/v1/health=0.01"`` into a key -> rate mapping."""
+    rates: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        key, sep, value = item.strip().rpartition("=")
+        if not sep or not key:
+            continue
+        try:
+            rates[key.strip()] = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+class LogSampler:
+    """Decide whether a DEBUG/INFO record is kept, by level and by route prefix."""
+
+    def __init__(
+        self,
+        level_rates: Optional[Dict[str, float]] = None,
+        route_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.level_rates = {k.lower(): v for k, v in (level_rates or {}).items()}
+        # Longest prefix first so "/api/v1/auth/login" beats "/api/v1/auth"
+        self.route_rates: List[Tuple[str, float]] = sorted(
+            (route_rates or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def rate(self, level: str, route: Optional[str] = None) -> float:
+        if LEVELS.get(level, logging.INFO) >= logging.WARNING:
+            return 1.0
+        rate = self.level_rates.get(level, 1.0)
+        if route:
+            for prefix, route_rate in self.route_rates:
+                if route.startswith(prefix):
+                    rate *= route_rate
+                    break
+        return rate
+
+    def sample(self, level: str, route: Optional[str] = None) -> Optional[float]:
+        """Return the applied rate if the record is kept, None if it is sampled out."""
+        rate = self.rate(level, route)
+        if rate >= 1.0:
+            return 1.0
+        if rate <= 0.0 or random.random() >= rate:
+            return None
+        return rate
+
+
+class DuplicateSuppressor:
+    """Rate-limit identical records to ``max_per_window`` per ``window`` seconds."""
+
+    MAX_KEYS = 10000
+    # Fields that distinguish one failure from another
+    KEY_FIELDS = ("error", "error_type", "error_message", "http_path", "http_status_code")
+
+    def __init__(
+        self, window: float = 10.0, max_per_window: int = 5, min_level: int = logging.WARNING
+    ):
+        self.window = window
+        self.max_per_window = max_per_window
+        self.min_level = min_level
+        # key -> [window_start, emitted, suppressed]
+        self._seen: Dict[Tuple[Any, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def key(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            record.get("level"),
+            record.get("logger"),
+            record.get("message"),
+            *(str(record.get(field)) for field in self.KEY_FIELDS),
+        )
+
+    def check(self, record: Dict[str, Any]) -> Tuple[bool, int]:
+        """Return (keep, suppressed_since_last_kept)."""
+        if self.max_per_window <= 0:
+            return True, 0
+        if LEVELS.get(record.get("level", "info"), logging.INFO) < self.min_level:
+            return True, 0
+        now = time.monotonic()
+        key = self.key(record)
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = int(entry[2]) if entry else 0
+                if len(self._seen) >= self.MAX_KEYS:
+                    self._prune(now)
+                self._seen[key] = [now, 1, 0]
+                return True, suppressed
+            if entry[1] < self.max_per_window:
+                entry[1] += 1
+                return True, 0
+            entry[2] += 1
+            return False, 0
+
+    def _prune(self, now: float):
+        expired = [k for k, v in self._seen.items() if now - v[0] >= self.window]
+        for key in expired:
+            del self._seen[key]
+        if len(self._seen) >= self.MAX_KEYS:
+            self._seen.clear()
+
+
+class LogPipeline:
+    """Bounded queue of record dicts drained by one writer thread."""
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        log_file: Optional[str] = None,
+        error_log_file: Optional[str] = None,
+        format_type: str = "json",
+        stream_level: int = logging.INFO,
+        max_queue_size: int = 10000,
+        sampler: Optional[LogSampler] = None,
+        suppressor: Optional[DuplicateSuppressor] = None,
+        batch_size: int = 512,
+    ):
+        self.stream = stream if stream is not None else sys.stdout
+        self.format_type = format_type
+        self.stream_level = stream_level
+        self.sampler = sampler or LogSampler()
+        self.suppressor = suppressor or DuplicateSuppressor()
+        self.batch_size = batch_size
+
+        self._file_handlers: List[logging.Handler] = []
+        if log_file:
+            self._file_handlers.append(
+                _line_handler(log_file, logging.DEBUG, backup_count=5)  # 10MB x 5
+            )
+        if error_log_file:
+            self._file_handlers.append(
+                _line_handler(error_log_file, logging.ERROR, backup_count=10)
+            )
+
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.suppressed = 0
+        self.written = 0
+        self._reported_drops = 0
+
+    def submit(self, record: Dict[str, Any], route: Optional[str] = None) -> bool:
+        """
+        Queue a record without blocking.
+
+        ``record`` must contain ``level`` and ``message``. Returns False if the
+        record was sampled out, suppressed as a duplicate or dropped.
+        """
+        level = record.get("level", "info")
+        rate = self.sampler.sample(level, route)
+        if rate is None:
+            self.sampled_out += 1
+            return False
+        keep, suppressed = self.suppressor.check(record)
+        if not keep:
+            self.suppressed += 1
+            return False
+
+        if rate < 1.0:
+            record["sample_rate"] = rate
+        if suppressed:
+            record["suppressed_count"] = suppressed
+        record.setdefault("timestamp", time.time())
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "suppressed": self.suppressed,
+        }
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written (for tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Write out queued records and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        for handler in self._file_handlers:
+            handler.close()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="janua-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            records = [item for item in batch if item is not _STOP]
+            if self.dropped != self._reported_drops:
+                records.append(self._drop_report())
+            try:
+                self._write(records)
+            except Exception:  # pragma: no cover - never let the writer die
+                traceback.print_exc(file=sys.__stderr__)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _drop_report(self) -> Dict[str, Any]:
+        dropped = self.dropped - self._reported_drops
+        self._reported_drops = self.dropped
+        return {
+            "level": "warning",
+            "logger": "janua.logging",
+            "message": "Log records dropped (queue full)",
+            "dropped": dropped,
+            "timestamp": time.time(),
+        }
+
+    def _write(self, records: List[Dict[str, Any]]):
+        lines = []
+        for record in records:
+            timestamp = record.get("timestamp")
+            if isinstance(timestamp, (int, float)):
+                record["timestamp"] = datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+            levelno = LEVELS.get(record.get("level", "info"), logging.INFO)
+            line = self._format(record)
+
+            if levelno >= self.stream_level:
+                lines.append(line)
+            for handler in self._file_handlers:
+                if levelno >= handler.level:
+                    handler.handle(logging.makeLogRecord({"msg": line, "levelno": levelno}))
+
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        self.written += len(records)
+
+    def _format(self, record: Dict[str, Any]) -> str:
+        if self.format_type == "console":
+            return (
+                f"{record.get('timestamp')} - {record.get('logger', 'janua')} - "
+                f"{record.get('level', 'info').upper()} - {record.get('message', '')}"
+            )
+        return dumps(record)
+
+
+def _line_handler(path: str, level: int, backup_count: int) -> logging.Handler:
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=10 * 1024 * 1024, backupCount=backup_count
+    )
+    handler.setLevel(level)
+    return handler
+
+
+class PipelineHandler(logging.Handler):
+    """Stdlib handler that turns records into dicts and hands them to a LogPipeline."""
+
+    def __init__(self, pipeline: LogPipeline, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                "timestamp": record.created,
+                "level": record.levelname.lower(),
+                "logger": record.name,
+                "message": record.getMessage(),
+                "module": record.module,
+                "line": record.lineno,
+            }
+            if record.exc_info:
+                # Tracebacks reference live frames, so render them on the caller
+                entry["exception"] = "".join(traceback.format_exception(*record.exc_info))
+            self.pipeline.submit(entry)
+        except Exception:
+            self.handleError(record)
@@ -12,16 +12,21 @@ import time
 import traceback
 import uuid
 from contextlib import asynccontextmanager, contextmanager
-from datetime import datetime
 from enum import Enum
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
 
 import structlog
 from opentelemetry import trace
-from pythonjsonlogger import jsonlogger
 
 from app.config import settings
+from app.logging.pipeline import (
+    DuplicateSuppressor,
+    LogPipeline,
+    LogSampler,
+    PipelineHandler,
+    parse_rates,
+)
 
 # Configure structlog
 structlog.configure(
@@ -80,12 +85,49 @@ class LogContext:
         return cls._context.copy()
 
 
+_pipeline: Optional[LogPipeline] = None
+
+
+def get_log_pipeline() -> LogPipeline:
+    """Return the process-wide log pipeline, creating it from settings on first use"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(
+            log_file=getattr(settings, "LOG_FILE", None),
+            error_log_file=getattr(settings, "ERROR_LOG_FILE", None),
+            format_type=getattr(settings, "LOG_FORMAT", "json"),
+            max_queue_size=getattr(settings, "LOG_QUEUE_SIZE", 10000),
+            sampler=LogSampler(
+                level_rates=parse_rates(getattr(settings, "LOG_SAMPLE_RATES", "")),
+                route_rates=parse_rates(getattr(settings, "LOG_ROUTE_SAMPLE_RATES", "")),
+            ),
+            suppressor=DuplicateSuppressor(
+                window=getattr(settings, "LOG_DUPLICATE_WINDOW_SECONDS", 10.0),
+                max_per_window=getattr(settings, "LOG_DUPLICATE_MAX_PER_WINDOW", 5),
+            ),
+        )
+    return _pipeline
+
+
+def close_log_pipeline(timeout: float = 5.0):
+    """Write out queued records and stop the writer thread (blocking; call at shutdown)"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.close(timeout)
+        _pipeline = None
+
+
 class StructuredLogger:
-    """Enhanced structured logger with correlation tracking and performance monitoring"""
+    """Enhanced structured logger with correlation tracking and performance monitoring
+
+    Records are built as dicts on the calling thread and written by the
+    background ``LogPipeline`` thread; no formatting or I/O happens here.
+    """
 
     def __init__(self, name: str = "janua"):
         self.name = name
         self.logger = structlog.get_logger(name)
+        self.pipeline = get_log_pipeline()
         self._setup_stdlib_logging()
 
         # Performance tracking
@@ -93,52 +135,17 @@ class StructuredLogger:
         self.operation_counters: Dict[str, int] = {}
 
     def _setup_stdlib_logging(self):
-        """Configure standard library logging integration"""
-
-        # Create formatters
-        json_formatter = jsonlogger.JsonFormatter(
-            "%(asctime)s %(name)s %(levelname)s %(message)s %(pathname)s %(lineno)d"
-        )
-
-        console_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-
-        # Root logger configuration
+        """Route standard library logging through the pipeline (installed once)"""
         root_logger = logging.getLogger()
         root_logger.setLevel(getattr(logging, getattr(settings, "LOG_LEVEL", "INFO")))
 
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(
-            console_formatter
-            if getattr(settings, "LOG_FORMAT", "json") == "console"
-            else json_formatter
-        )
-        console_handler.setLevel(logging.INFO)
-
-        # File handler (if configured)
-        log_file = getattr(settings, "LOG_FILE", None)
-        if log_file:
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
-            )
-            file_handler.setFormatter(json_formatter)
-            file_handler.setLevel(logging.DEBUG)
-            root_logger.addHandler(file_handler)
-
-        # Error file handler
-        error_log_file = getattr(settings, "ERROR_LOG_FILE", None)
-        if error_log_file:
-            error_handler = logging.handlers.RotatingFileHandler(
-                error_log_file, maxBytes=10 * 1024 * 1024, backupCount=10  # 10MB
-            )
-            error_handler.setFormatter(json_formatter)
-            error_handler.setLevel(logging.ERROR)
-            root_logger.addHandler(error_handler)
-
-        # Add console handler last
-        root_logger.addHandler(console_handler)
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, PipelineHandler):
+                if handler.pipeline is self.pipeline:
+                    return
+                root_logger.removeHandler(handler)
+
+        root_logger.addHandler(PipelineHandler(self.pipeline))
 
         # Prevent duplicate logs
         root_logger.propagate = False
@@ -149,7 +156,8 @@ class StructuredLogger:
             "service": "janua-api",
             "version": getattr(settings, "VERSION", "1.0.0"),
             "environment": getattr(settings, "ENVIRONMENT", "development"),
-            "timestamp": datetime.utcnow().isoformat(),
+            # Epoch seconds; the writer thread renders ISO-8601
+            "timestamp": time.time(),
         }
 
         # Add request context if available
@@ -183,11 +191,15 @@ class StructuredLogger:
 
     def _log(self, level: str, message: str, **kwargs):
         """Internal logging method with context enrichment"""
+        level = level.lower()
+        if self.pipeline.sampler.rate(level) <= 0.0 or not self._enabled(level):
+            return
+
         context = self._get_base_context()
         context.update(kwargs)
 
         # Add caller information for debugging
-        if level.lower() in ["debug", "trace"]:
+        if level in ["debug", "trace"]:
             frame = sys._getframe(2)
             context["caller"] = {
                 "file": frame.f_code.co_filename,
@@ -195,7 +207,14 @@ class StructuredLogger:
                 "line": frame.f_lineno,
             }
 
-        getattr(self.logger, level.lower())(message, **context)
+        context["level"] = level
+        context["logger"] = self.name
+        context["message"] = message
+        self.pipeline.submit(context, route=kwargs.get("http_path"))
+
+    def _enabled(self, level: str) -> bool:
+        """Whether records at ``level`` pass the configured root level"""
+        return logging.getLogger().isEnabledFor(getattr(logging, level.upper(), logging.INFO))
 
     def trace(self, message: str, **kwargs):
         """Trace level logging"""
@@ -573,8 +592,9 @@ def configure_logging(
     if error_log_file:
         os.environ["ERROR_LOG_FILE"] = error_log_file
 
-    # Recreate logger with new configuration
+    # Recreate pipeline and logger with new configuration
     global structured_logger
+    close_log_pipeline()
     structured_logger = StructuredLogger()
 
 
@@ -589,6 +609,8 @@ __all__ = [
     "request_logging_context",
     "generate_correlation_id",
     "configure_logging",
+    "get_log_pipeline",
+    "close_log_pipeline",
     "LogContext",
     "LogLevel",
 ]
@@ -60,6 +60,7 @@ pwd_context = CryptContext(
     bcrypt__rounds=12,  # Strong rounds for security
     bcrypt__ident="2b",  # Use 2b to avoid wrap bug detection
 )
+import asyncio
 import logging
 import os
 import secrets
@@ -247,15 +248,26 @@ try:
     enterprise_routers["scim_config"] = scim_config_v1
 except Exception as e:
     logger.warning(f"SCIM Config router not available: {e}")
+from app.core.db_routing import replica_router
+from app.core.invalidation import invalidation_bus
 from app.core.performance import PerformanceMonitoringMiddleware, cache_manager
 from app.core.scalability import (
     get_scalability_status,
     initialize_scalability_features,
+    resource_monitor,
     shutdown_scalability_features,
 )
 from app.core.tenant_context import TenantMiddleware
 from app.core.webhook_dispatcher import webhook_dispatcher
+from app.services.api_key_service import api_key_usage
+from app.services.audit_log_partitions import (
+    start_partition_maintenance,
+    stop_partition_maintenance,
+)
+from app.services.credential_rotation_service import client_secret_usage
+from app.services.metrics_rollup import metrics_rollup
 from app.services.monitoring import AlertManager, HealthChecker, MetricsCollector, SystemMonitor
+from app.services.system_settings_service import settings_snapshot
 
 # Set up logging
 logging.basicConfig(level=logging.INFO if settings.DEBUG else logging.WARNING)
@@ -779,26 +791,45 @@ async def prometheus_metrics():
 
         def collect(self):
             try:
-                import psutil
-
-                # System metrics
-                system_cpu = GaugeMetricFamily(
-                    "janua_system_cpu_percent", "System CPU usage percentage"
-                )
-                system_cpu.add_metric([], psutil.cpu_percent())
-                yield system_cpu
-
-                system_memory = GaugeMetricFamily(
-                    "janua_system_memory_percent", "System memory usage percentage"
+                # System metrics: the resource monitor's latest snapshot (sampled off the loop)
+                snapshot = resource_monitor.get_current_metrics()
+                if snapshot is not None:
+                    system_cpu = GaugeMetricFamily(
+                        "janua_system_cpu_percent", "System CPU usage percentage"
+                    )
+                    system_cpu.add_metric([], snapshot.cpu_usage_percent)
+                    yield system_cpu
+
+                    system_memory = GaugeMetricFamily(
+                        "janua_system_memory_percent", "System memory usage percentage"
+                    )
+                    system_memory.add_metric([], snapshot.memory_usage_percent)
+                    yield system_memory
+
+                    system_disk = GaugeMetricFamily(
+                        "janua_system_disk_free_bytes", "System disk free space in bytes"
+                    )
+                    system_disk.add_metric([], snapshot.disk_free_bytes)
+                    yield system_disk
+
+                    open_fds = GaugeMetricFamily(
+                        "janua_process_open_fds", "Open file descriptors of the API process"
+                    )
+                    open_fds.add_metric([], snapshot.open_file_descriptors)
+                    yield open_fds
+
+                    tcp_connections = GaugeMetricFamily(
+                        "janua_system_tcp_connections", "Open TCP connections on the host"
+                    )
+                    tcp_connections.add_metric([], snapshot.active_connections)
+                    yield tcp_connections
+
+                loop_lag = GaugeMetricFamily(
+                    "janua_event_loop_lag_seconds",
+                    "Worst event loop lag over the last minute",
                 )
-                system_memory.add_metric([], psutil.virtual_memory().percent)
-                yield system_memory
-
-                system_disk = GaugeMetricFamily(
-                    "janua_system_disk_free_bytes", "System disk free space in bytes"
-                )
-                system_disk.add_metric([], psutil.disk_usage("/").free)
-                yield system_disk
+                loop_lag.add_metric([], resource_monitor.event_loop_lag_ms() / 1000)
+                yield loop_lag
 
                 # Application health
                 app_health = GaugeMetricFamily(
@@ -853,6 +884,11 @@ async def prometheus_metrics():
                 redis_connected.add_metric([], 1)
                 yield redis_connected
 
+                # Cache hit ratio, recomputes and invalidation lag (app.core.caching)
+                from app.core.caching import cache_stats
+
+                yield from cache_stats.metric_families()
+
             except Exception:
                 # Fallback metric if system monitoring fails
                 error_metric = GaugeMetricFamily(
@@ -878,24 +914,19 @@ async def scalability_metrics():
 # Infrastructure connectivity test using database manager
 @app.get("/ready")
 async def ready_check():
+    """Readiness from the health checker's cached, concurrent database and Redis checks"""
     checks = {"status": "ready", "database": {}, "redis": False}
 
-    # Test Database with health manager
-    try:
-        db_health = await get_database_health()
-        checks["database"] = db_health
-    except Exception as e:
-        checks["database"] = {"healthy": False, "error": str(e)}
-
-    # Test Redis with direct connection
-    try:
-        redis_client = await get_redis_client()
-        await redis_client.ping()
-        checks["redis"] = True
-        await redis_client.close()
-    except Exception as e:
-        logger.warning("Redis health check failed", error=str(e))
-        checks["redis"] = False
+    result = await health_checker.check_health()
+    database = result["checks"].get("database")
+    if database is None:
+        checks["database"] = {"healthy": False, "error": "Database check not registered"}
+    else:
+        checks["database"] = database.get("details") or {
+            "healthy": database["status"] == "healthy",
+            **({"error": database["error"]} if "error" in database else {}),
+        }
+    checks["redis"] = result["checks"].get("redis", {}).get("status") == "healthy"
 
     # Overall status
     checks["status"] = (
@@ -1179,6 +1210,22 @@ async def startup_event():
         from app.core.database import bootstrap_admin_user
 
         await bootstrap_admin_user()
+
+        # Route GET traffic to read replicas (no-op without DATABASE_REPLICA_URLS)
+        await replica_router.start()
+
+        # Keep monthly audit_logs partitions created ahead of time
+        start_partition_maintenance()
+
+        # Flush per-minute metric rollups to Redis and the metrics_rollup table
+        metrics_rollup.start()
+
+        # Serve system settings and CORS origins from memory in this worker
+        await settings_snapshot.start()
+
+        # Write coalesced API key and client secret last_used timestamps in batches
+        api_key_usage.start()
+        client_secret_usage.start()
     except Exception as e:
         logger.error(f"Database initialization failed (app will start degraded): {e}")
 
@@ -1186,6 +1233,15 @@ async def startup_event():
         # Initialize performance cache manager
         await cache_manager.init_redis()
         logger.info("Performance cache manager initialized")
+
+        # Cross-worker cache invalidation (CORS origins, ...)
+        await invalidation_bus.start()
+        logger.info("Invalidation bus started")
+
+        # Cross-node WebSocket fan-out
+        if "websocket" in additional_routers:
+            await additional_routers["websocket"].manager.start()
+            logger.info("WebSocket backplane started")
     except Exception as e:
         logger.error(f"Redis initialization failed (app will start degraded): {e}")
 
@@ -1197,11 +1253,6 @@ async def startup_event():
         await system_monitor.initialize()
         logger.info("Monitoring services initialized successfully")
 
-        # Register health checks
-        health_checker.register_check("database", get_database_health, critical=True)
-        health_checker.register_check("redis", _check_redis_health, critical=True)
-        logger.info("Health checks registered")
-
         # Inject health checker into health router
         health_v1.health_checker = health_checker
 
@@ -1223,17 +1274,23 @@ async def startup_event():
 
 
 async def _check_redis_health():
-    """Redis health check for monitoring"""
+    """Redis health check for monitoring (on the shared connection pool)"""
     try:
-        redis_client = await get_redis_client()
+        from app.core.redis import get_raw_redis
+
+        redis_client = await get_raw_redis()
         await redis_client.ping()
-        await redis_client.close()
         return True
     except Exception as e:
         logger.debug("Redis ping check failed", error=str(e))
         return False
 
 
+# Registered at import so /ready works even if monitoring startup fails
+health_checker.register_check("database", get_database_health, critical=True)
+health_checker.register_check("redis", _check_redis_health, critical=True)
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Janua API...")
@@ -1252,20 +1309,40 @@ async def shutdown_event():
         await webhook_dispatcher.stop()
         logger.info("Webhook dispatcher stopped")
 
+        await stop_partition_maintenance()
+        await metrics_rollup.stop()
+        await settings_snapshot.stop()
+        await api_key_usage.stop()
+        await client_secret_usage.stop()
+
         # Close monitoring services (they have internal cleanup tasks)
         # The monitoring services will automatically stop their background tasks
         logger.info("Monitoring services stopped")
 
+        await invalidation_bus.stop()
+        logger.info("Invalidation bus stopped")
+
+        if "websocket" in additional_routers:
+            await additional_routers["websocket"].manager.stop()
+            logger.info("WebSocket backplane stopped")
+
         # Close cache manager
         await cache_manager.close_redis()
         logger.info("Performance cache manager closed")
 
+        await replica_router.stop()
         await close_database()
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
     logger.info("Janua API shutdown complete")
 
+    # Last: the writer is a daemon thread, so records still queued when the
+    # process exits would be lost
+    from app.logging.structured_logger import close_log_pipeline
+
+    await asyncio.to_thread(close_log_pipeline)
+
 
 def create_app(
     title: str = "Janua API",
@@ -14,14 +14,20 @@ If the key is invalid or revoked: returns 401.
 If the key is rate-limited: returns 429.
 If no API key is present: passes through so JWT auth can handle it.
 
+Keys are resolved through a short-TTL cache (resolve_api_key_identity), so a
+request with a known key does not touch the database. Per-key quotas are
+sliding-window counters in Redis shared by all workers; without Redis each
+worker enforces the quota on its own with a bounded in-memory table.
+
 Must be registered BEFORE DynamicCORSMiddleware in main.py so that
 the injected headers are available to route handlers.
 """
 
 import logging
+import math
 import time
-from collections import defaultdict
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
@@ -30,9 +36,13 @@ from starlette.types import ASGIApp
 
 logger = logging.getLogger(__name__)
 
-# In-memory sliding-window rate limiter keyed by key_id.
-# For production scale, replace with Redis-backed counters.
-_rate_limit_buckets: Dict[str, list] = defaultdict(list)
+QUOTA_WINDOW_SECONDS = 60
+QUOTA_KEY_PREFIX = "janua:apikey:quota:"
+
+# In-memory fallback when Redis is unavailable, keyed by key_id:
+# [window, count in window, count in previous window], least recently used first.
+MAX_LOCAL_BUCKETS = 10000
+_rate_limit_buckets: "OrderedDict[str, list]" = OrderedDict()
 
 # Paths that should never be intercepted by API key auth
 SKIP_PATHS = frozenset({
@@ -85,28 +95,102 @@ def _extract_api_key(request: Request) -> Optional[str]:
     return None
 
 
+def _window_usage(current: int, previous: int, now: float) -> float:
+    """Requests in the last minute, weighting the previous window by its overlap"""
+    elapsed = (now % QUOTA_WINDOW_SECONDS) / QUOTA_WINDOW_SECONDS
+    return previous * (1 - elapsed) + current
+
+
+def _retry_after(current: int, previous: int, limit: int, now: float) -> int:
+    """Seconds until the sliding window admits another request"""
+    remaining_in_window = QUOTA_WINDOW_SECONDS - (now % QUOTA_WINDOW_SECONDS)
+    if current >= limit or not previous:
+        return max(1, math.ceil(remaining_in_window))
+    # The previous window's share decays linearly until usage drops below the limit
+    elapsed_needed = 1 - (limit - current) / previous
+    wait = elapsed_needed * QUOTA_WINDOW_SECONDS - (now % QUOTA_WINDOW_SECONDS)
+    return max(1, math.ceil(min(wait, remaining_in_window)))
+
+
 def _check_rate_limit(key_id: str, limit_per_min: int) -> Tuple[bool, int]:
     """
-    Sliding-window rate limiter (in-memory).
+    Sliding-window rate limiter (in-memory fallback).
+
+    Keeps two counters per key and at most MAX_LOCAL_BUCKETS keys, evicting
+    the least recently used.
 
     Returns:
         (allowed: bool, retry_after_seconds: int)
     """
-    now = time.monotonic()
-    window_start = now - 60.0
+    now = time.time()
+    window = int(now // QUOTA_WINDOW_SECONDS)
+
+    state = _rate_limit_buckets.pop(key_id, None)
+    if state is None or state[0] < window - 1:
+        state = [window, 0, 0]
+    elif state[0] == window - 1:
+        state = [window, 0, state[1]]
+    _rate_limit_buckets[key_id] = state
+    while len(_rate_limit_buckets) > MAX_LOCAL_BUCKETS:
+        _rate_limit_buckets.popitem(last=False)
+
+    if _window_usage(state[1], state[2], now) >= limit_per_min:
+        return False, _retry_after(state[1], state[2], limit_per_min, now)
+
+    state[1] += 1
+    return True, 0
 
-    # Prune old entries
-    bucket = _rate_limit_buckets[key_id]
-    _rate_limit_buckets[key_id] = [t for t in bucket if t > window_start]
-    bucket = _rate_limit_buckets[key_id]
 
-    if len(bucket) >= limit_per_min:
-        # Find when the oldest entry in the window will expire
-        retry_after = int(bucket[0] - window_start) + 1
-        return False, max(retry_after, 1)
+def _local_remaining(key_id: str, limit_per_min: int) -> int:
+    state = _rate_limit_buckets.get(key_id)
+    if state is None:
+        return limit_per_min
+    return max(0, int(limit_per_min - _window_usage(state[1], state[2], time.time())))
 
-    bucket.append(now)
-    return True, 0
+
+async def _get_redis():
+    """Raw Redis client, or None while it is down (reconnects are throttled in core.redis)"""
+    try:
+        from app.core.redis import get_raw_redis
+
+        return await get_raw_redis()
+    except Exception:
+        return None
+
+
+async def _check_quota(key_id: str, limit_per_min: int) -> Tuple[bool, int, int]:
+    """
+    Per-key quota shared by all workers.
+
+    One MULTI/EXEC round trip counts the request in the current window and
+    reads the previous one; rejected requests are uncounted again. Falls back
+    to the in-memory limiter when Redis is unavailable.
+
+    Returns:
+        (allowed, remaining, retry_after_seconds)
+    """
+    client = await _get_redis()
+    if client is not None:
+        now = time.time()
+        window = int(now // QUOTA_WINDOW_SECONDS)
+        key = f"{QUOTA_KEY_PREFIX}{key_id}:{window}"
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(key)
+            pipe.expire(key, QUOTA_WINDOW_SECONDS * 2)
+            pipe.get(f"{QUOTA_KEY_PREFIX}{key_id}:{window - 1}")
+            current, _, previous = await pipe.execute()
+            previous = int(previous or 0)
+            usage = _window_usage(int(current), previous, now)
+            if usage > limit_per_min:
+                await client.decr(key)
+                return False, 0, _retry_after(int(current) - 1, previous, limit_per_min, now)
+            return True, max(0, int(limit_per_min - usage)), 0
+        except Exception as e:
+            logger.warning(f"API key quota check in Redis failed, using local limiter: {e}")
+
+    allowed, retry_after = _check_rate_limit(key_id, limit_per_min)
+    return allowed, _local_remaining(key_id, limit_per_min), retry_after
 
 
 class ApiKeyAuthMiddleware(BaseHTTPMiddleware):
@@ -133,19 +217,11 @@ class ApiKeyAuthMiddleware(BaseHTTPMiddleware):
             # No API key present -- fall through to JWT auth
             return await call_next(request)
 
-        # Resolve the key against the database
+        # Resolve the key (cached; the database is only hit on a miss)
         try:
-            from app.database import get_db
+            from app.services.api_key_service import api_key_usage, resolve_api_key_identity
 
-            async for db in get_db():
-                try:
-                    from app.services.api_key_service import ApiKeyService
-
-                    service = ApiKeyService(db)
-                    api_key = await service.verify_key_for_service(plain_key)
-                finally:
-                    # Ensure session is returned to pool
-                    await db.close()
+            api_key = await resolve_api_key_identity(plain_key)
         except Exception:
             logger.exception("Failed to verify API key")
             return JSONResponse(
@@ -159,9 +235,11 @@ class ApiKeyAuthMiddleware(BaseHTTPMiddleware):
                 content={"detail": "Invalid or revoked API key"},
             )
 
+        api_key_usage.touch(api_key.id)
+
         # Enforce per-key rate limit
         rate_limit = api_key.rate_limit_per_min or 60
-        allowed, retry_after = _check_rate_limit(str(api_key.id), rate_limit)
+        allowed, remaining, retry_after = await _check_quota(api_key.id, rate_limit)
         if not allowed:
             return JSONResponse(
                 status_code=429,
@@ -187,7 +265,6 @@ class ApiKeyAuthMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
 
         # Add rate limit info to response headers
-        remaining = max(0, rate_limit - len(_rate_limit_buckets.get(str(api_key.id), [])))
         response.headers["X-RateLimit-Limit"] = str(rate_limit)
         response.headers["X-RateLimit-Remaining"] = str(remaining)
 
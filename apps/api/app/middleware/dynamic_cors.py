@@ -6,7 +6,7 @@ Supports multi-tenant origins (system-level + organization-level).
 
 import logging
 import time
-from typing import List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 from urllib.parse import urlparse
 
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -15,13 +15,74 @@ from starlette.responses import Response
 from starlette.types import ASGIApp
 
 from app.config import settings
+from app.core.invalidation import invalidation_bus
 
 logger = logging.getLogger(__name__)
 
 # Module-level cache for CORS origins
 _cors_origins_cache: Optional[Set[str]] = None
+_cors_matcher: Optional["OriginMatcher"] = None
+_cors_matcher_source: Optional[Set[str]] = None  # origins set the matcher was compiled from
 _cors_cache_timestamp: float = 0
-CORS_CACHE_TTL_SECONDS = 60  # Refresh every minute
+CORS_CACHE_TTL_SECONDS = 60  # Refresh every minute when invalidation events are unavailable
+CORS_CACHE_MAX_AGE_SECONDS = 3600  # Safety refresh while the invalidation bus is listening
+
+# Invalidation bus topic published by the admin CORS endpoints and OAuth client CRUD
+CORS_INVALIDATION_TOPIC = "cors"
+
+# Trie key marking the end of a ``*.domain`` suffix ("*" is never a hostname label)
+_SUFFIX_END = "*"
+
+
+class OriginMatcher:
+    """
+    Precompiled CORS allow-list.
+
+    Exact origins live in a hash set. ``*.domain`` entries are stored in a trie
+    keyed by reversed host labels, so a lookup walks at most one node per label
+    of the request origin instead of scanning every wildcard entry. A wildcard
+    matches the bare domain and any subdomain on a label boundary, for any
+    scheme.
+    """
+
+    __slots__ = ("_exact", "_suffixes", "size")
+
+    def __init__(self, origins: Iterable[str]):
+        self._exact: Set[str] = set()
+        self._suffixes: Dict[str, dict] = {}
+        self.size = 0
+
+        for origin in origins:
+            if not origin:
+                continue
+            self.size += 1
+            if origin.startswith("*."):
+                node = self._suffixes
+                for label in reversed(origin[2:].lower().split(".")):
+                    node = node.setdefault(label, {})
+                node[_SUFFIX_END] = True
+            else:
+                self._exact.add(origin)
+
+    def matches(self, origin: str) -> bool:
+        """Check whether an Origin header value is allowed"""
+        if origin in self._exact:
+            return True
+        if not self._suffixes:
+            return False
+
+        _, sep, host = origin.partition("://")
+        if not sep:
+            host = origin
+
+        node = self._suffixes
+        for label in reversed(host.lower().split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _SUFFIX_END in node:
+                return True
+        return False
 
 
 class DynamicCORSMiddleware(BaseHTTPMiddleware):
@@ -34,9 +95,12 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
     3. Database allowed_cors_origins table (if enabled)
     4. OAuth client redirect_uris (origins auto-derived from active clients)
 
-    Caches origins with TTL for performance.
+    Origins are compiled into an OriginMatcher that is rebuilt only when the
+    origin set changes (invalidation bus event, or TTL when Redis is down).
     """
 
+    MAX_PRECOMPUTED_ORIGINS = 4096
+
     def __init__(
         self,
         app: ASGIApp,
@@ -65,10 +129,32 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
 
         # Initialize with config origins
         self._static_origins = set(settings.cors_origins_list)
+
+        # Origin-independent headers are joined once; per-origin header sets
+        # are memoized until the matcher is rebuilt.
+        self._static_cors_headers = self._build_static_cors_headers()
+        self._headers_by_origin: Dict[str, Dict[str, str]] = {}
+        self._headers_matcher: Optional[OriginMatcher] = None
         logger.info(
             f"DynamicCORSMiddleware initialized with {len(self._static_origins)} config origins"
         )
 
+    def _build_static_cors_headers(self) -> Dict[str, str]:
+        headers = {"Access-Control-Allow-Credentials": str(self.allow_credentials).lower()}
+
+        if self.allow_methods:
+            headers["Access-Control-Allow-Methods"] = ", ".join(self.allow_methods)
+
+        if self.allow_headers:
+            headers["Access-Control-Allow-Headers"] = ", ".join(self.allow_headers)
+
+        if self.expose_headers:
+            headers["Access-Control-Expose-Headers"] = ", ".join(self.expose_headers)
+
+        headers["Access-Control-Max-Age"] = str(self.max_age)
+        headers["Vary"] = "Origin"
+        return headers
+
     async def dispatch(self, request: Request, call_next) -> Response:
         """Handle CORS preflight and actual requests"""
         origin = request.headers.get("origin")
@@ -77,18 +163,17 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
         if not origin:
             return await call_next(request)
 
-        # Get allowed origins (from cache or fresh)
-        allowed_origins = await self._get_allowed_origins()
+        # Get compiled matcher (from cache or fresh)
+        matcher = await self._get_origin_matcher()
 
         # Check if origin is allowed
-        origin_allowed = self._is_origin_allowed(origin, allowed_origins)
+        origin_allowed = matcher.matches(origin)
 
         # Handle preflight (OPTIONS) request
         if request.method == "OPTIONS":
-            response = Response(status_code=204)
             if origin_allowed:
-                self._add_cors_headers(response, origin)
-            return response
+                return Response(status_code=204, headers=self._get_cors_headers(origin))
+            return Response(status_code=204, headers={"Vary": "Origin"})
 
         # Handle actual request
         response = await call_next(request)
@@ -98,55 +183,51 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
 
         return response
 
-    def _is_origin_allowed(self, origin: str, allowed_origins: Set[str]) -> bool:
-        """Check if origin is in allowed list"""
-        # Exact match
-        if origin in allowed_origins:
-            return True
+    def _get_cors_headers(self, origin: str) -> Dict[str, str]:
+        """Return the precomputed CORS header set for an allowed origin"""
+        if self._headers_matcher is not _cors_matcher:
+            self._headers_by_origin.clear()
+            self._headers_matcher = _cors_matcher
 
-        # Wildcard match (e.g., *.janua.dev)
-        for allowed in allowed_origins:
-            if allowed.startswith("*."):
-                domain = allowed[2:]  # Remove "*."
-                # Check if origin ends with the domain (e.g., sub.janua.dev matches *.janua.dev)
-                origin_domain = origin.replace("https://", "").replace("http://", "")
-                if origin_domain.endswith(domain) or origin_domain == domain.lstrip("."):
-                    return True
-
-        return False
+        headers = self._headers_by_origin.get(origin)
+        if headers is None:
+            if len(self._headers_by_origin) >= self.MAX_PRECOMPUTED_ORIGINS:
+                self._headers_by_origin.clear()
+            headers = {"Access-Control-Allow-Origin": origin, **self._static_cors_headers}
+            self._headers_by_origin[origin] = headers
+        return headers
 
     def _add_cors_headers(self, response: Response, origin: str):
         """Add CORS headers to response"""
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = str(self.allow_credentials).lower()
-
-        if self.allow_methods:
-            response.headers["Access-Control-Allow-Methods"] = ", ".join(self.allow_methods)
-
-        if self.allow_headers:
-            response.headers["Access-Control-Allow-Headers"] = ", ".join(self.allow_headers)
-
-        if self.expose_headers:
-            response.headers["Access-Control-Expose-Headers"] = ", ".join(self.expose_headers)
-
-        response.headers["Access-Control-Max-Age"] = str(self.max_age)
+        response.headers.update(
+            {k: v for k, v in self._get_cors_headers(origin).items() if k != "Vary"}
+        )
 
         # Add Vary header for proper caching
         vary = response.headers.get("Vary", "")
         if "Origin" not in vary:
             response.headers["Vary"] = f"{vary}, Origin".strip(", ") if vary else "Origin"
 
+    async def _get_origin_matcher(self) -> OriginMatcher:
+        """Get the compiled origin matcher, rebuilding it only when origins changed"""
+        global _cors_matcher, _cors_matcher_source
+
+        origins = await self._get_allowed_origins()
+        if _cors_matcher is None or _cors_matcher_source is not origins:
+            _cors_matcher = OriginMatcher(origins)
+            _cors_matcher_source = origins
+        return _cors_matcher
+
     async def _get_allowed_origins(self) -> Set[str]:
         """Get allowed origins from cache or fresh load"""
         global _cors_origins_cache, _cors_cache_timestamp
 
         current_time = time.time()
 
-        # Check cache validity
-        if (
-            _cors_origins_cache is not None
-            and (current_time - _cors_cache_timestamp) < CORS_CACHE_TTL_SECONDS
-        ):
+        # Check cache validity. While the invalidation bus is listening the
+        # cache is dropped on change, so the TTL is only a safety net.
+        ttl = CORS_CACHE_MAX_AGE_SECONDS if invalidation_bus.listening else CORS_CACHE_TTL_SECONDS
+        if _cors_origins_cache is not None and (current_time - _cors_cache_timestamp) < ttl:
             return _cors_origins_cache
 
         # Reload origins
@@ -247,15 +328,21 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
 
 def invalidate_cors_cache():
     """
-    Invalidate the CORS origins cache.
-    Call this when origins are added/removed via API.
+    Invalidate this worker's CORS origins cache.
+    Use app.services.system_settings_service.invalidate_cors_cache to also
+    notify other workers.
     """
-    global _cors_origins_cache, _cors_cache_timestamp
+    global _cors_origins_cache, _cors_cache_timestamp, _cors_matcher, _cors_matcher_source
     _cors_origins_cache = None
     _cors_cache_timestamp = 0
+    _cors_matcher = None
+    _cors_matcher_source = None
     logger.info("CORS origins cache invalidated")
 
 
+invalidation_bus.subscribe(CORS_INVALIDATION_TOPIC, lambda _payload: invalidate_cors_cache())
+
+
 def get_cors_cache_status() -> dict:
     """Get current CORS cache status for debugging"""
     global _cors_origins_cache, _cors_cache_timestamp
@@ -269,6 +356,7 @@ def get_cors_cache_status() -> dict:
         "cache_age_seconds": age,
         "cache_ttl_seconds": CORS_CACHE_TTL_SECONDS,
         "cache_valid": age is not None and age < CORS_CACHE_TTL_SECONDS,
+        "event_driven": invalidation_bus.listening,
     }
 
 
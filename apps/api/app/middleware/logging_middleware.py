@@ -22,7 +22,12 @@ logger = structlog.get_logger()
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for comprehensive request/response logging"""
+    """FastAPI middleware for comprehensive request/response logging
+
+    One completion record is emitted per request (the start record is opt-in
+    via ``log_request_start``); records go through the non-blocking log
+    pipeline, which applies per-route sampling using ``http_path``.
+    """
 
     def __init__(
         self,
@@ -32,6 +37,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         log_response_body: bool = False,
         max_body_size: int = 1000,
         sensitive_headers: Optional[list] = None,
+        log_request_start: bool = False,
     ):
         super().__init__(app)
         self.exclude_paths = exclude_paths or [
@@ -43,6 +49,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         ]
         self.log_request_body = log_request_body
         self.log_response_body = log_response_body
+        self.log_request_start = log_request_start
         self.max_body_size = max_body_size
         self.sensitive_headers = sensitive_headers or [
             "authorization",
@@ -78,16 +85,17 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         with request_logging_context(
             request_id=correlation_id, user_id=user_id, trace_id=request.headers.get("x-trace-id")
         ):
-            # Log request start
-            await self._log_request_start(
-                request=request,
-                correlation_id=correlation_id,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                request_size=request_size,
-                user_id=user_id,
-                session_id=session_id,
-            )
+            # Log request start (the completion record carries the same fields)
+            if self.log_request_start or self.log_request_body:
+                await self._log_request_start(
+                    request=request,
+                    correlation_id=correlation_id,
+                    client_ip=client_ip,
+                    user_agent=user_agent,
+                    request_size=request_size,
+                    user_id=user_id,
+                    session_id=session_id,
+                )
 
             response = None
             status_code = 500
@@ -15,6 +15,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.config import settings
+from app.core.client_ip import client_ip_from_request
 
 logger = structlog.get_logger()
 
@@ -252,28 +253,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         direct connection comes from a trusted proxy. This prevents IP spoofing
         for rate limit bypass.
         """
-        # Get the direct connection IP first
-        direct_ip = request.client.host if request.client else "unknown"
-
-        # Parse trusted proxies from config
-        trusted_proxies = set(
-            ip.strip() for ip in settings.TRUSTED_PROXIES.split(",") if ip.strip()
-        )
-
-        # Only trust forwarded headers if direct connection is from trusted proxy
-        if direct_ip in trusted_proxies:
-            # Check for forwarded IP (behind proxy/load balancer)
-            forwarded = request.headers.get("X-Forwarded-For")
-            if forwarded:
-                # Take the first (client) IP from the chain
-                return forwarded.split(",")[0].strip()
-
-            real_ip = request.headers.get("X-Real-IP")
-            if real_ip:
-                return real_ip
-
-        # Direct connection or untrusted proxy - use direct IP
-        return direct_ip
+        return client_ip_from_request(request, settings.TRUSTED_PROXIES)
 
     def _get_tenant_id(self, request: Request) -> Optional[str]:
         """Extract tenant ID from request"""
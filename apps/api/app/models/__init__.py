@@ -686,16 +686,40 @@ class AuditLog(Base):
     """Audit log model matching the existing production database schema."""
 
     __tablename__ = "audit_logs"
+    # On PostgreSQL the table is range-partitioned by month on created_at
+    # (migration 014), so queries should always bound created_at.
+    __table_args__ = (
+        sa.Index("ix_audit_logs_org_created_at", "organization_id", sa.text("created_at DESC")),
+        sa.Index("ix_audit_logs_user_created_at", "user_id", sa.text("created_at DESC")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    organization_id = Column(UUID(as_uuid=True))
     action = Column(String(100), nullable=False)  # Matches DB column
     resource_type = Column(String(100))
     resource_id = Column(UUID(as_uuid=True))
     details = Column(JSONB, default={})
     ip_address = Column(InetAddress)  # Cross-database IP address type
     user_agent = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class MetricsRollup(Base):
+    """Per-minute counter for a metric, so dashboards sum buckets instead of scanning events"""
+
+    __tablename__ = "metrics_rollup"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "metric", "scope", "bucket", name="uq_metrics_rollup_metric_scope_bucket"
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bucket = Column(DateTime, nullable=False)  # Start of the minute (UTC)
+    metric = Column(String(100), nullable=False)  # e.g. "http.requests", "http.latency.le_250"
+    scope = Column(String(64), nullable=False, default="global")  # "global" or an organization id
+    count = Column(sa.BigInteger, nullable=False, default=0)
 
 
 # Webhook models
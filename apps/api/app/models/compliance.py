@@ -6,7 +6,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import relationship
 
@@ -517,6 +517,28 @@ class ComplianceControl(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+
+class RetentionCheckpoint(Base):
+    """Progress of a batched retention purge, so interrupted runs resume"""
+
+    __tablename__ = "retention_checkpoints"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_key = Column(String(255), nullable=False, unique=True)  # e.g. "<policy_id>:audit_logs"
+    table_name = Column(String(100), nullable=False)
+
+    # Run state: the cutoff is fixed for the whole run; last_id is the keyset cursor
+    cutoff = Column(DateTime, nullable=False)
+    last_id = Column(String(64))
+    rows_deleted = Column(BigInteger, default=0, nullable=False)
+    batches = Column(Integer, default=0, nullable=False)
+    partitions_dropped = Column(JSONB, default=[])
+
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime)  # NULL while a run is in progress
+
+
 # Add relationships
 ConsentRecord.user = relationship(
     "User", back_populates="consent_records", foreign_keys=[ConsentRecord.user_id]
@@ -19,6 +19,7 @@ import structlog
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
 
 from app.config import settings
+from app.core.redis import MASTER, REPLICA, create_redis_client
 
 # Optional OpenTelemetry imports - gracefully handle missing dependencies
 HAS_OPENTELEMETRY = False
@@ -124,6 +125,7 @@ class APMCollector:
     def __init__(self):
         self.registry = CollectorRegistry()
         self.redis_client: Optional[aioredis.Redis] = None
+        self.read_client: Optional[aioredis.Redis] = None  # Replica for summaries, if any
         self.active_traces: Dict[str, TraceSpan] = {}
         self.active_profiles: Dict[str, PerformanceProfile] = {}
 
@@ -259,12 +261,10 @@ class APMCollector:
     async def initialize_redis(self):
         """Initialize Redis connection for APM data storage"""
         try:
-            self.redis_client = aioredis.from_url(
-                f"redis://{getattr(settings, 'REDIS_HOST', 'localhost')}:{getattr(settings, 'REDIS_PORT', 6379)}/2",
-                encoding="utf-8",
-                decode_responses=True,
-            )
+            options = {"db": 2, "encoding": "utf-8", "decode_responses": True}
+            self.redis_client = create_redis_client(MASTER, **options)
             await self.redis_client.ping()
+            self.read_client = create_redis_client(REPLICA, **options)
             logger.info("APM Redis connection initialized")
         except Exception as e:
             logger.error("Failed to initialize APM Redis", error=str(e))
@@ -526,17 +526,16 @@ class APMCollector:
 
         try:
             cutoff_time = time.time() - (hours * 3600)
+            reader = self.read_client or self.redis_client
 
             if operation:
                 # Get performance data for specific operation
-                profile_ids = await self.redis_client.zrangebyscore(
+                profile_ids = await reader.zrangebyscore(
                     f"apm:performance:{operation}", cutoff_time, "+inf", withscores=True
                 )
             else:
                 # Get all recent profiles
-                profile_ids = await self.redis_client.zrangebyscore(
-                    "apm:profiles", cutoff_time, "+inf"
-                )
+                profile_ids = await reader.zrangebyscore("apm:profiles", cutoff_time, "+inf")
 
             if not profile_ids:
                 return {"message": "No performance data available"}
@@ -548,11 +547,14 @@ class APMCollector:
             db_calls = []
             redis_calls = []
 
+            # One round trip for all profiles
+            pipe = reader.pipeline(transaction=False)
             for profile_id in profile_ids:
-                if isinstance(profile_id, tuple):
+                if isinstance(profile_id, (tuple, list)):
                     profile_id = profile_id[0]
+                pipe.hgetall(f"apm:profile:{profile_id}")
 
-                profile_data = await self.redis_client.hgetall(f"apm:profile:{profile_id}")
+            for profile_data in await pipe.execute():
                 if profile_data:
                     if profile_data.get("duration_ms"):
                         durations.append(float(profile_data["duration_ms"]))
@@ -40,6 +40,12 @@ from ...models import Session as UserSession
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# /admin/stats is polled by the dashboard; serve a short-lived snapshot so
+# repeated loads don't re-aggregate the users and sessions tables.
+_admin_stats_cache: Optional["AdminStatsResponse"] = None
+_admin_stats_cache_timestamp: float = 0
+ADMIN_STATS_CACHE_TTL_SECONDS = 30
+
 
 class AdminStatsResponse(BaseModel):
     """Admin statistics response"""
@@ -190,77 +196,68 @@ async def get_admin_stats(
     """Get admin statistics"""
     check_admin_permission(current_user)
 
-    # User statistics
-    result = await db.execute(select(func.count(User.id)))
-    total_users = result.scalar()
-
-    result = await db.execute(select(func.count(User.id)).where(User.status == UserStatus.ACTIVE))
-    active_users = result.scalar()
-
-    result = await db.execute(
-        select(func.count(User.id)).where(User.status == UserStatus.SUSPENDED)
-    )
-    suspended_users = result.scalar()
-
-    result = await db.execute(select(func.count(User.id)).where(User.status == UserStatus.DELETED))
-    deleted_users = result.scalar()
-
-    # Organization statistics
-    result = await db.execute(select(func.count(Organization.id)))
-    total_organizations = result.scalar()
-
-    # Session statistics
-    result = await db.execute(select(func.count(UserSession.id)))
-    total_sessions = result.scalar()
-
-    result = await db.execute(
-        select(func.count(UserSession.id)).where(
-            UserSession.revoked_at.is_(None), UserSession.expires_at > datetime.utcnow()
-        )
-    )
-    active_sessions = result.scalar()
-
-    # Security statistics - MFA enabled users count
-    result = await db.execute(select(func.count(User.id)).where(User.mfa_enabled.is_(True)))
-    mfa_enabled_users = result.scalar() or 0
-
-    # OAuth accounts - table may not exist yet, so skip if query fails
-    oauth_accounts = 0  # Default if table doesn't exist
-    passkeys_registered = 0  # Default if table doesn't exist
-
-    # We don't query these tables as they may not exist in production yet
-    # When oauth_accounts and passkeys tables are created, enable these queries:
-    # result = await db.execute(select(func.count(OAuthAccount.id)))
-    # oauth_accounts = result.scalar()
-    # result = await db.execute(select(func.count(Passkey.id)))
-    # passkeys_registered = result.scalar()
-
-    # Recent activity
-    last_24h = datetime.utcnow() - timedelta(hours=24)
-
-    result = await db.execute(select(func.count(User.id)).where(User.created_at >= last_24h))
-    users_last_24h = result.scalar()
-
-    result = await db.execute(
-        select(func.count(UserSession.id)).where(UserSession.created_at >= last_24h)
-    )
-    sessions_last_24h = result.scalar()
-
-    return AdminStatsResponse(
-        total_users=total_users,
-        active_users=active_users,
-        suspended_users=suspended_users,
-        deleted_users=deleted_users,
-        total_organizations=total_organizations,
-        total_sessions=total_sessions,
-        active_sessions=active_sessions,
-        mfa_enabled_users=mfa_enabled_users,
+    global _admin_stats_cache, _admin_stats_cache_timestamp
+
+    current_time = time.time()
+    if (
+        _admin_stats_cache is not None
+        and (current_time - _admin_stats_cache_timestamp) < ADMIN_STATS_CACHE_TTL_SECONDS
+    ):
+        return _admin_stats_cache
+
+    now = datetime.utcnow()
+    last_24h = now - timedelta(hours=24)
+
+    # One FILTER (WHERE ...) aggregate per table, cross-joined into a single
+    # row so the whole dashboard costs one round trip instead of ten.
+    user_stats = select(
+        func.count(User.id).label("total_users"),
+        func.count(User.id).filter(User.status == UserStatus.ACTIVE).label("active_users"),
+        func.count(User.id).filter(User.status == UserStatus.SUSPENDED).label("suspended_users"),
+        func.count(User.id).filter(User.status == UserStatus.DELETED).label("deleted_users"),
+        func.count(User.id).filter(User.mfa_enabled.is_(True)).label("mfa_enabled_users"),
+        func.count(User.id).filter(User.created_at >= last_24h).label("users_last_24h"),
+    ).subquery()
+
+    session_stats = select(
+        func.count(UserSession.id).label("total_sessions"),
+        func.count(UserSession.id)
+        .filter(UserSession.revoked_at.is_(None), UserSession.expires_at > now)
+        .label("active_sessions"),
+        func.count(UserSession.id)
+        .filter(UserSession.created_at >= last_24h)
+        .label("sessions_last_24h"),
+    ).subquery()
+
+    org_stats = select(func.count(Organization.id).label("total_organizations")).subquery()
+
+    result = await db.execute(select(user_stats, session_stats, org_stats))
+    row = result.one()
+
+    # OAuth accounts and passkeys are not counted here; enable them alongside
+    # the aggregates above once the dashboard surfaces them.
+    oauth_accounts = 0
+    passkeys_registered = 0
+
+    stats = AdminStatsResponse(
+        total_users=row.total_users or 0,
+        active_users=row.active_users or 0,
+        suspended_users=row.suspended_users or 0,
+        deleted_users=row.deleted_users or 0,
+        total_organizations=row.total_organizations or 0,
+        total_sessions=row.total_sessions or 0,
+        active_sessions=row.active_sessions or 0,
+        mfa_enabled_users=row.mfa_enabled_users or 0,
         oauth_accounts=oauth_accounts,
         passkeys_registered=passkeys_registered,
-        users_last_24h=users_last_24h,
-        sessions_last_24h=sessions_last_24h,
+        users_last_24h=row.users_last_24h or 0,
+        sessions_last_24h=row.sessions_last_24h or 0,
     )
 
+    _admin_stats_cache = stats
+    _admin_stats_cache_timestamp = current_time
+    return stats
+
 
 @router.get("/health", response_model=SystemHealthResponse)
 async def get_system_health(
@@ -341,8 +338,25 @@ async def list_all_users(
     """List all users (admin only)"""
     check_admin_permission(current_user)
 
+    # Per-user counts are correlated subqueries so the page comes back in a
+    # single statement rather than extra round trips per user.
+    orgs_count = (
+        select(func.count(organization_members.c.organization_id))
+        .where(organization_members.c.user_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+        .label("organizations_count")
+    )
+    sessions_count = (
+        select(func.count(UserSession.id))
+        .where(UserSession.user_id == User.id, UserSession.revoked_at.is_(None))
+        .correlate(User)
+        .scalar_subquery()
+        .label("sessions_count")
+    )
+
     # Build query
-    stmt = select(User)
+    stmt = select(User, orgs_count, sessions_count)
 
     # Apply filters
     if search:
@@ -369,46 +383,42 @@ async def list_all_users(
     stmt = stmt.offset(offset).limit(per_page)
 
     result_set = await db.execute(stmt)
-    users = result_set.scalars().all()
-
-    # Build response
-    result = []
-    for user in users:
-        # Get additional counts
-        orgs_result = await db.execute(
-            select(func.count(organization_members.c.organization_id)).where(
-                organization_members.c.user_id == user.id
-            )
-        )
-        orgs_count = orgs_result.scalar()
-
-        sessions_result = await db.execute(
-            select(func.count(UserSession.id)).where(
-                UserSession.user_id == user.id, UserSession.revoked_at.is_(None)
-            )
-        )
-        sessions_count = sessions_result.scalar()
-
-        # Query OAuth accounts - table may not exist, handle gracefully
-        oauth_providers = []
+    rows = result_set.all()
+
+    # OAuth providers for the whole page in one query - table may not exist,
+    # handle gracefully
+    oauth_providers_by_user: dict = {}
+    passkeys_by_user: dict = {}
+    if rows:
+        user_ids = [row.User.id for row in rows]
         try:
             oauth_result = await db.execute(
-                select(OAuthAccount.provider).where(OAuthAccount.user_id == user.id)
+                select(OAuthAccount.user_id, OAuthAccount.provider).where(
+                    OAuthAccount.user_id.in_(user_ids)
+                )
             )
-            oauth_providers = oauth_result.scalars().all()
+            for user_id, provider in oauth_result.all():
+                oauth_providers_by_user.setdefault(user_id, []).append(provider)
         except Exception:
             pass  # Table may not exist in production yet
 
-        # Query passkeys - table may not exist, handle gracefully
-        passkeys_count = 0
+        # Passkey counts for the page - table may not exist, counts then stay 0
         try:
             passkeys_result = await db.execute(
-                select(func.count(Passkey.id)).where(Passkey.user_id == user.id)
+                select(Passkey.user_id, func.count(Passkey.id))
+                .where(Passkey.user_id.in_(user_ids))
+                .group_by(Passkey.user_id)
             )
-            passkeys_count = passkeys_result.scalar() or 0
+            passkeys_by_user = dict(passkeys_result.all())
         except Exception:
             pass  # Table may not exist in production yet
 
+    # Build response
+    result = []
+    for row in rows:
+        user = row.User
+        oauth_providers = oauth_providers_by_user.get(user.id, [])
+
         # Coalesce nullable boolean columns (legacy rows may have NULL).
         # See migration 000_init.py: email_verified, is_admin, mfa_enabled are nullable=True.
         # Without this guard, pydantic raises ValidationError -> 500 on the whole list.
@@ -423,12 +433,12 @@ async def list_all_users(
                 status=user.status.value if user.status else UserStatus.ACTIVE.value,
                 mfa_enabled=bool(user.mfa_enabled),
                 is_admin=bool(user.is_admin),
-                organizations_count=orgs_count or 0,
-                sessions_count=sessions_count or 0,
+                organizations_count=row.organizations_count or 0,
+                sessions_count=row.sessions_count or 0,
                 oauth_providers=[
                     p.value if hasattr(p, "value") else str(p) for p in oauth_providers
                 ],
-                passkeys_count=passkeys_count or 0,
+                passkeys_count=passkeys_by_user.get(user.id, 0),
                 created_at=user.created_at,
                 updated_at=user.updated_at or user.created_at,
                 last_sign_in_at=user.last_sign_in_at,
@@ -743,8 +753,18 @@ async def list_all_organizations(
     """List all organizations (admin only)"""
     check_admin_permission(current_user)
 
-    # Build query
-    stmt = select(Organization).join(User, Organization.owner_id == User.id)
+    members_count = (
+        select(func.count(organization_members.c.user_id))
+        .where(organization_members.c.organization_id == Organization.id)
+        .correlate(Organization)
+        .scalar_subquery()
+        .label("members_count")
+    )
+
+    # Build query - owner email and member count ride along with each org row
+    stmt = select(Organization, User.email.label("owner_email"), members_count).join(
+        User, Organization.owner_id == User.id
+    )
 
     # Apply filters
     if search:
@@ -764,20 +784,11 @@ async def list_all_organizations(
     stmt = stmt.offset(offset).limit(per_page)
 
     result_set = await db.execute(stmt)
-    organizations = result_set.scalars().all()
 
     # Build response
     result = []
-    for org in organizations:
-        owner_result = await db.execute(select(User).where(User.id == org.owner_id))
-        owner = owner_result.scalar_one_or_none()
-
-        members_result = await db.execute(
-            select(func.count(organization_members.c.user_id)).where(
-                organization_members.c.organization_id == org.id
-            )
-        )
-        members_count = members_result.scalar()
+    for row in result_set.all():
+        org = row.Organization
 
         # Coalesce nullable columns (legacy rows may have NULL billing_plan/owner_id/updated_at).
         # See migration 000_init.py: owner_id and billing_plan are nullable=True.
@@ -787,10 +798,10 @@ async def list_all_organizations(
                 name=org.name,
                 slug=org.slug,
                 owner_id=str(org.owner_id) if org.owner_id else "",
-                owner_email=owner.email if owner else "unknown",
+                owner_email=row.owner_email or "unknown",
                 billing_plan=org.billing_plan or "free",
                 billing_email=org.billing_email,
-                members_count=members_count or 0,
+                members_count=row.members_count or 0,
                 created_at=org.created_at,
                 updated_at=org.updated_at or org.created_at,
             )
@@ -8,13 +8,16 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import and_, delete, desc, func, select
+from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user, require_admin
 from app.models import AuditLog
+from app.services.audit_log_partitions import apply_window, query_window
 from app.services.audit_logger import AuditAction, AuditLogger
+from app.services.retention_purger import RetentionPurger
 
 router = APIRouter(prefix="/v1/audit-logs", tags=["audit-logs"])
 
@@ -111,17 +114,15 @@ async def list_audit_logs(
     if ip_address:
         stmt = stmt.where(AuditLog.ip_address == ip_address)
 
-    # Time range filter - use created_at (actual DB column)
-    if start_date:
-        stmt = stmt.where(AuditLog.created_at >= start_date)
-
-    if end_date:
-        stmt = stmt.where(AuditLog.created_at <= end_date)
+    # Time range filter - the upper bound prunes partitions created ahead of time,
+    # the lower one applies only when a start date is given
+    cursor_time = datetime.fromisoformat(cursor) if cursor else None
+    window_start, window_end = query_window(start_date, end_date, cursor=cursor_time)
+    stmt = apply_window(stmt, AuditLog.created_at, window_start, window_end)
 
     # Handle cursor-based pagination
-    if cursor:
+    if cursor_time:
         # Cursor is the timestamp of the last item from previous page
-        cursor_time = datetime.fromisoformat(cursor)
         stmt = stmt.where(AuditLog.created_at < cursor_time)
 
     # Get total count (expensive, consider caching)
@@ -179,6 +180,27 @@ async def list_audit_logs(
     )
 
 
+async def _count_events_by_hour(
+    db: Session, start_date: datetime, end_date: datetime
+) -> List[Dict[str, Any]]:
+    """Hourly event counts; grouped in SQL on PostgreSQL, in Python elsewhere."""
+    if db.bind.dialect.name == "postgresql":
+        hour = func.date_trunc("hour", AuditLog.created_at).label("hour")
+        stmt = select(hour, func.count()).group_by(hour).order_by(hour)
+        result = await db.execute(apply_window(stmt, AuditLog.created_at, start_date, end_date))
+        buckets = result.all()
+    else:
+        result = await db.execute(
+            apply_window(select(AuditLog.created_at), AuditLog.created_at, start_date, end_date)
+        )
+        counts: Dict[datetime, int] = {}
+        for (created_at,) in result.all():
+            bucket = created_at.replace(minute=0, second=0, microsecond=0)
+            counts[bucket] = counts.get(bucket, 0) + 1
+        buckets = sorted(counts.items())
+    return [{"hour": bucket.isoformat(), "count": count} for bucket, count in buckets]
+
+
 @router.get("/stats", response_model=AuditLogStatsResponse)
 async def get_audit_stats(
     start_date: Optional[datetime] = Query(None, description="Start of time range"),
@@ -195,31 +217,41 @@ async def get_audit_stats(
     if not start_date:
         start_date = end_date - timedelta(days=30)
 
-    # Build base query - use created_at for time filtering
-    stmt = select(AuditLog).where(
-        and_(AuditLog.created_at >= start_date, AuditLog.created_at <= end_date)
-    )
-
-    result = await db.execute(stmt)
-    logs = result.scalars().all()
-
-    # Calculate statistics
-    total_events = len(logs)
+    # Aggregate in the database over the partitions in range
+    def windowed(stmt):
+        return apply_window(stmt, AuditLog.created_at, start_date, end_date)
+
+    totals = (
+        await db.execute(
+            windowed(
+                select(
+                    func.count(),
+                    func.count(func.distinct(AuditLog.user_id)),
+                    func.count(func.distinct(AuditLog.ip_address)),
+                ).select_from(AuditLog)
+            )
+        )
+    ).one()
+    total_events, unique_users, unique_ips = totals
 
     # Events by action
-    events_by_action = {}
-    for log in logs:
-        events_by_action[log.action] = events_by_action.get(log.action, 0) + 1
+    result = await db.execute(
+        windowed(select(AuditLog.action, func.count()).group_by(AuditLog.action))
+    )
+    events_by_action = dict(result.all())
 
     # Events by user (top 10)
-    events_by_user_dict = {}
-    for log in logs:
-        if log.user_id:
-            user_id_str = str(log.user_id)
-            events_by_user_dict[user_id_str] = events_by_user_dict.get(user_id_str, 0) + 1
-
-    # OPTIMIZED: Bulk fetch user emails for top 10 users
-    top_10_users = sorted(events_by_user_dict.items(), key=lambda x: x[1], reverse=True)[:10]
+    user_count = func.count().label("count")
+    result = await db.execute(
+        windowed(
+            select(AuditLog.user_id, user_count)
+            .where(AuditLog.user_id.isnot(None))
+            .group_by(AuditLog.user_id)
+            .order_by(desc(user_count))
+            .limit(10)
+        )
+    )
+    top_10_users = [(str(user_id), count) for user_id, count in result.all()]
     top_user_ids = [user_id for user_id, _ in top_10_users]
 
     user_email_map = {}
@@ -237,27 +269,18 @@ async def get_audit_stats(
         )
 
     # Events by resource type
-    events_by_resource_type = {}
-    for log in logs:
-        if log.resource_type:
-            events_by_resource_type[log.resource_type] = (
-                events_by_resource_type.get(log.resource_type, 0) + 1
-            )
+    result = await db.execute(
+        windowed(
+            select(AuditLog.resource_type, func.count())
+            .where(AuditLog.resource_type.isnot(None))
+            .group_by(AuditLog.resource_type)
+        )
+    )
+    events_by_resource_type = dict(result.all())
 
     # Events by hour (last 24 hours) - use created_at
-    events_by_hour = []
-    hour_counts = {}
-    for log in logs:
-        if log.created_at >= datetime.utcnow() - timedelta(hours=24):
-            hour = log.created_at.replace(minute=0, second=0, microsecond=0)
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-
-    for hour in sorted(hour_counts.keys()):
-        events_by_hour.append({"hour": hour.isoformat(), "count": hour_counts[hour]})
-
-    # Unique users and IPs
-    unique_users = len(set(str(log.user_id) for log in logs if log.user_id))
-    unique_ips = len(set(str(log.ip_address) for log in logs if log.ip_address))
+    last_day_start = max(start_date, datetime.utcnow() - timedelta(hours=24))
+    events_by_hour = await _count_events_by_hour(db, last_day_start, end_date)
 
     return AuditLogStatsResponse(
         total_events=total_events,
@@ -329,12 +352,10 @@ async def export_audit_logs(
     # Build query
     stmt = select(AuditLog)
 
-    # Apply filters - use created_at for time filtering
-    if export_request.start_date:
-        stmt = stmt.where(AuditLog.created_at >= export_request.start_date)
-
-    if export_request.end_date:
-        stmt = stmt.where(AuditLog.created_at <= export_request.end_date)
+    # Apply filters - an export without a start date covers all history; the
+    # upper bound still prunes the partitions created ahead of time
+    window_end = export_request.end_date or datetime.utcnow()
+    stmt = apply_window(stmt, AuditLog.created_at, export_request.start_date, window_end)
 
     if export_request.actions:
         stmt = stmt.where(AuditLog.action.in_(export_request.actions))
@@ -461,19 +482,21 @@ async def cleanup_old_audit_logs(
 ):
     """
     Delete old audit logs for compliance (admin only).
+
+    Rows are purged in throttled primary-key batches with a checkpoint. One
+    request runs at most ``RETENTION_REQUEST_MAX_BATCHES`` batches; while
+    ``completed`` is false, calling again resumes where it stopped.
     """
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-    # Count logs to be deleted - use created_at
-    count_result = await db.execute(
-        select(func.count()).select_from(AuditLog).where(AuditLog.created_at < cutoff_date)
+    purge = await RetentionPurger().purge(
+        AuditLog,
+        AuditLog.created_at,
+        cutoff_date,
+        job_key=f"audit_logs:cleanup:{days}d",
+        max_batches=settings.RETENTION_REQUEST_MAX_BATCHES,
     )
-    count = count_result.scalar()
-
-    # Delete logs
-    await db.execute(delete(AuditLog).where(AuditLog.created_at < cutoff_date))
-
-    await db.commit()
+    count = purge.rows_deleted
 
     # Log cleanup action
     audit_logger = AuditLogger(db)
@@ -484,15 +507,19 @@ async def cleanup_old_audit_logs(
         resource_type="audit_logs",
         details={
             "deleted_count": count,
-            "cutoff_date": cutoff_date.isoformat(),
+            "cutoff_date": purge.cutoff.isoformat(),
             "retention_days": days,
+            "partitions_dropped": purge.partitions_dropped,
         },
     )
 
     return {
         "message": f"Deleted {count} audit log entries older than {days} days",
         "deleted_count": count,
-        "cutoff_date": cutoff_date.isoformat(),
+        "cutoff_date": purge.cutoff.isoformat(),
+        "partitions_dropped": purge.partitions_dropped,
+        "rows_per_second": purge.rows_per_second,
+        "completed": purge.completed,
     }
 
 
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional
 from urllib.parse import urlencode, urlparse
 
+import structlog
 from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
@@ -16,24 +17,25 @@ from slowapi.util import get_remote_address
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-import structlog
-
 from app.config import settings
+from app.core.client_ip import client_ip_from_request
 from app.core.locale import locale_from_request
 from app.core.redis import ResilientRedisClient, get_redis
 from app.core.url_security import validate_redirect_url
 from app.database import AsyncSessionLocal, get_db
 from app.dependencies import get_current_user
+from app.models.system_settings import SettingKeys
 from app.services.account_lockout_service import AccountLockoutService
-from app.services.auth_service import AuthService
 from app.services.audit_logger import AuditEventType, AuditLogger
+from app.services.auth_service import AuthService
+from app.services.device_verification_service import DeviceVerificationService
 from app.services.email import EmailService
 from app.services.email_service import (
     send_magic_link_email_task,
     send_password_reset_email_task,
     send_verification_email_task,
 )
-from app.models.system_settings import SettingKeys
+from app.services.login_feature_store import login_feature_store
 from app.services.system_settings_service import SystemSettingsService
 from app.services.webhooks import WebhookEventType, trigger_user_webhook
 
@@ -170,6 +172,34 @@ async def log_activity(
     await db.commit()
 
 
+def _request_device_fingerprint(request: Request) -> str:
+    """Fingerprint the requesting device the same way the devices API does."""
+    return DeviceVerificationService.generate_device_fingerprint(
+        request.headers.get("user-agent")
+    )
+
+
+def _request_client_ip(request: Request) -> Optional[str]:
+    """Client IP behind trusted proxies; IP lockouts must not key on the load balancer."""
+    ip_address = client_ip_from_request(request)
+    return None if ip_address == "unknown" else ip_address
+
+
+def record_successful_login(user: User, request: Request):
+    """
+    Mark the device and network as known for risk scoring.
+
+    Only call this once every factor has passed and a session was issued: a
+    password alone (possibly a stolen one) must not make a device look familiar.
+    """
+    login_feature_store.record_login_nowait(
+        user.id,
+        success=True,
+        ip_address=_request_client_ip(request),
+        device_fingerprint=_request_device_fingerprint(request),
+    )
+
+
 # SOC 2 CF-08: Audit event type mapping for auth actions
 _AUDIT_EVENT_MAP = {
     "signup": AuditEventType.AUTH_SIGNUP,
@@ -366,6 +396,18 @@ async def sign_up(
 @limiter.limit("5/minute")  # Rate limiting for signin attempts
 async def sign_in(credentials: SignInRequest, request: Request, db: Session = Depends(get_db)):
     """Authenticate user and get tokens"""
+    # Addresses failing across many accounts are turned away before any lookup
+    blocked_seconds = await AccountLockoutService.ip_blocked_seconds(
+        _request_client_ip(request)
+    )
+    if blocked_seconds:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many failed login attempts. "
+            f"Please try again in {blocked_seconds // 60 + 1} minute(s).",
+            headers={"Retry-After": str(blocked_seconds)},
+        )
+
     # Find user - we need to find the user first to check lockout status
     # Note: We look for any user (not just ACTIVE) to check lockout, then verify status
     if credentials.email:
@@ -397,10 +439,16 @@ async def sign_in(credentials: SignInRequest, request: Request, db: Session = De
         credentials.password, user.password_hash
     ):
         # Record failed attempt
-        ip_address = request.client.host if request.client else None
+        ip_address = _request_client_ip(request)
         is_now_locked, lock_seconds = await AccountLockoutService.record_failed_attempt(
             db, user, ip_address=ip_address
         )
+        login_feature_store.record_login_nowait(
+            user.id,
+            success=False,
+            ip_address=ip_address,
+            device_fingerprint=_request_device_fingerprint(request),
+        )
         if is_now_locked:
             minutes_remaining = (lock_seconds or 0) // 60 + 1
             raise HTTPException(
@@ -456,6 +504,7 @@ async def sign_in(credentials: SignInRequest, request: Request, db: Session = De
     access_token, refresh_token, session = await AuthService.create_session(
         db, user, ip_address=request.client.host, user_agent=request.headers.get("user-agent")
     )
+    record_successful_login(user, request)
 
     # Log activity (best-effort, don't fail login)
     try:
@@ -1061,6 +1110,15 @@ async def login_form(
 """
         return HTMLResponse(content=error_html, status_code=401)
 
+    blocked_seconds = await AccountLockoutService.ip_blocked_seconds(
+        _request_client_ip(request)
+    )
+    if blocked_seconds:
+        return make_error_page(
+            f"Too many failed login attempts. "
+            f"Please try again in {blocked_seconds // 60 + 1} minute(s)."
+        )
+
     # Find user by email (without status filter to check lockout first)
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
@@ -1084,10 +1142,16 @@ async def login_form(
     # Verify password
     if not user.password_hash or not AuthService.verify_password(password, user.password_hash):
         # Record failed attempt
-        ip_address = request.client.host if request.client else None
+        ip_address = _request_client_ip(request)
         is_now_locked, lock_seconds = await AccountLockoutService.record_failed_attempt(
             db, user, ip_address=ip_address
         )
+        login_feature_store.record_login_nowait(
+            user.id,
+            success=False,
+            ip_address=ip_address,
+            device_fingerprint=_request_device_fingerprint(request),
+        )
         if is_now_locked:
             minutes_remaining = (lock_seconds or 0) // 60 + 1
             return make_error_page(
@@ -1103,6 +1167,7 @@ async def login_form(
     access_token, refresh_token, session = await AuthService.create_session(
         db, user, ip_address=request.client.host, user_agent=request.headers.get("user-agent")
     )
+    record_successful_login(user, request)
 
     # SECURITY: Delete the Redis key after successful login (single-use)
     # This prevents replay attacks where a leaked auth_request_id could be reused
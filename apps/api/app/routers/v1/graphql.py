@@ -10,6 +10,7 @@ from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL, GRAPHQL_WS_P
 from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user_optional
+from app.graphql.loaders import GraphQLLoaders
 from app.graphql.schema import schema
 
 router = APIRouter(tags=["graphql"])
@@ -27,6 +28,8 @@ async def get_context(
     """
     context = {
         "db": db,
+        # Fresh per request so batched results are never shared between users
+        "loaders": GraphQLLoaders(db),
         "user": current_user,
         "tenant_id": str(current_user.tenant_id) if current_user else None,
         "request": request,
@@ -5,19 +5,30 @@ Localization and internationalization API endpoints
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.etag import if_none_match_hit
 from app.dependencies import require_admin
 
 from ...database import get_db
 from ...models import User
 from ...models.localization import Locale, Translation, TranslationKey
+from ...services.translation_bundle_service import (
+    get_bundle,
+    invalidate_local_bundles,
+    rebuild_bundles,
+)
 
 logger = logging.getLogger(__name__)
 
+# Unversioned bundle URLs revalidate cheaply via ETag; URLs pinned to a bundle
+# version (?v=<hash>) never change and may be cached forever.
+BUNDLE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+VERSIONED_BUNDLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 router = APIRouter(
     prefix="/localization",
     tags=["Localization"],
@@ -106,31 +117,47 @@ async def create_translation(
 
         await db.commit()
 
+        # Recompile bundles now so reads never build them on the request path.
+        # The translation is already committed, so a failure here must not fail
+        # the request; this worker rebuilds on its next read instead.
+        try:
+            await rebuild_bundles(db)
+        except Exception as e:
+            logger.error(f"Translation saved but rebuilding bundles failed: {e}")
+            invalidate_local_bundles()
+
         return {"message": "Translation saved successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to create translation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/translations/{locale_code}")
-async def get_translations(locale_code: str, db: AsyncSession = Depends(get_db)):
-    """Get all translations for a locale"""
+async def get_translations(
+    locale_code: str,
+    request: Request,
+    v: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get all translations for a locale, merged along its fallback chain"""
     try:
-        query = (
-            select(Translation, TranslationKey)
-            .join(TranslationKey, Translation.translation_key_id == TranslationKey.id)
-            .join(Locale, Translation.locale_id == Locale.id)
-            .where(Locale.code == locale_code)
-        )
-
-        result = await db.execute(query)
-        translations = result.all()
-
-        return {
-            translation_key.key: translation.value for translation, translation_key in translations
-        }
-
+        bundle = await get_bundle(db, locale_code)
     except Exception as e:
         logger.error(f"Failed to get translations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {
+        "ETag": bundle.etag,
+        "Cache-Control": (
+            VERSIONED_BUNDLE_CACHE_CONTROL if v == bundle.version else BUNDLE_CACHE_CONTROL
+        ),
+        "X-Translations-Version": bundle.version,
+    }
+
+    if if_none_match_hit(request.headers.get("if-none-match"), bundle.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=bundle.body, media_type="application/json", headers=headers)
@@ -20,7 +20,13 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import get_db
-from app.routers.v1.auth import get_current_user, SignInResponse, UserResponse, TokenResponse
+from app.routers.v1.auth import (
+    SignInResponse,
+    TokenResponse,
+    UserResponse,
+    get_current_user,
+    record_successful_login,
+)
 from app.services.auth_service import AuthService
 
 from ...models import ActivityLog, User, UserStatus
@@ -599,6 +605,7 @@ async def verify_mfa_challenge(
     access_token, refresh_token, session = await AuthService.create_session(
         db, user, ip_address=request.client.host, user_agent=request.headers.get("user-agent")
     )
+    record_successful_login(user, request)
 
     # Log successful MFA sign-in
     activity = ActivityLog(
@@ -33,6 +33,7 @@ from app.schemas.oauth_client import (
 )
 from app.services.credential_rotation_service import CredentialRotationService
 from app.services.oauth_client_service import OAuthClientService
+from app.services.system_settings_service import invalidate_cors_cache
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +128,7 @@ async def register_oauth_client(
         existing_client.updated_at = datetime.utcnow()
         await db.commit()
         await db.refresh(existing_client)
+        invalidate_cors_cache()
 
         response.status_code = 200
         return _client_detail_response(existing_client)
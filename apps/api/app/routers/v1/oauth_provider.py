@@ -40,12 +40,10 @@ from app.core.url_security import (
     validate_post_logout_redirect_uri,
 )
 from app.dependencies import get_current_user
-from app.models import OAuthClient, Organization, OrganizationMember, User
+from app.models import OAuthClient, Organization, User
 from app.services.consent_service import ConsentService
-from app.services.entitlements_service import (
-    entitlements_to_claim,
-    get_user_entitlements,
-)
+from app.services.credential_rotation_service import CredentialRotationService
+from app.services.entitlements_service import resolve_token_entitlements
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/oauth", tags=["OAuth Provider"])
@@ -199,79 +197,6 @@ async def _validate_csrf_token(csrf_token: str, user_id: str, redis: ResilientRe
     return True
 
 
-# ============================================================================
-# User Entitlements Helper (Galaxy Membership Claims)
-# ============================================================================
-
-
-async def _get_user_entitlements(
-    user: User,
-    db: AsyncSession,
-) -> dict:
-    """
-    Fetch user entitlements for JWT enrichment.
-
-    Returns tier, roles, and subscription status for the Galaxy ecosystem.
-    This enables "one membership, all services" across Enclii, Dhanam, etc.
-
-    Returns:
-        dict with keys: tier, roles, sub_status, is_admin
-    """
-    # Default entitlements (community tier, no special roles)
-    entitlements = {
-        "tier": "community",
-        "roles": [],
-        "sub_status": "inactive",
-        "is_admin": user.is_admin if hasattr(user, "is_admin") else False,
-    }
-
-    try:
-        # Get user's organization memberships
-        result = await db.execute(
-            select(OrganizationMember).where(OrganizationMember.user_id == user.id)
-        )
-        memberships = result.scalars().all()
-
-        if memberships:
-            # Collect all roles across organizations
-            roles = list({m.role for m in memberships if m.role})
-            entitlements["roles"] = roles
-
-            # Get primary organization (first membership or tenant)
-            primary_org_id = memberships[0].organization_id
-            if hasattr(user, "tenant_id") and user.tenant_id:
-                primary_org_id = user.tenant_id
-
-            # Fetch organization for subscription tier
-            org_result = await db.execute(
-                select(Organization).where(Organization.id == primary_org_id)
-            )
-            org = org_result.scalar_one_or_none()
-
-            if org:
-                entitlements["tier"] = org.subscription_tier or "community"
-                # Check if org has active subscription (simplified check)
-                entitlements["sub_status"] = (
-                    "active"
-                    if org.subscription_tier and org.subscription_tier != "community"
-                    else "active"
-                )
-
-        # Add admin role if user is system admin
-        if entitlements["is_admin"] and "admin" not in entitlements["roles"]:
-            entitlements["roles"].append("admin")
-
-    except Exception as e:
-        logger.warning(
-            "Failed to fetch user entitlements, using defaults",
-            user_id=str(user.id),
-            error=str(e),
-        )
-        await db.rollback()
-
-    return entitlements
-
-
 # ============================================================================
 # Cookie-based Authentication Helper
 # ============================================================================
@@ -1397,7 +1322,7 @@ async def token(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="invalid_client: client_secret required",
             )
-        if not client.verify_secret(client_secret):
+        if not await CredentialRotationService(db).verify(client, client_secret):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="invalid_client: Invalid client_secret",
@@ -1584,13 +1509,11 @@ async def _handle_authorization_code_grant(
             detail="invalid_grant: User not found",
         )
 
-    # Fetch user entitlements for Galaxy ecosystem (tier, roles, sub_status)
-    entitlements = await _get_user_entitlements(user, db)
-
-    # Per-product MADFAM ecosystem grants (Selva-unified SSO Phase 1).
-    # Sourced from the user_entitlements table + org inheritance + admin
-    # bootstrap. See app/services/entitlements_service.py.
-    madfam_entitled_products = entitlements_to_claim(await get_user_entitlements(user, db))
+    # Galaxy membership claims (tier, roles, sub_status) and per-product
+    # MADFAM ecosystem grants (Selva-unified SSO Phase 1), sourced from the
+    # user_entitlements table + org inheritance + admin bootstrap and cached
+    # per user. See app/services/entitlements_service.py.
+    entitlement_claims = (await resolve_token_entitlements(user, db)).to_claims()
 
     # Resolve per-client audience (falls back to global JWT_AUDIENCE)
     client_audience = client.audience or settings.JWT_AUDIENCE
@@ -1604,13 +1527,8 @@ async def _handle_authorization_code_grant(
             "client_id": client.client_id,
             "aud": client_audience,
             "scope": scope,
-            # Galaxy membership claims
-            "tier": entitlements["tier"],
-            "roles": entitlements["roles"],
-            "sub_status": entitlements["sub_status"],
-            "is_admin": entitlements["is_admin"],
-            # MADFAM ecosystem per-product entitlements
-            "madfam_entitled_products": madfam_entitled_products,
+            # Galaxy membership claims + MADFAM per-product entitlements
+            **entitlement_claims,
         },
     )
 
@@ -1695,11 +1613,8 @@ async def _handle_refresh_token_grant(
             detail="invalid_grant: User not found",
         )
 
-    # Fetch user entitlements for Galaxy ecosystem (tier, roles, sub_status)
-    entitlements = await _get_user_entitlements(user, db)
-
-    # Per-product MADFAM ecosystem grants (Selva-unified SSO Phase 1).
-    madfam_entitled_products = entitlements_to_claim(await get_user_entitlements(user, db))
+    # Galaxy membership claims and per-product MADFAM entitlements (cached snapshot)
+    entitlement_claims = (await resolve_token_entitlements(user, db)).to_claims()
 
     # Resolve per-client audience (falls back to global JWT_AUDIENCE)
     client_audience = client.audience or settings.JWT_AUDIENCE
@@ -1713,13 +1628,8 @@ async def _handle_refresh_token_grant(
             "client_id": client.client_id,
             "aud": client_audience,
             "scope": scope,
-            # Galaxy membership claims
-            "tier": entitlements["tier"],
-            "roles": entitlements["roles"],
-            "sub_status": entitlements["sub_status"],
-            "is_admin": entitlements["is_admin"],
-            # MADFAM ecosystem per-product entitlements
-            "madfam_entitled_products": madfam_entitled_products,
+            # Galaxy membership claims + MADFAM per-product entitlements
+            **entitlement_claims,
         },
     )
 
@@ -1870,7 +1780,9 @@ async def introspect(
             detail="invalid_client",
         )
 
-    if client.is_confidential and not client.verify_secret(client_secret or ""):
+    if client.is_confidential and not await CredentialRotationService(db).verify(
+        client, client_secret or ""
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="invalid_client",
@@ -1937,7 +1849,7 @@ async def revoke(
     if client_id:
         client = await _get_oauth_client(client_id, db)
         if client and client.is_confidential:
-            if not client.verify_secret(client_secret or ""):
+            if not await CredentialRotationService(db).verify(client, client_secret or ""):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="invalid_client",
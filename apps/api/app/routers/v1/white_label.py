@@ -10,13 +10,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.etag import if_none_match_hit
 from app.database import get_db
 from app.dependencies import get_current_user, require_admin
 from app.models.white_label import (
@@ -27,11 +28,24 @@ from app.models.white_label import (
     ThemeMode,
     ThemePreset,
 )
+from app.services.branding_asset_service import (
+    FAVICON_VARIANTS,
+    LOGO_VARIANTS,
+    create_image_variants,
+    delete_image_variants,
+    get_branding,
+    publish_branding,
+)
 
 from ...models import Organization, User
 
 logger = logging.getLogger(__name__)
 
+# Unversioned stylesheet URLs revalidate cheaply via ETag; URLs pinned to a
+# content hash (?v=<hash>) never change and may be cached forever.
+CSS_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+VERSIONED_CSS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 router = APIRouter(
     prefix="/white-label",
     tags=["White Label"],
@@ -234,6 +248,9 @@ async def create_branding_configuration(
         db.add(branding_config)
         await db.commit()
 
+        # Compile stylesheets now so the login page never builds them per request
+        await publish_branding(organization_id, branding_config)
+
         return BrandingConfigurationResponse(
             id=str(branding_config.id),
             organization_id=str(branding_config.organization_id),
@@ -339,6 +356,7 @@ async def update_branding_configuration(
             setattr(config, field, value)
 
         await db.commit()
+        await publish_branding(organization_id, config)
 
         return BrandingConfigurationResponse(
             id=str(config.id),
@@ -450,6 +468,7 @@ async def _upload_branding_image(
     organization_id: str,
     image_type: str,
     max_size: int,
+    variants: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Helper to upload branding images (logos, favicons).
@@ -459,6 +478,7 @@ async def _upload_branding_image(
         organization_id: Organization ID for the image
         image_type: Type of image (logo, logo-dark, favicon)
         max_size: Maximum file size in bytes
+        variants: Resized variants to generate once, label -> (width, height)
 
     Returns:
         URL path to the uploaded image
@@ -503,8 +523,12 @@ async def _upload_branding_image(
     with open(file_path, "wb") as f:
         f.write(contents)
 
+    url_path = f"/uploads/branding/{safe_org_id}/{unique_filename}"
+    if variants:
+        await create_image_variants(contents, url_path, file.content_type, variants)
+
     # Return URL path
-    return f"/uploads/branding/{safe_org_id}/{unique_filename}"
+    return url_path
 
 
 @router.post("/branding/{organization_id}/logo")
@@ -536,16 +560,18 @@ async def upload_logo(
 
         # Delete old logo if exists (using safe deletion to prevent path traversal)
         _safe_delete_uploaded_file(config.company_logo_url)
+        delete_image_variants(config.company_logo_url, LOGO_VARIANTS)
 
         # Upload new logo
         logo_url = await _upload_branding_image(
-            file, organization_id, "logo", MAX_LOGO_SIZE
+            file, organization_id, "logo", MAX_LOGO_SIZE, variants=LOGO_VARIANTS
         )
 
         # Update branding configuration
         config.company_logo_url = logo_url
         config.updated_at = datetime.utcnow()
         await db.commit()
+        await publish_branding(organization_id, config)
 
         return {
             "message": "Logo uploaded successfully",
@@ -588,16 +614,18 @@ async def upload_logo_dark(
 
         # Delete old logo if exists (using safe deletion to prevent path traversal)
         _safe_delete_uploaded_file(config.company_logo_dark_url)
+        delete_image_variants(config.company_logo_dark_url, LOGO_VARIANTS)
 
         # Upload new logo
         logo_url = await _upload_branding_image(
-            file, organization_id, "logo-dark", MAX_LOGO_SIZE
+            file, organization_id, "logo-dark", MAX_LOGO_SIZE, variants=LOGO_VARIANTS
         )
 
         # Update branding configuration
         config.company_logo_dark_url = logo_url
         config.updated_at = datetime.utcnow()
         await db.commit()
+        await publish_branding(organization_id, config)
 
         return {
             "message": "Dark mode logo uploaded successfully",
@@ -640,6 +668,7 @@ async def upload_favicon(
 
         # Delete old favicon if exists (using safe deletion to prevent path traversal)
         _safe_delete_uploaded_file(config.company_favicon_url)
+        delete_image_variants(config.company_favicon_url, FAVICON_VARIANTS)
 
         # Upload new favicon (allow ICO files too)
         allowed_types = ALLOWED_IMAGE_TYPES + ["image/x-icon", "image/vnd.microsoft.icon"]
@@ -683,11 +712,13 @@ async def upload_favicon(
             f.write(contents)
 
         favicon_url = f"/uploads/branding/{safe_org_id}/{unique_filename}"
+        await create_image_variants(contents, favicon_url, file.content_type, FAVICON_VARIANTS)
 
         # Update branding configuration
         config.company_favicon_url = favicon_url
         config.updated_at = datetime.utcnow()
         await db.commit()
+        await publish_branding(organization_id, config)
 
         return {
             "message": "Favicon uploaded successfully",
@@ -725,9 +756,11 @@ async def delete_logo(
         # Delete logo file if exists (using safe deletion to prevent path traversal)
         if config.company_logo_url:
             _safe_delete_uploaded_file(config.company_logo_url)
+            delete_image_variants(config.company_logo_url, LOGO_VARIANTS)
             config.company_logo_url = None
             config.updated_at = datetime.utcnow()
             await db.commit()
+            await publish_branding(organization_id, config)
 
         return {"message": "Logo deleted successfully"}
 
@@ -762,9 +795,11 @@ async def delete_logo_dark(
         # Delete logo file if exists (using safe deletion to prevent path traversal)
         if config.company_logo_dark_url:
             _safe_delete_uploaded_file(config.company_logo_dark_url)
+            delete_image_variants(config.company_logo_dark_url, LOGO_VARIANTS)
             config.company_logo_dark_url = None
             config.updated_at = datetime.utcnow()
             await db.commit()
+            await publish_branding(organization_id, config)
 
         return {"message": "Dark mode logo deleted successfully"}
 
@@ -799,9 +834,11 @@ async def delete_favicon(
         # Delete favicon file if exists (using safe deletion to prevent path traversal)
         if config.company_favicon_url:
             _safe_delete_uploaded_file(config.company_favicon_url)
+            delete_image_variants(config.company_favicon_url, FAVICON_VARIANTS)
             config.company_favicon_url = None
             config.updated_at = datetime.utcnow()
             await db.commit()
+            await publish_branding(organization_id, config)
 
         return {"message": "Favicon deleted successfully"}
 
@@ -1005,99 +1042,50 @@ async def list_theme_presets(
 @router.get("/css/{organization_id}")
 async def get_organization_css(
     organization_id: str,
+    request: Request,
     theme_mode: Optional[ThemeMode] = ThemeMode.LIGHT,
+    v: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get compiled CSS for organization's branding
+
+    Served from the precompiled cache; ``v`` pins the URL to a content hash.
     """
     try:
-        result = await db.execute(
-            select(BrandingConfiguration).where(
-                BrandingConfiguration.organization_id == organization_id,
-                BrandingConfiguration.is_enabled == True,
-            )
-        )
-        config = result.scalar_one_or_none()
-
-        if not config:
-            # Return default CSS
-            css_content = _generate_default_css()
-        else:
-            # Generate CSS from branding configuration
-            css_content = _generate_organization_css(config, theme_mode)
-
-        return Response(
-            content=css_content,
-            media_type="text/css",
-            headers={"Cache-Control": "public, max-age=3600"},
-        )
-
+        branding = await get_branding(db, organization_id)
     except Exception as e:
         logger.error(f"Failed to get organization CSS: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-
-def _generate_default_css() -> str:
-    """Generate default CSS"""
-    return """
-    :root {
-        --primary-color: #1a73e8;
-        --secondary-color: #ea4335;
-        --accent-color: #34a853;
-        --background-color: #ffffff;
-        --surface-color: #f8f9fa;
-        --text-color: #202124;
-        --border-radius: 8px;
-        --font-family: Inter, system-ui, sans-serif;
-    }
-    
-    body {
-        font-family: var(--font-family);
-        color: var(--text-color);
-        background-color: var(--background-color);
+    stylesheet = branding.stylesheet(theme_mode)
+    headers = {
+        "ETag": stylesheet.etag,
+        "Cache-Control": (
+            VERSIONED_CSS_CACHE_CONTROL if v == stylesheet.version else CSS_CACHE_CONTROL
+        ),
     }
-    
-    .btn-primary {
-        background-color: var(--primary-color);
-        border-radius: var(--border-radius);
-    }
-    """
 
+    if if_none_match_hit(request.headers.get("if-none-match"), stylesheet.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=stylesheet.body, media_type="text/css", headers=headers)
 
-def _generate_organization_css(config: BrandingConfiguration, theme_mode: ThemeMode) -> str:
-    """Generate CSS from branding configuration"""
-    css_vars = f"""
-    :root {{
-        --primary-color: {config.primary_color};
-        --secondary-color: {config.secondary_color};
-        --accent-color: {config.accent_color};
-        --background-color: {config.background_color};
-        --surface-color: {config.surface_color};
-        --text-color: {config.text_color};
-        --border-radius: {config.border_radius};
-        --font-family: {config.font_family};
-    }}
-    
-    body {{
-        font-family: var(--font-family);
-        color: var(--text-color);
-        background-color: var(--background-color);
-    }}
-    
-    .btn-primary {{
-        background-color: var(--primary-color);
-        border-radius: var(--border-radius);
-    }}
-    
-    .btn-secondary {{
-        background-color: var(--secondary-color);
-        border-radius: var(--border-radius);
-    }}
-    """
 
-    # Add custom CSS if provided
-    if config.custom_css:
-        css_vars += f"\n\n{config.custom_css}"
+@router.get("/branding/{organization_id}/assets")
+async def get_branding_assets(
+    organization_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get fingerprinted stylesheet and logo/favicon URLs for the hosted login page
+    """
+    try:
+        branding = await get_branding(db, organization_id)
+    except Exception as e:
+        logger.error(f"Failed to get branding assets: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-    return css_vars
+    css_path = str(request.url_for("get_organization_css", organization_id=organization_id).path)
+    return branding.manifest(css_path)
@@ -0,0 +1,544 @@
+"""
+Shared IP intelligence index.
+
+One longest-prefix-match index answers "what do we know about this address?"
+for the WAF, threat detection, risk assessment and the policy engine. Feeds of
+CIDRs (Tor exits, VPN and hosting ranges, blocklists) are compiled into a
+path-compressed binary radix (Patricia) tree per address family, flattened into
+parallel arrays and written as a binary snapshot. Workers memory-map the
+snapshot, so the arrays are shared page cache rather than per-process Python
+objects, and a lookup walks at most one node per prefix bit.
+
+Refreshing compiles a new snapshot next to the old one, renames it into place
+and swaps the index reference; lookups in flight keep using the old mapping.
+Compiling a large feed set takes a while, so production workers normally only
+map a snapshot produced by ``scripts/compile_ip_intel.py``.
+
+Prefixes are indexed at the length the feed gives, up to /128 for IPv6. Node
+keys are stored as 64-bit words, two per node for IPv6.
+"""
+
+import ipaddress
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from socket import AF_INET, AF_INET6, inet_pton
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Feed categories and the default score for entries that don't carry one
+CATEGORY_SCORES: Dict[str, float] = {
+    "blocklist": 1.0,
+    "tor": 0.8,
+    "proxy": 0.6,
+    "vpn": 0.5,
+    "suspicious": 0.6,
+    "datacenter": 0.3,
+}
+
+SNAPSHOT_MAGIC = b"JIPX"
+SNAPSHOT_VERSION = 2
+# magic, version, v4/v6 node counts, v4/v6 jump table sizes, entries JSON length, padding
+_HEADER = struct.Struct("<4sIIIIIII")
+
+# Snapshot array layout, widest element type first so every array stays aligned
+_NODE_ARRAYS = (("keys", "Q"), ("lefts", "I"), ("rights", "I"), ("entries", "I"))
+_JUMP_ARRAYS = (("starts", "I"), ("bests", "I"))
+
+_V4_BITS = 32
+_V6_BITS = 128
+
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def _key_words(width: int) -> int:
+    """64-bit words per node key"""
+    return (width + _WORD_BITS - 1) // _WORD_BITS
+
+
+# Direct-indexed first level for large tries (2**16 slots, 512 KiB per family)
+JUMP_BITS = 16
+JUMP_TABLE_MIN_NODES = 4096
+
+
+@dataclass(frozen=True)
+class IPIntelEntry:
+    """What a feed says about a prefix. Instances are shared across lookups."""
+
+    category: str
+    score: float
+
+
+class _Node:
+    __slots__ = ("key", "plen", "children", "entry")
+
+    def __init__(self, key: int, plen: int, entry: int = 0):
+        self.key = key
+        self.plen = plen
+        self.children: List[Optional[_Node]] = [None, None]
+        self.entry = entry
+
+
+class _TrieBuilder:
+    """Insert-only Patricia trie over ``width``-bit keys, flattened when done."""
+
+    def __init__(self, width: int):
+        self.width = width
+        self.root = _Node(0, 0)
+
+    def _bit(self, key: int, position: int) -> int:
+        return (key >> (self.width - 1 - position)) & 1
+
+    def insert(self, key: int, plen: int, entry: int):
+        width = self.width
+        node = self.root
+        while True:
+            if plen == node.plen:
+                node.entry = entry
+                return
+
+            branch = self._bit(key, node.plen)
+            child = node.children[branch]
+            if child is None:
+                node.children[branch] = _Node(key, plen, entry)
+                return
+
+            diff = key ^ child.key
+            common = min(plen, child.plen, width - diff.bit_length() if diff else width)
+            if common == child.plen:
+                node = child
+                continue
+
+            if common == plen:
+                # New prefix sits between node and child
+                new = _Node(key, plen, entry)
+                new.children[self._bit(child.key, plen)] = child
+                node.children[branch] = new
+                return
+
+            mask = ((1 << common) - 1) << (width - common)
+            split = _Node(key & mask, common)
+            split.children[self._bit(child.key, common)] = child
+            split.children[self._bit(key, common)] = _Node(key, plen, entry)
+            node.children[branch] = split
+            return
+
+    def flatten(self) -> Tuple[array, array, array, array, array]:
+        """Breadth-first layout: keys, plens, left, right, entry. Node 0 is the root.
+
+        Keys wider than 64 bits take consecutive words, most significant first.
+        """
+        words = _key_words(self.width)
+        keys, plens = array("Q"), array("B")
+        lefts, rights, entries = array("I"), array("I"), array("I")
+
+        order = [self.root]
+        index = {id(self.root): 0}
+        i = 0
+        while i < len(order):
+            for child in order[i].children:
+                if child is not None:
+                    index[id(child)] = len(order)
+                    order.append(child)
+            i += 1
+
+        for node in order:
+            left, right = node.children
+            for shift in range(_WORD_BITS * (words - 1), -1, -_WORD_BITS):
+                keys.append((node.key >> shift) & _WORD_MASK)
+            plens.append(node.plen)
+            lefts.append(index[id(left)] if left is not None else 0)
+            rights.append(index[id(right)] if right is not None else 0)
+            entries.append(node.entry)
+
+        return keys, plens, lefts, rights, entries
+
+
+class _Trie:
+    """Read-only flattened trie over arrays or memoryviews.
+
+    Large tries also carry a jump table indexed by the top ``JUMP_BITS`` bits
+    of the key: the first node deeper than that and the best entry seen on the
+    way, so lookups skip the shallow levels every address walks through.
+    """
+
+    __slots__ = (
+        "width",
+        "words",
+        "keys",
+        "plens",
+        "lefts",
+        "rights",
+        "entries",
+        "starts",
+        "bests",
+    )
+
+    def __init__(self, width, keys, plens, lefts, rights, entries, starts=None, bests=None):
+        self.width = width
+        self.words = _key_words(width)
+        self.keys = keys
+        self.plens = plens
+        self.lefts = lefts
+        self.rights = rights
+        self.entries = entries
+        if starts is None:
+            if len(keys) >= JUMP_TABLE_MIN_NODES:
+                starts, bests = self._jump_table()
+            else:
+                starts, bests = array("I"), array("I")
+        self.starts = starts
+        self.bests = bests
+
+    def __len__(self):
+        return len(self.plens)
+
+    def _key(self, n: int) -> int:
+        if self.words == 1:
+            return self.keys[n]
+        return (self.keys[2 * n] << _WORD_BITS) | self.keys[2 * n + 1]
+
+    def _jump_table(self) -> Tuple[array, array]:
+        starts = array("I", bytes(4 << JUMP_BITS))
+        bests = array("I", bytes(4 << JUMP_BITS))
+        shift = self.width - JUMP_BITS
+        # A node shallower than JUMP_BITS covers a contiguous slot range, so
+        # each branch is filled with one slice rather than walking per slot
+        stack = [(0, 0)]
+        while stack:
+            n, best = stack.pop()
+            if self.entries[n]:
+                best = self.entries[n]
+            low = self._key(n) >> shift
+            half = 1 << (JUMP_BITS - self.plens[n] - 1)
+            for child, first in ((self.lefts[n], low), (self.rights[n], low + half)):
+                bests[first : first + half] = array("I", [best]) * half
+                if not child:
+                    continue
+                if self.plens[child] >= JUMP_BITS:
+                    # The child's own prefix check rejects addresses that
+                    # diverge from it, so it can start the whole branch
+                    starts[first : first + half] = array("I", [child]) * half
+                else:
+                    # Slots outside the child's (compressed) prefix keep start 0
+                    stack.append((child, best))
+        return starts, bests
+
+    def lookup(self, value: int) -> int:
+        """Entry index of the longest prefix containing ``value`` (0 = none)."""
+        width = self.width
+        wide = self.words > 1
+        keys, plens, lefts, rights, entries = (
+            self.keys,
+            self.plens,
+            self.lefts,
+            self.rights,
+            self.entries,
+        )
+        if self.starts:
+            slot = value >> (width - JUMP_BITS)
+            best = self.bests[slot]
+            n = self.starts[slot]
+            if not n:
+                return best
+        else:
+            best = 0
+            n = 0
+        while True:
+            plen = plens[n]
+            key = (keys[2 * n] << _WORD_BITS) | keys[2 * n + 1] if wide else keys[n]
+            if (value ^ key) >> (width - plen):
+                return best
+            if entries[n]:
+                best = entries[n]
+            if plen == width:
+                return best
+            n = rights[n] if (value >> (width - 1 - plen)) & 1 else lefts[n]
+            if not n:
+                return best
+
+
+def _parse_cidr(cidr: str) -> Optional[Tuple[int, int, int]]:
+    """(family bits, masked key, prefix length) for a feed line, or None if invalid."""
+    address, _, length = cidr.strip().partition("/")
+    try:
+        if ":" in address:
+            width = _V6_BITS
+            value = int.from_bytes(inet_pton(AF_INET6, address), "big")
+        else:
+            width = _V4_BITS
+            value = int.from_bytes(inet_pton(AF_INET, address), "big")
+        plen = int(length) if length else width
+    except (OSError, ValueError):
+        return None
+    if not 0 <= plen <= width:
+        return None
+    mask = ((1 << plen) - 1) << (width - plen)
+    return width, value & mask, plen
+
+
+class IPIntelIndex:
+    """Immutable longest-prefix-match index over IPv4 and IPv6 CIDRs."""
+
+    def __init__(self, v4: _Trie, v6: _Trie, entries: List[IPIntelEntry], source=None):
+        self._v4 = v4
+        self._v6 = v6
+        # Slot 0 means "no entry" so node entry indexes start at 1
+        self._entries: List[Optional[IPIntelEntry]] = [None] + list(entries)
+        self._source = source
+
+    @classmethod
+    def empty(cls) -> "IPIntelIndex":
+        return cls.build([])
+
+    @classmethod
+    def build(cls, prefixes: Iterable[Tuple[str, str, Optional[float]]]) -> "IPIntelIndex":
+        """Compile ``(cidr, category, score)`` triples; later entries win on duplicates."""
+        builders = {_V4_BITS: _TrieBuilder(_V4_BITS), _V6_BITS: _TrieBuilder(_V6_BITS)}
+        entries: List[IPIntelEntry] = []
+        entry_ids: Dict[IPIntelEntry, int] = {}
+
+        for cidr, category, score in prefixes:
+            parsed = _parse_cidr(cidr)
+            if parsed is None:
+                logger.warning("Skipping invalid CIDR in IP intelligence feed", cidr=cidr)
+                continue
+            if score is None:
+                score = CATEGORY_SCORES.get(category, 0.5)
+            entry = IPIntelEntry(category, score)
+            if entry not in entry_ids:
+                entries.append(entry)
+                entry_ids[entry] = len(entries)
+            width, key, plen = parsed
+            builders[width].insert(key, plen, entry_ids[entry])
+
+        v4 = _Trie(_V4_BITS, *builders[_V4_BITS].flatten())
+        v6 = _Trie(_V6_BITS, *builders[_V6_BITS].flatten())
+        return cls(v4, v6, entries)
+
+    @property
+    def size(self) -> int:
+        """Number of trie nodes across both families"""
+        return len(self._v4) + len(self._v6)
+
+    def lookup(self, ip: str) -> Optional[IPIntelEntry]:
+        """Most specific entry covering ``ip``, or None (also for unparseable input)."""
+        try:
+            if ":" in ip:
+                packed = inet_pton(AF_INET6, ip)
+                return self._entries[self._v6.lookup(int.from_bytes(packed, "big"))]
+            return self._entries[self._v4.lookup(int.from_bytes(inet_pton(AF_INET, ip), "big"))]
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def category(self, ip: str) -> Optional[str]:
+        entry = self.lookup(ip)
+        return entry.category if entry is not None else None
+
+    # Snapshots
+
+    def write_snapshot(self, path: str):
+        """Write the index to ``path`` atomically (temp file + rename)."""
+        entries_json = json.dumps([[e.category, e.score] for e in self._entries[1:]]).encode()
+        v4, v6 = self._v4, self._v6
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            len(v4),
+            len(v6),
+            len(v4.starts),
+            len(v6.starts),
+            len(entries_json),
+            0,
+        )
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ip-intel-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                for name, fmt in _NODE_ARRAYS + _JUMP_ARRAYS + (("plens", "B"),):
+                    for trie in (v4, v6):
+                        f.write(getattr(trie, name).tobytes())
+                f.write(entries_json)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "IPIntelIndex":
+        """Memory-map a snapshot; the arrays are views over the mapping, not copies."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(mapped)
+        magic, version, n4, n6, t4, t6, entries_len, _ = _HEADER.unpack_from(view, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not an IP intelligence snapshot: {path}")
+
+        offset = _HEADER.size
+        arrays: Dict[Tuple[str, int], memoryview] = {}
+        node_counts = {_V4_BITS: n4, _V6_BITS: n6}
+        key_counts = {width: count * _key_words(width) for width, count in node_counts.items()}
+        layout = (
+            [
+                (name, fmt, key_counts if name == "keys" else node_counts)
+                for name, fmt in _NODE_ARRAYS
+            ]
+            + [(name, fmt, {_V4_BITS: t4, _V6_BITS: t6}) for name, fmt in _JUMP_ARRAYS]
+            + [("plens", "B", node_counts)]
+        )
+        for name, fmt, counts in layout:
+            size = struct.calcsize(fmt)
+            for width in (_V4_BITS, _V6_BITS):
+                length = counts[width] * size
+                arrays[(name, width)] = view[offset : offset + length].cast(fmt)
+                offset += length
+
+        raw_entries = json.loads(bytes(view[offset : offset + entries_len]))
+        entries = [IPIntelEntry(category, score) for category, score in raw_entries]
+
+        def trie(width):
+            return _Trie(
+                width,
+                *(
+                    arrays[(name, width)]
+                    for name in ("keys", "plens", "lefts", "rights", "entries", "starts", "bests")
+                ),
+            )
+
+        return cls(trie(_V4_BITS), trie(_V6_BITS), entries, source=mapped)
+
+
+def read_feed_dir(feed_dir: str) -> List[Tuple[str, str, Optional[float]]]:
+    """Parse ``<category>.txt`` feed files: one ``CIDR[,score]`` per line, ``#`` comments."""
+    prefixes: List[Tuple[str, str, Optional[float]]] = []
+    for filename in sorted(os.listdir(feed_dir)):
+        if not filename.endswith(".txt"):
+            continue
+        category = filename[: -len(".txt")]
+        with open(os.path.join(feed_dir, filename), encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                cidr, _, score = line.partition(",")
+                try:
+                    prefixes.append((cidr, category, float(score) if score.strip() else None))
+                except ValueError:
+                    prefixes.append((cidr, category, None))
+    return prefixes
+
+
+def _feed_fingerprint(feed_dir: str) -> Tuple:
+    return tuple(
+        (name, os.stat(os.path.join(feed_dir, name)).st_mtime_ns)
+        for name in sorted(os.listdir(feed_dir))
+        if name.endswith(".txt")
+    )
+
+
+class IPIntelligence:
+    """Process-wide handle to the current index, hot-swapped on refresh."""
+
+    def __init__(self, feed_dir: Optional[str] = None, snapshot_path: Optional[str] = None):
+        self.feed_dir = feed_dir
+        self.snapshot_path = snapshot_path
+        self._index = IPIntelIndex.empty()
+        self._feed_fingerprint: Optional[Tuple] = None
+
+    @property
+    def index(self) -> IPIntelIndex:
+        return self._index
+
+    def swap(self, index: IPIntelIndex):
+        """Replace the live index; a single reference assignment, so readers never block."""
+        self._index = index
+
+    def refresh(self) -> bool:
+        """Recompile from the feed directory if it changed, else adopt a newer snapshot.
+
+        Returns True when the live index was replaced.
+        """
+        if self.feed_dir and os.path.isdir(self.feed_dir):
+            fingerprint = _feed_fingerprint(self.feed_dir)
+            if fingerprint != self._feed_fingerprint:
+                index = IPIntelIndex.build(read_feed_dir(self.feed_dir))
+                if self.snapshot_path:
+                    index.write_snapshot(self.snapshot_path)
+                    index = IPIntelIndex.load_snapshot(self.snapshot_path)
+                self.swap(index)
+                self._feed_fingerprint = fingerprint
+                logger.info("IP intelligence index rebuilt", nodes=index.size)
+                return True
+            return False
+
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            # Another process compiles the feeds; just map its latest snapshot
+            mtime = os.stat(self.snapshot_path).st_mtime_ns
+            if mtime != self._feed_fingerprint:
+                self.swap(IPIntelIndex.load_snapshot(self.snapshot_path))
+                self._feed_fingerprint = mtime
+                return True
+        return False
+
+    def lookup(self, ip: str) -> Optional[IPIntelEntry]:
+        return self._index.lookup(ip)
+
+    def category(self, ip: str) -> Optional[str]:
+        return self._index.category(ip)
+
+    def is_blocked(self, ip: str) -> bool:
+        return self._index.category(ip) == "blocklist"
+
+
+@lru_cache(maxsize=1024)
+def parse_network(cidr: str) -> Optional[IPNetwork]:
+    """Parse a CIDR (or bare address) once; repeated policy checks hit the cache."""
+    try:
+        return ipaddress.ip_network(cidr.strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def ip_in_network(ip: str, cidr: str) -> bool:
+    """Single-range membership test for ad-hoc rules (policy conditions, allowlists)."""
+    network = parse_network(cidr)
+    if network is None:
+        return False
+    try:
+        return ipaddress.ip_address(ip) in network
+    except ValueError:
+        return False
+
+
+def _create_ip_intelligence() -> IPIntelligence:
+    from app.config import settings
+
+    intel = IPIntelligence(
+        feed_dir=getattr(settings, "IP_INTEL_FEED_DIR", None),
+        snapshot_path=getattr(settings, "IP_INTEL_SNAPSHOT_PATH", None),
+    )
+    try:
+        intel.refresh()
+    except Exception as e:
+        logger.warning("IP intelligence feeds not loaded", error=str(e))
+    return intel
+
+
+# Global IP intelligence instance
+ip_intelligence = _create_ip_intelligence()
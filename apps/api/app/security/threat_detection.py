@@ -4,7 +4,6 @@ Real-time threat detection with ML-based anomaly detection and automated respons
 """
 
 import asyncio
-import ipaddress
 import json
 import logging
 import re
@@ -19,8 +18,21 @@ import joblib
 import redis.asyncio as aioredis
 from sklearn.ensemble import IsolationForest
 
+from app.security.ip_intelligence import IPIntelIndex, ip_intelligence
+
 logger = logging.getLogger(__name__)
 
+# Feed categories that make an IP "suspicious" for reputation scoring
+SUSPICIOUS_IP_CATEGORIES = frozenset({"tor", "vpn", "proxy", "suspicious", "blocklist"})
+
+_PRIVATE_RANGES = IPIntelIndex.build(
+    [
+        ("10.0.0.0/8", "private", 0.0),
+        ("172.16.0.0/12", "private", 0.0),
+        ("192.168.0.0/16", "private", 0.0),
+    ]
+)
+
 
 class ThreatLevel(Enum):
     """Threat severity levels"""
@@ -458,30 +470,11 @@ class AdvancedThreatDetectionSystem:
 
     def _is_suspicious_ip_range(self, ip: str) -> bool:
         """Check if IP is from suspicious range"""
-        try:
-            ip_obj = ipaddress.ip_address(ip)
-
-            # Check for common VPN/proxy ranges
-            suspicious_ranges = [
-                ipaddress.ip_network("10.0.0.0/8"),
-                ipaddress.ip_network("172.16.0.0/12"),
-                ipaddress.ip_network("192.168.0.0/16"),
-            ]
-
-            for range in suspicious_ranges:
-                if ip_obj in range:
-                    return True
-
-        except (ValueError, ipaddress.AddressValueError) as e:
-            # Invalid IP address format
-            logger.warning(
-                "Invalid IP address format in threat detection",
-                ip=ip,
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-
-        return False
+        # Private ranges reaching us directly usually mean a misconfigured or
+        # spoofed forwarding chain
+        if _PRIVATE_RANGES.lookup(ip) is not None:
+            return True
+        return ip_intelligence.category(ip) in SUSPICIOUS_IP_CATEGORIES
 
     def _detect_attack_patterns(self, content: str) -> List[ThreatIndicator]:
         """
@@ -888,9 +881,9 @@ class AdvancedThreatDetectionSystem:
     async def _fetch_threat_feeds(self):
         """Fetch latest threat intelligence feeds"""
 
-        # Would integrate with real threat feeds
-        # For example: AbuseIPDB, AlienVault OTX, etc.
-        pass
+        # Feed files are synced into IP_INTEL_FEED_DIR out of band (AbuseIPDB,
+        # Tor exit lists, ...); recompiling is CPU-bound so keep it off the loop
+        await asyncio.to_thread(ip_intelligence.refresh)
 
     async def _load_ip_reputation(self):
         """Load IP reputation database"""
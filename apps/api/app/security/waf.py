@@ -15,6 +15,8 @@ import structlog
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from app.security.ip_intelligence import ip_intelligence
+
 logger = structlog.get_logger()
 
 
@@ -210,7 +212,8 @@ class WAFEngine:
 
     def is_ip_blocked(self, ip: str) -> bool:
         """Check if IP is blocked"""
-        return ip in self.blocked_ips
+        # Runtime blocks are single addresses; feed blocklists are CIDR ranges
+        return ip in self.blocked_ips or ip_intelligence.is_blocked(ip)
 
     def is_ip_whitelisted(self, ip: str) -> bool:
         """Check if IP is whitelisted"""
@@ -3,11 +3,20 @@ Account Lockout Service
 
 Provides protection against brute-force attacks by locking accounts
 after a configurable number of failed login attempts.
+
+Failed attempts are counted in Redis, in sliding windows keyed by user and by
+IP address, so a credential-stuffing wave against one account does not turn
+into a stream of writes to its ``users`` row. The row is only written when the
+threshold is crossed (the lock is persisted) or when a lock is cleared, and
+``is_account_locked`` reads the already-loaded row. An IP address that fails
+``ACCOUNT_LOCKOUT_IP_THRESHOLD`` times across accounts is blocked for the
+lockout duration. Without Redis, attempts are counted on the row as before.
 """
 
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
-from uuid import UUID
+from typing import Any, Optional, Tuple
+from uuid import UUID, uuid4
 
 import structlog
 from sqlalchemy import select
@@ -18,6 +27,120 @@ from app.models import User
 
 logger = structlog.get_logger(__name__)
 
+KEY_PREFIX = "janua:lockout:"
+USER = "user"
+IP = "ip"
+
+
+class LockoutCounters:
+    """Sliding-window failure counters and lock markers, shared by all workers"""
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+
+    async def record_failure(
+        self, user_id: Any, ip_address: Optional[str] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Count a failure for the user and the IP address in one MULTI/EXEC.
+
+        Returns:
+            (failures for the user, failures from the IP) within the window,
+            or None when Redis is unavailable
+        """
+        client = await self._get_redis()
+        if client is None:
+            return None
+        now = time.time()
+        window = settings.ACCOUNT_LOCKOUT_WINDOW_MINUTES * 60
+        subjects = [(USER, user_id)] + ([(IP, ip_address)] if ip_address else [])
+        try:
+            pipe = client.pipeline(transaction=True)
+            for kind, subject in subjects:
+                key = _failures_key(kind, subject)
+                pipe.zremrangebyscore(key, 0, now - window)
+                pipe.zadd(key, {f"{now:.6f}:{uuid4().hex[:8]}": now})
+                pipe.zcard(key)
+                pipe.expire(key, window)
+            results = await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to count login failure in Redis", error=str(e))
+            return None
+        counts = [int(count) for count in results[2::4]]
+        return counts[0], counts[1] if ip_address else 0
+
+    async def failures(self, user_id: Any) -> Optional[int]:
+        """Failures for the user within the window, or None when Redis is unavailable"""
+        client = await self._get_redis()
+        if client is None:
+            return None
+        key = _failures_key(USER, user_id)
+        window = settings.ACCOUNT_LOCKOUT_WINDOW_MINUTES * 60
+        try:
+            return int(await client.zcount(key, time.time() - window, "+inf"))
+        except Exception as e:
+            logger.warning("Failed to read login failures from Redis", error=str(e))
+            return None
+
+    async def lock(self, kind: str, subject: Any, seconds: int) -> bool:
+        """
+        Mark ``subject`` locked for ``seconds``; only the first caller gets True,
+        so concurrent workers crossing the threshold persist the lock once.
+        """
+        client = await self._get_redis()
+        if client is None:
+            return True
+        try:
+            locked = await client.set(_lock_key(kind, subject), "1", nx=True, ex=seconds)
+            if locked and kind == USER:
+                await client.delete(_failures_key(kind, subject))
+            return bool(locked)
+        except Exception as e:
+            logger.warning("Failed to store lockout in Redis", error=str(e))
+            return True
+
+    async def locked_seconds(self, kind: str, subject: Any) -> Optional[int]:
+        """Seconds until ``subject`` is unlocked, or None if it is not locked"""
+        client = await self._get_redis()
+        if client is None:
+            return None
+        try:
+            ttl = await client.ttl(_lock_key(kind, subject))
+        except Exception as e:
+            logger.warning("Failed to read lockout from Redis", error=str(e))
+            return None
+        return int(ttl) if ttl and ttl > 0 else None
+
+    async def clear(self, kind: str, subject: Any):
+        client = await self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(_failures_key(kind, subject), _lock_key(kind, subject))
+        except Exception as e:
+            logger.warning("Failed to clear lockout in Redis", error=str(e))
+
+    async def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        try:
+            from app.core.redis import get_raw_redis
+
+            return await get_raw_redis()
+        except Exception:
+            return None
+
+
+def _failures_key(kind: str, subject: Any) -> str:
+    return f"{KEY_PREFIX}failures:{kind}:{subject}"
+
+
+def _lock_key(kind: str, subject: Any) -> str:
+    return f"{KEY_PREFIX}lock:{kind}:{subject}"
+
+
+lockout_counters = LockoutCounters()
+
 
 class AccountLockoutService:
     """Service for managing account lockout functionality."""
@@ -68,6 +191,67 @@ class AccountLockoutService:
         if not settings.ACCOUNT_LOCKOUT_ENABLED:
             return False, None
 
+        counts = await lockout_counters.record_failure(user.id, ip_address)
+        if counts is None:
+            return await AccountLockoutService._record_on_row(db, user, ip_address)
+        failed_attempts, ip_failures = counts
+        lock_duration = timedelta(minutes=settings.ACCOUNT_LOCKOUT_DURATION_MINUTES)
+        seconds_until_unlock = int(lock_duration.total_seconds())
+
+        if ip_address and ip_failures >= settings.ACCOUNT_LOCKOUT_IP_THRESHOLD:
+            if await lockout_counters.lock(IP, ip_address, seconds_until_unlock):
+                logger.warning(
+                    "IP address blocked due to too many failed attempts",
+                    ip_address=ip_address,
+                    failed_attempts=ip_failures,
+                    lock_duration_minutes=settings.ACCOUNT_LOCKOUT_DURATION_MINUTES,
+                )
+
+        logger.warning(
+            "Failed login attempt recorded",
+            user_id=str(user.id),
+            email=user.email,
+            failed_attempts=failed_attempts,
+            threshold=settings.ACCOUNT_LOCKOUT_THRESHOLD,
+            ip_address=ip_address,
+        )
+
+        if failed_attempts < settings.ACCOUNT_LOCKOUT_THRESHOLD:
+            return False, None
+
+        # Threshold crossed: the first worker to get here persists the lock
+        if not await lockout_counters.lock(USER, user.id, seconds_until_unlock):
+            seconds = await lockout_counters.locked_seconds(USER, user.id)
+            return True, seconds or seconds_until_unlock
+
+        now = datetime.utcnow()
+        user.failed_login_attempts = failed_attempts
+        user.last_failed_login = now
+        user.locked_until = now + lock_duration
+        try:
+            await db.commit()
+        except Exception:
+            await lockout_counters.clear(USER, user.id)
+            raise
+
+        logger.warning(
+            "Account locked due to too many failed attempts",
+            user_id=str(user.id),
+            email=user.email,
+            failed_attempts=failed_attempts,
+            locked_until=user.locked_until.isoformat(),
+            lock_duration_minutes=settings.ACCOUNT_LOCKOUT_DURATION_MINUTES,
+            ip_address=ip_address,
+        )
+        return True, seconds_until_unlock
+
+    @staticmethod
+    async def _record_on_row(
+        db: AsyncSession,
+        user: User,
+        ip_address: Optional[str] = None,
+    ) -> Tuple[bool, Optional[int]]:
+        """Count the attempt on the user row (used when Redis is unavailable)"""
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
         user.last_failed_login = datetime.utcnow()
 
@@ -102,6 +286,16 @@ class AccountLockoutService:
         await db.commit()
         return False, None
 
+    @staticmethod
+    async def ip_blocked_seconds(ip_address: Optional[str]) -> Optional[int]:
+        """
+        Seconds until an IP address blocked for failing across accounts may
+        try again, or None if it is not blocked. Answered from Redis alone.
+        """
+        if not settings.ACCOUNT_LOCKOUT_ENABLED or not ip_address:
+            return None
+        return await lockout_counters.locked_seconds(IP, ip_address)
+
     @staticmethod
     async def reset_failed_attempts(
         db: AsyncSession,
@@ -120,6 +314,9 @@ class AccountLockoutService:
         if not settings.ACCOUNT_LOCKOUT_RESET_ON_SUCCESS:
             return
 
+        await lockout_counters.clear(USER, user.id)
+
+        # The row only holds attempts once a lock was persisted (or without Redis)
         if user.failed_login_attempts and user.failed_login_attempts > 0:
             previous_attempts = user.failed_login_attempts
             user.failed_login_attempts = 0
@@ -159,6 +356,7 @@ class AccountLockoutService:
         user.failed_login_attempts = 0
         user.locked_until = None
         await db.commit()
+        await lockout_counters.clear(USER, user.id)
 
         logger.info(
             "Account manually unlocked",
@@ -191,13 +389,16 @@ class AccountLockoutService:
             return {"error": "User not found"}
 
         is_locked, seconds_remaining = AccountLockoutService.is_account_locked(user)
+        failed_attempts = await lockout_counters.failures(user.id)
+        if failed_attempts is None or is_locked:
+            failed_attempts = user.failed_login_attempts or 0
 
         return {
             "user_id": str(user_id),
             "email": user.email,
             "is_locked": is_locked,
             "seconds_until_unlock": seconds_remaining,
-            "failed_login_attempts": user.failed_login_attempts or 0,
+            "failed_login_attempts": failed_attempts,
             "lockout_threshold": settings.ACCOUNT_LOCKOUT_THRESHOLD,
             "last_failed_login": user.last_failed_login.isoformat()
             if user.last_failed_login
@@ -7,19 +7,29 @@ Follows the same patterns as OAuthClientService for consistency.
 Supports two key formats:
 - Legacy: jnk_<random> (bcrypt hashed) -- existing keys
 - Modern: sk_live_<hex> (SHA-256 hashed) -- new keys for external consumers / AI agents
+
+Request-path authentication (ApiKeyAuthMiddleware) goes through
+``resolve_api_key_identity``: verified keys are cached for
+``API_KEY_CACHE_TTL_SECONDS`` (Redis plus a short in-process L1) and dropped on
+every worker as soon as the key is updated, rotated or revoked. ``last_used`` is
+recorded in memory and written in batches by ``api_key_usage``.
 """
 
 import hashlib
 import logging
 import secrets
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 import bcrypt
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.caching import cache_manager, cached
+from app.core.last_used import LastUsedRecorder
 from app.models import ApiKey, AuditLog, OrganizationMember, User
 from app.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
 
@@ -28,6 +38,10 @@ logger = logging.getLogger(__name__)
 # Prefix for modern API keys (external consumers, AI agents)
 SK_LIVE_PREFIX = "sk_live_"
 
+# Resolved keys are also kept in each worker's L1 for this long; other workers
+# drop their copy through the invalidation bus when the key changes
+API_KEY_LOCAL_CACHE_SECONDS = 10
+
 
 class ApiKeyService:
     """Service for API key management operations"""
@@ -156,6 +170,7 @@ class ApiKeyService:
         audit_log = AuditLog(
             id=uuid.uuid4(),
             user_id=user.id,
+            organization_id=api_key.organization_id,
             action="api_key_created",
             resource_type="api_key",
             resource_id=str(api_key.id),
@@ -306,6 +321,7 @@ class ApiKeyService:
             audit_log = AuditLog(
                 id=uuid.uuid4(),
                 user_id=user.id,
+                organization_id=api_key.organization_id,
                 action="api_key_updated",
                 resource_type="api_key",
                 resource_id=str(api_key.id),
@@ -319,6 +335,7 @@ class ApiKeyService:
 
             await self.db.commit()
             await self.db.refresh(api_key)
+            await invalidate_api_key_cache(api_key.prefix)
 
             logger.info(f"API key updated: {api_key.id} by user {user.id}")
 
@@ -355,6 +372,7 @@ class ApiKeyService:
         audit_log = AuditLog(
             id=uuid.uuid4(),
             user_id=user.id,
+            organization_id=api_key.organization_id,
             action="api_key_revoked",
             resource_type="api_key",
             resource_id=str(api_key.id),
@@ -365,6 +383,7 @@ class ApiKeyService:
         self.db.add(audit_log)
 
         await self.db.commit()
+        await invalidate_api_key_cache(api_key.prefix)
 
         logger.info(f"API key revoked: {api_key.id} by user {user.id}")
 
@@ -406,6 +425,7 @@ class ApiKeyService:
         audit_log = AuditLog(
             id=uuid.uuid4(),
             user_id=user.id,
+            organization_id=api_key.organization_id,
             action="api_key_rotated",
             resource_type="api_key",
             resource_id=str(api_key.id),
@@ -420,6 +440,7 @@ class ApiKeyService:
 
         await self.db.commit()
         await self.db.refresh(api_key)
+        await invalidate_api_key_cache(old_prefix)
 
         logger.info(f"API key rotated: {api_key.id} by user {user.id}")
 
@@ -429,13 +450,13 @@ class ApiKeyService:
         """
         Update the last_used timestamp for an API key.
 
-        Called when the key is used for authentication.
+        Called when the key is used for authentication. The write is coalesced
+        with other uses and flushed in a batch by ``api_key_usage``.
 
         Args:
             api_key: The API key that was used
         """
-        api_key.last_used = datetime.utcnow()
-        await self.db.commit()
+        api_key_usage.touch(api_key.id)
 
     async def validate_and_get_user(
         self,
@@ -588,3 +609,132 @@ class ApiKeyService:
             )
         )
         return result.scalar_one_or_none() is not None
+
+
+# ----------------------------------------------------------------------
+# Request-path resolution and usage tracking
+# ----------------------------------------------------------------------
+
+
+def api_key_cache_tag(key_or_prefix: str) -> str:
+    """
+    Cache tag of a key, from the plain key or its display prefix.
+
+    Both start with the same DISPLAY_PREFIX_LENGTH characters, so revoking by
+    prefix drops the cached entry of the plain key.
+    """
+    return f"api_key:{key_or_prefix[: ApiKeyService.DISPLAY_PREFIX_LENGTH]}"
+
+
+async def invalidate_api_key_cache(*prefixes: Optional[str]) -> None:
+    """Drop cached resolutions of these keys on every worker"""
+    tags = [api_key_cache_tag(prefix) for prefix in prefixes if prefix]
+    if tags:
+        await cache_manager.invalidate_tags(*tags)
+
+
+@dataclass(frozen=True)
+class ApiKeyIdentity:
+    """What a request needs from a verified key, cached instead of the ApiKey row"""
+
+    id: str
+    organization_id: str
+    user_id: str
+    scopes: Tuple[str, ...]
+    rate_limit_per_min: int
+    expires_at: Optional[datetime] = None
+
+    @classmethod
+    def from_api_key(cls, api_key: ApiKey) -> "ApiKeyIdentity":
+        return cls(
+            id=str(api_key.id),
+            organization_id=str(api_key.organization_id),
+            user_id=str(api_key.user_id),
+            scopes=tuple(api_key.scopes or ()),
+            rate_limit_per_min=api_key.rate_limit_per_min or 60,
+            expires_at=api_key.expires_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ApiKeyIdentity":
+        expires_at = data.get("expires_at")
+        return cls(
+            id=data["id"],
+            organization_id=data["organization_id"],
+            user_id=data["user_id"],
+            scopes=tuple(data.get("scopes") or ()),
+            rate_limit_per_min=data.get("rate_limit_per_min") or 60,
+            expires_at=datetime.fromisoformat(expires_at) if expires_at else None,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "organization_id": self.organization_id,
+            "user_id": self.user_id,
+            "scopes": list(self.scopes),
+            "rate_limit_per_min": self.rate_limit_per_min,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return self.expires_at is not None and self.expires_at < (now or datetime.utcnow())
+
+
+@cached(
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+    key_prefix="api_key",
+    key_builder=lambda plain_key: ApiKeyService.hash_key_sha256(plain_key),
+    tags=lambda plain_key: [api_key_cache_tag(plain_key)],
+    local_ttl=API_KEY_LOCAL_CACHE_SECONDS,
+    cache_none=False,  # Unknown keys always reach the database, so new keys work at once
+)
+async def _load_api_key_identity(plain_key: str) -> Optional[dict]:
+    from app.database import get_db
+
+    async for db in get_db():
+        try:
+            api_key = await ApiKeyService(db)._resolve_api_key(plain_key)
+        finally:
+            await db.close()
+        return ApiKeyIdentity.from_api_key(api_key).to_dict() if api_key else None
+    return None
+
+
+async def resolve_api_key_identity(plain_key: str) -> Optional[ApiKeyIdentity]:
+    """
+    Verify a plain API key for the request path.
+
+    Returns the key's identity, or None if the key is unknown, revoked or
+    expired. Expiry is checked on every call, so a cached key stops working the
+    moment it expires.
+    """
+    data = await _load_api_key_identity(plain_key)
+    if data is None:
+        return None
+    identity = ApiKeyIdentity.from_dict(data)
+    if identity.is_expired():
+        return None
+    return identity
+
+
+class ApiKeyUsageRecorder(LastUsedRecorder):
+    """
+    Coalesced ``last_used`` writes for API keys, flushed every
+    ``API_KEY_LAST_USED_FLUSH_SECONDS``.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        super().__init__(
+            "API key last_used",
+            {"api_key": ApiKey.__table__.c.last_used},
+            lambda: settings.API_KEY_LAST_USED_FLUSH_SECONDS,
+            session_factory,
+        )
+
+    def touch(self, api_key_id, when: Optional[datetime] = None):
+        key_id = api_key_id if isinstance(api_key_id, uuid.UUID) else uuid.UUID(str(api_key_id))
+        self.record("api_key", key_id, when)
+
+
+api_key_usage = ApiKeyUsageRecorder()
@@ -0,0 +1,160 @@
+"""
+Monthly partitions for the audit_logs table.
+
+On PostgreSQL, migration 014 turns ``audit_logs`` into a table range-partitioned
+by month on ``created_at`` (``audit_logs_2026_10`` holds October 2026, and
+``audit_logs_default`` catches anything outside the created ranges). This module
+keeps partitions created ahead of time and gives queries the bounded
+``created_at`` window they need for the planner to prune partitions.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+MAINTENANCE_INTERVAL_SECONDS = 24 * 3600
+
+_maintenance_task: Optional[asyncio.Task] = None
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def query_window(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[datetime] = None,
+) -> Tuple[Optional[datetime], datetime]:
+    """
+    Resolve the ``[start, end]`` created_at range for an audit log listing.
+
+    The end is always bounded (by the pagination cursor when it is older), so
+    the partitions created ahead of time are never scanned. The start is only
+    bounded when the caller asks for one: a listing without a start date pages
+    through all history, and its total and ``has_more`` cover every partition.
+    Newest-first pages still stop in the newest partitions.
+    """
+    end = end_date or datetime.utcnow()
+    if cursor is not None and cursor < end:
+        end = cursor
+    return start_date, end
+
+
+def apply_window(stmt: Any, column: Any, start: Optional[datetime], end: datetime) -> Any:
+    """Add the partition-pruning ``start <= created_at <= end`` predicates (no start: open)"""
+    if start is not None:
+        stmt = stmt.where(column >= start)
+    return stmt.where(column <= end)
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    if session.bind.dialect.name != "postgresql":
+        return False
+    relkind = (
+        await session.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = :name"), {"name": PARENT_TABLE}
+        )
+    ).scalar_one_or_none()
+    return relkind == "p"
+
+
+async def ensure_partitions(
+    session: AsyncSession, months_ahead: Optional[int] = None, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create the current month's partition and ``months_ahead`` future ones.
+
+    Idempotent (``CREATE TABLE IF NOT EXISTS``) and a no-op unless audit_logs
+    is partitioned. Runs under a short ``lock_timeout``; a month whose lock is
+    not granted in time is retried by the next maintenance run. A month whose rows already landed in the default partition
+    cannot be created until they are moved; that is logged and skipped, and
+    writes keep going to the default partition in the meantime.
+    """
+    if not await is_partitioned(session):
+        return []
+
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD
+    current = month_start(now or datetime.utcnow())
+
+    # Attaching a partition locks the parent; never queue behind (and block)
+    # live audit writes for longer than this
+    await session.execute(
+        text(f"SET LOCAL lock_timeout = {int(settings.AUDIT_LOG_PARTITION_LOCK_TIMEOUT_MS)}")
+    )
+
+    created = []
+    for offset in range(months_ahead + 1):
+        lower = add_months(current, offset)
+        upper = add_months(lower, 1)
+        name = partition_name(lower)
+        exists = (
+            await session.execute(text("SELECT to_regclass(:name)"), {"name": name})
+        ).scalar_one_or_none()
+        if exists:
+            continue
+        try:
+            async with session.begin_nested():
+                await session.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+                    )
+                )
+            created.append(name)
+        except Exception as e:
+            logger.warning(f"Could not create audit log partition {name}: {e}")
+    await session.commit()
+
+    if created:
+        logger.info(f"Created audit log partitions: {', '.join(created)}")
+    return created
+
+
+async def _maintain_partitions():
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await ensure_partitions(session)
+        except Exception as e:
+            logger.warning(f"Audit log partition maintenance failed: {e}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+def start_partition_maintenance():
+    """Create upcoming partitions now and then once a day, in the background"""
+    global _maintenance_task
+    if _maintenance_task is None or _maintenance_task.done():
+        _maintenance_task = asyncio.create_task(_maintain_partitions())
+
+
+async def stop_partition_maintenance():
+    global _maintenance_task
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        try:
+            await _maintenance_task
+        except asyncio.CancelledError:
+            pass
+        _maintenance_task = None
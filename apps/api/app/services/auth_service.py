@@ -12,8 +12,9 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.core.redis import SessionStore, get_redis
+from app.core.redis import SessionStore, get_read_redis, get_redis
 from app.models import AuditLog, Session, User
+from app.services.metrics_rollup import metrics_rollup
 
 logger = structlog.get_logger()
 
@@ -121,19 +122,23 @@ class AuthService:
 
         if not user:
             logger.warning("Authentication failed - user not found", email=email)
+            metrics_rollup.record("auth.failure")
             return None
 
         if not user.is_active:
             logger.warning("Authentication failed - user inactive", user_id=str(user.id))
+            metrics_rollup.record("auth.failure")
             return None
 
         if user.is_suspended:
             logger.warning("Authentication failed - user suspended", user_id=str(user.id))
+            metrics_rollup.record("auth.failure")
             return None
 
         # Verify password
         if not AuthService.verify_password(password, user.password_hash):
             logger.warning("Authentication failed - invalid password", user_id=str(user.id))
+            metrics_rollup.record("auth.failure")
 
             # Log failed attempt
             await AuthService.create_audit_log(
@@ -159,6 +164,7 @@ class AuthService:
 
         await db.commit()
 
+        metrics_rollup.record("auth.success")
         logger.info("User authenticated", user_id=str(user.id))
         return user
 
@@ -308,6 +314,7 @@ class AuthService:
 
         revoked_count = 0
         redis = await get_redis()
+        session_store = SessionStore(redis, read_client=await get_read_redis())
 
         for session in sessions:
             # Mark session as revoked
@@ -320,7 +327,6 @@ class AuthService:
                 await jwt_manager.blacklist_token(session.access_token_jti, "access")
 
             # Remove from Redis
-            session_store = SessionStore(redis)
             await session_store.delete(str(session.id))
 
             revoked_count += 1
@@ -384,6 +390,7 @@ class AuthService:
             sessions_to_remove = len(existing_sessions) - max_sessions + 1  # +1 for new session
             if sessions_to_remove > 0:
                 redis = await get_redis()
+                session_store = SessionStore(redis, read_client=await get_read_redis())
                 for i, old_session in enumerate(existing_sessions):
                     if i >= sessions_to_remove:
                         break
@@ -398,7 +405,6 @@ class AuthService:
                         await jwt_manager.blacklist_token(old_session.access_token_jti, "access")
 
                     # Remove from Redis
-                    session_store = SessionStore(redis)
                     await session_store.delete(str(old_session.id))
 
                 logger.info(
@@ -437,7 +443,7 @@ class AuthService:
 
         # Store in Redis for fast lookup
         redis = await get_redis()
-        session_store = SessionStore(redis)
+        session_store = SessionStore(redis, read_client=await get_read_redis())
         await session_store.set(
             session_id=str(session.id),
             data={
@@ -615,7 +621,7 @@ class AuthService:
         await redis.set(f"blacklist:{session.refresh_token_jti}", "1", ex=86400)
 
         # Remove from Redis session store
-        session_store = SessionStore(redis)
+        session_store = SessionStore(redis, read_client=await get_read_redis())
         await session_store.delete(str(session_id))
 
         # Create audit log
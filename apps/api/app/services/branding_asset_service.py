@@ -0,0 +1,453 @@
+"""
+Precompiled organization branding.
+
+The hosted login page fetches an organization's stylesheet and logos on every
+load, but branding only changes when an admin saves it. Branding is therefore
+compiled at write time: one minified stylesheet per theme mode, each
+fingerprinted with a content hash that doubles as the HTTP ETag, plus the URLs
+of logo/favicon variants that were resized once at upload.
+
+Compiled branding is held in a process-local dict with Redis as the shared
+tier, so the login page's critical path never queries Postgres; only a cold
+cache (e.g. after a Redis flush) rebuilds from the database. Writers recompile,
+store in Redis and broadcast an invalidation so other workers drop their copy;
+without the invalidation bus, local copies fall back to a short TTL. Only
+organizations that exist are cached, so unauthenticated requests for made-up
+ids cannot fill the caches.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models import Organization
+from app.models.white_label import BrandingConfiguration, ThemeMode
+
+logger = logging.getLogger(__name__)
+
+BRANDING_REDIS_KEY_PREFIX = "branding:compiled:v1:"
+# A missed key is rebuilt from the database, so stale orgs need not linger
+BRANDING_REDIS_TTL_SECONDS = 24 * 3600
+BRANDING_INVALIDATION_TOPIC = "branding"
+MAX_LOCAL_ENTRIES = 1000
+BRANDING_LOCAL_TTL_SECONDS = 60  # Used when invalidation events are unavailable
+BRANDING_LOCAL_MAX_AGE_SECONDS = 3600  # Safety refresh while the invalidation bus is listening
+
+# Variants generated once per upload: label -> (max_width, max_height)
+LOGO_VARIANTS: Dict[str, Tuple[int, int]] = {"1x": (400, 100), "2x": (800, 200)}
+FAVICON_VARIANTS: Dict[str, Tuple[int, int]] = {"32": (32, 32), "180": (180, 180)}
+
+# Vector and icon formats are served as uploaded
+_UNRESIZABLE_TYPES = {"image/svg+xml", "image/x-icon", "image/vnd.microsoft.icon"}
+
+# Variant extension -> PIL format; anything else is written as PNG to keep transparency
+_VARIANT_FORMATS = {"png": "PNG", "webp": "WEBP", "jpg": "JPEG", "jpeg": "JPEG"}
+
+_COLOR_SCHEMES = {
+    ThemeMode.LIGHT: "light",
+    ThemeMode.DARK: "dark",
+    ThemeMode.AUTO: "light dark",
+}
+
+
+# Comments, or string literals (which are copied through untouched)
+_CSS_TOKENS = re.compile(r"/\*.*?\*/|(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')", re.S)
+# A property name inside a block: what follows ends at ";" or "}", not at a nested "{"
+_CSS_DECLARATION = re.compile(r"([{;])([\w-]+)\s*:\s*(?=[^{};]*[;}])")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace."""
+    strings = []
+
+    def _stash(match: re.Match) -> str:
+        if match.group(1) is None:
+            return " "
+        strings.append(match.group(1))
+        return f"\x00{len(strings) - 1}\x00"
+
+    css = _CSS_TOKENS.sub(_stash, css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = _CSS_DECLARATION.sub(r"\1\2:", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\x00(\d+)\x00", lambda m: strings[int(m.group(1))], css)
+
+
+def generate_default_css(theme_mode: ThemeMode = ThemeMode.LIGHT) -> str:
+    """Generate default CSS"""
+    return f"""
+    :root {{
+        color-scheme: {_COLOR_SCHEMES[theme_mode]};
+        --primary-color: #1a73e8;
+        --secondary-color: #ea4335;
+        --accent-color: #34a853;
+        --background-color: #ffffff;
+        --surface-color: #f8f9fa;
+        --text-color: #202124;
+        --border-radius: 8px;
+        --font-family: Inter, system-ui, sans-serif;
+    }}
+
+    body {{
+        font-family: var(--font-family);
+        color: var(--text-color);
+        background-color: var(--background-color);
+    }}
+
+    .btn-primary {{
+        background-color: var(--primary-color);
+        border-radius: var(--border-radius);
+    }}
+    """
+
+
+def generate_organization_css(config: BrandingConfiguration, theme_mode: ThemeMode) -> str:
+    """Generate CSS from branding configuration"""
+    css_vars = f"""
+    :root {{
+        color-scheme: {_COLOR_SCHEMES[theme_mode]};
+        --primary-color: {config.primary_color};
+        --secondary-color: {config.secondary_color};
+        --accent-color: {config.accent_color};
+        --background-color: {config.background_color};
+        --surface-color: {config.surface_color};
+        --text-color: {config.text_color};
+        --border-radius: {config.border_radius};
+        --font-family: {config.font_family};
+    }}
+
+    body {{
+        font-family: var(--font-family);
+        color: var(--text-color);
+        background-color: var(--background-color);
+    }}
+
+    .btn-primary {{
+        background-color: var(--primary-color);
+        border-radius: var(--border-radius);
+    }}
+
+    .btn-secondary {{
+        background-color: var(--secondary-color);
+        border-radius: var(--border-radius);
+    }}
+    """
+
+    # Add custom CSS if provided
+    if config.custom_css:
+        css_vars += f"\n\n{config.custom_css}"
+
+    return css_vars
+
+
+@dataclass(frozen=True)
+class CompiledStylesheet:
+    """A minified, fingerprinted stylesheet for one theme mode."""
+
+    theme_mode: ThemeMode
+    body: bytes
+    etag: str
+
+    @property
+    def version(self) -> str:
+        return self.etag.strip('"')
+
+    @classmethod
+    def from_css(cls, theme_mode: ThemeMode, css: str) -> "CompiledStylesheet":
+        body = minify_css(css).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        return cls(theme_mode=theme_mode, body=body, etag=f'"{digest}"')
+
+
+@dataclass(frozen=True)
+class CompiledBranding:
+    """Everything the hosted login page needs for one organization."""
+
+    organization_id: str
+    stylesheets: Dict[ThemeMode, CompiledStylesheet]
+    # Asset kind ("logo", "logo_dark", "favicon") -> {"original": url, <variant>: url}
+    assets: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def stylesheet(self, theme_mode: Optional[ThemeMode]) -> CompiledStylesheet:
+        return self.stylesheets[theme_mode or ThemeMode.LIGHT]
+
+    def manifest(self, css_path: str) -> Dict[str, Any]:
+        """Fingerprinted URLs for every compiled asset."""
+        return {
+            "organization_id": self.organization_id,
+            "css": {
+                mode.value: f"{css_path}?theme_mode={mode.value}&v={sheet.version}"
+                for mode, sheet in self.stylesheets.items()
+            },
+            **self.assets,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "organization_id": self.organization_id,
+                "css": {mode.value: s.body.decode("utf-8") for mode, s in self.stylesheets.items()},
+                "assets": self.assets,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CompiledBranding":
+        data = json.loads(raw)
+        return cls(
+            organization_id=data["organization_id"],
+            stylesheets={
+                ThemeMode(mode): CompiledStylesheet.from_css(ThemeMode(mode), css)
+                for mode, css in data["css"].items()
+            },
+            assets=data.get("assets", {}),
+        )
+
+
+def variant_path(url_path: str, label: str) -> str:
+    """``/uploads/.../org_logo_<hash>.png`` -> ``/uploads/.../org_logo_<hash>_<label>.png``"""
+    suffix = PurePosixPath(url_path).suffix
+    extension = suffix[1:].lower()
+    if extension not in _VARIANT_FORMATS:
+        extension = "png"
+    return f"{url_path[: len(url_path) - len(suffix)]}_{label}.{extension}"
+
+
+def _resize_image(contents: bytes, max_width: int, max_height: int, image_format: str) -> bytes:
+    """Shrink an image to fit the box, keeping its alpha channel unless saving as JPEG."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(contents)) as img:
+        img.load()
+        if image_format == "JPEG":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        img.save(output, format=image_format, optimize=True)
+        return output.getvalue()
+
+
+def _local_file(url_path: str) -> Optional[Path]:
+    """Resolve an /uploads/ URL to a file inside UPLOAD_DIR, or None."""
+    if not url_path or not url_path.startswith("/uploads/"):
+        return None
+    base_dir = Path(settings.UPLOAD_DIR).resolve()
+    target = (base_dir / url_path.replace("/uploads/", "", 1)).resolve()
+    try:
+        target.relative_to(base_dir)
+    except ValueError:
+        return None
+    return target
+
+
+async def create_image_variants(
+    contents: bytes,
+    url_path: str,
+    content_type: Optional[str],
+    variants: Dict[str, Tuple[int, int]],
+) -> Dict[str, str]:
+    """Resize an uploaded image once per variant and write the results next to it."""
+    if content_type in _UNRESIZABLE_TYPES:
+        return {}
+
+    created: Dict[str, str] = {}
+    for label, (max_width, max_height) in variants.items():
+        variant_url = variant_path(url_path, label)
+        target = _local_file(variant_url)
+        if target is None:
+            continue
+        image_format = _VARIANT_FORMATS[variant_url.rsplit(".", 1)[1]]
+        try:
+            resized = await asyncio.to_thread(
+                _resize_image, contents, max_width, max_height, image_format
+            )
+        except Exception as e:
+            # Not a raster image PIL understands; keep serving the original only
+            logger.warning(f"Failed to create image variant: {e}")
+            return {}
+        await asyncio.to_thread(target.write_bytes, resized)
+        created[label] = variant_url
+    return created
+
+
+def delete_image_variants(url_path: Optional[str], variants: Dict[str, Tuple[int, int]]):
+    """Remove the resized variants of an uploaded image."""
+    if not url_path:
+        return
+    for label in variants:
+        target = _local_file(variant_path(url_path, label))
+        if target is not None and target.is_file():
+            try:
+                target.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to delete image variant: {e}")
+
+
+def _asset_urls(url_path: Optional[str], variants: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+    if not url_path:
+        return {}
+    urls = {"original": url_path}
+    for label in variants:
+        variant_url = variant_path(url_path, label)
+        target = _local_file(variant_url)
+        if target is not None and target.is_file():
+            urls[label] = variant_url
+    return urls
+
+
+def compile_branding(
+    organization_id: str, config: Optional[BrandingConfiguration]
+) -> CompiledBranding:
+    """Compile stylesheets and asset URLs; a missing or disabled config gets the defaults."""
+    if config is None or not config.is_enabled:
+        return CompiledBranding(
+            organization_id=organization_id,
+            stylesheets={
+                mode: CompiledStylesheet.from_css(mode, generate_default_css(mode))
+                for mode in ThemeMode
+            },
+        )
+
+    assets = {
+        "logo": _asset_urls(config.company_logo_url, LOGO_VARIANTS),
+        "logo_dark": _asset_urls(config.company_logo_dark_url, LOGO_VARIANTS),
+        "favicon": _asset_urls(config.company_favicon_url, FAVICON_VARIANTS),
+    }
+    return CompiledBranding(
+        organization_id=organization_id,
+        stylesheets={
+            mode: CompiledStylesheet.from_css(mode, generate_organization_css(config, mode))
+            for mode in ThemeMode
+        },
+        assets={kind: urls for kind, urls in assets.items() if urls},
+    )
+
+
+# Process-local compiled branding: organization id -> (monotonic time stored, CompiledBranding)
+_branding: Dict[str, Tuple[float, CompiledBranding]] = {}
+
+
+def invalidate_local_branding(organization_id: str = ""):
+    """Drop this worker's copy for one organization (or all of them)."""
+    if organization_id:
+        _branding.pop(organization_id, None)
+    else:
+        _branding.clear()
+
+
+invalidation_bus.subscribe(BRANDING_INVALIDATION_TOPIC, invalidate_local_branding)
+
+
+def _remember(branding: CompiledBranding):
+    if len(_branding) >= MAX_LOCAL_ENTRIES and branding.organization_id not in _branding:
+        _branding.pop(next(iter(_branding)))
+    _branding[branding.organization_id] = (time.monotonic(), branding)
+
+
+def _local_branding(organization_id: str) -> Optional[CompiledBranding]:
+    entry = _branding.get(organization_id)
+    if entry is None:
+        return None
+    stored_at, branding = entry
+    ttl = (
+        BRANDING_LOCAL_MAX_AGE_SECONDS if invalidation_bus.listening else BRANDING_LOCAL_TTL_SECONDS
+    )
+    if time.monotonic() - stored_at >= ttl:
+        _branding.pop(organization_id, None)
+        return None
+    return branding
+
+
+async def build_branding(db: AsyncSession, organization_id: str) -> Tuple[CompiledBranding, bool]:
+    """
+    Compile an organization's branding from the database.
+
+    Returns the branding and whether it may be cached: False when the id is not
+    a UUID or names no organization (such ids still get the default branding).
+    """
+    try:
+        org_uuid = uuid.UUID(organization_id)
+    except ValueError:
+        return compile_branding(organization_id, None), False
+
+    result = await db.execute(
+        select(BrandingConfiguration).where(BrandingConfiguration.organization_id == org_uuid)
+    )
+    config = result.scalar_one_or_none()
+    if config is None:
+        exists = await db.execute(select(Organization.id).where(Organization.id == org_uuid))
+        if exists.scalar_one_or_none() is None:
+            return compile_branding(organization_id, None), False
+    return compile_branding(organization_id, config), True
+
+
+async def _load_from_redis(organization_id: str) -> Optional[CompiledBranding]:
+    from app.core.redis import get_redis
+
+    try:
+        redis_client = await get_redis()
+        raw = await redis_client.get(f"{BRANDING_REDIS_KEY_PREFIX}{organization_id}")
+        if not raw:
+            return None
+        return CompiledBranding.from_json(raw)
+    except Exception as e:
+        logger.warning(f"Failed to load compiled branding from Redis: {e}")
+        return None
+
+
+async def _store_in_redis(branding: CompiledBranding):
+    from app.core.redis import get_redis
+
+    try:
+        redis_client = await get_redis()
+        await redis_client.set(
+            f"{BRANDING_REDIS_KEY_PREFIX}{branding.organization_id}",
+            branding.to_json(),
+            ex=BRANDING_REDIS_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store compiled branding in Redis: {e}")
+
+
+async def get_branding(db: AsyncSession, organization_id: str) -> CompiledBranding:
+    """Return compiled branding: process memory, then Redis, then a database build."""
+    branding = _local_branding(organization_id)
+    if branding is not None:
+        return branding
+
+    branding = await _load_from_redis(organization_id)
+    if branding is None:
+        branding, cacheable = await build_branding(db, organization_id)
+        if not cacheable:
+            return branding
+        await _store_in_redis(branding)
+
+    _remember(branding)
+    return branding
+
+
+async def publish_branding(
+    organization_id: str, config: Optional[BrandingConfiguration]
+) -> CompiledBranding:
+    """Recompile after a branding write and propagate to every worker."""
+    branding = compile_branding(organization_id, config)
+    await _store_in_redis(branding)
+    _remember(branding)
+    await invalidation_bus.publish(BRANDING_INVALIDATION_TOPIC, organization_id)
+    return branding
@@ -3,11 +3,23 @@ OAuth Client Credential Rotation Service
 
 Manages graceful client secret rotation with overlap periods,
 allowing zero-downtime credential updates.
+
+Validation costs one bcrypt check however many secrets are live: the stored
+display prefix (the secret's first characters, not secret on its own) picks
+the candidate, and only its hash is checked, in a worker thread. Successful
+checks are remembered per worker for ``CLIENT_SECRET_VERIFY_CACHE_SECONDS``,
+keyed by the stored hash, so a revoked or expired secret stops matching as
+soon as it leaves the active set. ``last_used_at`` is recorded in memory and
+written in batches by ``client_secret_usage``.
 """
 
+import asyncio
+import hashlib
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from uuid import UUID
 
 import bcrypt
@@ -16,10 +28,43 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.last_used import LastUsedRecorder
 from app.models import AuditLog, OAuthClient, OAuthClientSecret, User
 
 logger = structlog.get_logger(__name__)
 
+MAX_VERIFIED_SECRETS = 10000
+
+# hash of (stored hash, presented secret) -> monotonic expiry
+_verified: "OrderedDict[str, float]" = OrderedDict()
+
+
+def _is_candidate(stored_prefix: Optional[str], plain_secret: str) -> bool:
+    """Whether a secret with this display prefix can be ``plain_secret``"""
+    if not isinstance(stored_prefix, str) or not stored_prefix:
+        return True  # No usable prefix recorded; check the hash
+    return plain_secret.startswith(stored_prefix.removesuffix("..."))
+
+
+async def _verify_hash(secret_hash: str, plain_secret: str, verify: Callable[[str], bool]) -> bool:
+    """Run ``verify`` (bcrypt) off the event loop, unless it recently succeeded"""
+    key = hashlib.sha256(f"{secret_hash}\0{plain_secret}".encode()).hexdigest()
+    now = time.monotonic()
+    expires_at = _verified.get(key)
+    if expires_at is not None:
+        if expires_at > now:
+            _verified.move_to_end(key)
+            return True
+        del _verified[key]
+
+    if not await asyncio.to_thread(verify, plain_secret):
+        return False
+
+    _verified[key] = now + settings.CLIENT_SECRET_VERIFY_CACHE_SECONDS
+    while len(_verified) > MAX_VERIFIED_SECRETS:
+        _verified.popitem(last=False)
+    return True
+
 
 class CredentialRotationService:
     """Service for managing OAuth client credential rotation."""
@@ -82,7 +127,7 @@ class CredentialRotationService:
         plain_secret: str,
     ) -> Optional[OAuthClientSecret]:
         """
-        Validate a secret against all active secrets for a client.
+        Validate a secret against the active secrets for a client.
 
         Args:
             client: The OAuth client
@@ -91,36 +136,62 @@ class CredentialRotationService:
         Returns:
             The matching OAuthClientSecret if valid, None otherwise
         """
-        if not settings.CLIENT_SECRET_ROTATION_ENABLED:
-            # Fall back to legacy single-secret validation
-            if client.verify_secret(plain_secret):
-                return None  # Indicates valid but no rotation tracking
-            return None
+        _, matched = await self._match(client, plain_secret)
+        return matched
 
-        # Get all active secrets
-        active_secrets = await self.get_active_secrets(client.id)
+    async def verify(
+        self,
+        client: OAuthClient,
+        plain_secret: str,
+    ) -> bool:
+        """
+        Check a client secret: any active rotated secret, or the client's own.
 
-        # Also check legacy secret for backward compatibility
-        if not active_secrets:
-            if client.verify_secret(plain_secret):
-                # Migrate to new system by creating a secret record
-                await self._migrate_legacy_secret(client)
-                return None
-            return None
+        Args:
+            client: The OAuth client
+            plain_secret: The plain text secret to check
 
-        # Check against all active secrets
-        for secret in active_secrets:
-            if secret.verify(plain_secret):
-                # Update last used timestamp
-                secret.last_used_at = datetime.utcnow()
-                await self.db.commit()
-                return secret
+        Returns:
+            True if the secret is valid
+        """
+        valid, _ = await self._match(client, plain_secret)
+        if valid:
+            client_secret_usage.touch(client_id=client.id)
+        return valid
 
-        # Also check legacy secret as fallback
-        if client.verify_secret(plain_secret):
-            return None
+    async def _match(
+        self,
+        client: OAuthClient,
+        plain_secret: str,
+    ) -> Tuple[bool, Optional[OAuthClientSecret]]:
+        """(valid, matching secret record); the record is None for the legacy secret"""
+        if not plain_secret:
+            return False, None
+
+        checked = set()
+        active_secrets = []
+        if settings.CLIENT_SECRET_ROTATION_ENABLED:
+            active_secrets = await self.get_active_secrets(client.id)
+            for secret in active_secrets:
+                if not _is_candidate(secret.secret_prefix, plain_secret):
+                    continue
+                checked.add(secret.secret_hash)
+                if await _verify_hash(secret.secret_hash, plain_secret, secret.verify):
+                    client_secret_usage.touch(secret_id=secret.id)
+                    return True, secret
+
+        # Legacy single secret on the client (also the primary after a rotation)
+        if (
+            client.client_secret_hash not in checked
+            and _is_candidate(client.client_secret_prefix, plain_secret)
+            and await _verify_hash(client.client_secret_hash, plain_secret, client.verify_secret)
+        ):
+            if settings.CLIENT_SECRET_ROTATION_ENABLED and not active_secrets:
+                # Migrate to new system by creating a secret record
+                await self._migrate_legacy_secret(client)
+            return True, None
 
-        return None
+        return False, None
 
     async def _migrate_legacy_secret(self, client: OAuthClient) -> None:
         """
@@ -196,6 +267,7 @@ class CredentialRotationService:
         # Audit log
         audit_log = AuditLog(
             user_id=user.id,
+            organization_id=client.organization_id,
             action="oauth_client_secret_rotated",
             resource_type="oauth_client",
             resource_id=client.id,
@@ -247,10 +319,16 @@ class CredentialRotationService:
 
         secret.revoked_at = datetime.utcnow()
         secret.revoked_by = user.id
+        organization_id = (
+            await self.db.execute(
+                select(OAuthClient.organization_id).where(OAuthClient.id == secret.client_id)
+            )
+        ).scalar_one_or_none()
 
         # Audit log
         audit_log = AuditLog(
             user_id=user.id,
+            organization_id=organization_id,
             action="oauth_client_secret_revoked",
             resource_type="oauth_client_secret",
             resource_id=secret.id,
@@ -306,6 +384,7 @@ class CredentialRotationService:
         if revoked_count > 0:
             audit_log = AuditLog(
                 user_id=user.id,
+                organization_id=client.organization_id,
                 action="oauth_client_secrets_bulk_revoked",
                 resource_type="oauth_client",
                 resource_id=client.id,
@@ -411,3 +490,34 @@ class CredentialRotationService:
             logger.info("Cleaned up expired secrets", count=deleted_count)
 
         return deleted_count
+
+
+class ClientSecretUsageRecorder(LastUsedRecorder):
+    """
+    Coalesced ``last_used_at`` writes for client secrets and clients, flushed
+    every ``CLIENT_SECRET_LAST_USED_FLUSH_SECONDS``.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        super().__init__(
+            "Client secret last_used_at",
+            {
+                "secret": OAuthClientSecret.__table__.c.last_used_at,
+                "client": OAuthClient.__table__.c.last_used_at,
+            },
+            lambda: settings.CLIENT_SECRET_LAST_USED_FLUSH_SECONDS,
+            session_factory,
+        )
+
+    def touch(
+        self,
+        secret_id: Optional[UUID] = None,
+        client_id: Optional[UUID] = None,
+        when: Optional[datetime] = None,
+    ):
+        for target, row_id in (("secret", secret_id), ("client", client_id)):
+            if row_id is not None:
+                self.record(target, row_id, when)
+
+
+client_secret_usage = ClientSecretUsageRecorder()
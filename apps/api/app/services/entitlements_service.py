@@ -33,15 +33,19 @@ Atrium store) can diff tokens by string equality on the claim.
 
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Iterable, Optional
 from uuid import UUID as UuidType
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.invalidation import invalidation_bus
 from app.models import (
     EntitlementSource,
     Organization,
@@ -69,6 +73,7 @@ async def _rollback_after_read_failure(
     logger.warning(event, error=str(exc), **log_kw)
     await db.rollback()
 
+
 # Admin catch-all: these products are always granted at `admin` tier to any
 # user marked `is_admin=True`. Keeps first-run admin access working before
 # any subscription data exists. Specific to the MADFAM ecosystem; new
@@ -170,19 +175,6 @@ async def get_user_entitlements(
     if now is None:
         now = datetime.utcnow()
 
-    merged: dict[str, Entitlement] = {}
-
-    # 3rd priority — admin bootstrap catch-all.
-    if getattr(user, "is_admin", False):
-        for slug in ADMIN_BOOTSTRAP_PRODUCTS:
-            merged[slug] = Entitlement(
-                product=slug,
-                tier=ADMIN_TIER,
-                expires_at=None,
-                source=EntitlementSource.ADMIN_GRANT,
-            )
-
-    # 2nd priority — org membership inheritance.
     try:
         org_tiers = await _fetch_org_tiers(user, db)
     except Exception as exc:
@@ -196,16 +188,6 @@ async def get_user_entitlements(
         )
         org_tiers = {}
 
-    for product, tier in org_tiers.items():
-        merged[product] = Entitlement(
-            product=product,
-            tier=str(tier),
-            expires_at=None,
-            source=EntitlementSource.INHERITED,
-        )
-
-    # 1st priority — explicit per-user rows. Inactive (expired) rows are
-    # dropped here; they don't override a still-valid org inheritance.
     try:
         user_rows = await _fetch_user_rows(user.id, db)
     except Exception as exc:
@@ -217,6 +199,39 @@ async def get_user_entitlements(
         )
         user_rows = []
 
+    return _merge_entitlements(user, org_tiers, user_rows, now)
+
+
+def _merge_entitlements(
+    user: User,
+    org_tiers: dict[str, str],
+    user_rows: Iterable[UserEntitlement],
+    now: datetime,
+) -> list[Entitlement]:
+    """Apply the per-user > org > admin bootstrap priority order."""
+    merged: dict[str, Entitlement] = {}
+
+    # 3rd priority — admin bootstrap catch-all.
+    if getattr(user, "is_admin", False):
+        for slug in ADMIN_BOOTSTRAP_PRODUCTS:
+            merged[slug] = Entitlement(
+                product=slug,
+                tier=ADMIN_TIER,
+                expires_at=None,
+                source=EntitlementSource.ADMIN_GRANT,
+            )
+
+    # 2nd priority — org membership inheritance.
+    for product, tier in org_tiers.items():
+        merged[product] = Entitlement(
+            product=product,
+            tier=str(tier),
+            expires_at=None,
+            source=EntitlementSource.INHERITED,
+        )
+
+    # 1st priority — explicit per-user rows. Inactive (expired) rows are
+    # dropped here; they don't override a still-valid org inheritance.
     for row in user_rows:
         if not _is_active(row.expires_at, now):
             continue
@@ -316,3 +331,282 @@ async def cancel_entitlement(
         row.updated_at = datetime.utcnow()
         await db.flush()
     return row
+
+
+# ============================================================================
+# Token Entitlements Snapshot (shared by every token-minting path)
+# ============================================================================
+#
+# Refresh-token storms would otherwise re-read memberships, the primary org
+# and user_entitlements for every access token minted. The resolver below
+# caches one snapshot per user, stamped with version counters for the user
+# and their primary org:
+#
+# - writes to user_entitlements, organization_members and
+#   organizations.product_tiers / subscription_tier are picked up at flush
+#   time and bump the affected versions once the transaction commits (on
+#   every worker, via the invalidation bus);
+# - a snapshot is reused until the earliest entitlement in it expires;
+# - without the bus, snapshots fall back to a short TTL.
+
+ENTITLEMENTS_INVALIDATION_TOPIC = "entitlements"
+SNAPSHOT_TTL_SECONDS = 60  # Used when invalidation events are unavailable
+SNAPSHOT_MAX_AGE_SECONDS = 3600  # Safety refresh while the invalidation bus is listening
+SNAPSHOT_CACHE_SIZE = 10000
+MAX_TRACKED_VERSIONS = 100000
+
+_PENDING_KEY = "entitlements_changed"
+_ORG_CLAIM_FIELDS = ("product_tiers", "subscription_tier")
+
+
+@dataclass(frozen=True)
+class EntitlementsSnapshot:
+    """Everything a token needs from the entitlement sources, plus cache stamps."""
+
+    tier: str
+    roles: tuple[str, ...]
+    sub_status: str
+    is_admin: bool
+    products: tuple[str, ...]
+    expires_at: Optional[datetime]
+    tenant_id: Optional[str]
+    org_key: Optional[str]
+    version: tuple[int, int, int]
+    built_at: float
+
+    def to_claims(self) -> dict:
+        """Galaxy membership claims plus `madfam_entitled_products`."""
+        return {
+            "tier": self.tier,
+            "roles": list(self.roles),
+            "sub_status": self.sub_status,
+            "is_admin": self.is_admin,
+            "madfam_entitled_products": list(self.products),
+        }
+
+
+_versions: dict[str, int] = {}
+# Bumped whenever _versions is reset so snapshots built before the reset never match
+_epoch = 0
+_snapshots: OrderedDict[str, EntitlementsSnapshot] = OrderedDict()
+
+
+def _user_key(user_id: object) -> str:
+    return f"user:{user_id}"
+
+
+def _org_key(org_id: object) -> str:
+    return f"org:{org_id}"
+
+
+def _version(key: Optional[str]) -> int:
+    return _versions.get(key, 0) if key else 0
+
+
+def _apply_bump(key: str) -> None:
+    """Invalidate locally. An empty key (missed messages) drops every snapshot."""
+    global _epoch
+    if not key:
+        _snapshots.clear()
+        return
+    if len(_versions) >= MAX_TRACKED_VERSIONS:
+        _versions.clear()
+        _snapshots.clear()
+        _epoch += 1
+    _versions[key] = _versions.get(key, 0) + 1
+    if key.startswith("user:"):
+        _snapshots.pop(key, None)
+
+
+def bump_entitlements_version(
+    *, user_id: Optional[object] = None, org_id: Optional[object] = None
+) -> None:
+    """Invalidate cached token entitlements for a user and/or an org's members.
+
+    Writes made through the ORM are tracked automatically; call this after
+    committing changes made with bulk UPDATE/DELETE statements.
+    """
+    keys = []
+    if user_id is not None:
+        keys.append(_user_key(user_id))
+    if org_id is not None:
+        keys.append(_org_key(org_id))
+    for key in keys:
+        _apply_bump(key)
+        invalidation_bus.publish_nowait(ENTITLEMENTS_INVALIDATION_TOPIC, key)
+
+
+def clear_entitlements_cache() -> None:
+    """Drop every cached snapshot in this process."""
+    global _epoch
+    _snapshots.clear()
+    _versions.clear()
+    _epoch += 1
+
+
+def _is_fresh(snapshot: EntitlementsSnapshot, user: User, now: datetime) -> bool:
+    ttl = SNAPSHOT_MAX_AGE_SECONDS if invalidation_bus.listening else SNAPSHOT_TTL_SECONDS
+    tenant_id = getattr(user, "tenant_id", None)
+    return (
+        time.monotonic() - snapshot.built_at < ttl
+        and (snapshot.expires_at is None or snapshot.expires_at > now)
+        and snapshot.is_admin == bool(getattr(user, "is_admin", False))
+        and snapshot.tenant_id == (str(tenant_id) if tenant_id else None)
+        and snapshot.version == (_epoch, _version(_user_key(user.id)), _version(snapshot.org_key))
+    )
+
+
+async def resolve_token_entitlements(
+    user: User,
+    db: AsyncSession,
+    *,
+    now: Optional[datetime] = None,
+) -> EntitlementsSnapshot:
+    """
+    Resolve the entitlement claims for an access token.
+
+    Loads memberships, the primary org and per-user rows once and merges
+    them into a snapshot that later grants reuse until its versions change
+    or its earliest entitlement expires. Read failures degrade to the
+    defaults and are never cached.
+    """
+    if now is None:
+        now = datetime.utcnow()
+
+    user_key = _user_key(user.id)
+    cached = _snapshots.get(user_key)
+    if cached is not None:
+        if _is_fresh(cached, user, now):
+            _snapshots.move_to_end(user_key)
+            return cached
+        _snapshots.pop(user_key, None)
+
+    # Versions are read before the data so a concurrent bump marks this
+    # snapshot stale instead of being lost.
+    epoch, user_version = _epoch, _version(user_key)
+    is_admin = bool(getattr(user, "is_admin", False))
+    tenant_id = getattr(user, "tenant_id", None)
+
+    tier = "community"
+    sub_status = "inactive"
+    roles: set[str] = set()
+    org_tiers: dict[str, str] = {}
+    org_key: Optional[str] = None
+    org_version = 0
+    degraded = False
+
+    try:
+        result = await db.execute(
+            select(OrganizationMember).where(OrganizationMember.user_id == user.id)
+        )
+        memberships = result.scalars().all()
+        roles = {m.role for m in memberships if m.role}
+
+        # Primary org: User.tenant_id when set, otherwise the first membership.
+        primary_org_id = tenant_id or (memberships[0].organization_id if memberships else None)
+        if primary_org_id:
+            org_key = _org_key(primary_org_id)
+            org_version = _version(org_key)
+            org_result = await db.execute(
+                select(Organization).where(Organization.id == primary_org_id)
+            )
+            org = org_result.scalar_one_or_none()
+            if org is not None:
+                if memberships:
+                    tier = org.subscription_tier or "community"
+                    sub_status = "active"
+                if org.product_tiers:
+                    org_tiers = {str(k): str(v) for k, v in dict(org.product_tiers).items()}
+    except Exception as exc:
+        await _rollback_after_read_failure(
+            db,
+            exc,
+            event="Failed to fetch memberships for token entitlements",
+            user_id=str(user.id),
+        )
+        degraded = True
+
+    try:
+        user_rows = await _fetch_user_rows(user.id, db)
+    except Exception as exc:
+        await _rollback_after_read_failure(
+            db,
+            exc,
+            event="Failed to fetch user_entitlements rows",
+            user_id=str(user.id),
+        )
+        user_rows = []
+        degraded = True
+
+    if is_admin:
+        roles.add("admin")
+
+    entitlements = _merge_entitlements(user, org_tiers, user_rows, now)
+    expiries = [e.expires_at for e in entitlements if e.expires_at is not None]
+
+    snapshot = EntitlementsSnapshot(
+        tier=tier,
+        roles=tuple(sorted(roles)),
+        sub_status=sub_status,
+        is_admin=is_admin,
+        products=tuple(entitlements_to_claim(entitlements)),
+        expires_at=min(expiries) if expiries else None,
+        tenant_id=str(tenant_id) if tenant_id else None,
+        org_key=org_key,
+        version=(epoch, user_version, org_version),
+        built_at=time.monotonic(),
+    )
+
+    if not degraded:
+        _snapshots[user_key] = snapshot
+        while len(_snapshots) > SNAPSHOT_CACHE_SIZE:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _collect_changes(session: Session) -> set[str]:
+    """Version keys touched by a flush.
+
+    Runs in after_flush, where foreign keys are populated but new/dirty/deleted
+    and attribute history still describe the flushed changes.
+    """
+    keys: set[str] = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (UserEntitlement, OrganizationMember)):
+            keys.add(_user_key(obj.user_id))
+        elif isinstance(obj, Organization):
+            keys.add(_org_key(obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, (UserEntitlement, OrganizationMember)):
+            state = inspect(obj)
+            keys.add(_user_key(obj.user_id))
+            # A member moved to another user invalidates both
+            previous = state.attrs.user_id.history.deleted
+            keys.update(_user_key(user_id) for user_id in previous if user_id)
+        elif isinstance(obj, Organization):
+            attrs = inspect(obj).attrs
+            if any(attrs[name].history.has_changes() for name in _ORG_CLAIM_FIELDS):
+                keys.add(_org_key(obj.id))
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _track_entitlement_changes(session, _flush_context):
+    keys = _collect_changes(session)
+    if keys:
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_entitlement_changes(session):
+    for key in session.info.pop(_PENDING_KEY, ()):
+        _apply_bump(key)
+        invalidation_bus.publish_nowait(ENTITLEMENTS_INVALIDATION_TOPIC, key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_entitlement_changes(session, _previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+invalidation_bus.subscribe(ENTITLEMENTS_INVALIDATION_TOPIC, _apply_bump)
@@ -0,0 +1,246 @@
+"""
+Per-user login feature store for risk assessment.
+
+Risk scoring needs a handful of per-user signals on every login: how many
+logins in the last hour, how many failures in the last day, which devices and
+networks the user has been seen on, and the account's age. Querying those from
+Postgres costs several round trips per attempt, so they are maintained
+incrementally in Redis as login events happen and read back with one pipelined
+fetch.
+
+Keys share a ``{user_id}`` hash tag so a user's features live on one cluster
+slot and the fetch stays a single round trip:
+
+- ``logins`` / ``failures``: sorted sets of event timestamps, trimmed to their
+  rolling window on every write
+- ``devices`` / ``locations``: sorted sets of last-seen timestamps, capped to
+  the most recent entries
+- ``profile``: hash with account creation time and email
+
+A user with no ``profile`` hash is cold; callers load features from the
+database and :meth:`LoginFeatureStore.seed` the store.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "risk:features"
+LOGIN_WINDOW_SECONDS = 3600
+FAILURE_WINDOW_SECONDS = 86400
+MAX_KNOWN_DEVICES = 50
+MAX_KNOWN_LOCATIONS = 50
+FEATURE_TTL_SECONDS = 90 * 86400
+
+
+def location_key(ip_address: Optional[str]) -> Optional[str]:
+    """Coarse network location for an IP: its /24 (IPv4) or /48 (IPv6)."""
+    if not ip_address:
+        return None
+    try:
+        ip = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    prefix = 24 if ip.version == 4 else 48
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+@dataclass
+class LoginFeatures:
+    """Snapshot of a user's login features at assessment time."""
+
+    logins_last_hour: int = 0
+    failed_last_24h: int = 0
+    known_devices: Set[str] = field(default_factory=set)
+    known_locations: Set[str] = field(default_factory=set)
+    account_created_at: Optional[datetime] = None
+    email: Optional[str] = None
+
+    def is_new_device(self, device_fingerprint: Optional[str]) -> bool:
+        return not device_fingerprint or device_fingerprint not in self.known_devices
+
+    def is_new_location(self, ip_address: Optional[str]) -> bool:
+        # Without any history every location would look new; don't penalise that
+        if not self.known_locations:
+            return False
+        return location_key(ip_address) not in self.known_locations
+
+    def account_age_days(self) -> int:
+        if not self.account_created_at:
+            return 0
+        return (datetime.utcnow() - self.account_created_at).days
+
+
+class LoginFeatureStore:
+    """Redis-backed rolling login features, one pipelined round trip per read."""
+
+    def __init__(self, client=None):
+        self._client_override = client
+        self._pending: Set[asyncio.Task] = set()
+
+    async def _client(self):
+        if self._client_override is not None:
+            return self._client_override
+        from app.core.redis import get_raw_redis
+
+        return await get_raw_redis()
+
+    @staticmethod
+    def _key(user_id: str, name: str) -> str:
+        return f"{KEY_PREFIX}:{{{user_id}}}:{name}"
+
+    async def fetch(self, user_id: str) -> Optional[LoginFeatures]:
+        """Load all features for a user, or None if cold or Redis is unavailable."""
+        try:
+            client = await self._client()
+            if client is None:
+                return None
+
+            now = time.time()
+            pipe = client.pipeline(transaction=False)
+            pipe.hgetall(self._key(user_id, "profile"))
+            pipe.zcount(self._key(user_id, "logins"), now - LOGIN_WINDOW_SECONDS, "+inf")
+            pipe.zcount(self._key(user_id, "failures"), now - FAILURE_WINDOW_SECONDS, "+inf")
+            pipe.zrange(self._key(user_id, "devices"), 0, -1)
+            pipe.zrange(self._key(user_id, "locations"), 0, -1)
+            profile, logins, failures, devices, locations = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Login feature fetch failed: {e}")
+            return None
+
+        profile = {_as_str(k): _as_str(v) for k, v in (profile or {}).items()}
+        if "created_at" not in profile:
+            return None
+
+        created_at = None
+        if profile["created_at"]:
+            try:
+                created_at = datetime.fromisoformat(profile["created_at"])
+            except ValueError:
+                pass
+
+        return LoginFeatures(
+            logins_last_hour=int(logins or 0),
+            failed_last_24h=int(failures or 0),
+            known_devices={_as_str(d) for d in devices or []},
+            known_locations={_as_str(loc) for loc in locations or []},
+            account_created_at=created_at,
+            email=profile.get("email") or None,
+        )
+
+    async def seed(
+        self,
+        user_id: str,
+        created_at: Optional[datetime],
+        email: Optional[str],
+        devices: Iterable[str] = (),
+    ):
+        """Warm a cold user from database state."""
+        try:
+            client = await self._client()
+            if client is None:
+                return
+
+            now = time.time()
+            pipe = client.pipeline(transaction=False)
+            profile_key = self._key(user_id, "profile")
+            pipe.hset(
+                profile_key,
+                mapping={
+                    "created_at": created_at.isoformat() if created_at else "",
+                    "email": email or "",
+                },
+            )
+            pipe.expire(profile_key, FEATURE_TTL_SECONDS)
+            devices = [d for d in devices if d]
+            if devices:
+                devices_key = self._key(user_id, "devices")
+                pipe.zadd(devices_key, dict.fromkeys(devices, now), nx=True)
+                pipe.zremrangebyrank(devices_key, 0, -(MAX_KNOWN_DEVICES + 1))
+                pipe.expire(devices_key, FEATURE_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Login feature seed failed: {e}")
+
+    async def record_login(
+        self,
+        user_id: str,
+        success: bool,
+        ip_address: Optional[str] = None,
+        device_fingerprint: Optional[str] = None,
+    ):
+        """Fold one login attempt into the user's rolling features."""
+        try:
+            client = await self._client()
+            if client is None:
+                return
+
+            now = time.time()
+            event_id = f"{now:.6f}:{uuid.uuid4().hex[:8]}"
+            pipe = client.pipeline(transaction=False)
+
+            if not success:
+                failures_key = self._key(user_id, "failures")
+                pipe.zadd(failures_key, {event_id: now})
+                pipe.zremrangebyscore(failures_key, "-inf", now - FAILURE_WINDOW_SECONDS)
+                pipe.expire(failures_key, FAILURE_WINDOW_SECONDS)
+                await pipe.execute()
+                return
+
+            logins_key = self._key(user_id, "logins")
+            pipe.zadd(logins_key, {event_id: now})
+            pipe.zremrangebyscore(logins_key, "-inf", now - LOGIN_WINDOW_SECONDS)
+            pipe.expire(logins_key, LOGIN_WINDOW_SECONDS)
+
+            # Only successful logins make a device or network "known"
+            if device_fingerprint:
+                devices_key = self._key(user_id, "devices")
+                pipe.zadd(devices_key, {device_fingerprint: now})
+                pipe.zremrangebyrank(devices_key, 0, -(MAX_KNOWN_DEVICES + 1))
+                pipe.expire(devices_key, FEATURE_TTL_SECONDS)
+
+            location = location_key(ip_address)
+            if location:
+                locations_key = self._key(user_id, "locations")
+                pipe.zadd(locations_key, {location: now})
+                pipe.zremrangebyrank(locations_key, 0, -(MAX_KNOWN_LOCATIONS + 1))
+                pipe.expire(locations_key, FEATURE_TTL_SECONDS)
+
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Login feature update failed: {e}")
+
+    def record_login_nowait(
+        self,
+        user_id: str,
+        success: bool,
+        ip_address: Optional[str] = None,
+        device_fingerprint: Optional[str] = None,
+    ):
+        """Schedule :meth:`record_login` without blocking the login response."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            self.record_login(str(user_id), success, ip_address, device_fingerprint)
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def _as_str(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+# Global login feature store instance
+login_feature_store = LoginFeatureStore()
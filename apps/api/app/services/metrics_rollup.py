@@ -0,0 +1,371 @@
+"""
+Per-minute metric rollups.
+
+Request, authentication and compliance outcomes are counted when they happen
+instead of being recounted from audit rows on every dashboard view:
+
+1. ``record`` / ``observe`` only bump an in-process dict (no I/O on the request
+   path).
+2. Every ``METRICS_ROLLUP_FLUSH_SECONDS`` the counters are added to one Redis
+   hash per minute (``janua:rollup:<minute>``), shared by all workers.
+3. Every ``METRICS_ROLLUP_PERSIST_SECONDS`` closed minutes are moved from Redis
+   into the ``metrics_rollup`` table (one worker per minute, via a lock).
+
+Readers sum ``metrics_rollup`` rows plus the minutes still in Redis, so cost is
+O(minutes in the window), independent of event volume. Latencies are counted
+into fixed histogram buckets (``<metric>.latency.le_<ms>``) plus a running sum, from
+which percentiles and means are derived. Without Redis, flushes write straight
+to the database.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import MetricsRollup
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+KEY_PREFIX = "janua:rollup:"
+BUCKETS_KEY = "janua:rollup:buckets"
+REDIS_TTL_SECONDS = 24 * 3600
+MAX_PENDING_KEYS = 50000
+
+# Upper bounds (ms) of the latency histogram; the last bucket is open-ended
+LATENCY_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+OVERFLOW_BUCKET = "le_inf"
+
+Counter = Tuple[int, str, str]  # (minute, metric, scope)
+
+
+def minute_of(value: Optional[datetime] = None) -> int:
+    """Epoch minute of a naive UTC datetime (now by default)"""
+    if value is None:
+        return int(time.time() // 60)
+    return int((value - datetime(1970, 1, 1)).total_seconds() // 60)
+
+
+def bucket_start(minute: int) -> datetime:
+    return datetime(1970, 1, 1) + timedelta(minutes=minute)
+
+
+def latency_bucket(latency_ms: float) -> str:
+    for bound in LATENCY_BOUNDS_MS:
+        if latency_ms <= bound:
+            return f"le_{bound}"
+    return OVERFLOW_BUCKET
+
+
+def percentile_from_histogram(histogram: Dict[str, int], percentile: float) -> Optional[float]:
+    """
+    Estimate a percentile (0-100) from ``le_<ms>`` bucket counts.
+
+    Interpolates linearly inside the bucket that contains the rank; the
+    open-ended bucket reports the last finite bound.
+    """
+    total = sum(histogram.values())
+    if total <= 0:
+        return None
+    rank = total * percentile / 100.0
+    seen = 0
+    lower = 0.0
+    for bound in LATENCY_BOUNDS_MS:
+        count = histogram.get(f"le_{bound}", 0)
+        if count and seen + count >= rank:
+            return lower + (bound - lower) * (rank - seen) / count
+        seen += count
+        lower = float(bound)
+    return float(LATENCY_BOUNDS_MS[-1])
+
+
+def _field(metric: str, scope: str) -> str:
+    return f"{metric}|{scope}"
+
+
+class RollupRecorder:
+    """Write-time counters aggregated into per-minute buckets"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        redis_client=None,
+    ):
+        self._session_factory = session_factory
+        self._redis = redis_client
+        self._pending: Dict[Counter, int] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    # Recording (request path: in-memory only)
+
+    def record(self, metric: str, scope: str = GLOBAL_SCOPE, count: int = 1):
+        if len(self._pending) >= MAX_PENDING_KEYS:
+            return  # Flushing has stalled; drop rather than grow without bound
+        key = (minute_of(), metric, scope or GLOBAL_SCOPE)
+        self._pending[key] = self._pending.get(key, 0) + count
+
+    def observe(self, metric: str, latency_ms: float, scope: str = GLOBAL_SCOPE):
+        """Count one event and its latency into the metric's histogram"""
+        self.record(metric, scope)
+        self.record(f"{metric}.latency.{latency_bucket(latency_ms)}", scope)
+        self.record(f"{metric}.latency.sum_ms", scope, int(round(latency_ms)))
+
+    # Flushing
+
+    async def flush(self) -> int:
+        """Move pending counters to Redis (or to the database if Redis is down)"""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                minutes = set()
+                for (minute, metric, scope), count in pending.items():
+                    pipe.hincrby(f"{KEY_PREFIX}{minute}", _field(metric, scope), count)
+                    minutes.add(minute)
+                for minute in minutes:
+                    pipe.expire(f"{KEY_PREFIX}{minute}", REDIS_TTL_SECONDS)
+                    pipe.zadd(BUCKETS_KEY, {str(minute): minute})
+                await pipe.execute()
+                return len(pending)
+            except Exception as e:
+                logger.warning(f"Metrics rollup flush to Redis failed, writing to database: {e}")
+
+        try:
+            await self._upsert(pending)
+        except Exception as e:
+            logger.warning(f"Metrics rollup flush to database failed: {e}")
+            for key, count in pending.items():
+                self._pending[key] = self._pending.get(key, 0) + count
+            return 0
+        return len(pending)
+
+    async def persist_closed_buckets(self, now: Optional[datetime] = None) -> int:
+        """Move every Redis minute older than the current one into metrics_rollup"""
+        client = await self._get_redis()
+        if client is None:
+            return 0
+
+        current = minute_of(now)
+        persisted = 0
+        for raw in await client.zrangebyscore(BUCKETS_KEY, "-inf", current - 1):
+            minute = int(raw)
+            key = f"{KEY_PREFIX}{minute}"
+            if not await client.set(f"{key}:lock", "1", nx=True, ex=60):
+                continue  # Another worker is on it
+            try:
+                # Rename first so late flushes start a fresh hash instead of being lost;
+                # a staging hash left by a failed run is persisted before anything new
+                staging = f"{key}:persisting"
+                if not await client.exists(staging):
+                    try:
+                        await client.rename(key, staging)
+                    except Exception:
+                        pass  # Already moved or expired
+                if await client.exists(staging):
+                    fields = await client.hgetall(staging)
+                    counters = {}
+                    for field, count in fields.items():
+                        metric, _, scope = _decode(field).rpartition("|")
+                        counters[(minute, metric, scope)] = int(count)
+                    # Rows are added to the stored counts, so the staging hash is
+                    # deleted before the commit: if that fails nothing is written,
+                    # and if the commit fails the hash is staged again for a retry
+                    try:
+                        await self._upsert(counters, before_commit=partial(client.delete, staging))
+                    except Exception:
+                        if fields and not await client.exists(staging):
+                            await client.hset(staging, mapping=fields)
+                            await client.expire(staging, REDIS_TTL_SECONDS)
+                        raise
+                    persisted += 1
+                if not await client.exists(key):
+                    await client.zrem(BUCKETS_KEY, raw)
+            finally:
+                await client.delete(f"{key}:lock")
+        return persisted
+
+    async def _upsert(
+        self,
+        counters: Dict[Counter, int],
+        before_commit: Optional[Callable[[], Awaitable]] = None,
+    ):
+        if not counters:
+            return
+        async with self._sessions()() as session:
+            insert = _insert_for(session)
+            rows = [
+                {"bucket": bucket_start(minute), "metric": metric, "scope": scope, "count": count}
+                for (minute, metric, scope), count in counters.items()
+            ]
+            stmt = insert(MetricsRollup.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["metric", "scope", "bucket"],
+                set_={"count": MetricsRollup.__table__.c.count + stmt.excluded.count},
+            )
+            await session.execute(stmt)
+            if before_commit is not None:
+                await before_commit()
+            await session.commit()
+
+    # Reading
+
+    async def totals(
+        self,
+        metrics: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        scope: str = GLOBAL_SCOPE,
+    ) -> Dict[str, int]:
+        """Sum each metric over the whole minutes overlapping ``[start, end)``"""
+        metrics = list(metrics)
+        end = end or datetime.utcnow()
+        result = dict.fromkeys(metrics, 0)
+
+        async with self._sessions()() as session:
+            rows = await session.execute(
+                select(MetricsRollup.metric, func.sum(MetricsRollup.count))
+                .where(
+                    MetricsRollup.metric.in_(metrics),
+                    MetricsRollup.scope == scope,
+                    MetricsRollup.bucket >= bucket_start(minute_of(start)),
+                    MetricsRollup.bucket < end,
+                )
+                .group_by(MetricsRollup.metric)
+            )
+            for metric, count in rows.all():
+                result[metric] += int(count or 0)
+
+        # Minutes not yet persisted
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                minutes = await client.zrangebyscore(
+                    BUCKETS_KEY, minute_of(start), minute_of(end - timedelta(microseconds=1))
+                )
+                if minutes:
+                    pipe = client.pipeline(transaction=False)
+                    fields = [_field(metric, scope) for metric in metrics]
+                    for minute in minutes:
+                        pipe.hmget(f"{KEY_PREFIX}{_decode(minute)}", fields)
+                    for values in await pipe.execute():
+                        for metric, value in zip(metrics, values):
+                            result[metric] += int(value or 0)
+            except Exception as e:
+                logger.warning(f"Failed to read recent metric rollups from Redis: {e}")
+
+        # This worker's counters that have not been flushed yet
+        first, last = minute_of(start), minute_of(end - timedelta(microseconds=1))
+        for (minute, metric, counter_scope), count in self._pending.items():
+            if counter_scope == scope and metric in result and first <= minute <= last:
+                result[metric] += count
+        return result
+
+    async def latency(
+        self,
+        metric: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        scope: str = GLOBAL_SCOPE,
+    ) -> Dict[str, Optional[float]]:
+        """Count, mean and p50/p95/p99 latency (ms) of ``metric`` over the window"""
+        buckets = [f"le_{bound}" for bound in LATENCY_BOUNDS_MS] + [OVERFLOW_BUCKET]
+        names = [f"{metric}.latency.{bucket}" for bucket in buckets]
+        sum_name = f"{metric}.latency.sum_ms"
+        counts = await self.totals(names + [sum_name], start, end, scope)
+
+        histogram = {bucket: counts[name] for bucket, name in zip(buckets, names)}
+        total = sum(histogram.values())
+        return {
+            "count": total,
+            "mean_ms": counts[sum_name] / total if total else None,
+            "p50_ms": percentile_from_histogram(histogram, 50),
+            "p95_ms": percentile_from_histogram(histogram, 95),
+            "p99_ms": percentile_from_histogram(histogram, 99),
+        }
+
+    # Background tasks
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._every(settings.METRICS_ROLLUP_FLUSH_SECONDS, self.flush)),
+            asyncio.create_task(
+                self._every(settings.METRICS_ROLLUP_PERSIST_SECONDS, self.persist_closed_buckets)
+            ),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        await self.flush()
+
+    async def _every(self, interval: float, job):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except Exception as e:
+                logger.warning(f"Metrics rollup job failed: {e}")
+
+    def _sessions(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import AsyncSessionLocal
+
+            return AsyncSessionLocal
+        return self._session_factory
+
+    async def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        try:
+            from app.core.redis import get_raw_redis
+
+            return await get_raw_redis()
+        except Exception:
+            return None
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _insert_for(session: AsyncSession):
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+metrics_rollup = RollupRecorder()
+
+
+def record_compliance_event(organization_id: Optional[str], event_type: str, outcome: str):
+    """
+    Count a compliance event, overall and by type, with failures counted
+    separately. Scoped per organization; events without one go to "default",
+    matching the compliance dashboard.
+    """
+    scope = organization_id or "default"
+    for metric in ("compliance.events", f"compliance.{event_type}"):
+        metrics_rollup.record(metric, scope)
+        if outcome == "failure":
+            metrics_rollup.record(f"{metric}.failure", scope)
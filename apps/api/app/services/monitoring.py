@@ -14,6 +14,7 @@ import aiohttp
 import psutil
 
 from app.config import settings
+from app.core.cpu_usage import CpuUsageMeter
 from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
@@ -231,6 +232,12 @@ class MetricsCollector:
 class HealthChecker:
     """
     System health checking and monitoring
+
+    Registered checks run concurrently, each bounded by
+    ``HEALTH_CHECK_TIMEOUT_SECONDS``, and the combined result is reused for
+    ``HEALTH_CHECK_CACHE_SECONDS``: however many probes arrive, at most one
+    round of real checks runs per interval, and concurrent callers share it.
+    ``liveness`` answers from memory without running any check.
     """
 
     def __init__(self, metrics: Optional[MetricsCollector] = None):
@@ -238,7 +245,13 @@ class HealthChecker:
         self.checks = {}
         self._checks = {}  # For test compatibility
         self.check_interval = 30  # seconds
+        self.cache_ttl = settings.HEALTH_CHECK_CACHE_SECONDS
+        self.check_timeout = settings.HEALTH_CHECK_TIMEOUT_SECONDS
+        self.started_at = time.time()
         self._check_task = None
+        self._last_results: Optional[Dict[str, Any]] = None
+        self._last_run = 0.0  # monotonic
+        self._running: Optional[asyncio.Future] = None
 
     async def initialize(self):
         """Initialize health checker"""
@@ -253,6 +266,7 @@ class HealthChecker:
             "last_check": None,
         }
         self.checks[name] = self._checks[name]
+        self._last_results = None
 
     def register_check(self, name: str, check_func, critical: bool = False):
         """Register a health check"""
@@ -263,55 +277,110 @@ class HealthChecker:
             "last_check": None,
         }
         self._checks[name] = self.checks[name]
-
-    async def check_health(self) -> Dict[str, Any]:
-        """Run all health checks"""
+        self._last_results = None
+
+    async def check_health(self, force: bool = False) -> Dict[str, Any]:
+        """Run all health checks, or return the results of a run within cache_ttl"""
+        if (
+            not force
+            and self._last_results is not None
+            and time.monotonic() - self._last_run < self.cache_ttl
+        ):
+            return self._last_results
+
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._run_checks())
+            self._running.add_done_callback(self._finished)
+        return await asyncio.shield(self._running)
+
+    def _finished(self, future: asyncio.Future):
+        self._running = None
+        if not future.cancelled() and future.exception() is None:
+            self._last_results = future.result()
+            self._last_run = time.monotonic()
+
+    async def _run_checks(self) -> Dict[str, Any]:
+        checks = list(self.checks.items())
+        outcomes = await asyncio.gather(*(self._run_check(name, check) for name, check in checks))
 
         results = {"status": "healthy", "timestamp": datetime.utcnow().isoformat(), "checks": {}}
-
-        for name, check in self.checks.items():
-            try:
-                start_time = time.time()
-                result = await check["func"]()
-                duration = (time.time() - start_time) * 1000
-
-                results["checks"][name] = {
-                    "status": "healthy" if result else "unhealthy",
-                    "duration_ms": duration,
-                    "critical": check["critical"],
-                }
-
-                # Record metric
-                await self.metrics.gauge(
-                    f"health.{name}", 1 if result else 0, {"critical": str(check["critical"])}
-                )
-
-                # Update overall status
-                if not result and check["critical"]:
-                    results["status"] = "unhealthy"
-
-                # Update check info
-                check["last_result"] = result
-                check["last_check"] = time.time()
-
-            except Exception as e:
-                logger.error(f"Health check {name} failed: {e}")
-                results["checks"][name] = {
-                    "status": "error",
-                    "error": str(e),
-                    "critical": check["critical"],
-                }
-
-                if check["critical"]:
-                    results["status"] = "unhealthy"
-
+        for (name, check), outcome in zip(checks, outcomes):
+            results["checks"][name] = outcome
+            # Update overall status
+            if outcome["status"] != "healthy" and check["critical"]:
+                results["status"] = "unhealthy"
+
+        # Record metrics
+        if self.metrics:
+            await asyncio.gather(
+                *(
+                    self.metrics.gauge(
+                        f"health.{name}",
+                        1 if results["checks"][name]["status"] == "healthy" else 0,
+                        {"critical": str(check["critical"])},
+                    )
+                    for name, check in checks
+                ),
+                return_exceptions=True,
+            )
         return results
 
+    async def _run_check(self, name: str, check: Dict[str, Any]) -> Dict[str, Any]:
+        start_time = time.time()
+        try:
+            result = await asyncio.wait_for(check["func"](), self.check_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Health check {name} timed out after {self.check_timeout}s")
+            check["last_result"] = False
+            check["last_check"] = time.time()
+            return {
+                "status": "error",
+                "error": f"timed out after {self.check_timeout}s",
+                "critical": check["critical"],
+            }
+        except Exception as e:
+            logger.error(f"Health check {name} failed: {e}")
+            check["last_result"] = False
+            check["last_check"] = time.time()
+            return {"status": "error", "error": str(e), "critical": check["critical"]}
+
+        duration = (time.time() - start_time) * 1000
+        # Checks may return a bool or a details dict with a "healthy" key
+        healthy = bool(result.get("healthy")) if isinstance(result, dict) else bool(result)
+
+        # Update check info
+        check["last_result"] = healthy
+        check["last_check"] = time.time()
+
+        outcome = {
+            "status": "healthy" if healthy else "unhealthy",
+            "duration_ms": duration,
+            "critical": check["critical"],
+        }
+        if isinstance(result, dict):
+            outcome["details"] = result
+        return outcome
+
+    def liveness(self) -> Dict[str, Any]:
+        """Process liveness from in-memory state only (no checks, no I/O)"""
+        status = {
+            "status": "alive",
+            "timestamp": datetime.utcnow().isoformat(),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+        if self._last_results is not None:
+            status["last_health_status"] = self._last_results["status"]
+            status["last_health_check_age_seconds"] = round(time.monotonic() - self._last_run, 1)
+        return status
+
     async def _periodic_check(self):
         """Run health checks periodically"""
         while True:
             await asyncio.sleep(self.check_interval)
-            await self.check_health()
+            try:
+                await self.check_health(force=True)
+            except Exception as e:
+                logger.error(f"Periodic health check failed: {e}")
 
 
 class AlertManager:
@@ -572,40 +641,43 @@ class SystemMonitor:
         self.metrics = metrics
         self.collect_interval = 30  # seconds
         self._collect_task = None
+        self._process = psutil.Process()
+        self._cpu = CpuUsageMeter()
 
     async def initialize(self):
         """Initialize system monitor"""
+        # CPU is measured from the previous collection; set the baseline
+        await asyncio.to_thread(self._cpu.percent)
         self._collect_task = asyncio.create_task(self._periodic_collect())
 
+    def _read_system(self) -> Dict[str, float]:
+        """Blocking psutil reads; run in a worker thread"""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
+        net_io = psutil.net_io_counters()
+        return {
+            # CPU since the previous collection, instead of sleeping a second to measure it
+            "system.cpu_percent": self._cpu.percent(),
+            "system.memory_percent": memory.percent,
+            "system.memory_used": memory.used,
+            "system.memory_available": memory.available,
+            "system.disk_percent": disk.percent,
+            "system.disk_free": disk.free,
+            "system.network_bytes_sent": net_io.bytes_sent,
+            "system.network_bytes_recv": net_io.bytes_recv,
+            "process.cpu_percent": self._process.cpu_percent(),
+            "process.memory_rss": self._process.memory_info().rss,
+            "process.num_threads": self._process.num_threads(),
+        }
+
     async def collect_system_metrics(self):
         """Collect system metrics"""
 
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            await self.metrics.gauge("system.cpu_percent", cpu_percent)
-
-            # Memory usage
-            memory = psutil.virtual_memory()
-            await self.metrics.gauge("system.memory_percent", memory.percent)
-            await self.metrics.gauge("system.memory_used", memory.used)
-            await self.metrics.gauge("system.memory_available", memory.available)
-
-            # Disk usage
-            disk = psutil.disk_usage("/")
-            await self.metrics.gauge("system.disk_percent", disk.percent)
-            await self.metrics.gauge("system.disk_free", disk.free)
-
-            # Network I/O
-            net_io = psutil.net_io_counters()
-            await self.metrics.gauge("system.network_bytes_sent", net_io.bytes_sent)
-            await self.metrics.gauge("system.network_bytes_recv", net_io.bytes_recv)
-
-            # Process info
-            process = psutil.Process()
-            await self.metrics.gauge("process.cpu_percent", process.cpu_percent())
-            await self.metrics.gauge("process.memory_rss", process.memory_info().rss)
-            await self.metrics.gauge("process.num_threads", process.num_threads())
+            readings = await asyncio.to_thread(self._read_system)
+            await asyncio.gather(
+                *(self.metrics.gauge(name, value) for name, value in readings.items())
+            )
 
         except Exception as e:
             logger.error(f"Failed to collect system metrics: {e}")
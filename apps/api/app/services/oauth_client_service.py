@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import AuditLog, OAuthClient, OrganizationMember, User
 from app.schemas.oauth_client import OAuthClientCreate, OAuthClientUpdate
+from app.services.system_settings_service import invalidate_cors_cache
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +116,7 @@ class OAuthClientService:
         # Log the action
         audit_log = AuditLog(
             user_id=created_by.id,
+            organization_id=organization_id,
             action="oauth_client_created",
             resource_type="oauth_client",
             resource_id=client.id,
@@ -129,6 +131,9 @@ class OAuthClientService:
         await self.db.commit()
         await self.db.refresh(client)
 
+        # redirect_uris feed the derived CORS origins
+        invalidate_cors_cache()
+
         logger.info(f"OAuth client created: {client_id} by user {created_by.id}")
 
         return client, plain_secret
@@ -296,6 +301,7 @@ class OAuthClientService:
         # Log the action
         audit_log = AuditLog(
             user_id=user.id,
+            organization_id=client.organization_id,
             action="oauth_client_updated",
             resource_type="oauth_client",
             resource_id=client.id,
@@ -306,6 +312,8 @@ class OAuthClientService:
         await self.db.commit()
         await self.db.refresh(client)
 
+        invalidate_cors_cache()
+
         logger.info(f"OAuth client updated: {client.client_id} by user {user.id}")
 
         return client
@@ -334,6 +342,7 @@ class OAuthClientService:
         # Log before deletion
         audit_log = AuditLog(
             user_id=user.id,
+            organization_id=client.organization_id,
             action="oauth_client_deleted",
             resource_type="oauth_client",
             resource_id=client.id,
@@ -344,6 +353,8 @@ class OAuthClientService:
         await self.db.delete(client)
         await self.db.commit()
 
+        invalidate_cors_cache()
+
         logger.info(f"OAuth client deleted: {client_id} by user {user.id}")
 
         return True
@@ -378,6 +389,7 @@ class OAuthClientService:
         # Log the action
         audit_log = AuditLog(
             user_id=user.id,
+            organization_id=client.organization_id,
             action="oauth_client_secret_rotated",
             resource_type="oauth_client",
             resource_id=client.id,
@@ -420,14 +432,8 @@ class OAuthClientService:
         if settings.CLIENT_SECRET_ROTATION_ENABLED:
             from app.services.credential_rotation_service import CredentialRotationService
 
-            rotation_service = CredentialRotationService(self.db)
-            matched_secret = await rotation_service.validate_secret(client, client_secret)
-
-            # If we got a matched secret or None (legacy valid), the secret is valid
-            if matched_secret is not None or client.verify_secret(client_secret):
-                # Update last used timestamp
-                client.last_used_at = datetime.utcnow()
-                await self.db.commit()
+            # Checks the active secrets and the client's own; records last_used_at in batches
+            if await CredentialRotationService(self.db).verify(client, client_secret):
                 return client
             return None
 
@@ -26,6 +26,7 @@ from app.models.policy import (
     RolePolicy,
     UserRole,
 )
+from app.security.ip_intelligence import ip_in_network
 from app.services.audit_logger import AuditAction, AuditLogger
 from app.services.cache import CacheService
 
@@ -319,16 +320,9 @@ class PolicyEngine:
 
     def _ip_in_range(self, ip: str, ip_range: str) -> bool:
         """
-        Check if an IP address is in a CIDR range.
+        Check if an IP address is in a CIDR range (or equals a bare address).
         """
-        # Simplified IP range checking
-        # In production, use ipaddress module for proper CIDR checking
-        if "/" in ip_range:
-            network, mask = ip_range.split("/")
-            # Simplified check - just check if IP starts with network prefix
-            return ip.startswith(network.rsplit(".", 1)[0])
-        else:
-            return ip == ip_range
+        return ip_in_network(ip, ip_range)
 
     def _generate_cache_key(self, request: PolicyEvaluateRequest, tenant_id: str) -> str:
         """
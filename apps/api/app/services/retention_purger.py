@@ -0,0 +1,306 @@
+"""
+Retention Purger
+Deletes expired rows in bounded, throttled, resumable batches.
+
+A single ``DELETE ... WHERE created_at < cutoff`` holds row locks for the whole
+statement, produces one huge WAL burst and, if it times out, rolls everything
+back. The purger instead:
+
+- drops whole monthly partitions that lie entirely before the cutoff (when the
+  table is range-partitioned), under a short ``lock_timeout`` so it never
+  queues behind live writes;
+- deletes the remainder in primary-key ordered batches, each in its own short
+  transaction that also advances a ``RetentionCheckpoint`` row;
+- sleeps between batches and halves the batch size when a batch runs long.
+
+An interrupted run resumes from the checkpoint's keyset cursor with the same
+cutoff, so progress is never lost or repeated.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.compliance import RetentionCheckpoint
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+# Upper bound of a range partition: "FOR VALUES FROM ('...') TO ('2025-02-01 00:00:00')"
+_PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+_PARTITIONS_QUERY = text(
+    """
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table_name
+    """
+)
+
+
+@dataclass
+class PurgeResult:
+    """Outcome of one purge run (or the resumed remainder of one)"""
+
+    table_name: str
+    cutoff: datetime
+    rows_deleted: int = 0
+    batches: int = 0
+    partitions_dropped: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    resumed: bool = False
+    completed: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return round(self.rows_deleted / self.elapsed_seconds, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table_name": self.table_name,
+            "cutoff": self.cutoff.isoformat(),
+            "rows_deleted": self.rows_deleted,
+            "batches": self.batches,
+            "partitions_dropped": self.partitions_dropped,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": self.rows_per_second,
+            "resumed": self.resumed,
+            "completed": self.completed,
+        }
+
+
+class RetentionPurger:
+    """Batched, checkpointed deletion of rows older than a cutoff"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: Optional[int] = None,
+        throttle_seconds: Optional[float] = None,
+        max_batch_seconds: Optional[float] = None,
+        min_batch_size: int = 100,
+        lock_timeout_ms: Optional[int] = None,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        self.throttle_seconds = (
+            settings.RETENTION_THROTTLE_SECONDS if throttle_seconds is None else throttle_seconds
+        )
+        self.max_batch_seconds = max_batch_seconds or settings.RETENTION_MAX_BATCH_SECONDS
+        self.min_batch_size = min(min_batch_size, self.batch_size)
+        self.lock_timeout_ms = lock_timeout_ms or settings.RETENTION_LOCK_TIMEOUT_MS
+
+    async def purge(
+        self,
+        model: Any,
+        timestamp_column: Any,
+        cutoff: datetime,
+        job_key: str,
+        max_batches: Optional[int] = None,
+    ) -> PurgeResult:
+        """
+        Delete rows of ``model`` whose ``timestamp_column`` is before ``cutoff``.
+
+        ``job_key`` identifies the checkpoint; an unfinished run under the same
+        key is resumed with its original cutoff. ``max_batches`` bounds the work
+        done by this call (the rest is picked up by the next one).
+        """
+        table_name = model.__tablename__
+        primary_key = model.__mapper__.primary_key[0]
+        started = time.monotonic()
+
+        checkpoint = await self._start(job_key, table_name, cutoff)
+        result = PurgeResult(
+            table_name=table_name,
+            cutoff=checkpoint.cutoff,
+            resumed=checkpoint.batches > 0,
+            partitions_dropped=list(checkpoint.partitions_dropped or []),
+        )
+        cutoff = checkpoint.cutoff
+        last_id = _cursor_value(primary_key, checkpoint.last_id)
+
+        if not result.resumed:
+            dropped = await self.drop_expired_partitions(table_name, cutoff)
+            if dropped:
+                result.partitions_dropped.extend(dropped)
+                await self._save(job_key, partitions_dropped=result.partitions_dropped)
+
+        batch_size = self.batch_size
+        while max_batches is None or result.batches < max_batches:
+            batch_started = time.monotonic()
+            async with self.session_factory() as session:
+                query = select(primary_key).where(timestamp_column < cutoff)
+                if last_id is not None:
+                    query = query.where(primary_key > last_id)
+                ids = (
+                    (await session.execute(query.order_by(primary_key).limit(batch_size)))
+                    .scalars()
+                    .all()
+                )
+                if not ids:
+                    await self._mark_completed(session, job_key)
+                    await session.commit()
+                    result.completed = True
+                    break
+
+                deleted = await session.execute(
+                    delete(model)
+                    .where(primary_key.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+                last_id = ids[-1]
+                await session.execute(
+                    update(RetentionCheckpoint)
+                    .where(RetentionCheckpoint.job_key == job_key)
+                    .values(
+                        last_id=str(last_id),
+                        rows_deleted=RetentionCheckpoint.rows_deleted + deleted.rowcount,
+                        batches=RetentionCheckpoint.batches + 1,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+                await session.commit()
+
+            result.rows_deleted += deleted.rowcount
+            result.batches += 1
+
+            # Long batches mean contention or bloat: back off to keep locks short
+            batch_seconds = time.monotonic() - batch_started
+            if batch_seconds > self.max_batch_seconds:
+                batch_size = max(self.min_batch_size, batch_size // 2)
+            elif batch_seconds < self.max_batch_seconds / 4:
+                batch_size = min(self.batch_size, batch_size * 2)
+
+            if self.throttle_seconds:
+                await asyncio.sleep(self.throttle_seconds)
+
+        result.elapsed_seconds = time.monotonic() - started
+        logger.info(
+            f"Retention purge of {table_name}: {result.rows_deleted} rows in "
+            f"{result.batches} batches ({result.rows_per_second} rows/s)",
+            extra={"job_key": job_key, **result.to_dict()},
+        )
+        return result
+
+    async def drop_expired_partitions(self, table_name: str, cutoff: datetime) -> List[str]:
+        """
+        Detach and drop partitions whose upper bound is at or before the cutoff.
+
+        No-op unless the table is a range-partitioned PostgreSQL table. Each
+        partition is dropped in its own transaction under a short lock_timeout;
+        a partition whose lock is not granted in time is left for the row-batch
+        phase (or the next run).
+        """
+        if not _IDENTIFIER.match(table_name):
+            raise ValueError(f"Unsafe table name: {table_name!r}")
+
+        dropped: List[str] = []
+        async with self.session_factory() as session:
+            if session.bind.dialect.name != "postgresql":
+                return dropped
+            partitions = (
+                await session.execute(_PARTITIONS_QUERY, {"table_name": table_name})
+            ).all()
+
+        for partition, bound in partitions:
+            upper = _partition_upper_bound(bound)
+            if upper is None or upper > cutoff or not _IDENTIFIER.match(partition):
+                continue
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(
+                        text(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}")
+                    )
+                    await session.execute(
+                        text(f"ALTER TABLE {table_name} DETACH PARTITION {partition}")
+                    )
+                    await session.execute(text(f"DROP TABLE {partition}"))
+                    await session.commit()
+                dropped.append(partition)
+                logger.info(f"Dropped expired partition {partition} of {table_name}")
+            except Exception as e:
+                logger.warning(f"Could not drop partition {partition} of {table_name}: {e}")
+        return dropped
+
+    async def _start(self, job_key: str, table_name: str, cutoff: datetime) -> RetentionCheckpoint:
+        """Resume the job's unfinished checkpoint, or (re)start it with this cutoff"""
+        async with self.session_factory() as session:
+            checkpoint = (
+                await session.execute(
+                    select(RetentionCheckpoint).where(RetentionCheckpoint.job_key == job_key)
+                )
+            ).scalar_one_or_none()
+
+            if checkpoint is not None and checkpoint.completed_at is None:
+                return checkpoint
+
+            now = datetime.utcnow()
+            if checkpoint is None:
+                checkpoint = RetentionCheckpoint(job_key=job_key)
+                session.add(checkpoint)
+            checkpoint.table_name = table_name
+            checkpoint.cutoff = cutoff
+            checkpoint.last_id = None
+            checkpoint.rows_deleted = 0
+            checkpoint.batches = 0
+            checkpoint.partitions_dropped = []
+            checkpoint.started_at = now
+            checkpoint.updated_at = now
+            checkpoint.completed_at = None
+            await session.commit()
+            return checkpoint
+
+    async def _save(self, job_key: str, **values: Any):
+        async with self.session_factory() as session:
+            await session.execute(
+                update(RetentionCheckpoint)
+                .where(RetentionCheckpoint.job_key == job_key)
+                .values(updated_at=datetime.utcnow(), **values)
+            )
+            await session.commit()
+
+    async def _mark_completed(self, session: AsyncSession, job_key: str):
+        now = datetime.utcnow()
+        await session.execute(
+            update(RetentionCheckpoint)
+            .where(RetentionCheckpoint.job_key == job_key)
+            .values(completed_at=now, updated_at=now)
+        )
+
+
+def _cursor_value(primary_key: Any, stored: Optional[str]) -> Any:
+    """Turn the checkpoint's stringified keyset cursor back into the key's Python type"""
+    if stored is None:
+        return None
+    try:
+        return primary_key.type.python_type(stored)
+    except (NotImplementedError, TypeError, ValueError):
+        return stored
+
+
+def _partition_upper_bound(bound: Optional[str]) -> Optional[datetime]:
+    """Parse the TO (...) value of a range partition bound; None for DEFAULT/MAXVALUE"""
+    match = _PARTITION_UPPER_BOUND.search(bound or "")
+    if not match:
+        return None
+    try:
+        upper = datetime.fromisoformat(match.group(1))
+    except ValueError:
+        return None
+    return upper.replace(tzinfo=None)
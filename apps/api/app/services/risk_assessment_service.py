@@ -2,11 +2,14 @@
 Risk assessment service for Zero-Trust authentication
 """
 
+import asyncio
 import logging
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 try:
@@ -26,6 +29,8 @@ except ImportError:
     NDArray = Any
 
 from ..models import Session, User
+from ..security.ip_intelligence import ip_intelligence
+from .login_feature_store import LoginFeatures, login_feature_store
 
 try:
     from ..models.zero_trust import (
@@ -54,12 +59,29 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RiskSignals:
+    """Everything the scorers read, fetched once before they run concurrently.
+
+    An ``AsyncSession`` cannot run statements concurrently, so database state is
+    prefetched here and the scorers only do in-memory work.
+    """
+
+    features: LoginFeatures = field(default_factory=LoginFeatures)
+    device_profile: Any = None
+    baseline: Any = None
+    ip_threat: Any = None
+    email_threat: Any = None
+
+
 class RiskAssessmentService:
     """Service for assessing authentication risk and making access decisions"""
 
-    def __init__(self):
+    def __init__(self, feature_store=None):
         self.geoip_reader = None
         self.anomaly_detector = None
+        self.feature_store = feature_store or login_feature_store
+        self._persist_tasks: Set[asyncio.Task] = set()
         self._init_geoip()
         self._init_anomaly_detector()
 
@@ -92,12 +114,28 @@ class RiskAssessmentService:
         Returns risk assessment with score, level, and access decision
         """
         try:
-            # Initialize risk scores
-            location_risk = await self._assess_location_risk(db, ip_address, user_id)
-            device_risk = await self._assess_device_risk(db, device_fingerprint, user_id)
-            behavior_risk = await self._assess_behavior_risk(db, user_id, ip_address, user_agent)
-            network_risk = await self._assess_network_risk(db, ip_address)
-            threat_risk = await self._assess_threat_intelligence(db, ip_address, user_id)
+            signals = await self._prefetch_signals(db, user_id, ip_address, device_fingerprint)
+
+            # Scorers are independent and only read the prefetched signals
+            (
+                location_risk,
+                device_risk,
+                behavior_risk,
+                network_risk,
+                threat_risk,
+                risk_factors,
+                anomalies,
+            ) = await asyncio.gather(
+                self._assess_location_risk(db, ip_address, user_id, signals=signals),
+                self._assess_device_risk(db, device_fingerprint, user_id, signals=signals),
+                self._assess_behavior_risk(db, user_id, ip_address, user_agent, signals=signals),
+                self._assess_network_risk(db, ip_address),
+                self._assess_threat_intelligence(db, ip_address, user_id, signals=signals),
+                self._collect_risk_factors(
+                    db, user_id, ip_address, device_fingerprint, signals=signals
+                ),
+                self._detect_anomalies(db, user_id, ip_address, user_agent, device_fingerprint),
+            )
 
             # Calculate weighted overall risk
             risk_weights = {
@@ -124,17 +162,9 @@ class RiskAssessmentService:
                 db, user_id, risk_level, resource
             )
 
-            # Collect risk factors and anomalies
-            risk_factors = await self._collect_risk_factors(
-                db, user_id, ip_address, device_fingerprint
-            )
-
-            anomalies = await self._detect_anomalies(
-                db, user_id, ip_address, user_agent, device_fingerprint
-            )
-
             # Create risk assessment record
             assessment = RiskAssessment(
+                id=uuid.uuid4(),
                 user_id=user_id,
                 overall_risk_score=overall_risk,
                 location_risk_score=location_risk,
@@ -152,8 +182,8 @@ class RiskAssessmentService:
                 expires_at=datetime.utcnow() + timedelta(minutes=30),
             )
 
-            db.add(assessment)
-            await db.commit()
+            # The record is for audit and later review; don't hold the login on it
+            self._persist_in_background(assessment)
 
             return {
                 "assessment_id": str(assessment.id),
@@ -177,8 +207,113 @@ class RiskAssessmentService:
                 "error": str(e),
             }
 
+    async def _prefetch_signals(
+        self,
+        db: AsyncSession,
+        user_id: Optional[str],
+        ip_address: Optional[str],
+        device_fingerprint: Optional[str],
+    ) -> RiskSignals:
+        """Load login features and the few rows the scorers need."""
+        signals = RiskSignals()
+
+        if user_id:
+            features = await self.feature_store.fetch(str(user_id))
+            if features is None:
+                features = await self._load_features_from_db(db, user_id)
+                await self.feature_store.seed(
+                    str(user_id),
+                    features.account_created_at,
+                    features.email,
+                    devices=features.known_devices,
+                )
+            signals.features = features
+
+            baseline_result = await db.execute(
+                select(BehaviorBaseline).where(BehaviorBaseline.user_id == user_id)
+            )
+            signals.baseline = baseline_result.scalar_one_or_none()
+
+        if device_fingerprint:
+            device_result = await db.execute(
+                select(DeviceProfile).where(DeviceProfile.device_fingerprint == device_fingerprint)
+            )
+            signals.device_profile = device_result.scalar_one_or_none()
+
+        # IP and email indicators in one statement
+        indicators = []
+        if ip_address:
+            indicators.append(
+                and_(
+                    ThreatIntelligence.indicator_type == "ip",
+                    ThreatIntelligence.indicator_value == ip_address,
+                )
+            )
+        if signals.features.email:
+            indicators.append(
+                and_(
+                    ThreatIntelligence.indicator_type == "email",
+                    ThreatIntelligence.indicator_value == signals.features.email,
+                )
+            )
+        if indicators:
+            threat_result = await db.execute(
+                select(ThreatIntelligence).where(
+                    and_(ThreatIntelligence.is_active == True, or_(*indicators))
+                )
+            )
+            for threat in threat_result.scalars().all():
+                if threat.indicator_type == "ip":
+                    signals.ip_threat = threat
+                else:
+                    signals.email_threat = threat
+
+        return signals
+
+    async def _load_features_from_db(self, db: AsyncSession, user_id: str) -> LoginFeatures:
+        """Build features for a user the feature store hasn't seen yet."""
+        since = datetime.utcnow() - timedelta(hours=1)
+        recent_logins = (
+            select(func.count(Session.id))
+            .where(and_(Session.user_id == user_id, Session.created_at >= since))
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(User.created_at, User.email, recent_logins).where(User.id == user_id)
+        )
+        row = result.first()
+        features = LoginFeatures()
+        if row is not None:
+            features.account_created_at, features.email, logins = row
+            features.logins_last_hour = logins or 0
+
+        devices_result = await db.execute(
+            select(DeviceProfile.device_fingerprint).where(DeviceProfile.user_id == user_id)
+        )
+        features.known_devices = set(devices_result.scalars().all())
+        return features
+
+    def _persist_in_background(self, assessment: "RiskAssessment"):
+        """Write the assessment on its own session after the response is built."""
+        task = asyncio.create_task(self._persist_assessment(assessment))
+        self._persist_tasks.add(task)
+        task.add_done_callback(self._persist_tasks.discard)
+
+    async def _persist_assessment(self, assessment: "RiskAssessment"):
+        from app.core.database import get_session
+
+        try:
+            async with get_session() as session:
+                session.add(assessment)
+        except Exception as e:
+            logger.error(f"Failed to persist risk assessment {assessment.id}: {e}")
+
     async def _assess_location_risk(
-        self, db: AsyncSession, ip_address: str, user_id: Optional[str]
+        self,
+        db: AsyncSession,
+        ip_address: str,
+        user_id: Optional[str],
+        signals: Optional[RiskSignals] = None,
     ) -> float:
         """Assess risk based on location"""
         risk_score = 0.0
@@ -193,7 +328,10 @@ class RiskAssessmentService:
 
             # Check if location is unusual for user
             if user_id:
-                is_new_location = await self._is_new_location(db, user_id, ip_address)
+                if signals is not None:
+                    is_new_location = signals.features.is_new_location(ip_address)
+                else:
+                    is_new_location = await self._is_new_location(db, user_id, ip_address)
                 if is_new_location:
                     risk_score += 0.2
 
@@ -219,7 +357,11 @@ class RiskAssessmentService:
         return min(risk_score, 1.0)
 
     async def _assess_device_risk(
-        self, db: AsyncSession, device_fingerprint: str, user_id: Optional[str]
+        self,
+        db: AsyncSession,
+        device_fingerprint: str,
+        user_id: Optional[str],
+        signals: Optional[RiskSignals] = None,
     ) -> float:
         """Assess risk based on device trust"""
         if not device_fingerprint:
@@ -229,10 +371,15 @@ class RiskAssessmentService:
 
         try:
             # Check device profile
-            device = await db.execute(
-                select(DeviceProfile).where(DeviceProfile.device_fingerprint == device_fingerprint)
-            )
-            device_profile = device.scalar_one_or_none()
+            if signals is not None:
+                device_profile = signals.device_profile
+            else:
+                device = await db.execute(
+                    select(DeviceProfile).where(
+                        DeviceProfile.device_fingerprint == device_fingerprint
+                    )
+                )
+                device_profile = device.scalar_one_or_none()
 
             if not device_profile:
                 # New device
@@ -266,7 +413,12 @@ class RiskAssessmentService:
         return min(risk_score, 1.0)
 
     async def _assess_behavior_risk(
-        self, db: AsyncSession, user_id: Optional[str], ip_address: str, user_agent: str
+        self,
+        db: AsyncSession,
+        user_id: Optional[str],
+        ip_address: str,
+        user_agent: str,
+        signals: Optional[RiskSignals] = None,
     ) -> float:
         """Assess risk based on user behavior"""
         if not user_id:
@@ -276,10 +428,13 @@ class RiskAssessmentService:
 
         try:
             # Get user's behavior baseline
-            baseline_result = await db.execute(
-                select(BehaviorBaseline).where(BehaviorBaseline.user_id == user_id)
-            )
-            baseline = baseline_result.scalar_one_or_none()
+            if signals is not None:
+                baseline = signals.baseline
+            else:
+                baseline_result = await db.execute(
+                    select(BehaviorBaseline).where(BehaviorBaseline.user_id == user_id)
+                )
+                baseline = baseline_result.scalar_one_or_none()
 
             if not baseline or not baseline.learning_completed_at:
                 # No baseline established yet
@@ -300,7 +455,10 @@ class RiskAssessmentService:
                     risk_score += 0.1
 
             # Check for velocity anomaly
-            recent_logins = await self._get_recent_login_count(db, user_id, hours=1)
+            if signals is not None:
+                recent_logins = signals.features.logins_last_hour
+            else:
+                recent_logins = await self._get_recent_login_count(db, user_id, hours=1)
             if baseline.login_velocity_baseline:
                 if recent_logins > baseline.login_velocity_baseline * 3:
                     risk_score += 0.3
@@ -345,11 +503,22 @@ class RiskAssessmentService:
         return min(risk_score, 1.0)
 
     async def _assess_threat_intelligence(
-        self, db: AsyncSession, ip_address: str, user_id: Optional[str]
+        self,
+        db: AsyncSession,
+        ip_address: str,
+        user_id: Optional[str],
+        signals: Optional[RiskSignals] = None,
     ) -> float:
         """Assess risk based on threat intelligence"""
         risk_score = 0.0
 
+        if signals is not None:
+            if signals.ip_threat:
+                risk_score = self._threat_level_score(signals.ip_threat.threat_level)
+            if signals.email_threat:
+                risk_score = max(risk_score, 0.6)
+            return min(risk_score, 1.0)
+
         try:
             # Check IP against threat intelligence
             if ip_address:
@@ -365,13 +534,7 @@ class RiskAssessmentService:
                 threat = threat_result.scalar_one_or_none()
 
                 if threat:
-                    threat_scores = {
-                        RiskLevel.LOW: 0.2,
-                        RiskLevel.MEDIUM: 0.4,
-                        RiskLevel.HIGH: 0.7,
-                        RiskLevel.CRITICAL: 0.9,
-                    }
-                    risk_score = threat_scores.get(threat.threat_level, 0.5)
+                    risk_score = self._threat_level_score(threat.threat_level)
 
             # Check user email against threat intelligence
             if user_id:
@@ -398,6 +561,16 @@ class RiskAssessmentService:
 
         return min(risk_score, 1.0)
 
+    def _threat_level_score(self, threat_level: RiskLevel) -> float:
+        """Map a threat intelligence level to a risk contribution"""
+        threat_scores = {
+            RiskLevel.LOW: 0.2,
+            RiskLevel.MEDIUM: 0.4,
+            RiskLevel.HIGH: 0.7,
+            RiskLevel.CRITICAL: 0.9,
+        }
+        return threat_scores.get(threat_level, 0.5)
+
     def _calculate_risk_level(self, risk_score: float) -> RiskLevel:
         """Convert risk score to risk level"""
         if risk_score < 0.25:
@@ -453,7 +626,12 @@ class RiskAssessmentService:
             return AccessDecision.CHALLENGE, ["mfa"]
 
     async def _collect_risk_factors(
-        self, db: AsyncSession, user_id: Optional[str], ip_address: str, device_fingerprint: str
+        self,
+        db: AsyncSession,
+        user_id: Optional[str],
+        ip_address: str,
+        device_fingerprint: str,
+        signals: Optional[RiskSignals] = None,
     ) -> Dict[str, Any]:
         """Collect detailed risk factors"""
         factors = {}
@@ -467,13 +645,24 @@ class RiskAssessmentService:
 
             if device_fingerprint:
                 factors["device_fingerprint"] = device_fingerprint
-                factors["is_new_device"] = await self._is_new_device(
-                    db, user_id, device_fingerprint
-                )
+                if signals is not None:
+                    factors["is_new_device"] = not user_id or signals.features.is_new_device(
+                        device_fingerprint
+                    )
+                else:
+                    factors["is_new_device"] = await self._is_new_device(
+                        db, user_id, device_fingerprint
+                    )
 
             if user_id:
-                factors["recent_failed_attempts"] = await self._get_failed_attempts(db, user_id)
-                factors["account_age_days"] = await self._get_account_age(db, user_id)
+                if signals is not None:
+                    factors["recent_failed_attempts"] = signals.features.failed_last_24h
+                    factors["account_age_days"] = signals.features.account_age_days()
+                else:
+                    factors["recent_failed_attempts"] = await self._get_failed_attempts(
+                        db, user_id
+                    )
+                    factors["account_age_days"] = await self._get_account_age(db, user_id)
 
         except Exception as e:
             logger.warning(f"Risk factor collection error: {e}")
@@ -527,23 +716,19 @@ class RiskAssessmentService:
 
     async def _is_vpn_ip(self, ip_address: str) -> bool:
         """Check if IP is from VPN provider"""
-        # In production, integrate with VPN detection service
-        return False
+        return ip_intelligence.category(ip_address) == "vpn"
 
     async def _is_tor_ip(self, ip_address: str) -> bool:
         """Check if IP is Tor exit node"""
-        # In production, check against Tor exit node list
-        return False
+        return ip_intelligence.category(ip_address) == "tor"
 
     async def _is_proxy_ip(self, ip_address: str) -> bool:
         """Check if IP is proxy"""
-        # In production, integrate with proxy detection service
-        return False
+        return ip_intelligence.category(ip_address) == "proxy"
 
     async def _is_datacenter_ip(self, ip_address: str) -> bool:
         """Check if IP belongs to datacenter/hosting provider"""
-        # In production, check against datacenter IP ranges
-        return False
+        return ip_intelligence.category(ip_address) == "datacenter"
 
     async def _is_blacklisted_ip(self, db: AsyncSession, ip_address: str) -> bool:
         """Check if IP is blacklisted"""
@@ -669,8 +854,8 @@ class RiskAssessmentService:
 
     def _evaluate_condition(self, condition: Dict[str, Any], context: Dict[str, Any]) -> bool:
         """Evaluate single condition"""
-        for field, check in condition.items():
-            value = context.get(field)
+        for name, check in condition.items():
+            value = context.get(name)
 
             if isinstance(check, dict):
                 if "in" in check:
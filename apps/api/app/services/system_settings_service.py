@@ -1,10 +1,18 @@
 """
 System Settings Service
 Manages global platform configuration that can be modified via API.
+
+Reads are served from a per-process snapshot of ``system_settings`` and
+``allowed_cors_origins`` (``settings_snapshot``), loaded at startup. Writes bump
+a version counter in Redis and publish it on the invalidation bus, and every
+worker reloads its snapshot in the background while still answering from the
+previous one.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import delete, select
@@ -12,6 +20,8 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings as app_settings
+from app.core.invalidation import invalidation_bus
+from app.middleware.dynamic_cors import CORS_INVALIDATION_TOPIC
 from app.models.system_settings import (
     AllowedCorsOrigin,
     SettingKeys,
@@ -21,6 +31,213 @@ from app.models.system_settings import (
 
 logger = logging.getLogger(__name__)
 
+# Invalidation bus topic for settings changes; the payload is the new version
+SETTINGS_INVALIDATION_TOPIC = "settings"
+SETTINGS_VERSION_KEY = "janua:settings:version"
+SETTINGS_SNAPSHOT_TTL_SECONDS = 30  # Reload interval when invalidation events are unavailable
+SETTINGS_SNAPSHOT_MAX_AGE_SECONDS = 3600  # Safety reload while the invalidation bus is listening
+SETTINGS_RELOAD_RETRY_SECONDS = 1.0
+
+CorsOriginRow = Tuple[str, Optional[str], bool]  # (origin, organization_id, is_active)
+
+
+class SettingsSnapshot:
+    """
+    Process-wide, read-only copy of all system settings and CORS origins.
+
+    A reload builds new containers and swaps them in, so readers never see a
+    half-loaded snapshot and never wait: a stale snapshot keeps answering while
+    a background task reloads it. Until the first load succeeds (or if it was
+    never started, as in unit tests) the service falls back to querying.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._session_factory = session_factory
+        self.values: Dict[str, Any] = {}
+        self.cors_origins: List[CorsOriginRow] = []
+        self.system_cors_origins: List[str] = []
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self._stale = False
+        self._last_attempt = 0.0
+        self._reload_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def current(self) -> bool:
+        """True if reads can be served from memory; schedules a reload when stale."""
+        if self.loaded_at is None:
+            return False
+        ttl = (
+            SETTINGS_SNAPSHOT_MAX_AGE_SECONDS
+            if invalidation_bus.listening
+            else SETTINGS_SNAPSHOT_TTL_SECONDS
+        )
+        if self._stale or time.monotonic() - self.loaded_at >= ttl:
+            self._schedule_reload()
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    def get_cors_origins(
+        self,
+        organization_id: Optional[UUID] = None,
+        include_inactive: bool = False,
+        include_system: bool = True,
+    ) -> List[str]:
+        org = str(organization_id) if organization_id else None
+        db_origins = [
+            origin
+            for origin, origin_org, is_active in self.cors_origins
+            if (is_active or include_inactive)
+            and ((include_system and origin_org is None) or (org and origin_org == org))
+        ]
+        return list(set(app_settings.cors_origins_list + db_origins))
+
+    async def start(self):
+        """Load the snapshot; called once per worker at startup"""
+        await self.reload()
+        logger.info("System settings snapshot loaded (version %s)", self.version)
+
+    async def stop(self):
+        if self._reload_task is not None and not self._reload_task.done():
+            self._reload_task.cancel()
+            try:
+                await self._reload_task
+            except asyncio.CancelledError:
+                pass
+        self._reload_task = None
+
+    async def reload(self):
+        """Re-read both tables and swap the snapshot in"""
+        async with self._lock:
+            self._last_attempt = time.monotonic()
+            self._stale = False
+            # Read the version before the rows: any change committed after this
+            # point carries a higher version and triggers another reload.
+            version = await self._read_version()
+            try:
+                async with self._sessions()() as session:
+                    result = await session.execute(select(SystemSetting))
+                    values = {s.key: s.get_value() for s in result.scalars().all()}
+                    result = await session.execute(
+                        select(
+                            AllowedCorsOrigin.origin,
+                            AllowedCorsOrigin.organization_id,
+                            AllowedCorsOrigin.is_active,
+                        )
+                    )
+                    cors_origins = [
+                        (origin, str(org_id) if org_id else None, bool(is_active))
+                        for origin, org_id, is_active in result.all()
+                    ]
+            except Exception:
+                self._stale = True
+                raise
+
+            system_origins = [o for o, org_id, active in cors_origins if active and org_id is None]
+            self.values = values
+            self.cors_origins = cors_origins
+            self.system_cors_origins = list(set(app_settings.cors_origins_list + system_origins))
+            self.version = max(self.version, version or 0)
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self, payload: str = ""):
+        """Invalidation bus handler; the payload is the version that was published"""
+        try:
+            version = int(payload)
+        except ValueError:
+            version = None
+        if version is not None and version <= self.version:
+            return  # Already loaded (e.g. our own publish)
+        self._stale = True
+        self._last_attempt = 0.0
+        if self.loaded:
+            self._schedule_reload()
+
+    async def publish_change(self):
+        """
+        After committing a change: bump the version, reload this worker's
+        snapshot so its next read sees the write, and tell every other worker.
+        """
+        self._stale = True
+        if not self.loaded:
+            # Nothing to reload here; notify the other workers without waiting
+            try:
+                asyncio.get_running_loop().create_task(self._notify(await_reload=False))
+            except RuntimeError:
+                pass
+            return
+        await self._notify(await_reload=True)
+
+    async def _notify(self, await_reload: bool):
+        version = await self._bump_version()
+        if await_reload:
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.warning("Failed to reload system settings snapshot: %s", e)
+        await invalidation_bus.publish(
+            SETTINGS_INVALIDATION_TOPIC, str(version) if version is not None else ""
+        )
+
+    def _schedule_reload(self):
+        if self._reload_task is not None and not self._reload_task.done():
+            return
+        if time.monotonic() - self._last_attempt < SETTINGS_RELOAD_RETRY_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._reload_task = loop.create_task(self._reload_in_background())
+
+    async def _reload_in_background(self):
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.warning("Failed to reload system settings snapshot: %s", e)
+
+    async def _read_version(self) -> Optional[int]:
+        try:
+            client = await self._get_redis()
+            if client is None:
+                return None
+            value = await client.get(SETTINGS_VERSION_KEY)
+            return int(value) if value else 0
+        except Exception as e:
+            logger.warning("Failed to read system settings version: %s", e)
+            return None
+
+    async def _bump_version(self) -> Optional[int]:
+        try:
+            client = await self._get_redis()
+            if client is None:
+                return None
+            return int(await client.incr(SETTINGS_VERSION_KEY))
+        except Exception as e:
+            logger.warning("Failed to bump system settings version: %s", e)
+            return None
+
+    def _sessions(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import AsyncSessionLocal
+
+            return AsyncSessionLocal
+        return self._session_factory
+
+    async def _get_redis(self):
+        from app.core.redis import get_raw_redis
+
+        return await get_raw_redis()
+
+
+settings_snapshot = SettingsSnapshot()
+
 
 class SystemSettingsService:
     """Service for managing system-wide settings"""
@@ -38,9 +255,15 @@ class SystemSettingsService:
         """
         Get a system setting value.
         Falls back to environment variable / config.py if not set in database.
+
+        With ``use_cache`` (the default) this is an in-memory lookup in the
+        process-wide snapshot; ``use_cache=False`` always queries the database.
         """
-        if use_cache and key in self._cache:
-            return self._cache[key]
+        if use_cache:
+            if settings_snapshot.current():
+                return settings_snapshot.get(key, default)
+            if key in self._cache:
+                return self._cache[key]
 
         result = await self.db.execute(select(SystemSetting).where(SystemSetting.key == key))
         setting = result.scalar_one_or_none()
@@ -101,8 +324,9 @@ class SystemSettingsService:
         setting = result.scalar_one()
         await self.db.commit()
 
-        # Invalidate cache
+        # Invalidate caches on every worker
         self._cache.pop(key, None)
+        await settings_snapshot.publish_change()
 
         # Sanitize key for logging to prevent log injection
         safe_key = key.replace("\n", "").replace("\r", "")[:100]
@@ -114,6 +338,7 @@ class SystemSettingsService:
         result = await self.db.execute(delete(SystemSetting).where(SystemSetting.key == key))
         await self.db.commit()
         self._cache.pop(key, None)
+        await settings_snapshot.publish_change()
         return result.rowcount > 0
 
     async def get_all_settings(
@@ -166,6 +391,11 @@ class SystemSettingsService:
         - System-level database origins (if include_system=True)
         - Organization-specific origins (if organization_id provided)
         """
+        if settings_snapshot.current():
+            return settings_snapshot.get_cors_origins(
+                organization_id, include_inactive, include_system
+            )
+
         cache_key = f"{organization_id}_{include_inactive}_{include_system}"
         if self._cors_cache is not None and cache_key in self._cors_cache:
             return self._cors_cache[cache_key]
@@ -258,8 +488,9 @@ class SystemSettingsService:
             await self.db.commit()
             await self.db.refresh(cors_origin)
 
-        # Invalidate cache
+        # Invalidate caches on every worker
         self._cors_cache = None
+        await self._cors_origins_changed()
 
         scope = f"org:{organization_id}" if organization_id else "system"
         # Sanitize origin for logging to prevent log injection
@@ -281,6 +512,7 @@ class SystemSettingsService:
             cors_origin.is_active = False
             await self.db.commit()
             self._cors_cache = None
+            await self._cors_origins_changed()
             scope = f"org:{organization_id}" if organization_id else "system"
             # Sanitize origin for logging to prevent log injection
             safe_origin = origin.replace("\n", "").replace("\r", "")[:200]
@@ -299,6 +531,7 @@ class SystemSettingsService:
         )
         await self.db.commit()
         self._cors_cache = None
+        await self._cors_origins_changed()
         return result.rowcount > 0
 
     async def list_cors_origins(
@@ -375,6 +608,7 @@ class SystemSettingsService:
 
         await self.db.commit()
         self._cors_cache = None
+        await self._cors_origins_changed()
 
     # =========================================================================
     # OIDC Settings
@@ -414,6 +648,10 @@ class SystemSettingsService:
         self._cache.clear()
         self._cors_cache = None
 
+    async def _cors_origins_changed(self):
+        await settings_snapshot.publish_change()
+        invalidate_cors_cache()
+
 
 # Singleton-ish pattern for getting cached CORS origins
 _cors_origins_cache: Optional[List[str]] = None
@@ -426,6 +664,8 @@ async def get_cached_cors_origins(db: AsyncSession) -> List[str]:
     """
     global _cors_origins_cache
 
+    if settings_snapshot.current():
+        return settings_snapshot.system_cors_origins
     if _cors_origins_cache is not None:
         return _cors_origins_cache
 
@@ -434,11 +674,8 @@ async def get_cached_cors_origins(db: AsyncSession) -> List[str]:
     return _cors_origins_cache
 
 
-def invalidate_cors_cache():
-    """
-    Invalidate all CORS caches (service-level and middleware-level).
-    This should be called whenever CORS origins are added, removed, or modified.
-    """
+def _invalidate_local_cors_caches():
+    """Drop this worker's service-level and middleware-level CORS caches."""
     global _cors_origins_cache
     _cors_origins_cache = None
 
@@ -449,3 +686,17 @@ def invalidate_cors_cache():
         invalidate_middleware_cache()
     except ImportError:
         pass  # Middleware not yet loaded
+
+
+def invalidate_cors_cache():
+    """
+    Invalidate all CORS caches (service-level and middleware-level) on every worker.
+    This should be called whenever CORS origins are added, removed, or modified,
+    including OAuth client redirect_uris changes.
+    """
+    _invalidate_local_cors_caches()
+    invalidation_bus.publish_nowait(CORS_INVALIDATION_TOPIC)
+
+
+invalidation_bus.subscribe(CORS_INVALIDATION_TOPIC, lambda _payload: _invalidate_local_cors_caches())
+invalidation_bus.subscribe(SETTINGS_INVALIDATION_TOPIC, settings_snapshot.invalidate)
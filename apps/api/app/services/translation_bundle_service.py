@@ -0,0 +1,183 @@
+"""
+Precompiled translation bundles.
+
+Every frontend page load fetches a locale's translations, but they change only
+when an admin writes one. Bundles are therefore compiled once per write: each
+locale's dictionary is merged along its fallback chain (``es-MX`` -> ``es`` ->
+``en`` -> key defaults), serialized to JSON bytes and fingerprinted with a
+content hash that doubles as the HTTP ETag.
+
+Bundles are held in a process-local dict with Redis as the shared tier, so a
+cold worker loads the whole set with one GET instead of rebuilding it from
+Postgres. Writers rebuild, publish to Redis and broadcast an invalidation so
+other workers drop their local copy.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.invalidation import invalidation_bus
+from app.models.localization import Locale, Translation, TranslationKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCALE = "en"
+BUNDLES_REDIS_KEY = "i18n:bundles:v1"
+# Upper bound on how long a copy that missed a rebuild can be served
+BUNDLES_REDIS_TTL_SECONDS = 24 * 3600
+BUNDLES_INVALIDATION_TOPIC = "i18n"
+
+# Key for the bundle made only of TranslationKey.default_value, served when a
+# requested locale shares nothing with any configured locale.
+_DEFAULTS_BUNDLE = ""
+
+
+@dataclass(frozen=True)
+class TranslationBundle:
+    """A serialized, fingerprinted translation dictionary for one locale."""
+
+    locale: str
+    body: bytes
+    etag: str
+
+    @property
+    def version(self) -> str:
+        return self.etag.strip('"')
+
+    @classmethod
+    def from_body(cls, locale: str, body: bytes) -> "TranslationBundle":
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        return cls(locale=locale, body=body, etag=f'"{digest}"')
+
+    @classmethod
+    def from_translations(cls, locale: str, translations: Dict[str, str]) -> "TranslationBundle":
+        body = json.dumps(
+            translations, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+        ).encode("utf-8")
+        return cls.from_body(locale, body)
+
+
+def fallback_chain(locale_code: str) -> List[str]:
+    """Most specific first: ``es-MX`` -> ``["es-MX", "es", "en"]``."""
+    chain: List[str] = []
+    code = (locale_code or "").strip().replace("_", "-")
+    while code:
+        if code not in chain:
+            chain.append(code)
+        code = code.rsplit("-", 1)[0] if "-" in code else ""
+    if DEFAULT_LOCALE not in chain:
+        chain.append(DEFAULT_LOCALE)
+    return chain
+
+
+# Process-local bundle set: locale code -> bundle
+_bundles: Optional[Dict[str, TranslationBundle]] = None
+
+
+def invalidate_local_bundles():
+    """Drop this worker's bundle set; the next read reloads from Redis."""
+    global _bundles
+    _bundles = None
+
+
+invalidation_bus.subscribe(BUNDLES_INVALIDATION_TOPIC, lambda _payload: invalidate_local_bundles())
+
+
+async def build_bundles(db: AsyncSession) -> Dict[str, TranslationBundle]:
+    """Compile every locale's bundle from the database in three queries."""
+    keys_result = await db.execute(select(TranslationKey.key, TranslationKey.default_value))
+    defaults = dict(keys_result.all())
+
+    rows_result = await db.execute(
+        select(Locale.code, TranslationKey.key, Translation.value)
+        .join(Translation, Translation.locale_id == Locale.id)
+        .join(TranslationKey, Translation.translation_key_id == TranslationKey.id)
+    )
+    per_locale: Dict[str, Dict[str, str]] = {}
+    for code, key, value in rows_result.all():
+        per_locale.setdefault(code, {})[key] = value
+
+    locales_result = await db.execute(select(Locale.code))
+    codes = set(locales_result.scalars().all()) | set(per_locale)
+
+    bundles = {_DEFAULTS_BUNDLE: TranslationBundle.from_translations(_DEFAULTS_BUNDLE, defaults)}
+    for code in codes:
+        merged = dict(defaults)
+        # Least specific first so the requested locale wins
+        for fallback in reversed(fallback_chain(code)):
+            merged.update(per_locale.get(fallback, {}))
+        bundles[code] = TranslationBundle.from_translations(code, merged)
+
+    return bundles
+
+
+async def _load_from_redis() -> Optional[Dict[str, TranslationBundle]]:
+    from app.core.redis import get_redis
+
+    try:
+        redis_client = await get_redis()
+        raw = await redis_client.get(BUNDLES_REDIS_KEY)
+        if not raw:
+            return None
+        bodies = json.loads(raw)
+        return {
+            code: TranslationBundle.from_body(code, body.encode("utf-8"))
+            for code, body in bodies.items()
+        }
+    except Exception as e:
+        logger.warning(f"Failed to load translation bundles from Redis: {e}")
+        return None
+
+
+async def _store_in_redis(bundles: Dict[str, TranslationBundle]):
+    from app.core.redis import get_redis
+
+    try:
+        redis_client = await get_redis()
+        payload = json.dumps({code: b.body.decode("utf-8") for code, b in bundles.items()})
+        await redis_client.set(BUNDLES_REDIS_KEY, payload, ex=BUNDLES_REDIS_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to store translation bundles in Redis: {e}")
+
+
+async def get_bundles(db: AsyncSession) -> Dict[str, TranslationBundle]:
+    """Return the bundle set: process memory, then Redis, then a database build."""
+    global _bundles
+
+    if _bundles is not None:
+        return _bundles
+
+    bundles = await _load_from_redis()
+    if bundles is None:
+        bundles = await build_bundles(db)
+        await _store_in_redis(bundles)
+
+    _bundles = bundles
+    return bundles
+
+
+async def get_bundle(db: AsyncSession, locale_code: str) -> TranslationBundle:
+    """Resolve a locale to its nearest compiled bundle (``es-AR`` falls back to ``es``)."""
+    bundles = await get_bundles(db)
+    for code in fallback_chain(locale_code):
+        bundle = bundles.get(code)
+        if bundle is not None:
+            return bundle
+    return bundles[_DEFAULTS_BUNDLE]
+
+
+async def rebuild_bundles(db: AsyncSession) -> Dict[str, TranslationBundle]:
+    """Recompile after a translation write and propagate to every worker."""
+    global _bundles
+
+    bundles = await build_bundles(db)
+    await _store_in_redis(bundles)
+    _bundles = bundles
+    await invalidation_bus.publish(BUNDLES_INVALIDATION_TOPIC)
+    return bundles
@@ -0,0 +1,192 @@
+"""
+Redis pub/sub backplane for cross-node WebSocket fan-out.
+
+Every API node keeps its own WebSocket connections, so a broadcast issued on
+one node has to reach subscribers connected to the others. The backplane maps
+each subscription key (``org:<id>``, ``topic:<name>``, ``user:<id>``, ``all``)
+to a Redis channel. A node only subscribes to the channels it has local
+subscribers for, and publishes the already-serialized message text, so the
+payload is encoded once per broadcast for the whole cluster.
+
+Frames carry the publishing node id, so nodes skip their own messages (they
+deliver locally without the round trip). When Redis is unavailable the
+backplane reports ``listening = False`` and broadcasts stay node-local.
+"""
+
+import asyncio
+from typing import Callable, Optional, Set, Tuple
+from uuid import uuid4
+
+import structlog
+
+logger = structlog.get_logger()
+
+CHANNEL_PREFIX = "janua:ws:"
+ALL_CHANNEL = "all"
+
+# (channel, text, exclude_connection, authenticated_only)
+DeliverHandler = Callable[[str, str, Optional[str], bool], None]
+
+
+def encode_frame(node_id: str, text: str, exclude: Optional[str], authenticated_only: bool) -> str:
+    """Prefix serialized message text with routing fields (no re-encoding)."""
+    return f"{node_id}|{exclude or ''}|{int(authenticated_only)}|{text}"
+
+
+def decode_frame(frame: str) -> Tuple[str, str, Optional[str], bool]:
+    """Inverse of :func:`encode_frame`."""
+    node_id, exclude, authenticated_only, text = frame.split("|", 3)
+    return node_id, text, exclude or None, authenticated_only == "1"
+
+
+class WebSocketBackplane:
+    """Relay broadcasts between API nodes over Redis pub/sub."""
+
+    def __init__(
+        self,
+        deliver: DeliverHandler,
+        channel_prefix: str = CHANNEL_PREFIX,
+        reconnect_delay: float = 1.0,
+    ):
+        self.node_id = uuid4().hex
+        self.channel_prefix = channel_prefix
+        self.reconnect_delay = reconnect_delay
+        self._deliver = deliver
+        self._channels: Set[str] = {ALL_CHANNEL}
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+        self._stopping = False
+
+    @property
+    def listening(self) -> bool:
+        """True while subscribed to Redis; broadcasts then reach every node."""
+        return self._listening
+
+    @property
+    def channels(self) -> Set[str]:
+        """Channels this node currently has local subscribers for."""
+        return set(self._channels)
+
+    async def add(self, channel: str):
+        """Start receiving a channel (called when its first local subscriber arrives)."""
+        if channel in self._channels:
+            return
+        self._channels.add(channel)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(f"{self.channel_prefix}{channel}")
+            except Exception as e:
+                logger.warning("Backplane subscribe failed", channel=channel, error=str(e))
+
+    async def remove(self, channel: str):
+        """Stop receiving a channel (called when its last local subscriber leaves)."""
+        if channel == ALL_CHANNEL or channel not in self._channels:
+            return
+        self._channels.discard(channel)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(f"{self.channel_prefix}{channel}")
+            except Exception as e:
+                logger.warning("Backplane unsubscribe failed", channel=channel, error=str(e))
+
+    async def publish(
+        self,
+        channel: str,
+        text: str,
+        exclude: Optional[str] = None,
+        authenticated_only: bool = False,
+    ) -> bool:
+        """Publish serialized message text to other nodes. Returns False if Redis is down."""
+        from app.core.redis import get_raw_redis
+
+        try:
+            client = await get_raw_redis()
+            if client is None:
+                return False
+            frame = encode_frame(self.node_id, text, exclude, authenticated_only)
+            await client.publish(f"{self.channel_prefix}{channel}", frame)
+            return True
+        except Exception as e:
+            logger.warning("Backplane publish failed", channel=channel, error=str(e))
+            return False
+
+    async def start(self):
+        """Start the background subscriber task"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the background subscriber task"""
+        self._stopping = True
+        self._listening = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        from app.core.redis import get_raw_redis
+
+        while not self._stopping:
+            pubsub = None
+            try:
+                client = await get_raw_redis()
+                if client is None:
+                    self._listening = False
+                    await asyncio.sleep(self.reconnect_delay * 10)
+                    continue
+
+                pubsub = client.pubsub()
+                # Expose the pubsub first so channels added during subscribe are not missed
+                self._pubsub = pubsub
+                await pubsub.subscribe(*(f"{self.channel_prefix}{c}" for c in self._channels))
+                self._listening = True
+                logger.info("WebSocket backplane subscribed", channels=len(self._channels))
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self._dispatch(_as_str(message.get("channel")), _as_str(message.get("data")))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("WebSocket backplane disconnected", error=str(e))
+            finally:
+                self._listening = False
+                self._pubsub = None
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _dispatch(self, channel: str, frame: str):
+        try:
+            node_id, text, exclude, authenticated_only = decode_frame(frame)
+        except ValueError:
+            logger.warning("Malformed backplane frame", channel=channel)
+            return
+        if node_id == self.node_id:
+            return
+        try:
+            self._deliver(channel[len(self.channel_prefix) :], text, exclude, authenticated_only)
+        except Exception as e:
+            logger.error("Backplane delivery failed", channel=channel, error=str(e))
+
+
+def _as_str(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
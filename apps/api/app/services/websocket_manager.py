@@ -1,16 +1,35 @@
 """
 WebSocket connection manager for real-time events.
+
+Broadcasts are serialized once and handed to each recipient's bounded
+``ConnectionOutbox``; a writer task per connection drains it, so one slow
+socket never stalls a fan-out. Subscriptions are mirrored onto the Redis
+``WebSocketBackplane`` so broadcasts reach clients connected to other nodes.
 """
 
 import asyncio
+import json
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional, Set
+from typing import Any, Callable, Dict, Iterable, Optional, Set
 
+import structlog
 from fastapi import WebSocket
 
+from app.config import settings
 from app.services.auth_service import AuthService
 from app.services.cache import CacheService
+from app.services.websocket_backplane import ALL_CHANNEL, WebSocketBackplane
+
+logger = structlog.get_logger()
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+def serialize_message(message: dict) -> str:
+    """Encode a message once; the text is shared by every recipient and node."""
+    return json.dumps(message, separators=(",", ":"), default=str)
 
 
 class EventType(str, Enum):
@@ -33,6 +52,73 @@ class EventType(str, Enum):
     PONG = "pong"
 
 
+class ConnectionOutbox:
+    """
+    Bounded outbound queue for one connection, drained by a single writer task.
+
+    When the queue is full the ``drop_oldest`` policy discards the oldest
+    pending message; ``disconnect`` treats the client as too slow and closes it.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        maxsize: int,
+        policy: str,
+        on_failure: Callable[[str], None],
+    ):
+        self.websocket = websocket
+        self.policy = policy
+        self.dropped = 0
+        self._on_failure = on_failure
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, text: str) -> bool:
+        """Queue serialized text without blocking. Returns False if it was not queued."""
+        if self._closed:
+            return False
+        if self._queue.full():
+            if self.policy == DISCONNECT:
+                self._closed = True
+                self._on_failure("slow consumer")
+                return False
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+        self._queue.put_nowait(text)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._drain())
+        return True
+
+    async def _drain(self):
+        while not self._queue.empty():
+            text = self._queue.get_nowait()
+            try:
+                await self.websocket.send_text(text)
+            except Exception as e:
+                self._closed = True
+                self._on_failure(str(e))
+                return
+            finally:
+                self._queue.task_done()
+
+    async def flush(self):
+        """Wait until everything queued so far has been written."""
+        if self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def close(self):
+        self._closed = True
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections and message routing.
@@ -54,6 +140,11 @@ class ConnectionManager:
         # Cache service for distributed deployments
         self.cache = CacheService()
 
+        # Cross-node fan-out; channels follow local subscriptions
+        self.backplane = WebSocketBackplane(self._deliver_remote)
+        self.outbound_queue_size = settings.WEBSOCKET_OUTBOUND_QUEUE_SIZE
+        self.slow_consumer_policy = settings.WEBSOCKET_SLOW_CONSUMER_POLICY
+
         # Connection ID counter
         self._connection_counter = 0
 
@@ -80,13 +171,17 @@ class ConnectionManager:
             "subscriptions": set(),
             "connected_at": datetime.utcnow(),
             "last_ping": datetime.utcnow(),
+            "outbox": ConnectionOutbox(
+                websocket,
+                maxsize=self.outbound_queue_size,
+                policy=self.slow_consumer_policy,
+                on_failure=lambda reason: self._drop_connection(connection_id, reason),
+            ),
         }
 
         # Map user to connection if authenticated
         if user_id:
-            if user_id not in self.user_connections:
-                self.user_connections[user_id] = set()
-            self.user_connections[user_id].add(connection_id)
+            await self._add_subscriber(self.user_connections, "user", user_id, connection_id)
             self.active_connections[connection_id]["authenticated"] = True
 
         # Send connection confirmation
@@ -117,25 +212,22 @@ class ConnectionManager:
             return
 
         connection = self.active_connections[connection_id]
+        connection["outbox"].close()
 
         # Remove from user connections
         if connection["user_id"]:
-            user_id = connection["user_id"]
-            if user_id in self.user_connections:
-                self.user_connections[user_id].discard(connection_id)
-                if not self.user_connections[user_id]:
-                    del self.user_connections[user_id]
+            await self._remove_subscriber(
+                self.user_connections, "user", connection["user_id"], connection_id
+            )
 
         # Remove from all subscriptions
         for org_id in list(self.organization_subscribers.keys()):
-            self.organization_subscribers[org_id].discard(connection_id)
-            if not self.organization_subscribers[org_id]:
-                del self.organization_subscribers[org_id]
+            await self._remove_subscriber(
+                self.organization_subscribers, "org", org_id, connection_id
+            )
 
         for topic in list(self.topic_subscribers.keys()):
-            self.topic_subscribers[topic].discard(connection_id)
-            if not self.topic_subscribers[topic]:
-                del self.topic_subscribers[topic]
+            await self._remove_subscriber(self.topic_subscribers, "topic", topic, connection_id)
 
         # Close WebSocket
         try:
@@ -173,8 +265,7 @@ class ConnectionManager:
 
         # Remove from old user mapping if exists
         if old_user_id and old_user_id != str(user.id):
-            if old_user_id in self.user_connections:
-                self.user_connections[old_user_id].discard(connection_id)
+            await self._remove_subscriber(self.user_connections, "user", old_user_id, connection_id)
 
         # Update connection info
         connection["user_id"] = str(user.id)
@@ -183,9 +274,7 @@ class ConnectionManager:
         connection["tenant_id"] = str(user.tenant_id)
 
         # Add to user connections
-        if str(user.id) not in self.user_connections:
-            self.user_connections[str(user.id)] = set()
-        self.user_connections[str(user.id)].add(connection_id)
+        await self._add_subscriber(self.user_connections, "user", str(user.id), connection_id)
 
         # Send success response
         await self.send_to_connection(
@@ -220,15 +309,13 @@ class ConnectionManager:
 
         # Add subscription based on type
         if subscription_type == "organization":
-            if target_id not in self.organization_subscribers:
-                self.organization_subscribers[target_id] = set()
-            self.organization_subscribers[target_id].add(connection_id)
+            await self._add_subscriber(
+                self.organization_subscribers, "org", target_id, connection_id
+            )
             connection["subscriptions"].add(f"org:{target_id}")
 
         elif subscription_type == "topic":
-            if target_id not in self.topic_subscribers:
-                self.topic_subscribers[target_id] = set()
-            self.topic_subscribers[target_id].add(connection_id)
+            await self._add_subscriber(self.topic_subscribers, "topic", target_id, connection_id)
             connection["subscriptions"].add(f"topic:{target_id}")
 
         else:
@@ -263,13 +350,13 @@ class ConnectionManager:
 
         # Remove subscription based on type
         if subscription_type == "organization":
-            if target_id in self.organization_subscribers:
-                self.organization_subscribers[target_id].discard(connection_id)
+            await self._remove_subscriber(
+                self.organization_subscribers, "org", target_id, connection_id
+            )
             connection["subscriptions"].discard(f"org:{target_id}")
 
         elif subscription_type == "topic":
-            if target_id in self.topic_subscribers:
-                self.topic_subscribers[target_id].discard(connection_id)
+            await self._remove_subscriber(self.topic_subscribers, "topic", target_id, connection_id)
             connection["subscriptions"].discard(f"topic:{target_id}")
 
         # Confirm unsubscription
@@ -286,6 +373,9 @@ class ConnectionManager:
     async def send_to_connection(self, connection_id: str, message: dict):
         """
         Send a message to a specific connection.
+
+        Used for direct replies (confirmations, errors, pongs); fan-out goes
+        through the connection outboxes instead.
         """
         if connection_id not in self.active_connections:
             return
@@ -294,52 +384,134 @@ class ConnectionManager:
         try:
             await connection["websocket"].send_json(message)
         except Exception as e:
-            print(f"Error sending to connection {connection_id}: {e}")
+            logger.warning("WebSocket send failed", connection_id=connection_id, error=str(e))
             await self.disconnect(connection_id)
 
     async def send_to_user(self, user_id: str, message: dict):
         """
-        Send a message to all connections for a user.
+        Send a message to all connections for a user, on every node.
         """
-        if user_id not in self.user_connections:
-            return
-
-        for connection_id in list(self.user_connections[user_id]):
-            await self.send_to_connection(connection_id, message)
+        text = serialize_message(message)
+        self._fan_out(self.user_connections.get(user_id, ()), text)
+        await self.backplane.publish(f"user:{user_id}", text)
 
     async def broadcast_to_organization(
         self, organization_id: str, message: dict, exclude_connection: Optional[str] = None
     ):
         """
-        Broadcast a message to all subscribers of an organization.
+        Broadcast a message to all subscribers of an organization, on every node.
         """
-        if organization_id not in self.organization_subscribers:
-            return
-
-        for connection_id in list(self.organization_subscribers[organization_id]):
-            if connection_id != exclude_connection:
-                await self.send_to_connection(connection_id, message)
+        text = serialize_message(message)
+        self._fan_out(
+            self.organization_subscribers.get(organization_id, ()), text, exclude_connection
+        )
+        await self.backplane.publish(f"org:{organization_id}", text, exclude_connection)
 
     async def broadcast_to_topic(
         self, topic: str, message: dict, exclude_connection: Optional[str] = None
     ):
         """
-        Broadcast a message to all subscribers of a topic.
+        Broadcast a message to all subscribers of a topic, on every node.
         """
-        if topic not in self.topic_subscribers:
-            return
-
-        for connection_id in list(self.topic_subscribers[topic]):
-            if connection_id != exclude_connection:
-                await self.send_to_connection(connection_id, message)
+        text = serialize_message(message)
+        self._fan_out(self.topic_subscribers.get(topic, ()), text, exclude_connection)
+        await self.backplane.publish(f"topic:{topic}", text, exclude_connection)
 
     async def broadcast_to_all(self, message: dict, authenticated_only: bool = True):
         """
-        Broadcast a message to all connected clients.
+        Broadcast a message to all connected clients, on every node.
         """
-        for connection_id, connection in list(self.active_connections.items()):
-            if not authenticated_only or connection["authenticated"]:
-                await self.send_to_connection(connection_id, message)
+        text = serialize_message(message)
+        self._fan_out(self.active_connections, text, authenticated_only=authenticated_only)
+        await self.backplane.publish(ALL_CHANNEL, text, authenticated_only=authenticated_only)
+
+    async def flush(self, connection_id: Optional[str] = None):
+        """
+        Wait for queued broadcasts to be written (one connection or all).
+        """
+        if connection_id is not None:
+            connection_ids = [connection_id]
+        else:
+            connection_ids = list(self.active_connections)
+        await asyncio.gather(
+            *(
+                self.active_connections[cid]["outbox"].flush()
+                for cid in connection_ids
+                if cid in self.active_connections
+            )
+        )
+
+    def _fan_out(
+        self,
+        connection_ids: Iterable[str],
+        text: str,
+        exclude_connection: Optional[str] = None,
+        authenticated_only: bool = False,
+    ) -> int:
+        """Queue serialized text for local recipients without awaiting any socket."""
+        queued = 0
+        for connection_id in list(connection_ids):
+            if connection_id == exclude_connection:
+                continue
+            connection = self.active_connections.get(connection_id)
+            if connection is None:
+                continue
+            if authenticated_only and not connection["authenticated"]:
+                continue
+            if connection["outbox"].put(text):
+                queued += 1
+        return queued
+
+    def _deliver_remote(
+        self, channel: str, text: str, exclude_connection: Optional[str], authenticated_only: bool
+    ):
+        """Backplane callback: fan a message published on another node out locally."""
+        kind, _, key = channel.partition(":")
+        if kind == "org":
+            recipients: Iterable[str] = self.organization_subscribers.get(key, ())
+        elif kind == "topic":
+            recipients = self.topic_subscribers.get(key, ())
+        elif kind == "user":
+            recipients = self.user_connections.get(key, ())
+        elif channel == ALL_CHANNEL:
+            recipients = self.active_connections
+        else:
+            return
+        self._fan_out(recipients, text, exclude_connection, authenticated_only)
+
+    async def _add_subscriber(
+        self, index: Dict[str, Set[str]], kind: str, key: str, connection_id: str
+    ):
+        if key not in index:
+            index[key] = set()
+            await self.backplane.add(f"{kind}:{key}")
+        index[key].add(connection_id)
+
+    async def _remove_subscriber(
+        self, index: Dict[str, Set[str]], kind: str, key: str, connection_id: str
+    ):
+        subscribers = index.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(connection_id)
+        if not subscribers:
+            del index[key]
+            await self.backplane.remove(f"{kind}:{key}")
+
+    def _drop_connection(self, connection_id: str, reason: str):
+        """Disconnect a failed or too-slow connection from synchronous code."""
+        logger.warning("Dropping WebSocket connection", connection_id=connection_id, reason=reason)
+        task = asyncio.get_running_loop().create_task(self.disconnect(connection_id))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def start(self):
+        """Start cross-node fan-out"""
+        await self.backplane.start()
+
+    async def stop(self):
+        """Stop cross-node fan-out"""
+        await self.backplane.stop()
 
     async def handle_message(self, connection_id: str, message: dict, db_session):
         """
@@ -436,7 +608,7 @@ class ConnectionManager:
 
                     # Disconnect if no ping for 90 seconds
                     if (datetime.utcnow() - last_ping).seconds > 90:
-                        print(f"Connection {connection_id} timed out")
+                        logger.info("WebSocket connection timed out", connection_id=connection_id)
                         await self.disconnect(connection_id)
                         break
 
@@ -450,7 +622,9 @@ class ConnectionManager:
                     )
 
             except Exception as e:
-                print(f"Heartbeat error for {connection_id}: {e}")
+                logger.warning(
+                    "WebSocket heartbeat failed", connection_id=connection_id, error=str(e)
+                )
                 break
 
     def get_connection_info(self, connection_id: str) -> Optional[dict]:
@@ -468,6 +642,8 @@ class ConnectionManager:
             "subscriptions": list(connection.get("subscriptions", set())),
             "connected_at": connection.get("connected_at"),
             "last_ping": connection.get("last_ping"),
+            "queued_messages": connection["outbox"].pending if "outbox" in connection else 0,
+            "dropped_messages": connection["outbox"].dropped if "outbox" in connection else 0,
         }
 
     def get_stats(self) -> dict:
@@ -487,6 +663,11 @@ class ConnectionManager:
             "total_subscriptions": sum(
                 len(c.get("subscriptions", set())) for c in self.active_connections.values()
             ),
+            "dropped_messages": sum(
+                c["outbox"].dropped for c in self.active_connections.values() if "outbox" in c
+            ),
+            "backplane_connected": self.backplane.listening,
+            "backplane_channels": len(self.backplane.channels),
         }
 
 
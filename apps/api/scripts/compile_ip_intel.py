@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Compile IP intelligence feeds into a memory-mappable snapshot.
+
+Run from cron or a sidecar after syncing feed files, so API workers only map
+the finished snapshot (set IP_INTEL_SNAPSHOT_PATH and leave IP_INTEL_FEED_DIR
+unset on the workers) instead of each compiling hundreds of thousands of CIDRs.
+
+Usage:
+    python scripts/compile_ip_intel.py <feed_dir> <snapshot_path>
+
+Feed files are named <category>.txt (tor.txt, vpn.txt, datacenter.txt,
+blocklist.txt, ...) with one CIDR per line, optionally followed by ",score".
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.security.ip_intelligence import IPIntelIndex, read_feed_dir  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("feed_dir", help="Directory of <category>.txt feed files")
+    parser.add_argument("snapshot_path", help="Where to write the compiled snapshot")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    prefixes = read_feed_dir(args.feed_dir)
+    index = IPIntelIndex.build(prefixes)
+    index.write_snapshot(args.snapshot_path)
+
+    print(
+        f"Compiled {len(prefixes):,} prefixes into {index.size:,} nodes "
+        f"-> {args.snapshot_path} in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Performance Tests for the IP Intelligence Index
+
+Benchmarks longest-prefix-match lookups against a feed-sized index:
+- 1M IPv4 prefixes with a realistic prefix-length mix
+- In-memory index vs memory-mapped snapshot
+- Snapshot load time (what a worker pays on hot-swap)
+"""
+
+import random
+import statistics
+import time
+from typing import List
+
+import pytest
+
+from app.security.ip_intelligence import IPIntelIndex
+
+PERF_CONFIG = {
+    "prefix_count": 1_000_000,
+    "lookup_count": 200_000,
+    # Feed prefix lengths skew towards /24 (hosting and VPN ranges) and /32 (Tor exits)
+    "prefix_lengths": (16, 20, 22, 24, 24, 24, 28, 32),
+    "categories": ("tor", "vpn", "proxy", "datacenter", "blocklist"),
+    "thresholds": {
+        "mean_lookup_us": 20,
+        "p99_lookup_us": 100,
+        "snapshot_load_ms": 50,
+    },
+}
+
+
+def _generate_prefixes(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    lengths = PERF_CONFIG["prefix_lengths"]
+    categories = PERF_CONFIG["categories"]
+    for _ in range(count):
+        plen = rng.choice(lengths)
+        value = rng.getrandbits(32) & (((1 << plen) - 1) << (32 - plen))
+        address = f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+        yield f"{address}/{plen}", rng.choice(categories), None
+
+
+def _random_ips(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        f"{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture(scope="module")
+def large_index():
+    return IPIntelIndex.build(_generate_prefixes(PERF_CONFIG["prefix_count"]))
+
+
+@pytest.fixture(scope="module")
+def snapshot_path(large_index, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("ip-intel") / "snapshot.bin")
+    large_index.write_snapshot(path)
+    return path
+
+
+def _benchmark(index: IPIntelIndex, ips: List[str]) -> dict:
+    # Batched timings keep timer overhead out of the per-lookup numbers
+    batch = 1000
+    per_lookup_us = []
+    hits = 0
+    for start in range(0, len(ips), batch):
+        chunk = ips[start : start + batch]
+        t0 = time.perf_counter()
+        for ip in chunk:
+            if index.lookup(ip) is not None:
+                hits += 1
+        per_lookup_us.append((time.perf_counter() - t0) / len(chunk) * 1e6)
+    per_lookup_us.sort()
+    return {
+        "mean_us": statistics.mean(per_lookup_us),
+        "p99_us": per_lookup_us[int(len(per_lookup_us) * 0.99) - 1],
+        "hit_rate": hits / len(ips),
+    }
+
+
+@pytest.mark.slow
+class TestIPIntelligenceLookupPerformance:
+    """Lookup latency at 1M prefixes"""
+
+    def test_in_memory_lookup_1m_prefixes(self, large_index):
+        """Lookups against the freshly compiled index"""
+        stats = _benchmark(large_index, _random_ips(PERF_CONFIG["lookup_count"]))
+
+        assert stats["mean_us"] < PERF_CONFIG["thresholds"]["mean_lookup_us"]
+        assert stats["p99_us"] < PERF_CONFIG["thresholds"]["p99_lookup_us"]
+
+        print(f"\n✅ In-memory index ({PERF_CONFIG['prefix_count']:,} prefixes):")
+        print(f"  Trie nodes: {large_index.size:,}")
+        print(f"  Mean lookup: {stats['mean_us']:.2f}µs")
+        print(f"  P99 lookup (per 1k batch): {stats['p99_us']:.2f}µs")
+        print(f"  Hit rate: {stats['hit_rate']:.1%}")
+
+    def test_mmap_snapshot_lookup_1m_prefixes(self, large_index, snapshot_path):
+        """Lookups against the memory-mapped snapshot match the in-memory index"""
+        t0 = time.perf_counter()
+        mapped = IPIntelIndex.load_snapshot(snapshot_path)
+        load_ms = (time.perf_counter() - t0) * 1000
+
+        ips = _random_ips(PERF_CONFIG["lookup_count"])
+        for ip in ips[:10_000]:
+            assert mapped.lookup(ip) == large_index.lookup(ip)
+
+        stats = _benchmark(mapped, ips)
+
+        assert load_ms < PERF_CONFIG["thresholds"]["snapshot_load_ms"]
+        assert stats["mean_us"] < PERF_CONFIG["thresholds"]["mean_lookup_us"]
+
+        print(f"\n✅ Memory-mapped snapshot ({PERF_CONFIG['prefix_count']:,} prefixes):")
+        print(f"  Snapshot load: {load_ms:.2f}ms")
+        print(f"  Mean lookup: {stats['mean_us']:.2f}µs")
+        print(f"  P99 lookup (per 1k batch): {stats['p99_us']:.2f}µs")
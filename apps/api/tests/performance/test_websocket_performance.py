@@ -10,10 +10,13 @@ Tests WebSocket server performance under various load conditions:
 """
 
 import asyncio
+import multiprocessing
 import statistics
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, patch
 
 import psutil
 import pytest
@@ -255,6 +258,12 @@ PERF_CONFIG = {
         "duration_minutes": 5,
         "ping_interval_seconds": 1,
     },
+    "fan_out": {
+        "connections": 50000,
+        "processes": 4,
+        "broadcasts": 5,
+        "max_broadcast_seconds": 10,
+    },
 }
 
 
@@ -688,3 +697,128 @@ class TestWebSocketMemory:
         print(f"  No significant leak: ✓")
 
         print("\n" + metrics.get_report())
+
+
+# Cross-process fan-out through ConnectionManager + WebSocketBackplane.
+# Each worker process plays one API node with its share of the connections;
+# the parent relays published frames to every node the way Redis pub/sub does.
+
+
+class _CountingWebSocket:
+    """Server-side socket stand-in that only counts what it is sent"""
+
+    received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        pass
+
+    async def send_text(self, text):
+        _CountingWebSocket.received += 1
+
+    async def close(self):
+        pass
+
+
+class _QueueRedis:
+    """Hands published frames to the parent process"""
+
+    def __init__(self, outbound):
+        self.outbound = outbound
+
+    async def publish(self, channel, frame):
+        self.outbound.put((channel, frame))
+
+
+def _fan_out_node(connections: int, inbound, outbound, reports):
+    asyncio.run(_fan_out_node_main(connections, inbound, outbound, reports))
+
+
+async def _fan_out_node_main(connections: int, inbound, outbound, reports):
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    for i in range(connections):
+        connection_id = await manager.connect(_CountingWebSocket(), user_id=f"user-{i}")
+        await manager.subscribe(connection_id, "organization", f"org-{i % 10}")
+    reports.put(("ready", connections))
+
+    loop = asyncio.get_running_loop()
+    redis = _QueueRedis(outbound)
+    with patch("app.core.redis.get_raw_redis", AsyncMock(return_value=redis)):
+        while True:
+            command = await loop.run_in_executor(None, inbound.get)
+            if command[0] == "stop":
+                break
+            before = _CountingWebSocket.received
+            if command[0] == "broadcast":
+                await manager.broadcast_to_all({"type": "notification", "data": command[1]})
+            else:
+                manager.backplane._dispatch(command[1], command[2])
+            await manager.flush()
+            reports.put(("delivered", _CountingWebSocket.received - before))
+
+
+class TestWebSocketCrossProcessFanOut:
+    """Broadcast to 50k connections spread over several node processes"""
+
+    @pytest.mark.slow
+    def test_broadcast_to_50k_connections_across_processes(self):
+        """Every connection on every node receives each broadcast"""
+        config = PERF_CONFIG["fan_out"]
+        processes = config["processes"]
+        per_node = config["connections"] // processes
+        total = per_node * processes
+
+        inbounds = [multiprocessing.Queue() for _ in range(processes)]
+        outbound = multiprocessing.Queue()
+        reports = multiprocessing.Queue()
+        nodes = [
+            multiprocessing.Process(
+                target=_fan_out_node, args=(per_node, inbound, outbound, reports), daemon=True
+            )
+            for inbound in inbounds
+        ]
+
+        def relay():
+            # Redis stand-in: deliver every published frame to every node
+            while True:
+                message = outbound.get()
+                if message is None:
+                    return
+                for inbound in inbounds:
+                    inbound.put(("frame",) + message)
+
+        relay_thread = threading.Thread(target=relay, daemon=True)
+        relay_thread.start()
+        for node in nodes:
+            node.start()
+
+        try:
+            connected = sum(reports.get(timeout=300)[1] for _ in nodes)
+            assert connected == total
+
+            durations = []
+            for n in range(config["broadcasts"]):
+                start = time.perf_counter()
+                inbounds[0].put(("broadcast", {"n": n}))
+                # Origin node reports its local delivery, then every node reports the relayed frame
+                delivered = sum(reports.get(timeout=60)[1] for _ in range(processes + 1))
+                durations.append(time.perf_counter() - start)
+                assert delivered == total
+
+            assert max(durations) < config["max_broadcast_seconds"]
+
+            print(f"\n✅ Cross-process fan-out ({total} connections, {processes} nodes):")
+            print(f"  Mean broadcast: {statistics.mean(durations) * 1000:.1f} ms")
+            print(f"  Max broadcast: {max(durations) * 1000:.1f} ms")
+        finally:
+            for inbound in inbounds:
+                inbound.put(("stop",))
+            outbound.put(None)
+            for node in nodes:
+                node.join(timeout=10)
+                if node.is_alive():
+                    node.terminate()
@@ -13,9 +13,11 @@ which calls asyncio.create_task() at module level. To avoid this, we:
 3. Mock the alerting package __init__.py to prevent the chain
 """
 
+import asyncio
 import sys
+import time
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -540,6 +542,194 @@ class TestAlertManager:
         assert "low_disk_space" in manager.alert_rules
 
 
+def _rule(rule_id, metric_name="error_rate", window=300, channels=None):
+    from app.alerting.core.alert_models import AlertRule
+    from app.alerting.core.alert_types import AlertChannel, AlertSeverity
+
+    return AlertRule(
+        rule_id=rule_id,
+        name=rule_id,
+        description=f"{rule_id} fired",
+        severity=AlertSeverity.HIGH,
+        metric_name=metric_name,
+        threshold_value=1.0,
+        comparison_operator=">",
+        evaluation_window=window,
+        channels=channels if channels is not None else [AlertChannel.SLACK],
+    )
+
+
+def _manager(rules, metric_value=5.0):
+    from app.alerting.core.alert_manager import AlertManager
+
+    manager = AlertManager()
+    manager.alert_rules = {rule.rule_id: rule for rule in rules}
+    manager._get_metric_value = AsyncMock(return_value=metric_value)
+    manager._get_alert_context = AsyncMock(return_value={})
+    manager.notification_sender.send_batch = AsyncMock(return_value=True)
+    return manager
+
+
+def _alert(alert_id="a1"):
+    from app.alerting.core.alert_models import Alert
+    from app.alerting.core.alert_types import AlertSeverity, AlertStatus
+
+    return Alert(
+        alert_id=alert_id,
+        rule_id=f"rule-{alert_id}",
+        severity=AlertSeverity.HIGH,
+        status=AlertStatus.TRIGGERED,
+        title="High error rate",
+        description="Errors above threshold",
+        metric_value=0.2,
+        threshold_value=0.05,
+        triggered_at=datetime(2026, 1, 1, 12, 0),
+    )
+
+
+@pytest.mark.asyncio
+class TestConcurrentEvaluation:
+    """Test rule evaluation cycles and notification batching."""
+
+    async def test_rules_sharing_a_metric_fetch_it_once(self):
+        rules = [_rule(f"errors-{i}") for i in range(3)] + [
+            _rule("errors-1h", window=3600),
+            _rule("latency", metric_name="avg_response_time"),
+        ]
+        manager = _manager(rules)
+
+        raised = await manager._evaluate_all_rules()
+
+        assert len(raised) == 5
+        fetched = sorted(call.args for call in manager._get_metric_value.await_args_list)
+        assert fetched == [("avg_response_time", 300), ("error_rate", 300), ("error_rate", 3600)]
+
+    async def test_slow_metric_does_not_stall_other_rules(self, monkeypatch):
+        from app.alerting.core import alert_manager
+
+        monkeypatch.setattr(alert_manager, "METRIC_FETCH_TIMEOUT_SECONDS", 0.05)
+        manager = _manager([_rule("slow", metric_name="slow_metric"), _rule("fast")])
+
+        async def metric_value(metric_name, window_seconds):
+            if metric_name == "slow_metric":
+                await asyncio.sleep(5)
+            return 5.0
+
+        manager._get_metric_value = metric_value
+
+        raised = await asyncio.wait_for(manager._evaluate_all_rules(), 1)
+
+        assert [alert.rule_id for alert in raised] == ["fast"]
+
+    async def test_alerts_raised_together_go_out_in_one_batch_per_channel(self):
+        from app.alerting.core.alert_models import NotificationChannel
+        from app.alerting.core.alert_types import AlertChannel
+
+        manager = _manager([_rule(f"rule-{i}") for i in range(3)])
+        manager.notification_channels = {
+            "ops": NotificationChannel("ops", AlertChannel.SLACK, "Ops", {"webhook_url": "x"})
+        }
+
+        raised = await manager._evaluate_all_rules()
+
+        send_batch = manager.notification_sender.send_batch
+        assert send_batch.await_count == 1
+        channel, alerts = send_batch.await_args.args
+        assert channel.channel_id == "ops"
+        assert sorted(a.alert_id for a in alerts) == sorted(a.alert_id for a in raised)
+        assert all(alert.notifications_sent == ["slack:ops"] for alert in raised)
+        assert len(manager.active_alerts) == 3
+
+    async def test_cycle_time_stays_flat_with_many_rules(self):
+        manager = _manager(
+            [_rule(f"rule-{i}", metric_name=f"metric-{i % 20}") for i in range(2000)],
+            metric_value=0.0,
+        )
+
+        async def metric_value(metric_name, window_seconds):
+            await asyncio.sleep(0.05)
+            return 0.0
+
+        manager._get_metric_value = metric_value
+
+        started = time.monotonic()
+        assert await manager._evaluate_all_rules() == []
+        # 20 distinct metrics fetched concurrently, not 2,000 serial fetches
+        assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+class TestNotificationBatches:
+    """Test NotificationSender.send_batch payloads."""
+
+    @pytest.fixture
+    def sender(self):
+        from app.alerting.core.notification_sender import NotificationSender
+
+        sender = NotificationSender()
+        sender.http_client = MagicMock(post=AsyncMock(), put=AsyncMock())
+        return sender
+
+    def _channel(self, channel_type, **config):
+        from app.alerting.core.alert_models import NotificationChannel
+
+        return NotificationChannel("c1", channel_type, "Channel", {"webhook_url": "u", **config})
+
+    async def test_slack_batch_is_one_message(self, sender):
+        from app.alerting.core.alert_types import AlertChannel
+
+        alerts = [_alert(f"a{i}") for i in range(3)]
+
+        assert await sender.send_batch(self._channel(AlertChannel.SLACK), alerts)
+
+        payload = sender.http_client.post.await_args.kwargs["json"]
+        assert sender.http_client.post.await_count == 1
+        assert len(payload["attachments"]) == 3
+        assert payload["text"].startswith("🚨 3 alerts")
+
+    async def test_discord_batch_respects_embed_limit(self, sender):
+        from app.alerting.core.alert_types import AlertChannel
+
+        alerts = [_alert(f"a{i}") for i in range(12)]
+
+        assert await sender.send_batch(self._channel(AlertChannel.DISCORD), alerts)
+
+        sizes = [len(c.kwargs["json"]["embeds"]) for c in sender.http_client.post.await_args_list]
+        assert sorted(sizes) == [2, 10]
+
+    async def test_webhook_batches_only_when_enabled(self, sender):
+        from app.alerting.core.alert_types import AlertChannel
+
+        alerts = [_alert("a1"), _alert("a2")]
+
+        await sender.send_batch(self._channel(AlertChannel.WEBHOOK), alerts)
+        assert sender.http_client.post.await_count == 2
+
+        sender.http_client.post.reset_mock()
+        await sender.send_batch(self._channel(AlertChannel.WEBHOOK, batch=True), alerts)
+        payload = sender.http_client.post.await_args.kwargs["json"]
+        assert [a["alert_id"] for a in payload["alerts"]] == ["a1", "a2"]
+
+    async def test_email_batch_uses_one_smtp_session(self, sender, monkeypatch):
+        from app.alerting.core import notification_sender
+        from app.alerting.core.alert_types import AlertChannel
+
+        smtp = MagicMock()
+        monkeypatch.setattr(notification_sender.smtplib, "SMTP", smtp)
+        channel = self._channel(
+            AlertChannel.EMAIL,
+            smtp_server="smtp.example.com",
+            username="alerts@example.com",
+            password="secret",
+            to_addresses=["ops@example.com"],
+        )
+
+        assert await sender.send_batch(channel, [_alert("a1"), _alert("a2")])
+
+        assert smtp.call_count == 1
+        assert smtp.return_value.__enter__.return_value.send_message.call_count == 2
+
+
 class TestSecurityAlertRules:
     """Test SOC 2 CF-10 security alert rules exist in default rule set."""
 
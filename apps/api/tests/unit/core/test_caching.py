@@ -3,11 +3,19 @@ Comprehensive Caching Utilities Test Suite
 Tests for cache key generation, decorators, and CacheManager
 """
 
+import asyncio
+import fnmatch
 import json
+import time
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from app.core import caching
+from app.core.redis_circuit_breaker import ResilientRedisClient
 from app.core.caching import (
+    CACHE_INVALIDATION_TOPIC,
+    TAG_KEY_PREFIX,
+    CacheEntry,
     cache_key,
     cached,
     CacheManager,
@@ -20,6 +28,56 @@ from app.core.caching import (
 pytestmark = pytest.mark.asyncio
 
 
+class FakeRedis:
+    """In-memory stand-in for both the resilient client and the raw client behind it."""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.redis = self
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def acquire_lock(self, key, ttl):
+        return await self.set(key, "1", ex=ttl, nx=True) is not None
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(caching, "get_redis", AsyncMock(return_value=redis))
+    return redis
+
+
+@pytest.fixture(autouse=True)
+def clean_cache_state(monkeypatch):
+    """Isolate the process-wide L1, tag versions and stats between tests."""
+    monkeypatch.setattr(caching.invalidation_bus, "publish_nowait", lambda *args: None)
+    monkeypatch.setattr(caching, "get_read_redis", AsyncMock(return_value=None))
+    monkeypatch.setattr(caching, "cache_stats", caching.CacheStats())
+    caching.local_cache.clear()
+    caching.tag_versions.clear()
+    yield
+    caching.local_cache.clear()
+    caching.tag_versions.clear()
+
+
 class TestCacheKeyGeneration:
     """Test cache key generation function."""
 
@@ -116,7 +174,9 @@ class TestCachedDecorator:
 
             await test_func()
 
-            mock_redis.set.assert_called_once()
+            # One write for the value (the other takes the recompute lock)
+            value_writes = [c for c in mock_redis.set.call_args_list if "nx" not in c.kwargs]
+            assert len(value_writes) == 1
             # Check TTL is passed
             call_kwargs = mock_redis.set.call_args
             assert call_kwargs[1]["ex"] == 600
@@ -233,11 +293,22 @@ class TestCacheManager:
 
         assert result is False
 
-    async def test_invalidate_pattern_returns_zero(self, cache_manager, mock_redis):
-        """Test pattern invalidation currently returns 0 (not fully implemented)."""
+    async def test_invalidate_pattern_deletes_matching_keys(self):
+        """Test pattern invalidation scans and deletes matching keys."""
+        redis = FakeRedis()
+        redis.data = {"user:1": "a", "user:2": "b", "org:1": "c"}
+
+        result = await CacheManager(redis_client=redis).invalidate_pattern("user:*")
+
+        assert result == 2
+        assert list(redis.data) == ["org:1"]
+
+    async def test_invalidate_pattern_without_redis(self, cache_manager, mock_redis):
+        """Test pattern invalidation returns 0 when Redis is unavailable."""
+        mock_redis.redis = None
+
         result = await cache_manager.invalidate_pattern("user:*")
 
-        # Current implementation logs warning and returns 0
         assert result == 0
 
     async def test_warm_cache_success(self, cache_manager, mock_redis):
@@ -383,3 +454,233 @@ class TestCacheKeyBuilders:
 
             call_args = mock_redis.get.call_args[0][0]
             assert "sso:org789:okta" in call_args
+
+
+class TestSingleFlight:
+    """Test one recompute per key across coroutines and processes."""
+
+    async def test_concurrent_misses_compute_once(self, fake_redis):
+        calls = []
+
+        @cached(ttl=60, key_prefix="report")
+        async def build_report(org_id):
+            calls.append(org_id)
+            await asyncio.sleep(0.01)
+            return {"org": org_id}
+
+        results = await asyncio.gather(*(build_report("org1") for _ in range(10)))
+
+        assert results == [{"org": "org1"}] * 10
+        assert calls == ["org1"]
+        assert caching.cache_stats.recomputes == {"report": 1}
+        assert "report:org1:lock" not in fake_redis.data
+
+    async def test_waits_for_recompute_in_another_process(self, fake_redis):
+        calls = []
+        key = f"report:{cache_key('org1')}"
+        fake_redis.data[f"{key}:lock"] = "1"  # Another process is recomputing
+
+        @cached(ttl=60, key_prefix="report")
+        async def build_report(org_id):
+            calls.append(org_id)
+            return {"org": org_id, "by": "us"}
+
+        async def other_process_finishes():
+            await asyncio.sleep(0.1)
+            entry = CacheEntry({"org": "org1", "by": "them"}, time.time() + 60, {})
+            fake_redis.data[key] = entry.dumps()
+
+        result, _ = await asyncio.gather(build_report("org1"), other_process_finishes())
+
+        assert result == {"org": "org1", "by": "them"}
+        assert calls == []
+
+    async def test_computes_at_once_without_redis(self, monkeypatch):
+        client = ResilientRedisClient(None)
+        monkeypatch.setattr(caching, "get_redis", AsyncMock(return_value=client))
+
+        @cached(ttl=60, key_prefix="report", lock_timeout=3)
+        async def build_report(org_id):
+            return {"org": org_id}
+
+        started = time.monotonic()
+        assert await build_report("org1") == {"org": "org1"}
+        assert await build_report("org1") == {"org": "org1"}
+        assert time.monotonic() - started < 0.5
+
+    async def test_compute_errors_reach_every_waiter(self, fake_redis):
+        @cached(ttl=60, key_prefix="broken")
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(broken(), broken(), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not caching._inflight
+
+
+class TestStaleWhileRevalidate:
+    """Test stale values are served while they are refreshed."""
+
+    async def test_stale_value_served_and_refreshed_in_background(self, fake_redis):
+        fake_redis.data["price:p1"] = CacheEntry({"price": 1}, time.time() - 5, {}).dumps()
+        refreshed = asyncio.Event()
+
+        @cached(ttl=60, key_prefix="price", key_builder=lambda pid: pid, stale_ttl=30)
+        async def get_price(pid):
+            refreshed.set()
+            return {"price": 2}
+
+        assert await get_price("p1") == {"price": 1}
+        await asyncio.wait_for(refreshed.wait(), 1)
+        await asyncio.sleep(0)
+
+        assert CacheEntry.loads(fake_redis.data["price:p1"]).value == {"price": 2}
+        assert await get_price("p1") == {"price": 2}
+        assert caching.cache_stats.lookups[("price", "stale")] == 1
+
+    async def test_stale_ttl_extends_redis_expiry(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=None)
+
+        with patch("app.core.caching.get_redis", return_value=redis):
+
+            @cached(ttl=60, key_prefix="price", stale_ttl=30)
+            async def get_price():
+                return 1
+
+            await get_price()
+
+        assert redis.set.call_args[1]["ex"] == 90
+
+
+class TestLocalCache:
+    """Test the in-process L1 in front of Redis."""
+
+    async def test_hits_are_served_without_redis(self, fake_redis):
+        @cached(ttl=60, key_prefix="user", key_builder=lambda uid: uid, local_ttl=30)
+        async def get_user(uid):
+            return {"id": uid}
+
+        await get_user("u1")
+        gets = fake_redis.gets
+
+        assert await get_user("u1") == {"id": "u1"}
+        assert fake_redis.gets == gets
+        assert caching.cache_stats.lookups[("user", "local_hit")] == 1
+
+    def test_lru_evicts_oldest(self):
+        local = caching.LocalCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            local.set(key, CacheEntry(key, time.time() + 60, {"t": "1"}), 60)
+
+        assert local.get("a") is None
+        assert local.get("c").value == "c"
+        assert len(local) == 2
+
+
+class TestTagInvalidation:
+    """Test tag-based invalidation."""
+
+    async def test_invalidate_tag_drops_tagged_entries(self, fake_redis):
+        calls = []
+
+        @cached(
+            ttl=600,
+            key_prefix="org",
+            key_builder=lambda org_id: org_id,
+            tags=lambda org_id: [f"org:{org_id}"],
+            local_ttl=60,
+        )
+        async def get_org(org_id):
+            calls.append(org_id)
+            return {"id": org_id, "version": len(calls)}
+
+        assert (await get_org("o1"))["version"] == 1
+        assert (await get_org("o2"))["version"] == 2
+        assert len(calls) == 2
+
+        assert await CacheManager(redis_client=fake_redis).invalidate_tags("org:o1") == 1
+
+        assert (await get_org("o1"))["version"] == 3
+        assert (await get_org("o2"))["version"] == 2
+        assert TAG_KEY_PREFIX + "org:o1" in fake_redis.data
+
+    async def test_replica_entries_are_checked_against_master_tags(
+        self, fake_redis, monkeypatch
+    ):
+        replica = FakeRedis()
+        monkeypatch.setattr(caching, "get_read_redis", AsyncMock(return_value=replica))
+        calls = []
+
+        @cached(
+            ttl=600,
+            key_prefix="org",
+            key_builder=lambda org_id: org_id,
+            tags=lambda org_id: [f"org:{org_id}"],
+        )
+        async def get_org(org_id):
+            calls.append(org_id)
+            return len(calls)
+
+        assert await get_org("o1") == 1
+        replica.data = dict(fake_redis.data)  # Replicated
+        replica.gets = 0
+
+        assert await get_org("o1") == 1
+        assert replica.gets == 1
+
+        # The replica has not seen the new tag version yet
+        await CacheManager(redis_client=fake_redis).invalidate_tags("org:o1")
+        assert await get_org("o1") == 2
+        assert not any(key.startswith(TAG_KEY_PREFIX) for key in replica.data)
+
+    async def test_invalidation_from_another_worker(self, fake_redis):
+        @cache_organization()
+        async def get_org(org_id):
+            return {"id": org_id}
+
+        await get_org("o1")
+        assert caching.local_cache.get("org:o1") is not None
+
+        payload = json.dumps({"tags": {"org:o1": "42"}, "at": time.time() - 0.02})
+        caching.invalidation_bus.dispatch(CACHE_INVALIDATION_TOPIC, payload)
+
+        assert caching.local_cache.get("org:o1") is None
+        stats = caching.cache_stats
+        assert stats.lag_count == 1
+        assert 0.02 <= stats.lag_sum < 1
+
+    async def test_resubscribe_forgets_local_state(self, fake_redis):
+        caching.local_cache.set("k", CacheEntry(1, time.time() + 60, {}), 60)
+        caching.tag_versions.set("org:o1", "1")
+
+        caching.invalidation_bus.dispatch(CACHE_INVALIDATION_TOPIC, "")
+
+        assert len(caching.local_cache) == 0
+        assert caching.tag_versions._versions == {}
+
+
+class TestCacheMetrics:
+    """Test cache metrics exported on /metrics."""
+
+    async def test_hit_ratio_and_families(self, fake_redis):
+        @cached(ttl=60, key_prefix="thing")
+        async def thing():
+            return 1
+
+        await thing()
+        await thing()
+
+        stats = caching.cache_stats
+        assert stats.hit_ratio("thing") == 0.5
+        families = {f.name: f for f in stats.metric_families()}
+        assert set(families) == {
+            "janua_cache_lookups",
+            "janua_cache_hit_ratio",
+            "janua_cache_recomputes",
+            "janua_cache_invalidation_lag_seconds",
+        }
+        assert families["janua_cache_recomputes"].samples[0].value == 1
+
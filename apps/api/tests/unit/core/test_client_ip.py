@@ -0,0 +1,33 @@
+"""
+Tests for resolving the client IP behind trusted proxies.
+"""
+
+from unittest.mock import MagicMock
+
+from fastapi import Request
+
+from app.core.client_ip import client_ip_from_request
+
+
+def _request(host, headers=None):
+    request = MagicMock(spec=Request)
+    request.client = MagicMock(host=host) if host else None
+    request.headers = headers or {}
+    return request
+
+
+class TestClientIp:
+    def test_forwarded_for_from_trusted_proxy(self):
+        request = _request("10.0.0.1", {"X-Forwarded-For": "203.0.113.5, 10.0.0.2"})
+        assert client_ip_from_request(request, "10.0.0.1") == "203.0.113.5"
+
+    def test_real_ip_from_trusted_proxy(self):
+        request = _request("10.0.0.1", {"X-Real-IP": "203.0.113.9"})
+        assert client_ip_from_request(request, "10.0.0.1") == "203.0.113.9"
+
+    def test_headers_from_untrusted_peer_are_ignored(self):
+        request = _request("203.0.113.100", {"X-Forwarded-For": "198.51.100.1"})
+        assert client_ip_from_request(request, "10.0.0.1") == "203.0.113.100"
+
+    def test_no_peer(self):
+        assert client_ip_from_request(_request(None), "") == "unknown"
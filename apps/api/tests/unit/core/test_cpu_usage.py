@@ -0,0 +1,55 @@
+"""
+Tests for CpuUsageMeter
+"""
+
+import threading
+from collections import namedtuple
+
+from app.core import cpu_usage
+from app.core.cpu_usage import CpuUsageMeter
+
+Times = namedtuple("Times", ["user", "system", "idle", "iowait"])
+
+
+def _feed(monkeypatch, *readings):
+    readings = iter(readings)
+    monkeypatch.setattr(cpu_usage.psutil, "cpu_times", lambda: next(readings))
+
+
+class TestCpuUsageMeter:
+    def test_first_reading_sets_the_baseline(self, monkeypatch):
+        _feed(monkeypatch, Times(10, 10, 80, 0))
+
+        assert CpuUsageMeter().percent() == 0.0
+
+    def test_percent_since_previous_reading(self, monkeypatch):
+        _feed(
+            monkeypatch,
+            Times(10, 10, 80, 0),
+            Times(40, 20, 130, 10),  # 40 busy of 100 elapsed
+            Times(40, 20, 230, 10),  # Idle throughout
+        )
+        meter = CpuUsageMeter()
+        meter.percent()
+
+        assert meter.percent() == 40.0
+        assert meter.percent() == 0.0
+
+    def test_baseline_is_shared_across_threads(self, monkeypatch):
+        _feed(monkeypatch, Times(0, 0, 100, 0), Times(50, 0, 150, 0))
+        meter = CpuUsageMeter()
+        meter.percent()
+
+        results = []
+        worker = threading.Thread(target=lambda: results.append(meter.percent()))
+        worker.start()
+        worker.join()
+
+        assert results == [50.0]
+
+    def test_meters_are_independent(self):
+        first, second = CpuUsageMeter(), CpuUsageMeter()
+        first.percent()
+
+        assert second.percent() == 0.0  # Its own first reading
+        assert 0.0 <= first.percent() <= 100.0
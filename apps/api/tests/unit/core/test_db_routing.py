@@ -0,0 +1,210 @@
+"""
+Tests for read/write routing between the primary and read replicas.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import client_ip, db_routing
+from app.core.db_routing import (
+    MIN_LSN,
+    READ_ONLY,
+    UNKNOWN_LSN,
+    WROTE,
+    ReplicaRouter,
+    RoutingSession,
+    is_write,
+    parse_lsn,
+)
+
+metadata = MetaData()
+items = Table("items", metadata, Column("id", Integer, primary_key=True), Column("name", String))
+
+
+def _request(method="GET", token="token-1", host="10.0.0.1", forwarded_for=None):
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    if forwarded_for:
+        headers["X-Forwarded-For"] = forwarded_for
+    return SimpleNamespace(
+        method=method,
+        headers=headers,
+        cookies={},
+        client=SimpleNamespace(host=host),
+    )
+
+
+async def _engine(path, name):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(insert(items).values(id=1, name=name))
+    return engine
+
+
+@pytest_asyncio.fixture
+async def router(tmp_path, monkeypatch):
+    replica_engine = await _engine(tmp_path / "replica.db", "replica")
+    router = ReplicaRouter()
+    router.configure(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    await replica_engine.dispose()
+    await router.check_all()
+
+    async def no_redis():
+        return None
+
+    monkeypatch.setattr(router, "_get_redis", no_redis)
+    monkeypatch.setattr(db_routing, "replica_router", router)
+    yield router
+    await router.stop()
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    engine = await _engine(tmp_path / "primary.db", "primary")
+    yield async_sessionmaker(
+        engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+    await engine.dispose()
+
+
+async def _name(session) -> str:
+    return (await session.execute(select(items.c.name).where(items.c.id == 1))).scalar()
+
+
+class TestStatementClassification:
+    def test_parse_lsn(self):
+        assert parse_lsn("0/0") == 0
+        assert parse_lsn("16/B374D848") == (0x16 << 32) + 0xB374D848
+        assert parse_lsn(None) is None
+        assert parse_lsn("garbage") is None
+
+    def test_writes(self):
+        assert is_write(insert(items).values(id=2))
+        assert is_write(items.update().values(name="x"))
+        assert is_write(select(items).with_for_update())
+        assert is_write(text("UPDATE items SET name = 'x'"))
+
+    def test_reads(self):
+        assert not is_write(select(items))
+        assert not is_write(text("  select 1"))
+        assert not is_write(None)
+
+
+class TestRouting:
+    async def test_read_only_session_reads_replica(self, router, sessions):
+        async with sessions() as session:
+            await router.prepare(session, _request("GET"))
+            assert await _name(session) == "replica"
+
+    async def test_unsafe_methods_use_primary(self, router, sessions):
+        async with sessions() as session:
+            await router.prepare(session, _request("POST"))
+            assert not session.info.get(READ_ONLY)
+            assert await _name(session) == "primary"
+
+    async def test_no_replicas_uses_primary(self, sessions, monkeypatch):
+        monkeypatch.setattr(db_routing, "replica_router", ReplicaRouter())
+        async with sessions() as session:
+            await db_routing.replica_router.prepare(session, _request("GET"))
+            assert await _name(session) == "primary"
+
+    async def test_reads_stick_to_primary_after_a_write(self, router, sessions):
+        async with sessions() as session:
+            await router.prepare(session, None, read_only=True)
+            assert await _name(session) == "replica"
+
+            await session.execute(items.update().values(name="updated"))
+            await session.commit()
+
+            assert session.info[WROTE]
+            assert await _name(session) == "updated"
+
+    async def test_lagging_replica_leaves_rotation(self, router, sessions):
+        replica = router.replicas[0]
+        router.update(replica, replay_lsn=100, lag_seconds=60.0)
+        assert router.choose() is None
+
+        async with sessions() as session:
+            await router.prepare(session, None, read_only=True)
+            assert await _name(session) == "primary"
+
+        router.update(replica, replay_lsn=100, lag_seconds=0.5)
+        assert router.choose() is replica
+
+    async def test_replica_must_reach_required_lsn(self, router):
+        replica = router.replicas[0]
+        router.update(replica, replay_lsn=100, lag_seconds=0.0)
+
+        assert router.choose(min_lsn=100) is replica
+        assert router.choose(min_lsn=101) is None
+
+    async def test_weighted_choice_skips_unhealthy(self, router, tmp_path):
+        await _engine(tmp_path / "replica2.db", "replica2")
+        router.configure(f"sqlite+aiosqlite:///{tmp_path / 'replica2.db'}#50")
+        await router.check_all()
+        router.replicas[0].healthy = False
+
+        assert {router.choose().name for _ in range(20)} == {router.replicas[1].name}
+        assert router.replicas[1].weight == 50
+
+
+class TestReadYourWrites:
+    async def test_write_pins_client_to_primary(self, router, sessions):
+        request = _request("POST")
+        async with sessions() as session:
+            await router.prepare(session, request)
+            await session.execute(items.update().values(name="written"))
+            await session.commit()
+            await router.finish(session, request)
+
+        # SQLite cannot report an LSN, so no replica can prove it caught up
+        assert await router.required_lsn(_request("GET")) == UNKNOWN_LSN
+        async with sessions() as session:
+            await router.prepare(session, _request("GET"))
+            assert session.info[MIN_LSN] == UNKNOWN_LSN
+            assert await _name(session) == "written"
+
+    async def test_other_clients_still_use_replica(self, router, sessions):
+        await router.remember_write(_request("POST", token="a", host="10.0.0.1"), 500)
+
+        other = _request("GET", token="b", host="10.0.0.2")
+        assert await router.required_lsn(other) is None
+        async with sessions() as session:
+            await router.prepare(session, other)
+            assert await _name(session) == "replica"
+
+    async def test_position_follows_ip_across_new_credentials(self, router):
+        await router.remember_write(_request("POST", token=None), 500)
+
+        assert await router.required_lsn(_request("GET", token="fresh-token")) == 500
+
+    async def test_clients_behind_a_trusted_proxy_are_kept_apart(self, router, monkeypatch):
+        monkeypatch.setattr(client_ip.settings, "TRUSTED_PROXIES", "10.0.0.9")
+        await router.remember_write(
+            _request("POST", token=None, host="10.0.0.9", forwarded_for="203.0.113.5"), 500
+        )
+
+        same = _request("GET", token=None, host="10.0.0.9", forwarded_for="203.0.113.5")
+        other = _request("GET", token=None, host="10.0.0.9", forwarded_for="198.51.100.7")
+        assert await router.required_lsn(same) == 500
+        assert await router.required_lsn(other) is None
+
+    async def test_read_only_session_without_writes_records_nothing(self, router, sessions):
+        request = _request("GET")
+        async with sessions() as session:
+            await router.prepare(session, request)
+            await _name(session)
+            await router.finish(session, request)
+
+        assert await router.required_lsn(request) is None
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD", "OPTIONS"])
+async def test_safe_methods_are_read_only(router, sessions, method):
+    async with sessions() as session:
+        await router.prepare(session, _request(method))
+        assert session.info[READ_ONLY]
@@ -0,0 +1,41 @@
+"""
+Tests for If-None-Match matching (RFC 9110 weak comparison).
+"""
+
+from app.core.etag import if_none_match_hit, parse_if_none_match
+
+
+class TestParseIfNoneMatch:
+    def test_lists_opaque_tags(self):
+        assert parse_if_none_match('"a", W/"b" ,"c"') == ["a", "b", "c"]
+
+    def test_commas_inside_a_tag(self):
+        assert parse_if_none_match('"a,b", "c"') == ["a,b", "c"]
+
+    def test_star(self):
+        assert parse_if_none_match(" * ") is None
+
+
+class TestIfNoneMatchHit:
+    def test_exact_match(self):
+        assert if_none_match_hit('"abc"', '"abc"')
+
+    def test_weak_tag_matches_strong_etag(self):
+        assert if_none_match_hit('W/"abc"', '"abc"')
+
+    def test_strong_tag_matches_weak_etag(self):
+        assert if_none_match_hit('"abc"', 'W/"abc"')
+
+    def test_match_in_list(self):
+        assert if_none_match_hit('"old", W/"abc"', '"abc"')
+
+    def test_star_matches_anything(self):
+        assert if_none_match_hit("*", '"abc"')
+
+    def test_no_match(self):
+        assert not if_none_match_hit('"other", W/"abcd"', '"abc"')
+
+    def test_missing_or_unquoted_header(self):
+        assert not if_none_match_hit(None, '"abc"')
+        assert not if_none_match_hit("", '"abc"')
+        assert not if_none_match_hit("abc", '"abc"')
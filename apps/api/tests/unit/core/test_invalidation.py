@@ -0,0 +1,54 @@
+"""
+Tests for the cross-process invalidation bus.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import invalidation
+from app.core.invalidation import InvalidationBus
+
+
+@pytest.mark.asyncio
+class TestPublishNowait:
+    async def test_scheduled_publish_is_kept_until_done(self, monkeypatch):
+        bus = InvalidationBus()
+        published = []
+
+        async def publish(topic, payload=""):
+            await asyncio.sleep(0)
+            published.append((topic, payload))
+
+        monkeypatch.setattr(bus, "publish", publish)
+
+        bus.publish_nowait("cors", "reload")
+        assert len(invalidation._pending_publishes) == 1
+
+        await asyncio.sleep(0.01)
+
+        assert published == [("cors", "reload")]
+        assert not invalidation._pending_publishes
+
+    async def test_failed_publish_is_logged(self, monkeypatch):
+        bus = InvalidationBus()
+        warnings = []
+
+        async def publish(topic, payload=""):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(bus, "publish", publish)
+        monkeypatch.setattr(
+            invalidation.logger, "warning", lambda event, **kw: warnings.append((event, kw))
+        )
+
+        bus.publish_nowait("cors")
+        await asyncio.sleep(0.01)
+
+        assert warnings == [("Scheduled invalidation publish failed", {"error": "boom"})]
+        assert not invalidation._pending_publishes
+
+    def test_without_running_loop_does_nothing(self):
+        InvalidationBus().publish_nowait("cors")
+
+        assert not invalidation._pending_publishes
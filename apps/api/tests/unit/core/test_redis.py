@@ -2,11 +2,13 @@
 Unit tests for Redis module
 """
 
-from unittest.mock import AsyncMock
+import importlib.util
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.core.redis import SessionStore
+from app.core import redis as redis_module
+from app.core.redis import MASTER, REPLICA, SessionStore, create_redis_client
 
 pytestmark = pytest.mark.asyncio
 
@@ -23,9 +25,7 @@ class TestSessionStore:
         session_data = {"user_id": "user_123", "email": "test@example.com"}
         await self.session_store.set("session_id", session_data, ttl=3600)
 
-        self.mock_redis.hset.assert_called_once_with(
-            "session:session_id", mapping=session_data
-        )
+        self.mock_redis.hset.assert_called_once_with("session:session_id", mapping=session_data)
         self.mock_redis.expire.assert_called_once_with("session:session_id", 3600)
 
     async def test_get_session(self):
@@ -43,6 +43,15 @@ class TestSessionStore:
         result = await self.session_store.get("session_id")
         assert result is None
 
+    async def test_get_session_reads_replica(self):
+        """Session lookups go to the read client when there is one."""
+        replica = AsyncMock()
+        replica.hgetall.return_value = {"user_id": "user_123"}
+        store = SessionStore(self.mock_redis, read_client=replica)
+
+        assert await store.get("session_id") == {"user_id": "user_123"}
+        self.mock_redis.hgetall.assert_not_called()
+
     async def test_delete_session(self):
         """Test deleting a session."""
         await self.session_store.delete("session_id")
@@ -59,3 +68,101 @@ class TestSessionStore:
         await self.session_store.set("sid", session_data)
         # Default is 24 hours = 86400
         self.mock_redis.expire.assert_called_once_with("session:sid", 86400)
+
+
+class TestCreateRedisClient:
+    """Test master/replica client creation."""
+
+    @pytest.fixture
+    def redis_settings(self, monkeypatch):
+        monkeypatch.setattr(redis_module, "_sentinel", None)
+        for name, value in {
+            "REDIS_URL": "redis://:secret@redis:6379/1",
+            "REDIS_SENTINEL_HOSTS": None,
+            "REDIS_REPLICA_URL": None,
+            "REDIS_READ_FROM_REPLICAS": True,
+            "REDIS_POOL_SIZE": 10,
+            "REDIS_REPLICA_POOL_SIZE": 30,
+        }.items():
+            monkeypatch.setattr(redis_module.settings, name, value)
+        return redis_module.settings
+
+    def test_plain_master_uses_redis_url(self, redis_settings):
+        client = create_redis_client(MASTER, decode_responses=True)
+        kwargs = client.connection_pool.connection_kwargs
+
+        assert (kwargs["host"], kwargs["db"], kwargs["password"]) == ("redis", 1, "secret")
+        assert client.connection_pool.max_connections == 10
+
+    def test_no_replica_without_configuration(self, redis_settings):
+        assert create_redis_client(REPLICA) is None
+
+    def test_replica_url_gets_replica_pool_size(self, redis_settings):
+        redis_settings.REDIS_REPLICA_URL = "redis://redis-replica:6379/1"
+        client = create_redis_client(REPLICA)
+
+        assert client.connection_pool.connection_kwargs["host"] == "redis-replica"
+        assert client.connection_pool.max_connections == 30
+
+    def test_replica_reads_can_be_disabled(self, redis_settings):
+        redis_settings.REDIS_REPLICA_URL = "redis://redis-replica:6379/1"
+        redis_settings.REDIS_READ_FROM_REPLICAS = False
+
+        assert create_redis_client(REPLICA) is None
+
+    def test_sentinel_clients_per_role(self, redis_settings, monkeypatch):
+        redis_settings.REDIS_SENTINEL_HOSTS = "s1:26379, s2"
+        sentinel = MagicMock()
+        monkeypatch.setattr(redis_module, "Sentinel", MagicMock(return_value=sentinel))
+
+        create_redis_client(MASTER, decode_responses=True)
+        create_redis_client(REPLICA, decode_responses=True)
+
+        hosts = redis_module.Sentinel.call_args.args[0]
+        assert hosts == [("s1", 26379), ("s2", 26379)]
+        master_kwargs = sentinel.master_for.call_args.kwargs
+        replica_kwargs = sentinel.slave_for.call_args.kwargs
+        assert sentinel.master_for.call_args.args == ("mymaster",)
+        assert (master_kwargs["db"], master_kwargs["password"]) == (1, "secret")
+        assert "host" not in master_kwargs
+        assert master_kwargs["max_connections"] == 10
+        assert replica_kwargs["max_connections"] == 30
+
+
+class TestReconnect:
+    """Test reconnecting while Redis is down."""
+
+    @pytest.fixture
+    def redis_down(self, monkeypatch):
+        # The suite's conftest swaps init_redis/get_redis for fakeredis stubs on
+        # app.core.redis, so exercise a private copy holding the real functions
+        spec = importlib.util.spec_from_file_location("_redis_under_test", redis_module.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        down = MagicMock()
+        down.ping = AsyncMock(side_effect=ConnectionError("refused"))
+        factory = MagicMock(side_effect=lambda role, **options: down if role == MASTER else None)
+        monkeypatch.setattr(module, "create_redis_client", factory)
+        return module, factory
+
+    async def test_raw_client_retries_at_most_once_per_interval(self, redis_down):
+        module, factory = redis_down
+
+        assert await module.get_raw_redis() is None
+        assert await module.get_raw_redis() is None
+        assert factory.call_count == 2  # One master and one replica attempt
+
+        module._last_init_attempt = -1e9
+        await module.get_raw_redis()
+        assert factory.call_count == 4
+
+    async def test_reconnect_keeps_circuit_breaker(self, redis_down):
+        module, _ = redis_down
+        resilient = await module.get_redis()
+        resilient.circuit_breaker.failure_count = 3
+
+        await module.init_redis()
+
+        assert await module.get_redis() is resilient
+        assert resilient.circuit_breaker.failure_count == 3
@@ -4,9 +4,9 @@ Unit tests for Redis Circuit Breaker
 Tests the circuit breaker pattern implementation for Redis operations.
 """
 
-import pytest
 from unittest.mock import AsyncMock
 
+import pytest
 import redis.asyncio as aioredis
 
 from app.core.redis_circuit_breaker import CircuitState, RedisCircuitBreaker, ResilientRedisClient
@@ -183,6 +183,17 @@ class TestResilientRedisClient:
         assert result is False
 
 
+    @pytest.mark.asyncio
+    async def test_acquire_lock_tells_unavailable_from_held(self):
+        master = AsyncMock()
+        master.set.side_effect = [True, None]
+        client = ResilientRedisClient(master)
+
+        assert await client.acquire_lock("k:lock", 10) is True
+        assert await client.acquire_lock("k:lock", 10) is False
+        assert await ResilientRedisClient(None).acquire_lock("k:lock", 10) is None
+
+
 class TestCacheBehavior:
     """Test fallback cache behavior"""
 
@@ -0,0 +1,145 @@
+"""
+Tests for host resource sampling and event-loop lag measurement.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from app.core import scalability
+from app.core.cpu_usage import CpuUsageMeter
+from app.core.scalability import (
+    EVENT_LOOP_LAG_SCALE_UP_MS,
+    HorizontalScalingManager,
+    ResourceMonitor,
+    ScalabilityMetrics,
+)
+
+
+def _metrics(**overrides) -> ScalabilityMetrics:
+    values = {
+        "timestamp": datetime.now(),
+        "cpu_usage_percent": 10.0,
+        "memory_usage_percent": 20.0,
+        "active_connections": 5,
+        "requests_per_second": 0,
+        "cache_hit_rate": 0,
+        "average_response_time_ms": 0,
+        "error_rate_percent": 0,
+    }
+    values.update(overrides)
+    return ScalabilityMetrics(**values)
+
+
+class TestSampling:
+    async def test_host_is_sampled_off_the_event_loop(self, monkeypatch):
+        loop_thread = threading.get_ident()
+        sampled_in = []
+
+        def sample(cpu):
+            sampled_in.append(threading.get_ident())
+            time.sleep(0.2)  # A slow psutil call
+            return {
+                "cpu_percent": 42.0,
+                "memory_percent": 61.5,
+                "disk_free_bytes": 1024,
+                "connections": 7,
+                "open_fds": 33,
+            }
+
+        monkeypatch.setattr(scalability, "_sample_host", sample)
+        monitor = ResourceMonitor()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        metrics = await monitor.collect_metrics()
+        task.cancel()
+
+        assert sampled_in and sampled_in[0] != loop_thread
+        assert ticks >= 5  # The loop kept running while the sample was taken
+        assert metrics.cpu_usage_percent == 42.0
+        assert metrics.open_file_descriptors == 33
+        assert metrics.disk_free_bytes == 1024
+
+    def test_real_host_sample(self):
+        sample = scalability._sample_host(CpuUsageMeter())
+
+        assert set(sample) == {
+            "cpu_percent",
+            "memory_percent",
+            "disk_free_bytes",
+            "connections",
+            "open_fds",
+        }
+        assert sample["disk_free_bytes"] > 0
+
+    def test_history_is_bounded(self):
+        monitor = ResourceMonitor()
+        for i in range(monitor.max_history + 10):
+            monitor.metrics_history.append(_metrics(active_connections=i))
+
+        assert len(monitor.metrics_history) == monitor.max_history
+        assert monitor.get_current_metrics().active_connections == monitor.max_history + 9
+
+
+class TestEventLoopLag:
+    async def test_blocked_loop_is_measured(self, monkeypatch):
+        monkeypatch.setattr(scalability, "LAG_PROBE_INTERVAL_SECONDS", 0.01)
+        monitor = ResourceMonitor()
+        probe = asyncio.create_task(monitor._lag_loop())
+        await asyncio.sleep(0.05)
+
+        time.sleep(0.15)  # Block the loop
+        await asyncio.sleep(0.03)
+        probe.cancel()
+
+        assert monitor.event_loop_lag_ms() >= 100
+
+    def test_no_samples_means_no_lag(self):
+        assert ResourceMonitor().event_loop_lag_ms() == 0.0
+
+    async def test_lag_triggers_scale_up(self, monkeypatch):
+        monitor = ResourceMonitor()
+        recommended = []
+
+        async def scale_up(metrics):
+            recommended.append(metrics)
+
+        monkeypatch.setattr(monitor, "_trigger_scale_up_alert", scale_up)
+
+        await monitor._check_scaling_conditions(_metrics())
+        await monitor._check_scaling_conditions(
+            _metrics(event_loop_lag_ms=EVENT_LOOP_LAG_SCALE_UP_MS + 1)
+        )
+
+        assert len(recommended) == 1
+
+
+class TestHealthCheck:
+    async def test_uses_latest_snapshot(self, monkeypatch):
+        monitor = ResourceMonitor()
+        monitor.metrics_history.append(_metrics(cpu_usage_percent=95.0))
+        monitor.loop_lag_samples.append(12.5)
+        monkeypatch.setattr(scalability, "resource_monitor", monitor)
+
+        def blocking_read(*args, **kwargs):
+            raise AssertionError("health check must not read psutil")
+
+        monkeypatch.setattr(scalability.psutil, "cpu_percent", blocking_read)
+        monkeypatch.setattr(scalability.psutil, "virtual_memory", blocking_read)
+        monkeypatch.setattr(
+            scalability.cache_manager, "get_stats", lambda: {"redis_connected": True}
+        )
+
+        health = await HorizontalScalingManager().health_check_extended()
+
+        assert health["cpu_usage_percent"] == 95.0
+        assert health["event_loop_lag_ms"] == 12.5
+        assert health["status"] == "degraded"
@@ -0,0 +1,99 @@
+"""
+Tests for the compiled origin matcher and event-driven cache in DynamicCORSMiddleware.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import app.middleware.dynamic_cors as dynamic_cors
+from app.core.invalidation import invalidation_bus
+from app.middleware.dynamic_cors import DynamicCORSMiddleware, OriginMatcher
+
+
+@pytest.fixture(autouse=True)
+def reset_cors_cache():
+    dynamic_cors.invalidate_cors_cache()
+    yield
+    dynamic_cors.invalidate_cors_cache()
+
+
+class TestOriginMatcher:
+    def test_exact_origin(self):
+        matcher = OriginMatcher(["https://app.janua.dev"])
+        assert matcher.matches("https://app.janua.dev")
+        assert not matcher.matches("http://app.janua.dev")
+        assert not matcher.matches("https://other.janua.dev")
+
+    def test_wildcard_matches_subdomains_and_bare_domain(self):
+        matcher = OriginMatcher(["*.janua.dev"])
+        assert matcher.matches("https://app.janua.dev")
+        assert matcher.matches("https://a.b.janua.dev")
+        assert matcher.matches("http://janua.dev")
+        assert matcher.matches("https://APP.Janua.Dev")
+
+    def test_wildcard_respects_label_boundaries(self):
+        matcher = OriginMatcher(["*.janua.dev"])
+        assert not matcher.matches("https://evil-janua.dev")
+        assert not matcher.matches("https://janua.dev.evil.com")
+        assert not matcher.matches("https://dev")
+
+    def test_wildcard_with_port(self):
+        matcher = OriginMatcher(["*.localhost:3000"])
+        assert matcher.matches("http://app.localhost:3000")
+        assert not matcher.matches("http://app.localhost:4000")
+
+    def test_empty_entries_ignored(self):
+        matcher = OriginMatcher(["", "https://a.com"])
+        assert matcher.size == 1
+        assert not matcher.matches("")
+
+
+class TestDynamicCORSMiddleware:
+    def _client(self, origins):
+        async def homepage(request):
+            return PlainTextResponse("OK")
+
+        app = Starlette(routes=[Route("/", homepage, methods=["GET", "OPTIONS"])])
+        with patch("app.middleware.dynamic_cors.settings") as mock_settings:
+            mock_settings.cors_origins_list = origins
+            middleware = DynamicCORSMiddleware(app, enable_database_origins=False)
+        return TestClient(middleware)
+
+    def test_preflight_allowed_origin_gets_precomputed_headers(self):
+        client = self._client(["*.janua.dev"])
+        response = client.options("/", headers={"Origin": "https://app.janua.dev"})
+        assert response.status_code == 204
+        assert response.headers["access-control-allow-origin"] == "https://app.janua.dev"
+        assert response.headers["access-control-max-age"] == "600"
+        assert response.headers["vary"] == "Origin"
+
+    def test_preflight_disallowed_origin_has_no_allow_header(self):
+        client = self._client(["https://app.janua.dev"])
+        response = client.options("/", headers={"Origin": "https://evil.com"})
+        assert response.status_code == 204
+        assert "access-control-allow-origin" not in response.headers
+        assert response.headers["vary"] == "Origin"
+
+    def test_actual_request_gets_cors_headers(self):
+        client = self._client(["https://app.janua.dev"])
+        response = client.get("/", headers={"Origin": "https://app.janua.dev"})
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "https://app.janua.dev"
+        assert response.headers["access-control-allow-credentials"] == "true"
+
+    def test_matcher_reused_until_invalidated(self):
+        client = self._client(["https://app.janua.dev"])
+        client.get("/", headers={"Origin": "https://app.janua.dev"})
+        first = dynamic_cors._cors_matcher
+        client.get("/", headers={"Origin": "https://app.janua.dev"})
+        assert dynamic_cors._cors_matcher is first
+
+        # A message from another worker drops the compiled matcher
+        invalidation_bus.dispatch(dynamic_cors.CORS_INVALIDATION_TOPIC)
+        assert dynamic_cors._cors_matcher is None
+        assert dynamic_cors._cors_origins_cache is None
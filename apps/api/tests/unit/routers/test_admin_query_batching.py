@@ -0,0 +1,159 @@
+"""Admin listings and /admin/stats issue a bounded number of statements.
+
+GET /admin/users used to run four extra queries per user on the page (now one
+per page each for OAuth providers and passkeys) and
+GET /admin/organizations two per org; /admin/stats fired ten sequential
+COUNT(*)s. These tests pin the round-trip count so the N+1 doesn't creep back,
+calling the endpoint coroutines directly with an AsyncMock session (same style
+as test_admin_create_user.py).
+"""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.routers.v1.admin as admin_mod
+from app.models import Organization, User, UserStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+def _admin_user() -> User:
+    return User(id=uuid.uuid4(), email="admin@madfam.io", password_hash="hashed", is_admin=True)
+
+
+def _user(i: int) -> User:
+    return User(
+        id=uuid.uuid4(),
+        email=f"user{i}@example.com",
+        password_hash="hashed",
+        status=UserStatus.ACTIVE,
+        created_at=datetime.utcnow(),
+    )
+
+
+def _result(rows):
+    r = MagicMock()
+    r.all = MagicMock(return_value=rows)
+    r.one = MagicMock(return_value=rows[0] if rows else None)
+    return r
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats_cache():
+    admin_mod._admin_stats_cache = None
+    admin_mod._admin_stats_cache_timestamp = 0
+    yield
+    admin_mod._admin_stats_cache = None
+    admin_mod._admin_stats_cache_timestamp = 0
+
+
+async def _list_users(db, per_page=50):
+    return await admin_mod.list_all_users(
+        page=1,
+        per_page=per_page,
+        search=None,
+        status=None,
+        mfa_enabled=None,
+        is_admin=None,
+        current_user=_admin_user(),
+        db=db,
+    )
+
+
+async def test_list_users_uses_three_statements_for_any_page_size():
+    users = [_user(i) for i in range(50)]
+    page_rows = [SimpleNamespace(User=u, organizations_count=2, sessions_count=1) for u in users]
+    oauth_rows = [(users[0].id, "google"), (users[0].id, "github")]
+    passkey_rows = [(users[1].id, 3)]
+
+    db = MagicMock()
+    db.execute = AsyncMock(
+        side_effect=[_result(page_rows), _result(oauth_rows), _result(passkey_rows)]
+    )
+
+    result = await _list_users(db)
+
+    assert db.execute.await_count == 3
+    assert len(result) == 50
+    assert result[0].organizations_count == 2
+    assert result[0].oauth_providers == ["google", "github"]
+    assert result[1].oauth_providers == []
+    assert result[1].passkeys_count == 3
+    assert result[0].passkeys_count == 0
+
+
+async def test_list_users_without_passkeys_table_counts_zero():
+    users = [_user(i) for i in range(3)]
+    page_rows = [SimpleNamespace(User=u, organizations_count=0, sessions_count=0) for u in users]
+
+    db = MagicMock()
+    db.execute = AsyncMock(
+        side_effect=[_result(page_rows), _result([]), Exception("relation does not exist")]
+    )
+
+    result = await _list_users(db)
+
+    assert [user.passkeys_count for user in result] == [0, 0, 0]
+
+
+async def test_list_organizations_uses_one_statement():
+    orgs = [
+        Organization(
+            id=uuid.uuid4(),
+            name=f"Org {i}",
+            slug=f"org-{i}",
+            owner_id=uuid.uuid4(),
+            billing_plan=None,
+            created_at=datetime.utcnow(),
+        )
+        for i in range(20)
+    ]
+    rows = [
+        SimpleNamespace(Organization=o, owner_email="owner@example.com", members_count=3)
+        for o in orgs
+    ]
+
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=_result(rows))
+
+    result = await admin_mod.list_all_organizations(
+        page=1, per_page=20, search=None, billing_plan=None, current_user=_admin_user(), db=db
+    )
+
+    assert db.execute.await_count == 1
+    assert result[0].members_count == 3
+    assert result[0].owner_email == "owner@example.com"
+    assert result[0].billing_plan == "free"
+
+
+async def test_stats_is_a_single_filtered_aggregate_and_cached():
+    row = SimpleNamespace(
+        total_users=10,
+        active_users=7,
+        suspended_users=2,
+        deleted_users=1,
+        mfa_enabled_users=4,
+        users_last_24h=3,
+        total_sessions=20,
+        active_sessions=5,
+        sessions_last_24h=6,
+        total_organizations=2,
+    )
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=_result([row]))
+
+    stats = await admin_mod.get_admin_stats(current_user=_admin_user(), db=db)
+    again = await admin_mod.get_admin_stats(current_user=_admin_user(), db=db)
+
+    assert db.execute.await_count == 1
+    assert stats.active_users == 7
+    assert stats.active_sessions == 5
+    assert again == stats
+
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FILTER (WHERE" in sql
@@ -7,19 +7,35 @@ Covers:
 - Revoked key returns 401 via middleware
 - Verify endpoint returns org_id and scopes for valid key
 - Rate limiting returns 429
+- Cached key resolution, Redis-backed quotas and batched last_used writes
 """
 
 import hashlib
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
-from app.models import Organization, OrganizationMember, User, UserStatus
-from app.services.api_key_service import ApiKeyService
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core import caching
+from app.core.redis_circuit_breaker import ResilientRedisClient
+from app.middleware import api_key_auth
+from app.models import ApiKey, Base, Organization, OrganizationMember, User, UserStatus
+from app.services.api_key_service import (
+    ApiKeyIdentity,
+    ApiKeyService,
+    ApiKeyUsageRecorder,
+    invalidate_api_key_cache,
+    resolve_api_key_identity,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -358,6 +374,240 @@ class TestRateLimiter:
         assert allowed is False
         assert retry_after >= 1
 
+    def test_local_buckets_are_bounded(self, monkeypatch):
+        from app.middleware.api_key_auth import _check_rate_limit, _rate_limit_buckets
+
+        monkeypatch.setattr(api_key_auth, "MAX_LOCAL_BUCKETS", 3)
+        keys = [f"test-{uuid.uuid4()}" for _ in range(5)]
+        for key in keys:
+            _check_rate_limit(key, limit_per_min=10)
+
+        assert len(_rate_limit_buckets) == 3
+        assert keys[0] not in _rate_limit_buckets
+        assert keys[-1] in _rate_limit_buckets
+
+
+# ---------------------------------------------------------------------------
+# Cached resolution and distributed quotas
+# ---------------------------------------------------------------------------
+
+PLAIN_KEY = "sk_live_abcd" + "0" * 60
+
+
+class FakeRedis:
+    """In-memory Redis for the resolution cache (get/set/delete) and quota counters."""
+
+    def __init__(self):
+        self.data = {}
+        self.redis = self
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls
+        ]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(caching, "get_redis", AsyncMock(return_value=redis))
+    monkeypatch.setattr(caching.cache_manager, "redis_client", redis)
+    monkeypatch.setattr(caching.invalidation_bus, "publish_nowait", lambda *args: None)
+    monkeypatch.setattr(api_key_auth, "_get_redis", AsyncMock(return_value=redis))
+    caching.local_cache.clear()
+    caching.tag_versions.clear()
+    yield redis
+    caching.local_cache.clear()
+    caching.tag_versions.clear()
+
+
+def _stored_key(**overrides):
+    values = {
+        "id": uuid.uuid4(),
+        "organization_id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "prefix": PLAIN_KEY[:12] + "...",
+        "scopes": ["karafiel:stamp"],
+        "rate_limit_per_min": 120,
+        "expires_at": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def resolve_from_db(monkeypatch):
+    """Stands in for the database lookup; returns the mock counting lookups."""
+    lookup = AsyncMock(return_value=_stored_key())
+
+    async def fake_get_db():
+        yield AsyncMock()
+
+    monkeypatch.setattr(ApiKeyService, "_resolve_api_key", lookup)
+    monkeypatch.setattr("app.database.get_db", fake_get_db)
+    return lookup
+
+
+@pytest.mark.asyncio
+class TestCachedResolution:
+    async def test_known_key_is_resolved_once(self, fake_redis, resolve_from_db):
+        first = await resolve_api_key_identity(PLAIN_KEY)
+        second = await resolve_api_key_identity(PLAIN_KEY)
+
+        assert resolve_from_db.await_count == 1
+        assert first == second
+        assert first.scopes == ("karafiel:stamp",)
+        assert first.rate_limit_per_min == 120
+
+    async def test_revocation_drops_cached_key(self, fake_redis, resolve_from_db):
+        api_key = resolve_from_db.return_value
+        assert await resolve_api_key_identity(PLAIN_KEY) is not None
+
+        resolve_from_db.return_value = None
+        await invalidate_api_key_cache(api_key.prefix)
+
+        assert await resolve_api_key_identity(PLAIN_KEY) is None
+        assert resolve_from_db.await_count == 2
+
+    async def test_unknown_key_is_not_cached(self, fake_redis, resolve_from_db):
+        resolve_from_db.return_value = None
+
+        assert await resolve_api_key_identity(PLAIN_KEY) is None
+        assert await resolve_api_key_identity(PLAIN_KEY) is None
+        assert resolve_from_db.await_count == 2
+
+    async def test_resolves_at_once_without_redis(self, monkeypatch, resolve_from_db):
+        monkeypatch.setattr(
+            caching, "get_redis", AsyncMock(return_value=ResilientRedisClient(None))
+        )
+        caching.local_cache.clear()
+
+        started = time.monotonic()
+        first = await resolve_api_key_identity(PLAIN_KEY)
+        second = await resolve_api_key_identity(PLAIN_KEY)
+
+        assert time.monotonic() - started < 0.5  # No wait on a lock Redis cannot grant
+        assert first == second
+        assert resolve_from_db.await_count == 1  # Served from the local cache
+        caching.local_cache.clear()
+
+    async def test_expiry_is_checked_on_cached_keys(self, fake_redis, resolve_from_db):
+        expires_at = datetime.utcnow() + timedelta(minutes=5)
+        resolve_from_db.return_value = _stored_key(expires_at=expires_at)
+
+        identity = await resolve_api_key_identity(PLAIN_KEY)
+
+        assert identity.expires_at == expires_at
+        assert identity.is_expired(expires_at + timedelta(seconds=1))
+        assert ApiKeyIdentity.from_dict(identity.to_dict()) == identity
+
+
+@pytest.mark.asyncio
+class TestDistributedQuota:
+    async def test_quota_counts_in_redis(self, fake_redis):
+        key_id = str(uuid.uuid4())
+
+        results = [await api_key_auth._check_quota(key_id, 3) for _ in range(4)]
+
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False]
+        assert results[0][1] == 2
+        assert results[-1][2] >= 1
+        # The rejected request is not counted against the window
+        counters = [v for k, v in fake_redis.data.items() if key_id in k]
+        assert counters == [3]
+
+    async def test_falls_back_to_local_limiter(self, monkeypatch):
+        monkeypatch.setattr(api_key_auth, "_get_redis", AsyncMock(return_value=None))
+        key_id = str(uuid.uuid4())
+
+        allowed, remaining, retry_after = await api_key_auth._check_quota(key_id, 1)
+        assert (allowed, remaining, retry_after) == (True, 0, 0)
+        allowed, _, retry_after = await api_key_auth._check_quota(key_id, 1)
+        assert allowed is False
+        assert retry_after >= 1
+
+
+@pytest_asyncio.fixture
+async def api_key_sessions():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[ApiKey.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestLastUsedBatching:
+    async def test_uses_are_written_in_one_batch(self, api_key_sessions):
+        earlier = datetime(2026, 1, 1, 12, 0)
+        later = earlier + timedelta(minutes=5)
+        async with api_key_sessions() as session:
+            keys = [
+                ApiKey(
+                    id=uuid.uuid4(),
+                    user_id=uuid.uuid4(),
+                    organization_id=uuid.uuid4(),
+                    name=f"key-{i}",
+                    key_hash=f"hash-{i}",
+                    prefix=f"jnk_{i}...",
+                    last_used=later if i == 1 else None,
+                )
+                for i in range(2)
+            ]
+            session.add_all(keys)
+            await session.commit()
+
+        recorder = ApiKeyUsageRecorder(api_key_sessions)
+        recorder.touch(keys[0].id, earlier)
+        recorder.touch(str(keys[0].id), later)
+        recorder.touch(keys[1].id, earlier)  # Older than what is stored
+
+        assert await recorder.flush() == 2
+        assert await recorder.flush() == 0
+
+        async with api_key_sessions() as session:
+            rows = dict((await session.execute(select(ApiKey.id, ApiKey.last_used))).all())
+        assert rows == {keys[0].id: later, keys[1].id: later}
+
 
 # ---------------------------------------------------------------------------
 # Integration-style test: create key, verify it, revoke it, verify again
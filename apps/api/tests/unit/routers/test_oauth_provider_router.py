@@ -378,6 +378,14 @@ class TestSafeCallbackURLBuilder:
 class TestUserEntitlements:
     """Test user entitlements fetching"""
 
+    @pytest.fixture(autouse=True)
+    def clear_snapshots(self):
+        from app.services.entitlements_service import clear_entitlements_cache
+
+        clear_entitlements_cache()
+        yield
+        clear_entitlements_cache()
+
     @pytest.fixture
     def mock_db(self):
         """Mock async database session"""
@@ -395,14 +403,14 @@ class TestUserEntitlements:
 
     async def test_get_user_entitlements_default(self, mock_db, mock_user):
         """Should return default entitlements when no memberships"""
-        from app.routers.v1.oauth_provider import _get_user_entitlements
+        from app.services.entitlements_service import resolve_token_entitlements
 
         # Mock no memberships
         mock_db.execute = AsyncMock(
             return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[]))))
         )
 
-        result = await _get_user_entitlements(mock_user, mock_db)
+        result = (await resolve_token_entitlements(mock_user, mock_db)).to_claims()
 
         assert result["tier"] == "community"
         assert result["roles"] == []
@@ -411,7 +419,7 @@ class TestUserEntitlements:
 
     async def test_get_user_entitlements_admin_flag(self, mock_db, mock_user):
         """Should include admin role when user is admin"""
-        from app.routers.v1.oauth_provider import _get_user_entitlements
+        from app.services.entitlements_service import resolve_token_entitlements
 
         mock_user.is_admin = True
 
@@ -419,7 +427,7 @@ class TestUserEntitlements:
             return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[]))))
         )
 
-        result = await _get_user_entitlements(mock_user, mock_db)
+        result = (await resolve_token_entitlements(mock_user, mock_db)).to_claims()
 
         assert "admin" in result["roles"]
         assert result["is_admin"] is True
@@ -0,0 +1,212 @@
+"""
+Tests for the shared IP intelligence index and its consumers.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.security.ip_intelligence import (
+    IPIntelIndex,
+    IPIntelligence,
+    ip_in_network,
+    read_feed_dir,
+)
+
+
+@pytest.fixture
+def index():
+    return IPIntelIndex.build(
+        [
+            ("0.0.0.0/0", "default", 0.1),
+            ("203.0.113.0/24", "datacenter", None),
+            ("203.0.113.128/25", "vpn", None),
+            ("203.0.113.200/32", "tor", 0.95),
+            ("2001:db8::/32", "proxy", None),
+            ("2001:db8:1:2::/64", "blocklist", None),
+        ]
+    )
+
+
+class TestIPIntelIndex:
+    def test_longest_prefix_wins(self, index):
+        assert index.category("203.0.113.5") == "datacenter"
+        assert index.category("203.0.113.130") == "vpn"
+        assert index.lookup("203.0.113.200").score == 0.95
+        assert index.category("198.51.100.1") == "default"
+
+    def test_default_scores_by_category(self, index):
+        assert index.lookup("203.0.113.5").score == 0.3
+
+    def test_ipv6(self, index):
+        assert index.category("2001:db8:5::1") == "proxy"
+        assert index.category("2001:db8:1:2::dead") == "blocklist"
+        assert index.lookup("2001:dead::1") is None
+
+    def test_ipv6_keyed_at_requested_length(self):
+        index = IPIntelIndex.build(
+            [
+                ("2001:db8:1:2::/64", "vpn", None),
+                ("2001:db8:1:2::1/128", "blocklist", None),
+                ("2001:db8:1:2:8000::/65", "proxy", None),
+            ]
+        )
+        assert index.category("2001:db8:1:2::1") == "blocklist"
+        assert index.category("2001:db8:1:2::99") == "vpn"
+        assert index.category("2001:db8:1:2:8000::5") == "proxy"
+        assert index.lookup("2001:db8:1:3::1") is None
+
+    def test_invalid_input(self, index):
+        assert index.lookup("not-an-ip") is None
+        assert index.lookup("") is None
+        assert IPIntelIndex.build([("bogus/99", "tor", None)]).size == 2
+
+    def test_entries_are_shared_across_lookups(self, index):
+        assert index.lookup("203.0.113.1") is index.lookup("203.0.113.2")
+
+    def test_jump_table_matches_plain_walk(self):
+        prefixes = [(f"10.{i % 256}.{i // 256}.0/24", "vpn", float(i)) for i in range(5000)]
+        prefixes += [("10.0.0.0/8", "suspicious", None), ("10.7.0.0/16", "tor", None)]
+        with patch("app.security.ip_intelligence.JUMP_TABLE_MIN_NODES", 10**9):
+            plain = IPIntelIndex.build(prefixes)
+        jumped = IPIntelIndex.build(prefixes)
+
+        assert jumped._v4.starts and not plain._v4.starts
+        for ip in ["10.3.2.1", "10.7.250.9", "10.200.19.4", "10.255.255.255", "11.0.0.1"]:
+            assert jumped.lookup(ip) == plain.lookup(ip)
+
+    def test_ipv6_jump_table_matches_plain_walk(self):
+        prefixes = [(f"2001:db8:{i:x}::1/128", "blocklist", None) for i in range(5000)]
+        prefixes += [("2001:db8::/32", "proxy", None), ("2001:db8:7::/48", "tor", None)]
+        with patch("app.security.ip_intelligence.JUMP_TABLE_MIN_NODES", 10**9):
+            plain = IPIntelIndex.build(prefixes)
+        jumped = IPIntelIndex.build(prefixes)
+
+        assert jumped._v6.starts and not plain._v6.starts
+        for ip in ["2001:db8:7::1", "2001:db8:7::2", "2001:db8:1234::1", "2001:db9::1"]:
+            assert jumped.lookup(ip) == plain.lookup(ip)
+
+
+class TestSnapshots:
+    def test_round_trip_through_mmap(self, index, tmp_path):
+        path = str(tmp_path / "intel.bin")
+        index.write_snapshot(path)
+        loaded = IPIntelIndex.load_snapshot(path)
+
+        for ip in ["203.0.113.5", "203.0.113.130", "203.0.113.200", "2001:db8:5::1", "8.8.8.8"]:
+            assert loaded.lookup(ip) == index.lookup(ip)
+
+    def test_round_trip_keeps_full_ipv6_prefixes(self, tmp_path):
+        path = str(tmp_path / "intel.bin")
+        IPIntelIndex.build([("2001:db8::1/128", "blocklist", None)]).write_snapshot(path)
+        loaded = IPIntelIndex.load_snapshot(path)
+
+        assert loaded.category("2001:db8::1") == "blocklist"
+        assert loaded.lookup("2001:db8::2") is None
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "junk.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            IPIntelIndex.load_snapshot(str(path))
+
+
+class TestIPIntelligence:
+    def _write_feeds(self, feed_dir, tor="198.51.100.7\n"):
+        (feed_dir / "tor.txt").write_text(f"# exits\n{tor}")
+        (feed_dir / "blocklist.txt").write_text("192.0.2.0/24,0.9\n")
+
+    def test_read_feed_dir(self, tmp_path):
+        self._write_feeds(tmp_path)
+        assert sorted(read_feed_dir(str(tmp_path))) == [
+            ("192.0.2.0/24", "blocklist", 0.9),
+            ("198.51.100.7", "tor", None),
+        ]
+
+    def test_refresh_hot_swaps_on_feed_change(self, tmp_path):
+        feeds = tmp_path / "feeds"
+        feeds.mkdir()
+        self._write_feeds(feeds)
+        intel = IPIntelligence(feed_dir=str(feeds), snapshot_path=str(tmp_path / "intel.bin"))
+
+        assert intel.refresh() is True
+        old = intel.index
+        assert intel.is_blocked("192.0.2.10")
+        assert intel.category("198.51.100.7") == "tor"
+        assert intel.refresh() is False
+
+        self._write_feeds(feeds, tor="198.51.100.8\n")
+        stat = os.stat(feeds / "tor.txt")
+        os.utime(feeds / "tor.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert intel.refresh() is True
+        assert intel.index is not old
+        assert intel.category("198.51.100.8") == "tor"
+        # The retired index still answers for lookups that were in flight
+        assert old.category("198.51.100.7") == "tor"
+
+    def test_snapshot_only_worker(self, tmp_path):
+        path = str(tmp_path / "intel.bin")
+        IPIntelIndex.build([("192.0.2.0/24", "blocklist", None)]).write_snapshot(path)
+
+        intel = IPIntelligence(snapshot_path=path)
+        assert intel.refresh() is True
+        assert intel.is_blocked("192.0.2.1")
+
+
+class TestIPInNetwork:
+    def test_cidr_and_exact(self):
+        assert ip_in_network("192.168.1.50", "192.168.1.0/24")
+        assert not ip_in_network("192.168.2.50", "192.168.1.0/24")
+        assert ip_in_network("10.0.0.1", "10.0.0.1")
+        assert ip_in_network("2001:db8::1", "2001:db8::/32")
+
+    def test_no_prefix_string_false_positives(self):
+        # The old check compared string prefixes, so 192.168.10.x matched 192.168.1.0/24
+        assert not ip_in_network("192.168.10.1", "192.168.1.0/24")
+
+    def test_invalid_values(self):
+        assert not ip_in_network("garbage", "10.0.0.0/8")
+        assert not ip_in_network("10.0.0.1", "garbage")
+
+
+class TestConsumers:
+    def test_waf_blocks_feed_ranges(self):
+        from app.security.waf import WAFEngine
+
+        intel = IPIntelligence()
+        intel.swap(IPIntelIndex.build([("192.0.2.0/24", "blocklist", None)]))
+        with patch("app.security.waf.ip_intelligence", intel):
+            waf = WAFEngine()
+            assert waf.is_ip_blocked("192.0.2.77")
+            assert not waf.is_ip_blocked("198.51.100.1")
+            waf.add_to_blocklist("198.51.100.1")
+            assert waf.is_ip_blocked("198.51.100.1")
+
+    async def test_risk_service_categories(self):
+        from app.services.risk_assessment_service import RiskAssessmentService
+
+        intel = IPIntelligence()
+        intel.swap(
+            IPIntelIndex.build(
+                [("198.51.100.0/24", "tor", None), ("203.0.113.0/24", "datacenter", None)]
+            )
+        )
+        service = RiskAssessmentService(feature_store=object())
+        with patch("app.services.risk_assessment_service.ip_intelligence", intel):
+            assert await service._is_tor_ip("198.51.100.9")
+            assert not await service._is_vpn_ip("198.51.100.9")
+            assert await service._is_datacenter_ip("203.0.113.4")
+            assert not await service._is_datacenter_ip(None)
+
+    def test_threat_detection_suspicious_ranges(self):
+        from app.security.threat_detection import AdvancedThreatDetectionSystem
+
+        detector = object.__new__(AdvancedThreatDetectionSystem)
+        intel = IPIntelligence()
+        intel.swap(IPIntelIndex.build([("198.51.100.0/24", "tor", None)]))
+        with patch("app.security.threat_detection.ip_intelligence", intel):
+            assert detector._is_suspicious_ip_range("10.1.2.3")
+            assert detector._is_suspicious_ip_range("198.51.100.9")
+            assert not detector._is_suspicious_ip_range("8.8.8.8")
+            assert not detector._is_suspicious_ip_range("not-an-ip")
@@ -10,9 +10,78 @@ from uuid import uuid4
 
 import pytest
 
+from app.services.account_lockout_service import IP, USER, LockoutCounters
+
 pytestmark = pytest.mark.asyncio
 
 
+@pytest.fixture(autouse=True)
+def no_redis():
+    """Without Redis, attempts are counted on the user row"""
+    with patch(
+        "app.services.account_lockout_service.lockout_counters", LockoutCounters()
+    ) as counters:
+        counters._get_redis = AsyncMock(return_value=None)
+        yield counters
+
+
+class FakeRedis:
+    """The subset of Redis the lockout counters use: sorted sets and expiring keys."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zremrangebyscore(self, key, low, high):
+        members = self.data.get(key, {})
+        for member in [m for m, score in members.items() if low <= score <= high]:
+            del members[member]
+
+    async def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    async def zcount(self, key, low, high):
+        return sum(1 for score in self.data.get(key, {}).values() if score >= low)
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2) if key in self.data else -2
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls
+        ]
+
+
 class TestIsAccountLocked:
     """Test account lock status checking"""
 
@@ -494,3 +563,112 @@ class TestEdgeCases:
             await AccountLockoutService.record_failed_attempt(mock_db, mock_user)
 
             assert mock_user.failed_login_attempts == 5
+
+
+class TestRedisCounters:
+    """Attempts counted in Redis; the user row is written only when a lock is set"""
+
+    @pytest.fixture
+    def redis_client(self, no_redis):
+        client = FakeRedis()
+        no_redis._redis = client
+        no_redis._get_redis = AsyncMock(return_value=client)
+        return client
+
+    @pytest.fixture
+    def lockout_settings(self):
+        with patch("app.services.account_lockout_service.settings") as mock_settings:
+            mock_settings.ACCOUNT_LOCKOUT_ENABLED = True
+            mock_settings.ACCOUNT_LOCKOUT_RESET_ON_SUCCESS = True
+            mock_settings.ACCOUNT_LOCKOUT_THRESHOLD = 3
+            mock_settings.ACCOUNT_LOCKOUT_DURATION_MINUTES = 15
+            mock_settings.ACCOUNT_LOCKOUT_WINDOW_MINUTES = 15
+            mock_settings.ACCOUNT_LOCKOUT_IP_THRESHOLD = 5
+            yield mock_settings
+
+    @pytest.fixture
+    def mock_user(self):
+        user = MagicMock()
+        user.id = uuid4()
+        user.email = "user@example.com"
+        user.failed_login_attempts = 0
+        user.last_failed_login = None
+        user.locked_until = None
+        return user
+
+    async def test_failures_below_threshold_do_not_write_the_row(
+        self, redis_client, lockout_settings, mock_user
+    ):
+        from app.services.account_lockout_service import AccountLockoutService
+
+        mock_db = AsyncMock()
+        for _ in range(2):
+            is_locked, _ = await AccountLockoutService.record_failed_attempt(
+                mock_db, mock_user, "10.0.0.1"
+            )
+            assert is_locked is False
+
+        mock_db.commit.assert_not_called()
+        assert mock_user.failed_login_attempts == 0
+        assert mock_user.last_failed_login is None
+
+    async def test_crossing_threshold_persists_lock_once(
+        self, redis_client, lockout_settings, mock_user
+    ):
+        from app.services.account_lockout_service import AccountLockoutService
+
+        mock_db = AsyncMock()
+        results = [
+            await AccountLockoutService.record_failed_attempt(mock_db, mock_user, "10.0.0.1")
+            for _ in range(3)
+        ]
+        # Another worker still counting failures it saw before the lock was set
+        other_worker = MagicMock(id=mock_user.id, email=mock_user.email)
+        await redis_client.zadd(
+            f"janua:lockout:failures:{USER}:{mock_user.id}", {f"late-{i}": 9e9 for i in range(3)}
+        )
+        concurrent = await AccountLockoutService.record_failed_attempt(
+            AsyncMock(), other_worker, "10.0.0.2"
+        )
+
+        assert results[-1] == (True, 15 * 60)
+        assert concurrent[0] is True
+        mock_db.commit.assert_called_once()
+        assert mock_user.failed_login_attempts == 3
+        assert mock_user.locked_until is not None
+        assert AccountLockoutService.is_account_locked(mock_user)[0] is True
+
+    async def test_failures_outside_window_expire(self, redis_client, lockout_settings, no_redis):
+        await redis_client.zadd(
+            f"janua:lockout:failures:{USER}:user-1", {"old-1": 1.0, "old-2": 2.0}
+        )
+
+        user_failures, _ = await no_redis.record_failure("user-1")
+
+        assert user_failures == 1
+
+    async def test_ip_failing_across_accounts_is_blocked(self, redis_client, lockout_settings):
+        from app.services.account_lockout_service import AccountLockoutService
+
+        for _ in range(5):
+            user = MagicMock(id=uuid4(), email="victim@example.com")
+            await AccountLockoutService.record_failed_attempt(AsyncMock(), user, "10.9.9.9")
+
+        assert await AccountLockoutService.ip_blocked_seconds("10.9.9.9") == 15 * 60
+        assert await AccountLockoutService.ip_blocked_seconds("10.0.0.1") is None
+        assert f"janua:lockout:lock:{IP}:10.9.9.9" in redis_client.data
+
+    async def test_success_clears_counter_without_writing_row(
+        self, redis_client, lockout_settings, mock_user
+    ):
+        from app.services.account_lockout_service import AccountLockoutService
+
+        mock_db = AsyncMock()
+        await AccountLockoutService.record_failed_attempt(mock_db, mock_user, "10.0.0.1")
+        await AccountLockoutService.reset_failed_attempts(mock_db, mock_user)
+
+        assert await AccountLockoutService.record_failed_attempt(
+            mock_db, mock_user, "10.0.0.1"
+        ) == (False, None)
+        assert len(redis_client.data[f"janua:lockout:failures:user:{mock_user.id}"]) == 1
+        mock_db.commit.assert_not_called()
@@ -0,0 +1,115 @@
+"""
+Tests for audit_logs partition maintenance and partition-pruning query windows.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+
+from app.models import AuditLog
+from app.services.audit_log_partitions import (
+    add_months,
+    apply_window,
+    ensure_partitions,
+    month_start,
+    partition_name,
+    query_window,
+)
+
+
+def _pg_session(relkind="p", existing=()):
+    session = MagicMock()
+    session.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    session.commit = AsyncMock()
+    session.begin_nested = MagicMock(
+        return_value=MagicMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False))
+    )
+    statements = []
+
+    async def execute(statement, params=None):
+        sql = str(statement)
+        statements.append(sql)
+        result = MagicMock()
+        if "relkind" in sql:
+            result.scalar_one_or_none.return_value = relkind
+        elif "to_regclass" in sql:
+            result.scalar_one_or_none.return_value = (
+                params["name"] if params["name"] in existing else None
+            )
+        return result
+
+    session.execute = execute
+    session.statements = statements
+    return session
+
+
+class TestPartitionNames:
+    def test_month_arithmetic(self):
+        assert month_start(datetime(2026, 10, 18, 13, 5)) == datetime(2026, 10, 1)
+        assert add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+        assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+        assert partition_name(datetime(2026, 3, 1)) == "audit_logs_2026_03"
+
+
+class TestQueryWindow:
+    def test_explicit_range_is_kept(self):
+        start, end = datetime(2026, 1, 1), datetime(2026, 2, 1)
+        assert query_window(start, end) == (start, end)
+
+    def test_missing_start_is_open(self):
+        end = datetime(2026, 6, 1)
+        assert query_window(None, end) == (None, end)
+
+    def test_cursor_moves_end_back(self):
+        end = datetime(2026, 6, 1)
+        cursor = datetime(2026, 3, 1)
+        assert query_window(None, end, cursor=cursor) == (None, cursor)
+
+    def test_end_always_bounded(self):
+        _, end = query_window()
+        assert end <= datetime.utcnow()
+
+    def test_window_without_start_is_open_below(self):
+        end = datetime(2026, 6, 1)
+        bounded = str(apply_window(select(AuditLog), AuditLog.created_at, end, end))
+        open_below = str(apply_window(select(AuditLog), AuditLog.created_at, None, end))
+
+        assert "audit_logs.created_at >=" in bounded
+        assert "audit_logs.created_at >=" not in open_below
+        assert "audit_logs.created_at <=" in open_below
+
+
+class TestEnsurePartitions:
+    async def test_creates_current_and_future_months(self):
+        session = _pg_session(existing={"audit_logs_2026_10"})
+
+        created = await ensure_partitions(session, months_ahead=2, now=datetime(2026, 10, 18))
+
+        assert created == ["audit_logs_2026_11", "audit_logs_2026_12"]
+        ddl = [s for s in session.statements if s.startswith("CREATE TABLE")]
+        assert ddl[-1] == (
+            "CREATE TABLE IF NOT EXISTS audit_logs_2026_12 PARTITION OF audit_logs "
+            "FOR VALUES FROM ('2026-12-01T00:00:00') TO ('2027-01-01T00:00:00')"
+        )
+        session.commit.assert_awaited_once()
+
+    async def test_ddl_runs_under_lock_timeout(self):
+        session = _pg_session()
+
+        await ensure_partitions(session, months_ahead=0, now=datetime(2026, 10, 18))
+
+        lock = session.statements.index("SET LOCAL lock_timeout = 2000")
+        create = next(i for i, s in enumerate(session.statements) if s.startswith("CREATE"))
+        assert lock < create
+
+    async def test_noop_for_unpartitioned_table(self):
+        session = _pg_session(relkind="r")
+        assert await ensure_partitions(session) == []
+        assert not any(s.startswith("CREATE") for s in session.statements)
+
+    async def test_noop_on_other_dialects(self):
+        session = MagicMock()
+        session.bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+        assert await ensure_partitions(session) == []
@@ -0,0 +1,325 @@
+"""
+Tests for precompiled branding stylesheets, image variants and the cached CSS endpoint.
+"""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+from starlette.requests import Request
+
+import app.services.branding_asset_service as branding_mod
+from app.models.white_label import ThemeMode
+from app.routers.v1 import white_label
+from app.routers.v1.white_label import get_branding_assets, get_organization_css
+from app.services.branding_asset_service import (
+    FAVICON_VARIANTS,
+    LOGO_VARIANTS,
+    CompiledBranding,
+    CompiledStylesheet,
+    compile_branding,
+    create_image_variants,
+    delete_image_variants,
+    get_branding,
+    minify_css,
+    publish_branding,
+    variant_path,
+)
+
+ORG_ID = "7b0c5a1e-0000-4000-8000-000000000001"
+
+
+@pytest.fixture(autouse=True)
+def reset_branding():
+    branding_mod.invalidate_local_branding()
+    yield
+    branding_mod.invalidate_local_branding()
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    with patch.object(branding_mod.settings, "UPLOAD_DIR", str(tmp_path)):
+        (tmp_path / "branding" / "org").mkdir(parents=True)
+        yield tmp_path
+
+
+def _config(**overrides):
+    values = {
+        "is_enabled": True,
+        "primary_color": "#123456",
+        "secondary_color": "#654321",
+        "accent_color": "#00ff00",
+        "background_color": "#ffffff",
+        "surface_color": "#f0f0f0",
+        "text_color": "#111111",
+        "border_radius": "4px",
+        "font_family": "Inter, sans-serif",
+        "custom_css": None,
+        "company_logo_url": None,
+        "company_logo_dark_url": None,
+        "company_favicon_url": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _db(config=None):
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = config
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _png(width=1000, height=250) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def _request(headers=None, path="/"):
+    app = FastAPI()
+    app.include_router(white_label.router, prefix="/api/v1")
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "headers": raw,
+            "app": app,
+            "router": app.router,
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "root_path": "",
+            "query_string": b"",
+        }
+    )
+
+
+class TestMinifyCss:
+    def test_strips_comments_and_whitespace(self):
+        css = "a  >  b {\n  margin : 0 auto ;  /* note */\n  color: red;\n}\n"
+        assert minify_css(css) == "a>b{margin:0 auto;color:red}"
+
+    def test_selectors_inside_blocks_are_untouched(self):
+        css = "@media (min-width: 600px) { a :hover { color : red } }"
+        assert minify_css(css) == "@media (min-width: 600px){a :hover{color:red}}"
+
+    def test_string_literals_are_preserved(self):
+        assert minify_css('a { content: "x  /* y */" ; }') == 'a{content:"x  /* y */"}'
+
+
+class TestCompileBranding:
+    def test_stylesheet_per_theme_mode(self):
+        branding = compile_branding(ORG_ID, _config(custom_css=".x { color : red }"))
+
+        assert set(branding.stylesheets) == set(ThemeMode)
+        light = branding.stylesheet(ThemeMode.LIGHT).body.decode()
+        dark = branding.stylesheet(ThemeMode.DARK).body.decode()
+        assert "--primary-color:#123456" in light
+        assert light.endswith(".x{color:red}")
+        assert "color-scheme:dark" in dark
+        assert branding.stylesheet(ThemeMode.LIGHT).etag != branding.stylesheet(ThemeMode.DARK).etag
+
+    def test_missing_or_disabled_config_gets_defaults(self):
+        default = compile_branding(ORG_ID, None)
+        disabled = compile_branding(ORG_ID, _config(is_enabled=False))
+
+        assert "--primary-color:#1a73e8" in default.stylesheet(None).body.decode()
+        assert default.stylesheets == disabled.stylesheets
+
+    def test_etag_is_content_hash(self):
+        a = CompiledStylesheet.from_css(ThemeMode.LIGHT, "a { color: red; }")
+        b = CompiledStylesheet.from_css(ThemeMode.DARK, "a{color:red}")
+        c = CompiledStylesheet.from_css(ThemeMode.LIGHT, "a{color:blue}")
+        assert a.etag == b.etag
+        assert a.etag != c.etag
+
+    def test_round_trips_through_json(self):
+        branding = compile_branding(ORG_ID, _config())
+        restored = CompiledBranding.from_json(branding.to_json())
+        assert restored == branding
+
+    def test_manifest_lists_existing_variants(self, upload_dir):
+        logo = "/uploads/branding/org/org_logo_abc.png"
+        (upload_dir / "branding" / "org" / "org_logo_abc_1x.png").write_bytes(b"x")
+
+        manifest = compile_branding(ORG_ID, _config(company_logo_url=logo)).manifest("/css/o")
+
+        assert manifest["logo"] == {
+            "original": logo,
+            "1x": "/uploads/branding/org/org_logo_abc_1x.png",
+        }
+        assert "favicon" not in manifest
+        assert manifest["css"]["dark"].startswith("/css/o?theme_mode=dark&v=")
+
+
+class TestImageVariants:
+    async def test_resized_once_at_upload(self, upload_dir):
+        url = "/uploads/branding/org/org_logo_abc.png"
+
+        created = await create_image_variants(_png(), url, "image/png", LOGO_VARIANTS)
+
+        assert created == {label: variant_path(url, label) for label in LOGO_VARIANTS}
+        with Image.open(upload_dir / "branding" / "org" / "org_logo_abc_1x.png") as img:
+            assert img.size == (400, 100)
+            assert img.mode == "RGBA"
+            assert img.getpixel((0, 0)) == (255, 0, 0, 128)
+
+        delete_image_variants(url, LOGO_VARIANTS)
+        assert not list((upload_dir / "branding" / "org").iterdir())
+
+    async def test_variants_keep_the_source_format(self, upload_dir):
+        output = io.BytesIO()
+        Image.new("RGB", (1000, 250), (0, 0, 255)).save(output, format="JPEG")
+
+        created = await create_image_variants(
+            output.getvalue(), "/uploads/branding/org/org_logo_abc.JPG", "image/jpeg", LOGO_VARIANTS
+        )
+
+        assert created["1x"] == "/uploads/branding/org/org_logo_abc_1x.jpg"
+        with Image.open(upload_dir / "branding" / "org" / "org_logo_abc_2x.jpg") as img:
+            assert img.format == "JPEG"
+        assert variant_path("/uploads/branding/org/org_logo_abc.gif", "1x").endswith("_1x.png")
+
+    async def test_vector_images_are_not_resized(self, upload_dir):
+        url = "/uploads/branding/org/org_favicon_abc.svg"
+        assert await create_image_variants(b"<svg/>", url, "image/svg+xml", FAVICON_VARIANTS) == {}
+
+    async def test_variant_paths_stay_inside_upload_dir(self, upload_dir):
+        url = "/uploads/../../etc/logo.png"
+        assert await create_image_variants(_png(), url, "image/png", LOGO_VARIANTS) == {}
+
+
+class TestGetBranding:
+    async def test_served_from_memory_after_first_load(self):
+        db = _db(_config())
+        with (
+            patch.object(branding_mod, "_load_from_redis", AsyncMock(return_value=None)),
+            patch.object(branding_mod, "_store_in_redis", AsyncMock()) as store,
+        ):
+            first = await get_branding(db, ORG_ID)
+            second = await get_branding(db, ORG_ID)
+
+        assert first is second
+        assert db.execute.await_count == 1
+        store.assert_awaited_once()
+
+    async def test_unknown_organization_is_not_cached(self):
+        db = _db(None)  # No branding config and no organization
+        with (
+            patch.object(branding_mod, "_load_from_redis", AsyncMock(return_value=None)),
+            patch.object(branding_mod, "_store_in_redis", AsyncMock()) as store,
+        ):
+            branding = await get_branding(db, ORG_ID)
+            malformed = await get_branding(db, "not-a-uuid")
+
+        assert branding.stylesheet(ThemeMode.LIGHT) == compile_branding(ORG_ID, None).stylesheet(
+            ThemeMode.LIGHT
+        )
+        assert malformed.organization_id == "not-a-uuid"
+        assert db.execute.await_count == 2  # Config and organization lookups, once
+        assert not branding_mod._branding
+        store.assert_not_awaited()
+
+    async def test_local_copy_expires_without_invalidation_bus(self, monkeypatch):
+        branding_mod._remember(compile_branding(ORG_ID, _config()))
+        monkeypatch.setattr(branding_mod.invalidation_bus, "_listening", False)
+        now = branding_mod.time.monotonic()
+
+        with patch.object(branding_mod.time, "monotonic", return_value=now + 30):
+            assert branding_mod._local_branding(ORG_ID) is not None
+        with patch.object(
+            branding_mod.time,
+            "monotonic",
+            return_value=now + branding_mod.BRANDING_LOCAL_TTL_SECONDS,
+        ):
+            assert branding_mod._local_branding(ORG_ID) is None
+
+    async def test_redis_copy_skips_database(self):
+        cached = compile_branding(ORG_ID, _config())
+        db = _db()
+        with patch.object(branding_mod, "_load_from_redis", AsyncMock(return_value=cached)):
+            branding = await get_branding(db, ORG_ID)
+
+        assert branding == cached
+        db.execute.assert_not_awaited()
+
+    async def test_publish_recompiles_and_invalidates(self):
+        stale = compile_branding(ORG_ID, None)
+        branding_mod._remember(stale)
+        with (
+            patch.object(branding_mod, "_store_in_redis", AsyncMock()) as store,
+            patch.object(branding_mod.invalidation_bus, "publish", AsyncMock()) as publish,
+        ):
+            fresh = await publish_branding(ORG_ID, _config())
+
+        assert await get_branding(_db(), ORG_ID) is fresh
+        store.assert_awaited_once_with(fresh)
+        publish.assert_awaited_once_with(branding_mod.BRANDING_INVALIDATION_TOPIC, ORG_ID)
+
+    async def test_redis_copy_expires(self):
+        redis_client = AsyncMock()
+        branding = compile_branding(ORG_ID, _config())
+        with patch("app.core.redis.get_redis", AsyncMock(return_value=redis_client)):
+            await branding_mod._store_in_redis(branding)
+
+        redis_client.set.assert_awaited_once_with(
+            f"{branding_mod.BRANDING_REDIS_KEY_PREFIX}{ORG_ID}",
+            branding.to_json(),
+            ex=branding_mod.BRANDING_REDIS_TTL_SECONDS,
+        )
+
+
+class TestOrganizationCssEndpoint:
+    async def test_returns_compiled_css_with_etag(self):
+        branding = compile_branding(ORG_ID, _config())
+        with patch("app.routers.v1.white_label.get_branding", AsyncMock(return_value=branding)):
+            response = await get_organization_css(
+                ORG_ID, _request(), theme_mode=ThemeMode.DARK, v=None, db=AsyncMock()
+            )
+
+        sheet = branding.stylesheet(ThemeMode.DARK)
+        assert response.status_code == 200
+        assert response.body == sheet.body
+        assert response.headers["etag"] == sheet.etag
+        assert "immutable" not in response.headers["cache-control"]
+
+    async def test_if_none_match_returns_304(self):
+        branding = compile_branding(ORG_ID, _config())
+        etag = branding.stylesheet(ThemeMode.LIGHT).etag
+        with patch("app.routers.v1.white_label.get_branding", AsyncMock(return_value=branding)):
+            response = await get_organization_css(
+                ORG_ID,
+                _request({"If-None-Match": etag}),
+                theme_mode=ThemeMode.LIGHT,
+                v=None,
+                db=AsyncMock(),
+            )
+
+        assert response.status_code == 304
+        assert response.body == b""
+
+    async def test_versioned_url_is_immutable(self):
+        branding = compile_branding(ORG_ID, _config())
+        version = branding.stylesheet(ThemeMode.LIGHT).version
+        with patch("app.routers.v1.white_label.get_branding", AsyncMock(return_value=branding)):
+            response = await get_organization_css(
+                ORG_ID, _request(), theme_mode=ThemeMode.LIGHT, v=version, db=AsyncMock()
+            )
+
+        assert "immutable" in response.headers["cache-control"]
+
+    async def test_assets_manifest_links_versioned_css(self):
+        branding = compile_branding(ORG_ID, _config())
+        with patch("app.routers.v1.white_label.get_branding", AsyncMock(return_value=branding)):
+            manifest = await get_branding_assets(ORG_ID, _request(), db=AsyncMock())
+
+        version = branding.stylesheet(ThemeMode.LIGHT).version
+        assert manifest["css"]["light"] == (
+            f"/api/v1/white-label/css/{ORG_ID}?theme_mode=light&v={version}"
+        )
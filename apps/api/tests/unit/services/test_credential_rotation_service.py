@@ -3,15 +3,38 @@ Comprehensive Credential Rotation Service Test Suite
 Tests OAuth client secret rotation, validation, and lifecycle management.
 """
 
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import bcrypt
 import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, OAuthClientSecret
 
 pytestmark = pytest.mark.asyncio
 
 
+@pytest.fixture(autouse=True)
+def client_secret_usage():
+    """Fresh verification cache and usage recorder for every test"""
+    from app.services import credential_rotation_service
+
+    credential_rotation_service._verified.clear()
+    with patch.object(
+        credential_rotation_service,
+        "client_secret_usage",
+        credential_rotation_service.ClientSecretUsageRecorder(),
+    ) as usage:
+        yield usage
+    credential_rotation_service._verified.clear()
+
+
 class TestGenerateSecret:
     """Test secret generation functionality"""
 
@@ -171,14 +194,14 @@ class TestValidateSecret:
 
             assert result == mock_secret
             mock_secret.verify.assert_called_once_with("valid_secret")
-            assert mock_secret.last_used_at is not None
 
-    async def test_validate_updates_last_used(self, service):
-        """Should update last_used_at on successful validation"""
+    async def test_validate_records_last_used_in_batch(self, service, client_secret_usage):
+        """Should record last_used_at for the batched flush instead of committing"""
         mock_client = MagicMock()
         mock_client.id = uuid4()
 
         mock_secret = MagicMock()
+        mock_secret.id = uuid4()
         mock_secret.verify = MagicMock(return_value=True)
         mock_secret.last_used_at = None
 
@@ -196,8 +219,8 @@ class TestValidateSecret:
 
             await service.validate_secret(mock_client, "secret")
 
-            assert mock_secret.last_used_at is not None
-            service.db.commit.assert_called()
+            assert ("secret", mock_secret.id) in client_secret_usage._pending
+            service.db.commit.assert_not_called()
 
     async def test_validate_fallback_to_legacy(self, service):
         """Should fall back to legacy secret if no rotation secrets match"""
@@ -592,3 +615,168 @@ class TestCleanupExpiredSecrets:
 
         assert count == 0
         service.db.commit.assert_not_called()
+
+
+def _secret(plain: str, **overrides):
+    """An active secret record for ``plain``, with the prefix generate_secret stores"""
+    secret = MagicMock()
+    secret.id = uuid4()
+    secret.secret_hash = bcrypt.hashpw(plain.encode(), bcrypt.gensalt(4)).decode()
+    secret.secret_prefix = plain[:12] + "..."
+    secret.verify = MagicMock(
+        side_effect=lambda value: bcrypt.checkpw(value.encode(), secret.secret_hash.encode())
+    )
+    for name, value in overrides.items():
+        setattr(secret, name, value)
+    return secret
+
+
+class TestFastPathValidation:
+    """One bcrypt check per request, whatever the number of live secrets"""
+
+    @pytest.fixture
+    def service(self):
+        from app.services.credential_rotation_service import CredentialRotationService
+
+        return CredentialRotationService(AsyncMock())
+
+    @pytest.fixture
+    def client(self):
+        client = MagicMock()
+        client.id = uuid4()
+        client.client_secret_hash = "legacy-hash"
+        client.client_secret_prefix = "jns_legacy12..."
+        client.verify_secret = MagicMock(return_value=False)
+        return client
+
+    @pytest.fixture
+    def rotation_enabled(self):
+        with patch("app.services.credential_rotation_service.settings") as mock_settings:
+            mock_settings.CLIENT_SECRET_ROTATION_ENABLED = True
+            mock_settings.CLIENT_SECRET_VERIFY_CACHE_SECONDS = 60
+            yield mock_settings
+
+    def _active(self, service, secrets):
+        service.get_active_secrets = AsyncMock(return_value=secrets)
+
+    async def test_only_the_prefix_candidate_is_verified(self, service, client, rotation_enabled):
+        secrets = [_secret(f"jns_{i}abcdefgh-rest-of-secret-{i}") for i in range(3)]
+        self._active(service, secrets)
+
+        assert await service.verify(client, "jns_1abcdefgh-rest-of-secret-1")
+
+        secrets[0].verify.assert_not_called()
+        secrets[1].verify.assert_called_once()
+        secrets[2].verify.assert_not_called()
+        client.verify_secret.assert_not_called()
+
+    async def test_unknown_prefix_costs_no_bcrypt(self, service, client, rotation_enabled):
+        secrets = [_secret("jns_aaaaaaaa-first"), _secret("jns_bbbbbbbb-second")]
+        self._active(service, secrets)
+
+        assert not await service.verify(client, "jns_zzzzzzzz-guess")
+
+        for secret in secrets:
+            secret.verify.assert_not_called()
+        client.verify_secret.assert_not_called()
+
+    async def test_seeded_short_prefix_still_matches(self, service, client, rotation_enabled):
+        self._active(service, [])
+        client.client_secret_prefix = "jns_seed"  # Seed scripts store 8 characters
+        client.verify_secret = MagicMock(return_value=True)
+
+        assert await service.verify(client, "jns_seed-and-the-rest")
+
+    async def test_verification_runs_off_the_event_loop(self, service, client, rotation_enabled):
+        secret = _secret("jns_threaded-secret")
+        threads = []
+        secret.verify.side_effect = lambda value: threads.append(threading.get_ident()) or True
+        self._active(service, [secret])
+
+        assert await service.verify(client, "jns_threaded-secret")
+
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_success_is_cached_until_secret_leaves_active_set(
+        self, service, client, rotation_enabled
+    ):
+        secret = _secret("jns_cachedsec-value")
+        self._active(service, [secret])
+
+        assert await service.verify(client, "jns_cachedsec-value")
+        assert await service.verify(client, "jns_cachedsec-value")
+        secret.verify.assert_called_once()
+
+        # Revoked: no longer returned as active, so the cached check cannot match it
+        self._active(service, [])
+        assert not await service.verify(client, "jns_cachedsec-value")
+
+    async def test_failures_are_not_cached(self, service, client, rotation_enabled):
+        secret = _secret("jns_realsecret-value")
+        self._active(service, [secret])
+
+        assert not await service.verify(client, "jns_realsecret-wrong")
+        assert not await service.verify(client, "jns_realsecret-wrong")
+
+        assert secret.verify.call_count == 2
+
+    async def test_verify_records_client_use(
+        self, service, client, rotation_enabled, client_secret_usage
+    ):
+        self._active(service, [_secret("jns_usedsecret-value")])
+
+        await service.verify(client, "jns_usedsecret-value")
+
+        assert ("client", client.id) in client_secret_usage._pending
+
+
+@pytest_asyncio.fixture
+async def secret_sessions():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[OAuthClientSecret.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestLastUsedBatching:
+    async def test_uses_are_written_in_one_batch(self, secret_sessions):
+        from app.services.credential_rotation_service import ClientSecretUsageRecorder
+
+        earlier = datetime(2026, 1, 1, 12, 0)
+        later = earlier + timedelta(minutes=5)
+        async with secret_sessions() as session:
+            rows = [
+                OAuthClientSecret(
+                    id=uuid4(),
+                    client_id=uuid4(),
+                    secret_hash=f"hash-{i}",
+                    secret_prefix=f"jns_{i}...",
+                    last_used_at=later if i == 1 else None,
+                )
+                for i in range(2)
+            ]
+            session.add_all(rows)
+            await session.commit()
+
+        recorder = ClientSecretUsageRecorder(secret_sessions)
+        recorder.touch(secret_id=rows[0].id, when=earlier)
+        recorder.touch(secret_id=rows[0].id, when=later)
+        recorder.touch(secret_id=rows[1].id, when=earlier)  # Older than what is stored
+
+        assert await recorder.flush() == 2
+        assert await recorder.flush() == 0
+
+        async with secret_sessions() as session:
+            stored = dict(
+                (
+                    await session.execute(
+                        select(OAuthClientSecret.id, OAuthClientSecret.last_used_at)
+                    )
+                ).all()
+            )
+        assert stored == {rows[0].id: later, rows[1].id: later}
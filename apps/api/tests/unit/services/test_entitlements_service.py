@@ -15,14 +15,18 @@ from uuid import uuid4
 
 import pytest
 
-from app.models import EntitlementSource
+from app.models import EntitlementSource, Organization, OrganizationMember, UserEntitlement
+from app.services import entitlements_service
 from app.services.entitlements_service import (
     ADMIN_BOOTSTRAP_PRODUCTS,
     ADMIN_TIER,
     Entitlement,
+    bump_entitlements_version,
     cancel_entitlement,
+    clear_entitlements_cache,
     entitlements_to_claim,
     get_user_entitlements,
+    resolve_token_entitlements,
     upsert_entitlement,
 )
 
@@ -313,3 +317,157 @@ class TestCancelEntitlement:
         await cancel_entitlement(db, user_id=uuid4(), product="karafiel")
         # Past expiry preserved — must not be overwritten with a later "now".
         assert existing.expires_at == past
+
+
+class TestResolveTokenEntitlements:
+    """Versioned snapshot shared by the authorization-code and refresh grants."""
+
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        clear_entitlements_cache()
+        yield
+        clear_entitlements_cache()
+
+    def _db(self, *, memberships=(), org=None, rows=()):
+        results = [("scalars_all", list(memberships))]
+        if memberships:
+            results.append(("scalar_one_or_none", org))
+        results.append(("scalars_all", list(rows)))
+        return _make_db_with_results(*results)
+
+    async def test_builds_claims_from_one_pass(self):
+        user = _user()
+        org_id = uuid4()
+        membership = SimpleNamespace(organization_id=org_id, role="owner")
+        org = SimpleNamespace(subscription_tier="pro", product_tiers={"dhanam": "pro"})
+        row = SimpleNamespace(
+            product="karafiel",
+            tier="contador",
+            expires_at=datetime.utcnow() + timedelta(days=3),
+            source=EntitlementSource.DHANAM_SUBSCRIPTION,
+        )
+        db = self._db(memberships=[membership], org=org, rows=[row])
+
+        snapshot = await resolve_token_entitlements(user, db)
+
+        assert snapshot.to_claims() == {
+            "tier": "pro",
+            "roles": ["owner"],
+            "sub_status": "active",
+            "is_admin": False,
+            "madfam_entitled_products": ["dhanam:pro", "karafiel:contador"],
+        }
+        assert snapshot.expires_at == row.expires_at
+        assert snapshot.org_key == f"org:{org_id}"
+        assert db.execute.await_count == 3
+
+    async def test_snapshot_reused_until_version_bump(self):
+        user = _user()
+        db = self._db()
+        first = await resolve_token_entitlements(user, db)
+
+        # Fixture is exhausted: any further query would raise
+        assert await resolve_token_entitlements(user, db) is first
+
+        bump_entitlements_version(user_id=user.id)
+        rebuilt = await resolve_token_entitlements(user, self._db())
+        assert rebuilt is not first
+
+    async def test_org_bump_invalidates_members(self):
+        user = _user()
+        org_id = uuid4()
+        membership = SimpleNamespace(organization_id=org_id, role="member")
+        org = SimpleNamespace(subscription_tier="community", product_tiers={})
+        first = await resolve_token_entitlements(user, self._db(memberships=[membership], org=org))
+
+        bump_entitlements_version(org_id=org_id)
+        org.product_tiers = {"tezca": "pro"}
+        rebuilt = await resolve_token_entitlements(
+            user, self._db(memberships=[membership], org=org)
+        )
+
+        assert first.products == ()
+        assert rebuilt.products == ("tezca:pro",)
+
+    async def test_snapshot_expires_with_earliest_entitlement(self):
+        user = _user()
+        expires_at = datetime.utcnow() + timedelta(minutes=5)
+        row = SimpleNamespace(
+            product="karafiel",
+            tier="contador",
+            expires_at=expires_at,
+            source=EntitlementSource.DHANAM_SUBSCRIPTION,
+        )
+        await resolve_token_entitlements(user, self._db(rows=[row]))
+
+        later = await resolve_token_entitlements(
+            user, self._db(rows=[row]), now=expires_at + timedelta(seconds=1)
+        )
+        assert later.products == ()
+
+    async def test_admin_flag_change_is_not_served_from_cache(self):
+        user = _user()
+        await resolve_token_entitlements(user, self._db())
+
+        user.is_admin = True
+        snapshot = await resolve_token_entitlements(user, self._db())
+
+        assert snapshot.is_admin is True
+        assert "admin" in snapshot.roles
+        assert len(snapshot.products) == len(ADMIN_BOOTSTRAP_PRODUCTS)
+
+    async def test_degraded_result_is_not_cached(self):
+        user = _user()
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=RuntimeError("db down"))
+        db.rollback = AsyncMock()
+
+        snapshot = await resolve_token_entitlements(user, db)
+
+        assert snapshot.tier == "community"
+        assert snapshot.products == ()
+        assert f"user:{user.id}" not in entitlements_service._snapshots
+
+    async def test_committed_writes_bump_versions(self):
+        user_id, org_id = uuid4(), uuid4()
+        org = Organization(id=org_id, product_tiers={"dhanam": "pro"})
+        session = SimpleNamespace(
+            new=[UserEntitlement(user_id=user_id, product="karafiel", tier="pro")],
+            dirty=[org],
+            deleted=[OrganizationMember(user_id=user_id, organization_id=org_id)],
+            info={},
+        )
+
+        entitlements_service._track_entitlement_changes(session, None)
+        assert session.info["entitlements_changed"] == {f"user:{user_id}", f"org:{org_id}"}
+        assert entitlements_service._version(f"user:{user_id}") == 0
+
+        entitlements_service._publish_entitlement_changes(session)
+        assert entitlements_service._version(f"user:{user_id}") == 1
+        assert entitlements_service._version(f"org:{org_id}") == 1
+        assert "entitlements_changed" not in session.info
+
+    async def test_rolled_back_writes_are_discarded(self):
+        user_id = uuid4()
+        session = SimpleNamespace(
+            new=[UserEntitlement(user_id=user_id, product="karafiel", tier="pro")],
+            dirty=[],
+            deleted=[],
+            info={},
+        )
+
+        entitlements_service._track_entitlement_changes(session, None)
+        entitlements_service._discard_entitlement_changes(session, None)
+        entitlements_service._publish_entitlement_changes(session)
+
+        assert entitlements_service._version(f"user:{user_id}") == 0
+
+    async def test_bus_message_from_other_worker(self):
+        user = _user()
+        await resolve_token_entitlements(user, self._db())
+
+        entitlements_service.invalidation_bus.dispatch(
+            entitlements_service.ENTITLEMENTS_INVALIDATION_TOPIC, f"user:{user.id}"
+        )
+
+        assert f"user:{user.id}" not in entitlements_service._snapshots
@@ -0,0 +1,150 @@
+"""
+Tests for the Redis login feature store and its use by RiskAssessmentService.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.login_feature_store import LoginFeatures, LoginFeatureStore, location_key
+from app.services.risk_assessment_service import RiskAssessmentService, RiskSignals
+
+
+def _client(results=None):
+    """Raw Redis client whose pipeline records commands and returns ``results``."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results or [])
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    return client, pipe
+
+
+class TestLocationKey:
+    def test_ipv4_collapses_to_slash_24(self):
+        assert location_key("203.0.113.7") == "203.0.113.0/24"
+        assert location_key("203.0.113.250") == location_key("203.0.113.7")
+
+    def test_ipv6_collapses_to_slash_48(self):
+        assert location_key("2001:db8:1:2::1") == "2001:db8:1::/48"
+
+    def test_invalid_or_missing(self):
+        assert location_key("not-an-ip") is None
+        assert location_key(None) is None
+
+
+class TestLoginFeatureStore:
+    async def test_fetch_is_one_pipelined_round_trip(self):
+        created = datetime.utcnow() - timedelta(days=40)
+        client, pipe = _client(
+            [
+                {b"created_at": created.isoformat().encode(), b"email": b"a@example.com"},
+                2,
+                1,
+                [b"fp-old", b"fp-new"],
+                [b"203.0.113.0/24"],
+            ]
+        )
+
+        features = await LoginFeatureStore(client=client).fetch("user-1")
+
+        pipe.execute.assert_awaited_once()
+        assert features.logins_last_hour == 2
+        assert features.failed_last_24h == 1
+        assert features.known_devices == {"fp-old", "fp-new"}
+        assert features.known_locations == {"203.0.113.0/24"}
+        assert features.email == "a@example.com"
+        assert features.account_age_days() == 40
+
+    async def test_cold_user_returns_none(self):
+        client, _ = _client([{}, 0, 0, [], []])
+        assert await LoginFeatureStore(client=client).fetch("user-1") is None
+
+    async def test_keys_share_a_cluster_hash_tag(self):
+        client, pipe = _client([{}, 0, 0, [], []])
+        await LoginFeatureStore(client=client).fetch("user-1")
+
+        keys = [c.args[0] for c in pipe.method_calls if c.args]
+        assert keys and all("{user-1}" in key for key in keys)
+
+    async def test_success_updates_devices_and_locations(self):
+        client, pipe = _client()
+        await LoginFeatureStore(client=client).record_login("user-1", True, "203.0.113.7", "fp-1")
+
+        added = {c.args[0].rsplit(":", 1)[1]: c.args[1] for c in pipe.zadd.call_args_list}
+        assert set(added) == {"logins", "devices", "locations"}
+        assert "fp-1" in added["devices"]
+        assert "203.0.113.0/24" in added["locations"]
+        pipe.execute.assert_awaited_once()
+
+    async def test_failed_attempt_does_not_make_device_known(self):
+        client, pipe = _client()
+        await LoginFeatureStore(client=client).record_login(
+            "user-1", False, "203.0.113.7", "fp-attacker"
+        )
+
+        added = [c.args[0].rsplit(":", 1)[1] for c in pipe.zadd.call_args_list]
+        assert added == ["failures"]
+
+    async def test_redis_unavailable_degrades_to_none(self):
+        store = LoginFeatureStore()
+        store._client = AsyncMock(return_value=None)
+        assert await store.fetch("user-1") is None
+        await store.record_login("user-1", True, "203.0.113.7")
+
+    async def test_redis_error_degrades_to_none(self):
+        client, pipe = _client()
+        pipe.execute.side_effect = ConnectionError("down")
+        assert await LoginFeatureStore(client=client).fetch("user-1") is None
+
+
+class TestLoginFeatures:
+    def test_new_location_needs_history(self):
+        assert not LoginFeatures().is_new_location("203.0.113.7")
+        features = LoginFeatures(known_locations={"203.0.113.0/24"})
+        assert not features.is_new_location("203.0.113.200")
+        assert features.is_new_location("198.51.100.1")
+
+
+class TestScorersUsePrefetchedSignals:
+    @pytest.fixture
+    def service(self):
+        return RiskAssessmentService(feature_store=MagicMock())
+
+    @pytest.fixture
+    def db(self):
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=AssertionError("scorer queried the database"))
+        return db
+
+    async def test_risk_factors_come_from_features(self, service, db):
+        signals = RiskSignals(
+            features=LoginFeatures(
+                failed_last_24h=4,
+                known_devices={"fp-1"},
+                account_created_at=datetime.utcnow() - timedelta(days=10),
+            )
+        )
+
+        factors = await service._collect_risk_factors(
+            db, "user-1", "203.0.113.7", "fp-1", signals=signals
+        )
+
+        assert factors["is_new_device"] is False
+        assert factors["recent_failed_attempts"] == 4
+        assert factors["account_age_days"] == 10
+
+    async def test_location_risk_flags_new_network(self, service, db):
+        signals = RiskSignals(features=LoginFeatures(known_locations={"203.0.113.0/24"}))
+
+        known = await service._assess_location_risk(db, "203.0.113.7", "user-1", signals=signals)
+        new = await service._assess_location_risk(db, "198.51.100.1", "user-1", signals=signals)
+
+        assert new > known
+
+    async def test_unknown_device_and_missing_baseline(self, service, db):
+        signals = RiskSignals()
+
+        assert await service._assess_device_risk(db, "fp-1", "user-1", signals=signals) == 0.5
+        assert await service._assess_behavior_risk(db, "user-1", None, None, signals=signals) == 0.2
+        db.execute.assert_not_called()
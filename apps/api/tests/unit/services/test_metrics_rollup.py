@@ -0,0 +1,308 @@
+"""
+Tests for per-minute metric rollups.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, MetricsRollup
+from app.services.metrics_rollup import (
+    BUCKETS_KEY,
+    KEY_PREFIX,
+    RollupRecorder,
+    latency_bucket,
+    minute_of,
+    percentile_from_histogram,
+    record_compliance_event,
+)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[MetricsRollup.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class FakeRedis:
+    """The subset of Redis the rollups use: minute hashes, the bucket index and locks."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hincrby(self, key, field, amount):
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(int(hash_.get(field, 0)) + amount)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def zrangebyscore(self, key, low, high):
+        low = float("-inf") if low == "-inf" else low
+        members = self.data.get(key, {})
+        return sorted(m for m, score in members.items() if low <= score <= high)
+
+    async def zrem(self, key, member):
+        self.data.get(key, {}).pop(member, None)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def rename(self, key, new_key):
+        self.data[new_key] = self.data.pop(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls
+        ]
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+def _since() -> datetime:
+    return datetime.utcnow() - timedelta(minutes=5)
+
+
+async def _db_total(factory, metric: str) -> int:
+    async with factory() as session:
+        result = await session.execute(
+            select(func.coalesce(func.sum(MetricsRollup.count), 0)).where(
+                MetricsRollup.metric == metric
+            )
+        )
+        return int(result.scalar())
+
+
+class TestHistogram:
+    def test_latency_bucket(self):
+        assert latency_bucket(3) == "le_5"
+        assert latency_bucket(100) == "le_100"
+        assert latency_bucket(101) == "le_250"
+        assert latency_bucket(60000) == "le_inf"
+
+    def test_percentile_interpolates_within_bucket(self):
+        histogram = {"le_10": 50, "le_100": 50}
+        assert percentile_from_histogram(histogram, 50) == 10.0
+        assert percentile_from_histogram(histogram, 75) == 75.0  # halfway from 50 to 100
+
+    def test_percentile_of_empty_histogram(self):
+        assert percentile_from_histogram({}, 95) is None
+
+    def test_overflow_reports_last_bound(self):
+        assert percentile_from_histogram({"le_inf": 10}, 99) == 10000.0
+
+
+class TestRecording:
+    async def test_pending_counters_are_readable_before_flush(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("auth.success")
+        recorder.record("auth.success")
+
+        totals = await recorder.totals(["auth.success", "auth.failure"], _since())
+
+        assert totals == {"auth.success": 2, "auth.failure": 0}
+
+    async def test_flush_writes_minute_hash_to_redis(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests", count=3)
+        recorder.record("http.requests", scope="org-1")
+
+        assert await recorder.flush() == 2
+
+        minute = minute_of()
+        fields = await redis_client.hgetall(f"{KEY_PREFIX}{minute}")
+        assert fields == {"http.requests|global": "3", "http.requests|org-1": "1"}
+        assert redis_client.data[BUCKETS_KEY] == {str(minute): minute}
+        assert (await recorder.totals(["http.requests"], _since()))["http.requests"] == 3
+        assert (await recorder.totals(["http.requests"], _since(), scope="org-1"))[
+            "http.requests"
+        ] == 1
+
+    async def test_window_excludes_other_minutes(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests")
+        await recorder.flush()
+
+        totals = await recorder.totals(
+            ["http.requests"], datetime.utcnow() - timedelta(hours=2), _since()
+        )
+
+        assert totals["http.requests"] == 0
+
+    async def test_flush_falls_back_to_database_without_redis(self, session_factory):
+        recorder = RollupRecorder(session_factory)
+
+        async def no_redis():
+            return None
+
+        recorder._get_redis = no_redis
+        recorder.record("auth.failure", count=2)
+        await recorder.flush()
+        recorder.record("auth.failure")
+        await recorder.flush()
+
+        assert await _db_total(session_factory, "auth.failure") == 3
+        assert (await recorder.totals(["auth.failure"], _since()))["auth.failure"] == 3
+
+    async def test_observe_builds_latency_histogram(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        for latency_ms in [4, 8, 40, 90, 400]:
+            recorder.observe("http.requests", latency_ms)
+        await recorder.flush()
+
+        latency = await recorder.latency("http.requests", _since())
+
+        assert latency["count"] == 5
+        assert latency["mean_ms"] == 108.4
+        assert 25 < latency["p50_ms"] <= 50  # the 40ms request
+        assert 250 < latency["p99_ms"] <= 500
+
+    def test_compliance_events_are_scoped_per_organization(self, monkeypatch):
+        recorder = RollupRecorder()
+        monkeypatch.setattr("app.services.metrics_rollup.metrics_rollup", recorder)
+
+        record_compliance_event(None, "user_access", "failure")
+        record_compliance_event("org-1", "security_event", "success")
+
+        counted = {
+            (metric, scope): count for (_, metric, scope), count in recorder._pending.items()
+        }
+        assert counted == {
+            ("compliance.events", "default"): 1,
+            ("compliance.events.failure", "default"): 1,
+            ("compliance.user_access", "default"): 1,
+            ("compliance.user_access.failure", "default"): 1,
+            ("compliance.events", "org-1"): 1,
+            ("compliance.security_event", "org-1"): 1,
+        }
+
+
+class TestPersist:
+    async def test_closed_minutes_move_to_database_once(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests", count=4)
+        await recorder.flush()
+        minute = minute_of()
+
+        later = datetime.utcnow() + timedelta(minutes=2)
+        assert await recorder.persist_closed_buckets(later) == 1
+        assert await recorder.persist_closed_buckets(later) == 0
+
+        assert await _db_total(session_factory, "http.requests") == 4
+        assert not await redis_client.exists(f"{KEY_PREFIX}{minute}")
+        assert redis_client.data[BUCKETS_KEY] == {}
+        assert (await recorder.totals(["http.requests"], _since()))["http.requests"] == 4
+
+    async def test_current_minute_stays_in_redis(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests")
+        await recorder.flush()
+
+        assert await recorder.persist_closed_buckets() == 0
+        assert await _db_total(session_factory, "http.requests") == 0
+
+    async def test_leftover_staging_hash_is_persisted(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests", count=2)
+        await recorder.flush()
+        minute = minute_of()
+        key = f"{KEY_PREFIX}{minute}"
+        # A previous run renamed the hash but died before writing it
+        await redis_client.rename(key, f"{key}:persisting")
+        await redis_client.hincrby(key, "http.requests|global", 1)
+
+        later = datetime.utcnow() + timedelta(minutes=2)
+        await recorder.persist_closed_buckets(later)
+        await recorder.persist_closed_buckets(later)
+
+        assert await _db_total(session_factory, "http.requests") == 3
+        assert redis_client.data[BUCKETS_KEY] == {}
+
+    async def test_failed_staging_delete_writes_nothing(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests", count=3)
+        await recorder.flush()
+        later = datetime.utcnow() + timedelta(minutes=2)
+
+        delete = redis_client.delete
+
+        async def failing_delete(key):
+            if key.endswith(":persisting"):
+                raise ConnectionError("redis went away")
+            await delete(key)
+
+        redis_client.delete = failing_delete
+        with pytest.raises(ConnectionError):
+            await recorder.persist_closed_buckets(later)
+        assert await _db_total(session_factory, "http.requests") == 0
+
+        redis_client.delete = delete
+        assert await recorder.persist_closed_buckets(later) == 1
+        assert await _db_total(session_factory, "http.requests") == 3
+
+    async def test_failed_commit_restages_the_minute(self, session_factory, redis_client):
+        recorder = RollupRecorder(session_factory, redis_client)
+        recorder.record("http.requests", count=3)
+        await recorder.flush()
+        later = datetime.utcnow() + timedelta(minutes=2)
+
+        upsert = recorder._upsert
+
+        async def failing_upsert(counters, before_commit=None):
+            await before_commit()
+            raise RuntimeError("commit failed")
+
+        recorder._upsert = failing_upsert
+        with pytest.raises(RuntimeError):
+            await recorder.persist_closed_buckets(later)
+
+        recorder._upsert = upsert
+        assert await recorder.persist_closed_buckets(later) == 1
+        assert await _db_total(session_factory, "http.requests") == 3
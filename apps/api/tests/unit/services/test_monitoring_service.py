@@ -3,9 +3,19 @@ Comprehensive unit tests for MonitoringService
 Tests the basic functionality of the monitoring module
 """
 
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
 import pytest
 
-from app.services.monitoring import MonitoringService, MetricsCollector, MetricType, AlertSeverity
+from app.services.monitoring import (
+    AlertSeverity,
+    HealthChecker,
+    MetricsCollector,
+    MetricType,
+    MonitoringService,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -127,3 +137,82 @@ class TestMonitoringService:
 
         await service.shutdown()
         assert service.initialized is False
+
+
+class TestHealthChecker:
+    """Test concurrent, cached health checks."""
+
+    def _checker(self, cache_ttl=5.0, timeout=1.0):
+        checker = HealthChecker(AsyncMock())
+        checker.cache_ttl = cache_ttl
+        checker.check_timeout = timeout
+        return checker
+
+    async def test_checks_run_concurrently(self):
+        checker = self._checker()
+
+        async def slow_check():
+            await asyncio.sleep(0.2)
+            return True
+
+        for name in ("database", "redis", "kms"):
+            checker.register_check(name, slow_check, critical=True)
+
+        started = time.monotonic()
+        result = await checker.check_health()
+
+        assert time.monotonic() - started < 0.5
+        assert result["status"] == "healthy"
+        assert checker.metrics.gauge.await_count == 3
+
+    async def test_slow_check_hits_its_deadline(self):
+        checker = self._checker(timeout=0.05)
+
+        async def hanging_check():
+            await asyncio.sleep(5)
+
+        checker.register_check("database", hanging_check, critical=True)
+        checker.register_check("cache", AsyncMock(return_value=True))
+
+        result = await asyncio.wait_for(checker.check_health(), 1)
+
+        assert result["status"] == "unhealthy"
+        assert result["checks"]["database"]["status"] == "error"
+        assert result["checks"]["cache"]["status"] == "healthy"
+
+    async def test_probe_flood_runs_checks_once_per_interval(self):
+        checker = self._checker()
+        check = AsyncMock(return_value=True)
+        checker.register_check("database", check, critical=True)
+
+        results = await asyncio.gather(*(checker.check_health() for _ in range(50)))
+        await checker.check_health()
+
+        assert check.await_count == 1
+        assert all(result is results[0] for result in results)
+
+        await checker.check_health(force=True)
+        assert check.await_count == 2
+
+    async def test_details_dict_reports_its_health(self):
+        checker = self._checker()
+        checker.register_check(
+            "database", AsyncMock(return_value={"healthy": False}), critical=True
+        )
+
+        result = await checker.check_health()
+
+        assert result["status"] == "unhealthy"
+        assert result["checks"]["database"]["details"] == {"healthy": False}
+
+    async def test_liveness_runs_no_checks(self):
+        checker = self._checker()
+        check = AsyncMock(return_value=True)
+        checker.register_check("database", check, critical=True)
+
+        assert checker.liveness()["status"] == "alive"
+        assert check.await_count == 0
+
+        await checker.check_health()
+        assert checker.liveness()["last_health_status"] == "healthy"
+
@@ -0,0 +1,141 @@
+"""
+Tests for the batched, checkpointed retention purger.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models import AuditLog, Base
+from app.models.compliance import RetentionCheckpoint
+from app.services.retention_purger import (
+    PurgeResult,
+    RetentionPurger,
+    _partition_upper_bound,
+)
+
+NOW = datetime(2026, 6, 1)
+CUTOFF = NOW - timedelta(days=90)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[AuditLog.__table__, RetentionCheckpoint.__table__],
+        )
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(factory, old: int, recent: int):
+    async with factory() as session:
+        for i in range(old):
+            session.add(
+                AuditLog(id=uuid.uuid4(), action="login", created_at=CUTOFF - timedelta(days=1 + i))
+            )
+        for i in range(recent):
+            session.add(
+                AuditLog(id=uuid.uuid4(), action="login", created_at=NOW - timedelta(days=i))
+            )
+        await session.commit()
+
+
+async def _remaining(factory) -> int:
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(AuditLog))).scalar()
+
+
+async def _checkpoint(factory, job_key: str) -> RetentionCheckpoint:
+    async with factory() as session:
+        return (
+            await session.execute(
+                select(RetentionCheckpoint).where(RetentionCheckpoint.job_key == job_key)
+            )
+        ).scalar_one()
+
+
+def _purger(factory, **kwargs):
+    kwargs.setdefault("batch_size", 10)
+    return RetentionPurger(factory, throttle_seconds=0, max_batch_seconds=60, **kwargs)
+
+
+class TestRetentionPurger:
+    async def test_deletes_only_expired_rows_in_batches(self, session_factory):
+        await _seed(session_factory, old=25, recent=5)
+
+        result = await _purger(session_factory).purge(
+            AuditLog, AuditLog.created_at, CUTOFF, job_key="audit"
+        )
+
+        assert result.rows_deleted == 25
+        assert result.batches == 3
+        assert result.completed
+        assert not result.resumed
+        assert await _remaining(session_factory) == 5
+
+        checkpoint = await _checkpoint(session_factory, "audit")
+        assert checkpoint.completed_at is not None
+        assert checkpoint.rows_deleted == 25
+        assert checkpoint.batches == 3
+
+    async def test_interrupted_run_resumes_from_checkpoint(self, session_factory):
+        await _seed(session_factory, old=25, recent=0)
+        purger = _purger(session_factory)
+
+        first = await purger.purge(
+            AuditLog, AuditLog.created_at, CUTOFF, job_key="audit", max_batches=1
+        )
+        assert (first.rows_deleted, first.completed) == (10, False)
+        assert (await _checkpoint(session_factory, "audit")).completed_at is None
+
+        # A later run keeps the original cutoff and continues after the cursor
+        second = await purger.purge(
+            AuditLog, AuditLog.created_at, NOW + timedelta(days=1), job_key="audit"
+        )
+        assert second.resumed
+        assert second.cutoff == CUTOFF
+        assert second.rows_deleted == 15
+        assert second.completed
+        assert (await _checkpoint(session_factory, "audit")).rows_deleted == 25
+
+    async def test_completed_job_restarts_with_new_cutoff(self, session_factory):
+        await _seed(session_factory, old=3, recent=2)
+        purger = _purger(session_factory)
+        await purger.purge(AuditLog, AuditLog.created_at, CUTOFF, job_key="audit")
+
+        result = await purger.purge(
+            AuditLog, AuditLog.created_at, NOW + timedelta(days=1), job_key="audit"
+        )
+
+        assert not result.resumed
+        assert result.rows_deleted == 2
+        assert await _remaining(session_factory) == 0
+
+    async def test_partitions_are_only_dropped_on_postgres(self, session_factory):
+        dropped = await _purger(session_factory).drop_expired_partitions("audit_logs", CUTOFF)
+        assert dropped == []
+
+
+class TestPurgeResult:
+    def test_rows_per_second(self):
+        result = PurgeResult("audit_logs", CUTOFF, rows_deleted=500, elapsed_seconds=2.0)
+        assert result.rows_per_second == 250.0
+        assert result.to_dict()["rows_per_second"] == 250.0
+        assert PurgeResult("audit_logs", CUTOFF).rows_per_second == 0.0
+
+    def test_partition_upper_bound(self):
+        bound = "FOR VALUES FROM ('2026-01-01 00:00:00') TO ('2026-02-01 00:00:00')"
+        assert _partition_upper_bound(bound) == datetime(2026, 2, 1)
+        assert _partition_upper_bound("FOR VALUES FROM ('2026-01-01') TO (MAXVALUE)") is None
+        assert _partition_upper_bound("DEFAULT") is None
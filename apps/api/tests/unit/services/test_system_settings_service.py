@@ -3,13 +3,23 @@ Comprehensive System Settings Service Test Suite
 Tests for system settings and CORS origins management
 """
 
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from app.models import Base
+from app.models.system_settings import AllowedCorsOrigin, SystemSetting
+from app.services import system_settings_service
 from app.services.system_settings_service import (
+    SETTINGS_INVALIDATION_TOPIC,
+    SETTINGS_VERSION_KEY,
+    SettingsSnapshot,
     SystemSettingsService,
     get_cached_cors_origins,
     invalidate_cors_cache,
@@ -720,3 +730,154 @@ class TestServiceMethodExistence:
         """Test service has invalidate_cache method."""
         assert hasattr(service, "invalidate_cache")
         assert callable(service.invalidate_cache)
+
+
+class FakeRedis:
+    """Just the version counter the snapshot keeps in Redis."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[SystemSetting.__table__, AllowedCorsOrigin.__table__],
+        )
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    publish = AsyncMock(return_value=True)
+    monkeypatch.setattr(system_settings_service.invalidation_bus, "publish", publish)
+    return publish
+
+
+@pytest_asyncio.fixture
+async def snapshot(session_factory, redis_client, published):
+    snapshot = SettingsSnapshot(session_factory)
+
+    async def get_redis():
+        return redis_client
+
+    snapshot._get_redis = get_redis
+    await snapshot.start()
+    yield snapshot
+    await snapshot.stop()
+
+
+async def _store(session_factory, *rows):
+    async with session_factory() as session:
+        session.add_all(rows)
+        await session.commit()
+
+
+class TestSettingsSnapshot:
+    """Test the process-wide settings snapshot."""
+
+    async def test_reads_are_served_from_memory(self, session_factory, monkeypatch):
+        await _store(session_factory, SystemSetting(key="auth.allow_signups", value="false"))
+        snapshot = SettingsSnapshot(session_factory)
+        snapshot._get_redis = AsyncMock(return_value=None)
+        await snapshot.start()
+        monkeypatch.setattr(system_settings_service, "settings_snapshot", snapshot)
+
+        service = SystemSettingsService(AsyncMock())
+
+        assert await service.get_setting("auth.allow_signups") == "false"
+        assert await service.get_setting("missing", default="fallback") == "fallback"
+        service.db.execute.assert_not_called()
+
+    async def test_unloaded_snapshot_falls_back_to_database(self):
+        assert not SettingsSnapshot().current()
+
+    async def test_publish_change_reloads_and_publishes_version(
+        self, snapshot, session_factory, redis_client, published
+    ):
+        await _store(session_factory, SystemSetting(key="features.beta", value="on"))
+
+        await snapshot.publish_change()
+
+        assert snapshot.get("features.beta") == "on"
+        assert snapshot.version == 1
+        assert redis_client.data[SETTINGS_VERSION_KEY] == "1"
+        published.assert_awaited_once_with(SETTINGS_INVALIDATION_TOPIC, "1")
+
+    async def test_other_workers_reload_on_newer_version(
+        self, snapshot, session_factory, redis_client
+    ):
+        await _store(session_factory, SystemSetting(key="features.beta", value="on"))
+        redis_client.data[SETTINGS_VERSION_KEY] = "3"
+
+        snapshot.invalidate("3")
+        # Reads keep answering from the previous snapshot while it reloads
+        assert snapshot.current()
+        assert snapshot.get("features.beta") is None
+        await snapshot._reload_task
+
+        assert snapshot.get("features.beta") == "on"
+        assert snapshot.version == 3
+
+    async def test_already_loaded_version_is_ignored(self, snapshot, redis_client):
+        redis_client.data[SETTINGS_VERSION_KEY] = "2"
+        await snapshot.reload()
+
+        snapshot.invalidate("2")
+        snapshot.invalidate("1")
+
+        assert not snapshot._stale
+        assert snapshot._reload_task is None
+
+    async def test_cors_origins_by_scope(self, snapshot, session_factory):
+        org_id = uuid4()
+        await _store(
+            session_factory,
+            AllowedCorsOrigin(origin="https://system.example.com"),
+            AllowedCorsOrigin(origin="https://tenant.example.com", organization_id=org_id),
+            AllowedCorsOrigin(origin="https://old.example.com", is_active=False),
+        )
+        await snapshot.reload()
+
+        with patch("app.services.system_settings_service.app_settings") as mock_settings:
+            mock_settings.cors_origins_list = ["http://localhost:3000"]
+            system = snapshot.get_cors_origins()
+            tenant = snapshot.get_cors_origins(org_id, include_system=False)
+            everything = snapshot.get_cors_origins(org_id, include_inactive=True)
+
+        assert sorted(system) == ["http://localhost:3000", "https://system.example.com"]
+        assert sorted(tenant) == ["http://localhost:3000", "https://tenant.example.com"]
+        assert len(everything) == 4
+        assert "https://system.example.com" in snapshot.system_cors_origins
+
+    async def test_failed_reload_keeps_previous_snapshot(self, snapshot, session_factory):
+        await _store(session_factory, SystemSetting(key="features.beta", value="on"))
+        await snapshot.reload()
+        snapshot._session_factory = MagicMock(side_effect=RuntimeError("database down"))
+
+        snapshot.invalidate("")
+        await asyncio.gather(snapshot._reload_task)
+
+        assert snapshot.get("features.beta") == "on"
+        assert snapshot._stale
+
@@ -0,0 +1,178 @@
+"""
+Tests for precompiled translation bundles and the ETag-aware translations endpoint.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from starlette.requests import Request
+
+import app.services.translation_bundle_service as bundles_mod
+from app.routers.v1.localization import get_translations
+from app.services.translation_bundle_service import (
+    TranslationBundle,
+    build_bundles,
+    fallback_chain,
+    get_bundle,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_bundles():
+    bundles_mod.invalidate_local_bundles()
+    yield
+    bundles_mod.invalidate_local_bundles()
+
+
+def _result(rows=None, scalars=None):
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalars.return_value.all.return_value = scalars or []
+    return result
+
+
+def _db():
+    db = AsyncMock()
+    db.execute = AsyncMock(
+        side_effect=[
+            _result(rows=[("auth.login", "Log in"), ("auth.logout", "Log out")]),
+            _result(
+                rows=[
+                    ("en", "auth.login", "Sign in"),
+                    ("es", "auth.login", "Iniciar sesión"),
+                    ("es", "auth.logout", "Cerrar sesión"),
+                    ("es-MX", "auth.logout", "Salir"),
+                ]
+            ),
+            _result(scalars=["en", "es", "es-MX"]),
+        ]
+    )
+    return db
+
+
+def _request(headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class TestFallbackChain:
+    def test_regional_variant(self):
+        assert fallback_chain("es-MX") == ["es-MX", "es", "en"]
+
+    def test_default_locale_not_duplicated(self):
+        assert fallback_chain("en-US") == ["en-US", "en"]
+
+    def test_posix_separator(self):
+        assert fallback_chain("es_MX") == ["es-MX", "es", "en"]
+
+
+class TestBuildBundles:
+    async def test_merges_along_fallback_chain(self):
+        bundles = await build_bundles(_db())
+
+        assert json.loads(bundles["es-MX"].body) == {
+            "auth.login": "Iniciar sesión",
+            "auth.logout": "Salir",
+        }
+        assert json.loads(bundles["en"].body) == {"auth.login": "Sign in", "auth.logout": "Log out"}
+
+    async def test_etag_is_content_hash(self):
+        a = TranslationBundle.from_translations("en", {"k": "v"})
+        b = TranslationBundle.from_translations("en-GB", {"k": "v"})
+        c = TranslationBundle.from_translations("en", {"k": "w"})
+        assert a.etag == b.etag
+        assert a.etag != c.etag
+
+    async def test_unknown_regional_locale_uses_nearest_bundle(self):
+        with (
+            patch.object(bundles_mod, "_load_from_redis", AsyncMock(return_value=None)),
+            patch.object(bundles_mod, "_store_in_redis", AsyncMock()),
+        ):
+            bundle = await get_bundle(_db(), "es-AR")
+
+        assert bundle.locale == "es"
+
+    async def test_served_from_memory_after_first_load(self):
+        db = _db()
+        with (
+            patch.object(bundles_mod, "_load_from_redis", AsyncMock(return_value=None)),
+            patch.object(bundles_mod, "_store_in_redis", AsyncMock()) as store,
+        ):
+            await get_bundle(db, "es")
+            await get_bundle(db, "en")
+
+        assert db.execute.await_count == 3
+        store.assert_awaited_once()
+
+
+class TestGetTranslationsEndpoint:
+    async def test_returns_bundle_with_etag(self):
+        bundle = TranslationBundle.from_translations("es", {"auth.login": "Iniciar sesión"})
+        with patch("app.routers.v1.localization.get_bundle", AsyncMock(return_value=bundle)):
+            response = await get_translations("es", _request(), v=None, db=AsyncMock())
+
+        assert response.status_code == 200
+        assert response.body == bundle.body
+        assert response.headers["etag"] == bundle.etag
+        assert "immutable" not in response.headers["cache-control"]
+
+    async def test_if_none_match_returns_304(self):
+        bundle = TranslationBundle.from_translations("es", {"auth.login": "Iniciar sesión"})
+        with patch("app.routers.v1.localization.get_bundle", AsyncMock(return_value=bundle)):
+            response = await get_translations(
+                "es", _request({"If-None-Match": bundle.etag}), v=None, db=AsyncMock()
+            )
+
+        assert response.status_code == 304
+        assert response.body == b""
+
+    async def test_weak_and_star_if_none_match_return_304(self):
+        bundle = TranslationBundle.from_translations("es", {"auth.login": "Iniciar sesión"})
+        with patch("app.routers.v1.localization.get_bundle", AsyncMock(return_value=bundle)):
+            for header in (f'"stale", W/{bundle.etag}', "*"):
+                response = await get_translations(
+                    "es", _request({"If-None-Match": header}), v=None, db=AsyncMock()
+                )
+                assert response.status_code == 304
+
+    async def test_versioned_url_is_immutable(self):
+        bundle = TranslationBundle.from_translations("es", {"auth.login": "Iniciar sesión"})
+        with patch("app.routers.v1.localization.get_bundle", AsyncMock(return_value=bundle)):
+            response = await get_translations("es", _request(), v=bundle.version, db=AsyncMock())
+
+        assert "immutable" in response.headers["cache-control"]
+
+
+class TestCreateTranslation:
+    async def test_bundle_rebuild_failure_does_not_fail_committed_write(self):
+        from app.routers.v1.localization import TranslationCreate, create_translation
+
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=MagicMock(id=1))),
+                MagicMock(scalar_one_or_none=MagicMock(return_value=MagicMock(id=2))),
+                MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+            ]
+        )
+        rebuild = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch("app.routers.v1.localization.rebuild_bundles", rebuild):
+            result = await create_translation(
+                TranslationCreate(key="auth.login", locale_code="es", value="Entrar"),
+                current_user=MagicMock(),
+                db=db,
+            )
+
+        assert result == {"message": "Translation saved successfully"}
+        db.commit.assert_awaited_once()
+        rebuild.assert_awaited_once()
+
+    async def test_bundles_are_stored_with_ttl(self):
+        redis_client = AsyncMock()
+        bundle = TranslationBundle.from_translations("es", {"auth.login": "Entrar"})
+        with patch("app.core.redis.get_redis", AsyncMock(return_value=redis_client)):
+            await bundles_mod._store_in_redis({"es": bundle})
+
+        assert redis_client.set.await_args.kwargs["ex"] == bundles_mod.BUNDLES_REDIS_TTL_SECONDS
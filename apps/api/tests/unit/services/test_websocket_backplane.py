@@ -0,0 +1,237 @@
+"""
+Tests for cross-node WebSocket fan-out and per-connection backpressure.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.websocket_backplane import WebSocketBackplane, decode_frame, encode_frame
+from app.services.websocket_manager import (
+    DISCONNECT,
+    DROP_OLDEST,
+    ConnectionManager,
+    ConnectionOutbox,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def _websocket(send_text=None):
+    ws = AsyncMock()
+    ws.send_text = send_text or AsyncMock()
+    return ws
+
+
+async def _connect(manager, websocket, user_id="user-1"):
+    """Connect without starting the heartbeat task."""
+    with patch("asyncio.create_task", side_effect=lambda coro: coro.close() or MagicMock()):
+        return await manager.connect(websocket, user_id=user_id)
+
+
+class FakeRedis:
+    """Routes publish() straight into every attached backplane, like Redis would."""
+
+    def __init__(self):
+        self.backplanes = []
+        self.published = []
+
+    async def publish(self, channel, frame):
+        self.published.append(channel)
+        for backplane in self.backplanes:
+            if channel[len(backplane.channel_prefix) :] in backplane.channels:
+                backplane._dispatch(channel, frame)
+
+
+class TestFrames:
+    """Test backplane frame encoding."""
+
+    def test_round_trip(self):
+        frame = encode_frame("node", '{"a":"b|c"}', "conn_1", True)
+        assert decode_frame(frame) == ("node", '{"a":"b|c"}', "conn_1", True)
+
+    def test_empty_exclude(self):
+        assert decode_frame(encode_frame("node", "{}", None, False)) == ("node", "{}", None, False)
+
+
+class TestConnectionOutbox:
+    """Test bounded per-connection queues."""
+
+    async def test_drop_oldest_policy(self):
+        sent = []
+        gate = asyncio.Event()
+
+        async def send_text(text):
+            await gate.wait()
+            sent.append(text)
+
+        outbox = ConnectionOutbox(_websocket(send_text), 2, DROP_OLDEST, MagicMock())
+        outbox.put("0")
+        await asyncio.sleep(0)  # writer takes "0" and blocks on the socket
+        for i in range(1, 5):
+            assert outbox.put(str(i))
+
+        gate.set()
+        await outbox.flush()
+
+        assert sent[0] == "0"
+        assert sent[1:] == ["3", "4"]
+        assert outbox.dropped == 2
+
+    async def test_disconnect_policy(self):
+        gate = asyncio.Event()
+
+        async def send_text(text):
+            await gate.wait()
+
+        on_failure = MagicMock()
+        outbox = ConnectionOutbox(_websocket(send_text), 1, DISCONNECT, on_failure)
+        outbox.put("a")
+        await asyncio.sleep(0)
+        outbox.put("b")
+
+        assert outbox.put("c") is False
+        on_failure.assert_called_once_with("slow consumer")
+        assert outbox.put("d") is False
+        outbox.close()
+
+    async def test_send_error_reports_failure(self):
+        on_failure = MagicMock()
+        outbox = ConnectionOutbox(
+            _websocket(AsyncMock(side_effect=RuntimeError("gone"))), 4, DROP_OLDEST, on_failure
+        )
+        outbox.put("a")
+        await outbox.flush()
+
+        on_failure.assert_called_once_with("gone")
+
+
+class TestConcurrentFanOut:
+    """Test that broadcasts do not wait on individual sockets."""
+
+    async def test_slow_socket_does_not_stall_broadcast(self):
+        manager = ConnectionManager()
+        stuck = asyncio.Event()
+        slow = _websocket(AsyncMock(side_effect=lambda text: stuck.wait()))
+        fast = _websocket()
+
+        for ws in (slow, fast):
+            connection_id = await _connect(manager, ws)
+            await manager.subscribe(connection_id, "organization", "org-1")
+
+        await asyncio.wait_for(manager.broadcast_to_organization("org-1", {"n": 1}), 1)
+        await manager.flush(list(manager.active_connections)[1])
+
+        fast.send_text.assert_called_once_with('{"n":1}')
+        stuck.set()
+        await manager.flush()
+
+    async def test_message_serialized_once(self):
+        manager = ConnectionManager()
+        websockets = [_websocket() for _ in range(20)]
+        for ws in websockets:
+            await _connect(manager, ws)
+
+        with patch(
+            "app.services.websocket_manager.serialize_message", return_value='{"x":1}'
+        ) as serialize:
+            await manager.send_to_user("user-1", {"x": 1})
+            await manager.flush()
+
+        serialize.assert_called_once()
+        assert all(ws.send_text.call_args.args[0] == '{"x":1}' for ws in websockets)
+
+    async def test_slow_consumer_is_disconnected(self):
+        manager = ConnectionManager()
+        manager.outbound_queue_size = 1
+        manager.slow_consumer_policy = DISCONNECT
+        stuck = asyncio.Event()
+        ws = _websocket(AsyncMock(side_effect=lambda text: stuck.wait()))
+        await _connect(manager, ws)
+
+        for i in range(3):
+            await manager.broadcast_to_all({"n": i})
+        await asyncio.gather(*(t for t in manager.background_tasks if isinstance(t, asyncio.Task)))
+
+        assert manager.active_connections == {}
+        ws.close.assert_called()
+
+
+class TestBackplane:
+    """Test cross-node delivery through the backplane."""
+
+    async def test_channels_follow_local_subscribers(self):
+        manager = ConnectionManager()
+        connection_id = await _connect(manager, _websocket())
+        await manager.subscribe(connection_id, "organization", "org-1")
+        await manager.subscribe(connection_id, "topic", "deploys")
+
+        assert manager.backplane.channels == {"all", "user:user-1", "org:org-1", "topic:deploys"}
+
+        await manager.unsubscribe(connection_id, "topic", "deploys")
+        assert "topic:deploys" not in manager.backplane.channels
+
+        await manager.disconnect(connection_id)
+        assert manager.backplane.channels == {"all"}
+
+    async def test_subscribes_pubsub_only_for_new_channels(self):
+        backplane = WebSocketBackplane(MagicMock())
+        backplane._pubsub = AsyncMock()
+
+        await backplane.add("org:1")
+        await backplane.add("org:1")
+        await backplane.remove("org:1")
+        await backplane.remove("all")
+
+        backplane._pubsub.subscribe.assert_awaited_once_with("janua:ws:org:1")
+        backplane._pubsub.unsubscribe.assert_awaited_once_with("janua:ws:org:1")
+
+    async def test_broadcast_reaches_other_node(self):
+        redis = FakeRedis()
+        node_a, node_b = ConnectionManager(), ConnectionManager()
+        redis.backplanes = [node_a.backplane, node_b.backplane]
+
+        ws_a, ws_b, ws_other = _websocket(), _websocket(), _websocket()
+        conn_a = await _connect(node_a, ws_a)
+        conn_b = await _connect(node_b, ws_b)
+        await node_a.subscribe(conn_a, "organization", "org-1")
+        await node_b.subscribe(conn_b, "organization", "org-1")
+        await _connect(node_b, ws_other, user_id="user-2")
+
+        with patch("app.core.redis.get_raw_redis", AsyncMock(return_value=redis)):
+            await node_a.broadcast_to_organization("org-1", {"event": "updated"})
+            await node_a.send_to_user("user-2", {"event": "direct"})
+        await node_a.flush()
+        await node_b.flush()
+
+        ws_a.send_text.assert_called_once_with('{"event":"updated"}')
+        ws_b.send_text.assert_called_once_with('{"event":"updated"}')
+        ws_other.send_text.assert_called_once_with('{"event":"direct"}')
+        assert redis.published == ["janua:ws:org:org-1", "janua:ws:user:user-2"]
+
+    async def test_exclude_applies_across_nodes(self):
+        manager = ConnectionManager()
+        ws = _websocket()
+        connection_id = await _connect(manager, ws)
+        await manager.subscribe(connection_id, "organization", "org-1")
+
+        manager._deliver_remote("org:org-1", "{}", connection_id, False)
+        manager._deliver_remote("all", "{}", None, False)
+        await manager.flush()
+
+        ws.send_text.assert_called_once_with("{}")
+
+    async def test_publish_without_redis_stays_local(self):
+        backplane = WebSocketBackplane(MagicMock())
+        with patch("app.core.redis.get_raw_redis", AsyncMock(return_value=None)):
+            assert await backplane.publish("all", "{}") is False
+
+    async def test_own_frames_are_ignored(self):
+        deliver = MagicMock()
+        backplane = WebSocketBackplane(deliver)
+
+        backplane._dispatch("janua:ws:all", encode_frame(backplane.node_id, "{}", None, False))
+        backplane._dispatch("janua:ws:all", encode_frame("other", "{}", None, True))
+
+        deliver.assert_called_once_with("all", "{}", None, True)
@@ -624,7 +624,8 @@ class TestSendToUser:
             mock_websocket.send_json.reset_mock()
 
         await connection_manager.send_to_user("user-123", {"test": "message"})
-        mock_websocket.send_json.assert_called_with({"test": "message"})
+        await connection_manager.flush()
+        mock_websocket.send_text.assert_called_with('{"test":"message"}')
 
 
 class TestBroadcastToOrganization:
@@ -660,7 +661,8 @@ class TestBroadcastToOrganization:
             mock_websocket.send_json.reset_mock()
 
         await connection_manager.broadcast_to_organization("org-1", {"test": "message"})
-        mock_websocket.send_json.assert_called_with({"test": "message"})
+        await connection_manager.flush()
+        mock_websocket.send_text.assert_called_with('{"test":"message"}')
 
     async def test_broadcast_excludes_connection(self, connection_manager, mock_websocket):
         """Test broadcast can exclude a connection."""
@@ -675,8 +677,10 @@ class TestBroadcastToOrganization:
         await connection_manager.broadcast_to_organization(
             "org-1", {"test": "message"}, exclude_connection=connection_id
         )
+        await connection_manager.flush()
         # Should not have received the message due to exclusion
         assert mock_websocket.send_json.call_count == 0
+        assert mock_websocket.send_text.call_count == 0
 
 
 class TestBroadcastToTopic:
@@ -712,7 +716,8 @@ class TestBroadcastToTopic:
             mock_websocket.send_json.reset_mock()
 
         await connection_manager.broadcast_to_topic("notifications", {"test": "message"})
-        mock_websocket.send_json.assert_called_with({"test": "message"})
+        await connection_manager.flush()
+        mock_websocket.send_text.assert_called_with('{"test":"message"}')
 
 
 class TestBroadcastToAll:
@@ -743,8 +748,10 @@ class TestBroadcastToAll:
             mock_websocket.send_json.reset_mock()
 
         await connection_manager.broadcast_to_all({"test": "message"}, authenticated_only=True)
+        await connection_manager.flush()
         # Should not have received message as not authenticated
         assert mock_websocket.send_json.call_count == 0
+        assert mock_websocket.send_text.call_count == 0
 
     async def test_broadcast_to_all_includes_unauthenticated(self, connection_manager, mock_websocket):
         """Test broadcast to all can include unauthenticated."""
@@ -756,7 +763,8 @@ class TestBroadcastToAll:
             mock_websocket.send_json.reset_mock()
 
         await connection_manager.broadcast_to_all({"test": "message"}, authenticated_only=False)
-        mock_websocket.send_json.assert_called_with({"test": "message"})
+        await connection_manager.flush()
+        mock_websocket.send_text.assert_called_with('{"test":"message"}')
 
 
 class TestHandleMessage:
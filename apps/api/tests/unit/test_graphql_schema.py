@@ -0,0 +1,224 @@
+"""
+Tests for GraphQL DataLoader batching, query cost limits and persisted queries.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models.policy  # noqa: F401 - registers user_roles / policy_evaluations
+from app.graphql.loaders import GraphQLLoaders
+from app.graphql.persisted_queries import PersistedQueryStore, query_hash
+from app.graphql.schema import schema
+from app.models import Base, Invitation, Organization, OrganizationMember, Role, User
+from app.models.policy import UserRole
+
+ORG_COUNT = 5
+MEMBERS_PER_ORG = 4
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as s:
+        now = datetime.utcnow()
+        for o in range(ORG_COUNT):
+            org = Organization(id=uuid.uuid4(), name=f"Org {o}", slug=f"org-{o}")
+            role = Role(
+                id=uuid.uuid4(),
+                organization_id=org.id,
+                name=f"admin-{o}",
+                permissions=["users:read", f"org-{o}:write"],
+            )
+            s.add_all([org, role])
+            for m in range(MEMBERS_PER_ORG):
+                user = User(id=uuid.uuid4(), email=f"u{o}-{m}@janua.test", first_name=f"U{m}")
+                s.add(user)
+                s.add(OrganizationMember(organization_id=org.id, user_id=user.id))
+                s.add(UserRole(user_id=user.id, role_id=role.id, organization_id=org.id))
+                s.add(
+                    Invitation(
+                        organization_id=org.id,
+                        email=f"invitee{o}-{m}@janua.test",
+                        token=uuid.uuid4().hex,
+                        expires_at=now + timedelta(days=7),
+                        created_by=user.id,
+                        status="pending" if m % 2 else "accepted",
+                    )
+                )
+        await s.commit()
+        statements.clear()
+        s.info["statements"] = statements
+        yield s
+    await engine.dispose()
+
+
+async def _execute(session, query, **kwargs):
+    context = {"db": session, "loaders": GraphQLLoaders(session), "user": None}
+    return await schema.execute(query, context_value=context, **kwargs)
+
+
+class TestLoaderBatching:
+    async def test_nested_lists_cost_one_query_per_level(self, session):
+        result = await _execute(
+            session,
+            """
+            {
+              organizations(limit: 10) {
+                memberCount
+                members { email permissions organizations { id slug } }
+                invitations(status: "pending") { email inviter { email } }
+              }
+            }
+            """,
+        )
+
+        assert result.errors is None
+        orgs = result.data["organizations"]
+        assert len(orgs) == ORG_COUNT
+        assert all(org["memberCount"] == MEMBERS_PER_ORG for org in orgs)
+        assert all(len(org["invitations"]) == MEMBERS_PER_ORG // 2 for org in orgs)
+        member = orgs[0]["members"][0]
+        assert member["permissions"] == sorted(["users:read", "org-0:write"])
+        assert member["organizations"][0]["slug"] == "org-0"
+        # organizations, member counts, members, invitations, roles, member
+        # organizations and inviters: one query each, however many rows
+        assert len(session.info["statements"]) == 7
+
+    async def test_one_loader_returns_none_for_unknown_and_invalid_keys(self, session):
+        loaders = GraphQLLoaders(session)
+        users = await loaders.one(User).load_many([str(uuid.uuid4()), "not-a-uuid"])
+        assert users == [None, None]
+
+    async def test_page_size_is_clamped(self, session):
+        result = await _execute(session, "{ users(limit: 100000) { id } }")
+        assert result.errors is None
+        assert len(result.data["users"]) == ORG_COUNT * MEMBERS_PER_ORG
+
+
+class TestQueryLimits:
+    async def test_costly_document_rejected_before_execution(self, session):
+        result = await _execute(
+            session,
+            """
+            query Fanout {
+              organizations(limit: 100) {
+                members { organizations { members { organizations { id } } } }
+              }
+            }
+            """,
+        )
+
+        assert result.data is None
+        assert result.errors[0].extensions["code"] == "QUERY_TOO_COSTLY"
+        assert session.info["statements"] == []
+
+    async def test_variable_limit_is_costed_at_max_page_size(self, session):
+        result = await _execute(
+            session,
+            """
+            query Fanout($limit: Int!) {
+              organizations(limit: $limit) { members { organizations { members { id } } } }
+            }
+            """,
+            variable_values={"limit": 1},
+        )
+
+        assert result.errors[0].extensions["code"] == "QUERY_TOO_COSTLY"
+
+    async def test_fragments_are_costed(self, session):
+        result = await _execute(
+            session,
+            """
+            fragment Deep on User { organizations { members { organizations { members { id } } } } }
+            { users(limit: 100) { ...Deep } }
+            """,
+        )
+
+        assert result.errors[0].extensions["code"] == "QUERY_TOO_COSTLY"
+
+    async def test_depth_limit(self, session):
+        nested = "organizations { members { " * 6 + "id" + " } }" * 6
+        result = await _execute(session, f"{{ users(limit: 1) {{ {nested} }} }}")
+
+        assert result.errors
+        assert "exceeds maximum operation depth" in result.errors[0].message
+
+
+class TestPersistedQueries:
+    @pytest.fixture(autouse=True)
+    def store(self, monkeypatch):
+        store = PersistedQueryStore()
+        store._client = _no_redis
+        monkeypatch.setattr("app.graphql.persisted_queries.persisted_query_store", store)
+        return store
+
+    async def test_unknown_hash_asks_client_to_register(self, session):
+        query = "{ organizations(limit: 1) { slug } }"
+        result = await _execute(
+            session,
+            None,
+            operation_extensions={
+                "persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}
+            },
+        )
+
+        assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    async def test_registered_hash_executes_without_query_text(self, session, store):
+        query = "{ organizations(limit: 1) { slug } }"
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+
+        first = await _execute(session, query, operation_extensions=extensions)
+        second = await _execute(session, None, operation_extensions=extensions)
+
+        assert first.errors is None
+        assert second.errors is None
+        assert second.data == first.data
+        assert await store.get(query_hash(query)) == query
+
+    async def test_hash_mismatch_rejected(self, session, store):
+        result = await _execute(
+            session,
+            "{ organizations { slug } }",
+            operation_extensions={"persistedQuery": {"version": 1, "sha256Hash": "0" * 64}},
+        )
+
+        assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
+        assert await store.get("0" * 64) is None
+
+    async def test_invalid_documents_are_not_registered(self, session, store):
+        query = "{ organizations { doesNotExist } }"
+        await _execute(
+            session,
+            query,
+            operation_extensions={
+                "persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}
+            },
+        )
+
+        assert await store.get(query_hash(query)) is None
+
+
+async def _no_redis():
+    return None
@@ -0,0 +1,175 @@
+"""
+Tests for the non-blocking log pipeline.
+"""
+
+import io
+import json
+import logging
+import threading
+
+from app.logging import structured_logger
+from app.logging.pipeline import (
+    DuplicateSuppressor,
+    LogPipeline,
+    LogSampler,
+    PipelineHandler,
+    parse_rates,
+)
+
+
+def _lines(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestLogPipeline:
+    def test_records_are_written_by_background_thread(self):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream)
+        writers = []
+        original_write = stream.write
+        stream.write = lambda text: (
+            writers.append(threading.current_thread().name),
+            original_write(text),
+        )
+
+        assert pipeline.submit({"level": "info", "message": "hello", "user_id": "u1"})
+        assert pipeline.flush()
+
+        [record] = _lines(stream)
+        assert record["message"] == "hello"
+        assert record["user_id"] == "u1"
+        assert record["timestamp"].endswith("+00:00")
+        assert writers == ["janua-log-writer"]
+        pipeline.close()
+
+    def test_close_log_pipeline_writes_queued_records(self, monkeypatch):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream)
+        monkeypatch.setattr(structured_logger, "_pipeline", pipeline)
+
+        for i in range(100):
+            pipeline.submit({"level": "info", "message": f"record {i}"})
+        structured_logger.close_log_pipeline()
+
+        assert len(_lines(stream)) == 100
+        assert pipeline._thread is None
+        assert structured_logger._pipeline is None
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream, max_queue_size=2)
+        gate = threading.Event()
+        original_write = pipeline._write
+        pipeline._write = lambda records: (gate.wait(), original_write(records))
+
+        results = [pipeline.submit({"level": "info", "message": f"m{i}"}) for i in range(10)]
+        gate.set()
+        pipeline.flush()
+
+        assert results.count(False) == pipeline.dropped > 0
+        assert pipeline.stats()["dropped"] == pipeline.dropped
+        # The writer reports drops as a record of its own
+        pipeline.submit({"level": "info", "message": "after"})
+        pipeline.flush()
+        assert any(r.get("dropped") for r in _lines(stream))
+        pipeline.close()
+
+    def test_level_threshold_for_stream(self):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream, stream_level=logging.WARNING)
+        pipeline.submit({"level": "info", "message": "quiet"})
+        pipeline.submit({"level": "error", "message": "loud"})
+        pipeline.flush()
+
+        assert [r["message"] for r in _lines(stream)] == ["loud"]
+        pipeline.close()
+
+    def test_file_sinks(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        error_file = tmp_path / "error.log"
+        pipeline = LogPipeline(
+            stream=io.StringIO(), log_file=str(log_file), error_log_file=str(error_file)
+        )
+        pipeline.submit({"level": "info", "message": "info"})
+        pipeline.submit({"level": "error", "message": "boom"})
+        pipeline.close()
+
+        assert [json.loads(x)["message"] for x in log_file.read_text().splitlines()] == [
+            "info",
+            "boom",
+        ]
+        assert [json.loads(x)["message"] for x in error_file.read_text().splitlines()] == ["boom"]
+
+    def test_stdlib_handler(self):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream)
+        logger = logging.getLogger("test.pipeline")
+        logger.addHandler(PipelineHandler(pipeline))
+        logger.propagate = False
+        try:
+            try:
+                raise ValueError("bad")
+            except ValueError:
+                logger.exception("failed %s", "op")
+        finally:
+            logger.handlers.clear()
+        pipeline.flush()
+
+        [record] = _lines(stream)
+        assert record["message"] == "failed op"
+        assert record["level"] == "error"
+        assert "ValueError: bad" in record["exception"]
+        pipeline.close()
+
+
+class TestSampling:
+    def test_parse_rates(self):
+        assert parse_rates("debug=0.1, /api/v1/health=0, junk, x=abc") == {
+            "debug": 0.1,
+            "/api/v1/health": 0.0,
+        }
+
+    def test_level_and_route_rates(self):
+        sampler = LogSampler({"debug": 0.5}, {"/api/v1/health": 0.0, "/api/v1": 0.5})
+
+        assert sampler.rate("debug") == 0.5
+        assert sampler.rate("info", "/api/v1/health/live") == 0.0
+        assert sampler.rate("debug", "/api/v1/users") == 0.25
+        assert sampler.rate("error", "/api/v1/health") == 1.0
+
+    def test_sampled_out_records_are_counted(self):
+        stream = io.StringIO()
+        pipeline = LogPipeline(stream=stream, sampler=LogSampler(route_rates={"/health": 0.0}))
+
+        assert not pipeline.submit({"level": "info", "message": "ok"}, route="/health")
+        assert pipeline.submit({"level": "warning", "message": "slow"}, route="/health")
+        pipeline.flush()
+
+        assert pipeline.sampled_out == 1
+        assert [r["message"] for r in _lines(stream)] == ["slow"]
+        pipeline.close()
+
+
+class TestDuplicateSuppression:
+    def test_identical_errors_are_rate_limited(self):
+        stream = io.StringIO()
+        suppressor = DuplicateSuppressor(window=60, max_per_window=2)
+        pipeline = LogPipeline(stream=stream, suppressor=suppressor)
+
+        for _ in range(5):
+            pipeline.submit({"level": "error", "message": "db down", "error": "timeout"})
+        pipeline.submit({"level": "error", "message": "db down", "error": "refused"})
+        for _ in range(3):
+            pipeline.submit({"level": "info", "message": "HTTP request completed"})
+        pipeline.flush()
+
+        assert pipeline.suppressed == 3
+        assert len(_lines(stream)) == 6
+        pipeline.close()
+
+    def test_next_window_reports_suppressed_count(self):
+        suppressor = DuplicateSuppressor(window=0.0, max_per_window=1)
+        record = {"level": "error", "message": "x"}
+        suppressor._seen[suppressor.key(record)] = [0.0, 1, 4]
+
+        assert suppressor.check(record) == (True, 4)
@@ -10,6 +10,9 @@ __email__ = "support@janua.dev"
 
 # Main client
 from .client import JanuaClient, create_client
+from .async_client import AsyncJanuaClient, AsyncPaginator, gather
+from .jwks import JWKSTokenValidator
+from .middleware import JanuaASGIMiddleware, JanuaWSGIMiddleware
 
 # Service clients
 from .auth import AuthClient
@@ -103,6 +106,12 @@ __all__ = [
     # Main client
     "JanuaClient",
     "create_client",
+    "AsyncJanuaClient",
+    "AsyncPaginator",
+    "gather",
+    "JWKSTokenValidator",
+    "JanuaASGIMiddleware",
+    "JanuaWSGIMiddleware",
     
     # Service clients
     "AuthClient",
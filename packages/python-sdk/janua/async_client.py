@@ -0,0 +1,492 @@
+"""Asyncio client for the Janua API.
+
+``AsyncJanuaClient`` exposes the same service clients as
+:class:`~janua.client.JanuaClient` (``users``, ``organizations``,
+``sessions``, ...) with every method awaited, on top of one pooled
+``httpx.AsyncClient``:
+
+```python
+async with AsyncJanuaClient(api_key="...") as client:
+    user = await client.users.get(user_id)
+
+    async for user in client.users.iterate(search="@example.com"):
+        ...
+
+    users = await client.gather(
+        (client.users.get(uid) for uid in user_ids), concurrency=10
+    )
+```
+
+The service methods are not re-implemented. Each sync method is run against a
+replaying transport: when it issues a request the call is suspended, the
+request is sent on the async client, and the method is re-run with the
+recorded responses until it returns. Request building, response parsing and
+error handling therefore stay in one place for both clients.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from httpx import Response
+
+from .admin import AdminModule
+from .async_http_client import AsyncHTTPClient
+from .auth import AuthClient
+from .exceptions import ConfigurationError, JanuaError
+from .http_client import RetryConfig
+from .mfa import MFAClient
+from .organizations import OrganizationsClient
+from .passkeys import PasskeysClient
+from .sessions import SessionsClient
+from .types import JanuaConfig, ListResponse
+from .users import UsersClient
+from .webhooks import WebhooksClient
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 10
+
+
+class _PendingRequest(BaseException):
+    """Unwinds a sync service method at the first request it has no response for.
+
+    Derives from BaseException so ``except Exception`` blocks inside service
+    methods cannot swallow it.
+    """
+
+    def __init__(self, method: str, endpoint: str, kwargs: Dict[str, Any]):
+        super().__init__(method, endpoint)
+        self.method = method
+        self.endpoint = endpoint
+        self.kwargs = kwargs
+
+
+class _ReplayHTTP:
+    """Stand-in for ``HTTPClient`` that hands recorded outcomes back in order."""
+
+    def __init__(self, http: AsyncHTTPClient, outcomes: List[Union[Response, JanuaError]]):
+        self._http = http
+        self._outcomes = outcomes
+        self._position = 0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._http.headers
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self._http.api_key
+
+    @property
+    def base_url(self) -> str:
+        return self._http.base_url
+
+    def request(self, method: str, endpoint: str, **kwargs) -> Response:
+        if self._position == len(self._outcomes):
+            raise _PendingRequest(method, endpoint, kwargs)
+        outcome = self._outcomes[self._position]
+        self._position += 1
+        if isinstance(outcome, JanuaError):
+            raise outcome
+        return outcome
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        return self.request('GET', endpoint, params=params, **kwargs)
+
+    def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        return self.request('POST', endpoint, json=json, **kwargs)
+
+    def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        return self.request('PUT', endpoint, json=json, **kwargs)
+
+    def patch(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        return self.request('PATCH', endpoint, json=json, **kwargs)
+
+    def delete(self, endpoint: str, **kwargs) -> Response:
+        return self.request('DELETE', endpoint, **kwargs)
+
+    def close(self) -> None:
+        """The async client owns the connections."""
+
+
+class AsyncPaginator(Generic[T]):
+    """``async for`` over every item of an offset-paginated list endpoint.
+
+    While the items of one page are being consumed the next page is already
+    being fetched, so iteration waits on the network at most once per page
+    rather than once per page plus processing time.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[ListResponse]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        """
+        Args:
+            fetch_page: Coroutine function taking ``(limit, offset)``
+            page_size: Items requested per page
+        """
+        self._fetch_page = fetch_page
+        self.page_size = page_size
+
+    async def pages(self) -> AsyncIterator[ListResponse]:
+        """Iterate over whole pages, prefetching the next one."""
+        pending: Optional[asyncio.Future] = asyncio.ensure_future(
+            self._fetch_page(self.page_size, 0)
+        )
+        offset = 0
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                # The server may clamp ``limit``; advance by what actually came back
+                offset += len(page.items)
+                if page.items and offset < page.total:
+                    pending = asyncio.ensure_future(self._fetch_page(self.page_size, offset))
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        async for page in self.pages():
+            for item in page.items:
+                yield item
+
+    async def to_list(self) -> List[T]:
+        """Collect every item into a list."""
+        return [item async for item in self]
+
+
+class AsyncResource:
+    """Async view of a sync service client: the same methods, awaited."""
+
+    def __init__(self, factory: Callable[[Any], Any], http: AsyncHTTPClient):
+        """
+        Args:
+            factory: Builds the sync service client around a given HTTP client
+            http: Async HTTP client that actually sends the requests
+        """
+        self._factory = factory
+        self._http = http
+        self._template = factory(_ReplayHTTP(http, []))
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        outcomes: List[Union[Response, JanuaError]] = []
+        while True:
+            service = self._factory(_ReplayHTTP(self._http, outcomes))
+            try:
+                return getattr(service, name)(*args, **kwargs)
+            except _PendingRequest as pending:
+                try:
+                    outcomes.append(
+                        await self._http.request(
+                            pending.method, pending.endpoint, **pending.kwargs
+                        )
+                    )
+                except JanuaError as e:
+                    # Replayed into the method so its own error handling applies
+                    outcomes.append(e)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._template, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+
+        return method
+
+    def paginate(
+        self, method: str, *args, page_size: int = DEFAULT_PAGE_SIZE, **kwargs
+    ) -> AsyncPaginator:
+        """Iterate every item of a ``limit``/``offset`` list method.
+
+        Example:
+            ```python
+            async for member in client.organizations.paginate("list_members", org_id):
+                ...
+            ```
+        """
+
+        async def fetch_page(limit: int, offset: int) -> ListResponse:
+            return await self._call(method, *args, limit=limit, offset=offset, **kwargs)
+
+        return AsyncPaginator(fetch_page, page_size=page_size)
+
+    def iterate(self, *args, page_size: int = DEFAULT_PAGE_SIZE, **kwargs) -> AsyncPaginator:
+        """Shortcut for ``paginate("list", ...)``."""
+        return self.paginate('list', *args, page_size=page_size, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"AsyncResource({type(self._template).__name__})"
+
+
+async def gather(
+    aws: Iterable[Awaitable[T]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Await many calls with at most ``concurrency`` in flight.
+
+    Unlike ``asyncio.gather`` the awaitables are pulled lazily, so passing a
+    generator over thousands of ids does not schedule thousands of tasks at
+    once. Results are returned in input order.
+
+    Args:
+        aws: Awaitables (typically un-awaited client calls)
+        concurrency: Maximum number in flight at once
+        return_exceptions: Return errors in place of results instead of raising
+            the first one
+
+    Returns:
+        List of results, in the order of ``aws``
+    """
+    iterator = iter(enumerate(aws))
+    results: Dict[int, Any] = {}
+
+    async def worker() -> None:
+        for index, aw in iterator:
+            try:
+                results[index] = await aw
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        for _, aw in iterator:
+            if inspect.iscoroutine(aw):
+                aw.close()
+        raise
+
+    return [results[index] for index in range(len(results))]
+
+
+class AsyncJanuaClient:
+    """
+    Asyncio client for the Janua API.
+
+    Provides the same service clients as :class:`~janua.client.JanuaClient`
+    with every method awaited, plus auto-paginating iterators and a
+    bounded-concurrency :meth:`gather` for bulk calls.
+
+    Example:
+        ```python
+        from janua import AsyncJanuaClient
+
+        async with AsyncJanuaClient(api_key="your_api_key") as client:
+            org = await client.organizations.get(org_id)
+
+            async for member in client.organizations.paginate("list_members", org.id):
+                print(member.user_id)
+        ```
+    """
+
+    DEFAULT_BASE_URL = "https://api.janua.dev"
+    DEFAULT_TIMEOUT = 30.0
+    DEFAULT_MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        environment: Optional[str] = None,
+        debug: bool = False,
+        custom_headers: Optional[Dict[str, str]] = None,
+        retry_config: Optional[RetryConfig] = None,
+        http2: bool = True,
+        max_connections: int = AsyncHTTPClient.DEFAULT_MAX_CONNECTIONS,
+    ):
+        """
+        Initialize the async Janua client.
+
+        Args:
+            api_key: Your Janua API key. Can also be set via JANUA_API_KEY env var
+            base_url: Base URL for the API. Defaults to https://api.janua.dev
+            timeout: Request timeout in seconds. Defaults to 30
+            max_retries: Maximum number of attempts. Ignored if retry_config is given
+            environment: Environment name (production, staging, development)
+            debug: Enable debug mode for detailed logging
+            custom_headers: Additional headers to include in all requests
+            retry_config: Full retry configuration
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+            max_connections: Size of the connection pool
+
+        Raises:
+            ConfigurationError: If API key is not provided and not in environment
+        """
+        self.api_key = api_key or os.environ.get('JANUA_API_KEY')
+        if not self.api_key:
+            raise ConfigurationError(
+                "API key is required. Provide it as a parameter or set JANUA_API_KEY environment variable"
+            )
+
+        self.base_url = (
+            base_url or
+            os.environ.get('JANUA_BASE_URL') or
+            self.DEFAULT_BASE_URL
+        )
+
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.max_retries = max_retries or self.DEFAULT_MAX_RETRIES
+        self.environment = environment or os.environ.get('JANUA_ENVIRONMENT', 'production')
+        self.debug = debug
+
+        self.config = JanuaConfig(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            environment=self.environment,
+            debug=self.debug,
+        )
+
+        self.http = AsyncHTTPClient(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            timeout=self.timeout,
+            retry_config=retry_config or RetryConfig(max_attempts=self.max_retries),
+            custom_headers=custom_headers,
+            http2=http2,
+            max_connections=max_connections,
+        )
+
+        self._access_token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
+        self._id_token: Optional[str] = None
+
+        self.auth = AsyncResource(lambda http: AuthClient(http, self.config, self), self.http)
+        self.users = AsyncResource(lambda http: UsersClient(http, self.config), self.http)
+        self.organizations = AsyncResource(
+            lambda http: OrganizationsClient(http, self.config), self.http
+        )
+        self.sessions = AsyncResource(lambda http: SessionsClient(http, self.config), self.http)
+        self.webhooks = AsyncResource(lambda http: WebhooksClient(http, self.config), self.http)
+        self.mfa = AsyncResource(lambda http: MFAClient(http, self.config), self.http)
+        self.passkeys = AsyncResource(lambda http: PasskeysClient(http, self.config), self.http)
+        # AdminModule is already written against an awaitable transport
+        self.admin = AdminModule(self.http)
+
+    async def gather(
+        self,
+        aws: Iterable[Awaitable[T]],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Await many client calls with bounded concurrency.
+
+        Args:
+            aws: Un-awaited client calls, e.g. ``(client.users.get(i) for i in ids)``
+            concurrency: Maximum in flight; defaults to the connection pool size
+            return_exceptions: Return errors in place of results instead of raising
+
+        Returns:
+            List of results, in input order
+        """
+        return await gather(
+            aws,
+            concurrency=concurrency or self.http.max_connections,
+            return_exceptions=return_exceptions,
+        )
+
+    def get_access_token(self) -> Optional[str]:
+        """Get the current access token."""
+        return self._access_token
+
+    def get_id_token(self) -> Optional[str]:
+        """Get the current ID token."""
+        return self._id_token
+
+    def get_refresh_token(self) -> Optional[str]:
+        """Get the current refresh token."""
+        return self._refresh_token
+
+    def set_tokens(
+        self,
+        access_token: str,
+        refresh_token: Optional[str] = None,
+        id_token: Optional[str] = None,
+    ) -> None:
+        """Store authentication tokens and update the authorization header."""
+        self._access_token = access_token
+        self._refresh_token = refresh_token
+        self._id_token = id_token
+        self.http.headers['Authorization'] = f'Bearer {access_token}'
+
+    def clear_tokens(self) -> None:
+        """Clear all stored tokens and remove the authorization header."""
+        self._access_token = None
+        self._refresh_token = None
+        self._id_token = None
+        self.http.headers.pop('Authorization', None)
+
+    def is_authenticated(self) -> bool:
+        """Check if the client has an access token."""
+        return self._access_token is not None
+
+    def set_api_key(self, api_key: str) -> None:
+        """Update the API key used for authentication."""
+        self.api_key = api_key
+        self.config.api_key = api_key
+        self.http.api_key = api_key
+        self.http.headers['Authorization'] = f'Bearer {api_key}'
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check the health status of the Janua API."""
+        response = await self.http.get('/health')
+        return response.json()
+
+    async def get_api_version(self) -> str:
+        """Get the current API version."""
+        response = await self.http.get('/version')
+        return response.json().get('version', 'unknown')
+
+    async def close(self) -> None:
+        """Close the client and release pooled connections."""
+        await self.http.close()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    def __repr__(self) -> str:
+        """String representation of the client."""
+        return (
+            f"AsyncJanuaClient("
+            f"base_url={self.base_url}, "
+            f"environment={self.environment}, "
+            f"http2={self.http.http2}"
+            f")"
+        )
@@ -0,0 +1,215 @@
+"""Async HTTP client with connection pooling, HTTP/2 and retry logic."""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from httpx import AsyncClient, Limits, NetworkError, Response, Timeout, TimeoutException
+
+from .exceptions import (
+    APIError,
+    AuthenticationError,
+    AuthorizationError,
+    JanuaError,
+    NetworkConnectionError,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    ValidationError,
+)
+from .http_client import DEFAULT_RETRY_CONFIG, RetryConfig, raise_for_response
+
+try:  # HTTP/2 needs the optional ``h2`` package (``pip install janua[async]``)
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
+
+class AsyncHTTPClient:
+    """Async counterpart of :class:`~janua.http_client.HTTPClient`.
+
+    One pooled ``httpx.AsyncClient`` is shared by every request, so connections
+    are kept alive between calls and, when ``h2`` is installed, concurrent
+    requests are multiplexed over a single HTTP/2 connection.
+    """
+
+    DEFAULT_TIMEOUT = 30.0
+    DEFAULT_MAX_CONNECTIONS = 20
+    DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry_config: Optional[RetryConfig] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+        http2: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ):
+        """
+        Initialize the async HTTP client.
+
+        Args:
+            base_url: Base URL for the API
+            api_key: API key for authentication
+            timeout: Request timeout in seconds
+            retry_config: Retry configuration
+            custom_headers: Additional headers to include in requests
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+            max_connections: Size of the connection pool
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.retry_config = retry_config or DEFAULT_RETRY_CONFIG
+        self.max_connections = max_connections
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'User-Agent': 'Janua-Python-SDK/1.0.0',
+        }
+
+        if api_key:
+            self.headers['Authorization'] = f'Bearer {api_key}'
+
+        if custom_headers:
+            self.headers.update(custom_headers)
+
+        self.client = AsyncClient(
+            timeout=Timeout(timeout),
+            headers=self.headers,
+            follow_redirects=True,
+            http2=self.http2,
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def _get_url(self, endpoint: str) -> str:
+        """Construct full URL for an endpoint."""
+        endpoint = endpoint.lstrip('/')
+        return f"{self.base_url}/{endpoint}"
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Response:
+        """
+        Make an HTTP request with retry logic.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, etc.)
+            endpoint: API endpoint path
+            json: JSON body for the request
+            params: Query parameters
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to httpx
+
+        Returns:
+            HTTP response object
+
+        Raises:
+            Various JanuaError subclasses based on error type
+        """
+        url = self._get_url(endpoint)
+
+        request_headers = self.headers.copy()
+        if headers:
+            request_headers.update(headers)
+
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.retry_config.max_attempts):
+            try:
+                response = await self.client.request(
+                    method=method,
+                    url=url,
+                    json=json,
+                    params=params,
+                    headers=request_headers,
+                    **kwargs
+                )
+
+                if response.status_code >= 400:
+                    raise_for_response(response)
+
+                return response
+
+            except (NetworkError, TimeoutException) as e:
+                last_error = NetworkConnectionError(
+                    f"Network error during {method} {url}: {str(e)}"
+                )
+
+                if not self.retry_config.should_retry(last_error, attempt):
+                    raise last_error
+
+            except (AuthenticationError, AuthorizationError, NotFoundError, ValidationError):
+                # Don't retry client errors
+                raise
+
+            except (RateLimitError, ServerError, APIError) as e:
+                last_error = e
+
+                if not self.retry_config.should_retry(e, attempt):
+                    raise
+
+            except Exception as e:
+                raise JanuaError(f"Unexpected error during {method} {url}: {str(e)}")
+
+            delay = self.retry_config.calculate_delay(attempt, last_error)
+
+            if self.retry_config.on_retry:
+                self.retry_config.on_retry(attempt, last_error, delay)
+
+            await asyncio.sleep(delay)
+
+        if last_error:
+            raise last_error
+        raise JanuaError(
+            f"Failed to complete request after {self.retry_config.max_attempts} retries"
+        )
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        """Make a GET request."""
+        return await self.request('GET', endpoint, params=params, **kwargs)
+
+    async def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        """Make a POST request."""
+        return await self.request('POST', endpoint, json=json, **kwargs)
+
+    async def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        """Make a PUT request."""
+        return await self.request('PUT', endpoint, json=json, **kwargs)
+
+    async def patch(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        """Make a PATCH request."""
+        return await self.request('PATCH', endpoint, json=json, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs) -> Response:
+        """Make a DELETE request."""
+        return await self.request('DELETE', endpoint, **kwargs)
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
@@ -151,6 +151,53 @@ def get_user_message(error: Union[Exception, str]) -> str:
     return 'An unexpected error occurred.'
 
 
+def raise_for_response(response: Response) -> None:
+    """
+    Raise the JanuaError subclass matching an error response.
+
+    Shared by the sync and async HTTP clients so both map status codes the
+    same way.
+
+    Args:
+        response: The HTTP response object
+
+    Raises:
+        Various JanuaError subclasses based on status code
+    """
+    try:
+        error_data = response.json()
+        message = error_data.get('message', response.text)
+        code = error_data.get('code')
+        details = error_data.get('details')
+    except Exception:
+        message = response.text or f"HTTP {response.status_code}"
+        code = None
+        details = None
+
+    status_code = response.status_code
+
+    # Map status codes to specific exceptions
+    if status_code == 401:
+        raise AuthenticationError(message, code=code, details=details)
+    elif status_code == 403:
+        raise AuthorizationError(message, code=code, details=details)
+    elif status_code == 404:
+        raise NotFoundError(message, code=code, details=details)
+    elif status_code == 422 or status_code == 400:
+        raise ValidationError(message, code=code, details=details)
+    elif status_code == 429:
+        # Extract retry-after header if available
+        retry_after = response.headers.get('Retry-After')
+        details = details or {}
+        if retry_after:
+            details['retry_after'] = retry_after
+        raise RateLimitError(message, code=code, details=details)
+    elif 500 <= status_code < 600:
+        raise ServerError(message, code=code, details=details)
+    else:
+        raise APIError(message, status_code=status_code, code=code, details=details)
+
+
 class HTTPClient:
     """HTTP client for making API requests to the Janua API."""
 
@@ -233,38 +280,7 @@ class HTTPClient:
         Raises:
             Various JanuaError subclasses based on status code
         """
-        try:
-            error_data = response.json()
-            message = error_data.get('message', response.text)
-            code = error_data.get('code')
-            details = error_data.get('details')
-        except Exception:
-            message = response.text or f"HTTP {response.status_code}"
-            code = None
-            details = None
-        
-        status_code = response.status_code
-        
-        # Map status codes to specific exceptions
-        if status_code == 401:
-            raise AuthenticationError(message, code=code, details=details)
-        elif status_code == 403:
-            raise AuthorizationError(message, code=code, details=details)
-        elif status_code == 404:
-            raise NotFoundError(message, code=code, details=details)
-        elif status_code == 422 or status_code == 400:
-            raise ValidationError(message, code=code, details=details)
-        elif status_code == 429:
-            # Extract retry-after header if available
-            retry_after = response.headers.get('Retry-After')
-            details = details or {}
-            if retry_after:
-                details['retry_after'] = retry_after
-            raise RateLimitError(message, code=code, details=details)
-        elif 500 <= status_code < 600:
-            raise ServerError(message, code=code, details=details)
-        else:
-            raise APIError(message, status_code=status_code, code=code, details=details)
+        raise_for_response(response)
     
     def _should_retry(self, error: Exception, attempt: int) -> bool:
         """
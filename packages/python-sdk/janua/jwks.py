@@ -0,0 +1,301 @@
+"""
+Offline JWT verification against Janua's published signing keys.
+
+:class:`~janua.utils.TokenValidator` needs a key passed in, which breaks on
+rotation, and calling ``/oauth/introspect`` costs a round trip per request.
+:class:`JWKSTokenValidator` instead discovers ``jwks_uri`` from the issuer's
+``/.well-known/openid-configuration`` and keeps a ``kid``-indexed keyring:
+
+- Keys are refreshed in the background once the keyring is older than
+  ``refresh_interval``; validation keeps using the current keys meanwhile.
+- A token signed with an unknown ``kid`` (i.e. right after a rotation) triggers
+  one refetch. Concurrent callers wait on that single fetch, and refetches are
+  rate limited by ``min_refresh_interval`` so garbage ``kid`` values cannot be
+  used to hammer the issuer.
+- Verified claims are cached by token digest until the token's ``exp``, so a
+  token presented on every request is verified once.
+- While the issuer is unreachable, the last keys keep being used and retries
+  are rate limited by ``min_refresh_interval`` too; with no keys at all,
+  validation fails with :class:`~janua.exceptions.AuthenticationError`.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import jwt
+
+from .exceptions import (
+    AuthenticationError,
+    ConfigurationError,
+    InvalidTokenError,
+    TokenExpiredError,
+)
+
+
+class JWKSTokenValidator:
+    """Verify Janua-issued JWTs locally using the issuer's JWKS."""
+
+    DEFAULT_REFRESH_INTERVAL = 3600.0
+    DEFAULT_MIN_REFRESH_INTERVAL = 30.0
+    DEFAULT_CACHE_SIZE = 10000
+
+    def __init__(
+        self,
+        issuer: str,
+        audience: Optional[str] = None,
+        algorithms: Optional[List[str]] = None,
+        jwks_uri: Optional[str] = None,
+        leeway: int = 0,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        timeout: float = 5.0,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        """
+        Initialize the validator.
+
+        Args:
+            issuer: Issuer URL, e.g. ``https://auth.example.com``; must match ``iss``
+            audience: Expected ``aud`` claim
+            algorithms: Allowed signing algorithms. Defaults to ``["RS256"]``
+            jwks_uri: JWKS URL. Discovered from the issuer when omitted
+            leeway: Seconds of clock skew tolerated for ``exp``/``nbf``
+            refresh_interval: Seconds after which keys are refreshed in the background
+            min_refresh_interval: Minimum seconds between refetches for unknown ``kid``
+            cache_size: Maximum number of verified tokens kept in the claims cache
+            timeout: Timeout in seconds for discovery and JWKS requests
+            http_client: Optional ``httpx.Client`` to fetch keys with
+        """
+        self.issuer = issuer.rstrip('/')
+        self.audience = audience
+        self.algorithms = algorithms or ["RS256"]
+        self.jwks_uri = jwks_uri
+        self.leeway = leeway
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.cache_size = cache_size
+        self._http = http_client or httpx.Client(timeout=timeout, follow_redirects=True)
+
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0  # Stamped before every fetch, successful or not
+        self._generation = 0
+        self._fetch_lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+
+        self._claims: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._claims_lock = threading.Lock()
+
+    # Keyring
+
+    def _discover(self) -> str:
+        if self.jwks_uri:
+            return self.jwks_uri
+        response = self._http.get(f"{self.issuer}/.well-known/openid-configuration")
+        response.raise_for_status()
+        jwks_uri = response.json().get('jwks_uri')
+        if not jwks_uri:
+            raise ConfigurationError(f"No jwks_uri in discovery document for {self.issuer}")
+        self.jwks_uri = jwks_uri
+        return jwks_uri
+
+    def _fetch_keys(self) -> None:
+        response = self._http.get(self._discover())
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get('keys', []):
+            if jwk.get('use', 'sig') != 'sig' or 'kid' not in jwk:
+                continue
+            try:
+                keys[jwk['kid']] = jwt.PyJWK(jwk).key
+            except jwt.PyJWTError:
+                # Skip key types this install cannot use rather than failing them all
+                continue
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self._generation += 1
+
+    def refresh(self, force: bool = True) -> None:
+        """
+        Refetch the JWKS.
+
+        Single-flight: if another thread is already fetching, wait for that
+        fetch instead of starting a second one.
+
+        Args:
+            force: Refetch even if the keys were fetched within ``min_refresh_interval``
+        """
+        generation = self._generation
+        with self._fetch_lock:
+            if self._generation != generation:
+                return  # Someone else refreshed while we waited
+            if not force and time.monotonic() - self._attempted_at < self.min_refresh_interval:
+                return
+            self._attempted_at = time.monotonic()
+            self._fetch_keys()
+
+    def _refresh_or_keep(self) -> None:
+        """Refetch (rate limited); on failure keep the current keys if there are any."""
+        try:
+            self.refresh(force=False)
+        except (httpx.HTTPError, ValueError, ConfigurationError) as e:
+            if not self._keys:
+                raise AuthenticationError(f"Could not fetch signing keys: {e}") from e
+
+    def _background_refresh_due(self) -> bool:
+        now = time.monotonic()
+        if now - self._fetched_at <= self.refresh_interval:
+            return False
+        # After a failed fetch, retry no more often than min_refresh_interval
+        failed = self._attempted_at > self._fetched_at
+        return not failed or now - self._attempted_at >= self.min_refresh_interval
+
+    def _refresh_in_background(self) -> None:
+        if self._background is not None and self._background.is_alive():
+            return
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception:  # noqa: BLE001 - keep serving the current keys
+                pass
+
+        self._background = threading.Thread(target=run, name="janua-jwks-refresh", daemon=True)
+        self._background.start()
+
+    def _key(self, kid: Optional[str], fetch: bool = True) -> Optional[Any]:
+        if not self._keys and fetch:
+            self._refresh_or_keep()
+        elif self._background_refresh_due():
+            self._refresh_in_background()
+
+        key = self._keys.get(kid) if kid else None
+        if key is None and kid is None and len(self._keys) == 1:
+            key = next(iter(self._keys.values()))
+        if key is None and fetch:
+            # Possibly a freshly rotated key
+            self._refresh_or_keep()
+            key = self._keys.get(kid)
+        return key
+
+    # Claims cache
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def _cached(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._claims_lock:
+            entry = self._claims.get(digest)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if time.time() > exp + self.leeway:
+                del self._claims[digest]
+                raise TokenExpiredError("Token has expired")
+            self._claims.move_to_end(digest)
+            return claims
+
+    def _remember(self, digest: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get('exp')
+        if not isinstance(exp, (int, float)) or self.cache_size <= 0:
+            return
+        with self._claims_lock:
+            self._claims[digest] = (claims, float(exp))
+            while len(self._claims) > self.cache_size:
+                self._claims.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached claims (e.g. after revoking tokens)."""
+        with self._claims_lock:
+            self._claims.clear()
+
+    # Validation
+
+    def _header(self, token: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Malformed token: {str(e)}")
+        if header.get('alg') not in self.algorithms:
+            raise InvalidTokenError(f"Signing algorithm {header.get('alg')!r} is not allowed")
+        return header
+
+    def _verify(self, token: str, key: Any) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=self.algorithms,
+                issuer=self.issuer,
+                audience=self.audience,
+                leeway=self.leeway,
+                options={"verify_aud": self.audience is not None},
+            )
+        except jwt.ExpiredSignatureError:
+            raise TokenExpiredError("Token has expired")
+        except jwt.InvalidTokenError as e:
+            raise InvalidTokenError(f"Token validation failed: {str(e)}")
+
+    def validate(self, token: str) -> Dict[str, Any]:
+        """
+        Validate a token and return its claims.
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            Dictionary of token claims
+
+        Raises:
+            InvalidTokenError: If the token is malformed, unsigned by a known key
+                or fails issuer/audience checks
+            TokenExpiredError: If the token is expired
+            AuthenticationError: If no signing keys could be fetched
+        """
+        digest = self._digest(token)
+        claims = self._cached(digest)
+        if claims is not None:
+            return claims
+
+        header = self._header(token)
+        key = self._key(header.get('kid'))
+        if key is None:
+            raise InvalidTokenError(f"No signing key found for kid {header.get('kid')!r}")
+
+        claims = self._verify(token, key)
+        self._remember(digest, claims)
+        return claims
+
+    async def avalidate(self, token: str) -> Dict[str, Any]:
+        """
+        Async variant of :meth:`validate`.
+
+        Cache hits and tokens signed by a known key are verified inline; only
+        key fetches are moved off the event loop.
+        """
+        digest = self._digest(token)
+        claims = self._cached(digest)
+        if claims is not None:
+            return claims
+
+        header = self._header(token)
+        key = self._key(header.get('kid'), fetch=False)
+        if key is None:
+            key = await asyncio.to_thread(self._key, header.get('kid'))
+        if key is None:
+            raise InvalidTokenError(f"No signing key found for kid {header.get('kid')!r}")
+
+        claims = self._verify(token, key)
+        self._remember(digest, claims)
+        return claims
+
+    def close(self) -> None:
+        """Close the HTTP client used to fetch keys."""
+        self._http.close()
@@ -0,0 +1,186 @@
+"""
+Drop-in ASGI and WSGI middleware that authenticate requests with a
+:class:`~janua.jwks.JWKSTokenValidator`.
+
+Example (FastAPI / Starlette)::
+
+    validator = JWKSTokenValidator(issuer="https://auth.example.com", audience="my-api")
+    app.add_middleware(JanuaASGIMiddleware, validator=validator, exclude_paths=["/health"])
+
+    @app.get("/me")
+    async def me(request: Request):
+        return request.state.janua_claims
+
+Example (Flask / any WSGI app)::
+
+    app.wsgi_app = JanuaWSGIMiddleware(app.wsgi_app, validator=validator)
+    # claims are available as request.environ["janua.claims"]
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from .exceptions import AuthenticationError, TokenExpiredError
+from .jwks import JWKSTokenValidator
+
+CLAIMS_KEY = "janua_claims"
+WSGI_CLAIMS_KEY = "janua.claims"
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+
+def _is_excluded(path: str, exclude_paths: Sequence[str]) -> bool:
+    return any(path == prefix or path.startswith(prefix.rstrip('/') + '/') for prefix in exclude_paths)
+
+
+def _error_body(error: str, description: str) -> Tuple[bytes, str]:
+    body = json.dumps({"error": error, "error_description": description}).encode('utf-8')
+    challenge = f'Bearer error="{error}", error_description="{description}"'
+    return body, challenge
+
+
+def _failure(exc: Optional[AuthenticationError]) -> Tuple[bytes, str]:
+    if exc is None:
+        return _error_body("invalid_request", "Missing bearer token")
+    if isinstance(exc, TokenExpiredError):
+        return _error_body("invalid_token", "Token has expired")
+    return _error_body("invalid_token", "Token is invalid")
+
+
+class JanuaASGIMiddleware:
+    """
+    ASGI middleware that verifies the ``Authorization: Bearer`` token.
+
+    Verified claims are stored in ``scope["state"]["janua_claims"]`` (i.e.
+    ``request.state.janua_claims`` in Starlette/FastAPI). Requests without a
+    valid token get a ``401`` response, unless ``optional`` is set, in which
+    case they pass through with no claims.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        validator: JWKSTokenValidator,
+        exclude_paths: Sequence[str] = (),
+        optional: bool = False,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            validator: Validator used to verify tokens
+            exclude_paths: Path prefixes that skip authentication (e.g. ``/health``)
+            optional: Let unauthenticated requests through instead of rejecting them
+        """
+        self.app = app
+        self.validator = validator
+        self.exclude_paths = tuple(exclude_paths)
+        self.optional = optional
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] not in ("http", "websocket") or _is_excluded(scope.get("path", ""), self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = None
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                authorization = value.decode('latin-1')
+                break
+
+        token = _bearer_token(authorization)
+        error: Optional[AuthenticationError] = None
+        claims = None
+        if token is not None:
+            try:
+                claims = await self.validator.avalidate(token)
+            except AuthenticationError as e:
+                error = e
+
+        if claims is None and (token is not None or not self.optional):
+            await self._reject(scope, send, error)
+            return
+
+        scope.setdefault("state", {})[CLAIMS_KEY] = claims
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Dict[str, Any], send: Callable, error: Optional[AuthenticationError]) -> None:
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        body, challenge = _failure(error)
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode('latin-1')),
+                (b"www-authenticate", challenge.encode('latin-1')),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class JanuaWSGIMiddleware:
+    """
+    WSGI middleware that verifies the ``Authorization: Bearer`` token.
+
+    Verified claims are stored in ``environ["janua.claims"]``. Behaves like
+    :class:`JanuaASGIMiddleware` otherwise.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        validator: JWKSTokenValidator,
+        exclude_paths: Sequence[str] = (),
+        optional: bool = False,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped WSGI application
+            validator: Validator used to verify tokens
+            exclude_paths: Path prefixes that skip authentication (e.g. ``/health``)
+            optional: Let unauthenticated requests through instead of rejecting them
+        """
+        self.app = app
+        self.validator = validator
+        self.exclude_paths = tuple(exclude_paths)
+        self.optional = optional
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if _is_excluded(environ.get("PATH_INFO", ""), self.exclude_paths):
+            return self.app(environ, start_response)
+
+        token = _bearer_token(environ.get("HTTP_AUTHORIZATION"))
+        error: Optional[AuthenticationError] = None
+        claims = None
+        if token is not None:
+            try:
+                claims = self.validator.validate(token)
+            except AuthenticationError as e:
+                error = e
+
+        if claims is None and (token is not None or not self.optional):
+            body, challenge = _failure(error)
+            start_response("401 Unauthorized", [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(body))),
+                ("WWW-Authenticate", challenge),
+            ])
+            return [body]
+
+        environ[WSGI_CLAIMS_KEY] = claims
+        return self.app(environ, start_response)
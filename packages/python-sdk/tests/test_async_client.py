@@ -0,0 +1,223 @@
+"""Tests for the async Janua client."""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from janua import AsyncJanuaClient, gather
+from janua.exceptions import NotFoundError
+from janua.http_client import RetryConfig
+
+
+def _user(index: int) -> dict:
+    return {
+        "id": str(uuid4()),
+        "email": f"user{index}@example.com",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+USERS = [_user(i) for i in range(250)]
+
+
+def _client(handler, **kwargs) -> AsyncJanuaClient:
+    """AsyncJanuaClient whose requests are answered by ``handler``."""
+    client = AsyncJanuaClient(api_key="test_api_key", base_url="https://api.test", **kwargs)
+    client.http.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _list_users(request: httpx.Request) -> httpx.Response:
+    limit = int(request.url.params["limit"])
+    offset = int(request.url.params["offset"])
+    return httpx.Response(
+        200,
+        json={
+            "items": USERS[offset:offset + limit],
+            "total": len(USERS),
+            "limit": limit,
+            "offset": offset,
+        },
+    )
+
+
+class TestAsyncJanuaClient:
+    """Test the AsyncJanuaClient class."""
+
+    @pytest.mark.asyncio
+    async def test_service_methods_are_awaited(self):
+        """Test that sync service methods run over the async transport."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=USERS[0])
+
+        async with _client(handler) as client:
+            user = await client.users.get(USERS[0]["id"])
+
+        assert user.email == "user0@example.com"
+        assert requests[0].url.path == f"/users/{USERS[0]['id']}"
+        assert requests[0].headers["Authorization"] == "Bearer test_api_key"
+
+    @pytest.mark.asyncio
+    async def test_errors_map_to_sdk_exceptions(self):
+        """Test that error responses raise the same exceptions as the sync client."""
+        def handler(request):
+            return httpx.Response(404, json={"message": "User not found"})
+
+        async with _client(handler) as client:
+            with pytest.raises(NotFoundError):
+                await client.users.get("missing")
+
+    @pytest.mark.asyncio
+    async def test_retries_with_retry_config(self):
+        """Test that server errors are retried per RetryConfig."""
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) < 3:
+                return httpx.Response(503, json={"message": "unavailable"})
+            return httpx.Response(200, json=USERS[0])
+
+        retry = RetryConfig(max_attempts=3, base_delay=0, jitter=False)
+        async with _client(handler, retry_config=retry) as client:
+            user = await client.users.get(USERS[0]["id"])
+
+        assert len(attempts) == 3
+        assert user.id is not None
+
+    @pytest.mark.asyncio
+    async def test_auth_stores_tokens_on_async_client(self):
+        """Test that sign-in stores tokens on the async client."""
+        def handler(request):
+            assert json.loads(request.content)["email"] == "user0@example.com"
+            return httpx.Response(
+                200,
+                json={
+                    "user": USERS[0],
+                    "session": {
+                        "id": str(uuid4()),
+                        "user_id": USERS[0]["id"],
+                        "created_at": "2024-01-01T00:00:00Z",
+                        "expires_at": "2024-01-02T00:00:00Z",
+                    },
+                    "tokens": {
+                        "access_token": "access",
+                        "refresh_token": "refresh",
+                        "token_type": "bearer",
+                        "expires_in": 3600,
+                    },
+                },
+            )
+
+        async with _client(handler) as client:
+            await client.auth.sign_in(email="user0@example.com", password="pw")
+
+        assert client.get_access_token() == "access"
+        assert client.http.headers["Authorization"] == "Bearer access"
+
+
+class TestAsyncPagination:
+    """Test auto-paginating iterators."""
+
+    @pytest.mark.asyncio
+    async def test_iterates_every_page(self):
+        """Test that iterate() walks all pages."""
+        offsets = []
+
+        def handler(request):
+            offsets.append(int(request.url.params["offset"]))
+            return _list_users(request)
+
+        async with _client(handler) as client:
+            emails = [user.email async for user in client.users.iterate(page_size=100)]
+
+        assert len(emails) == len(USERS)
+        assert emails[-1] == "user249@example.com"
+        assert offsets == [0, 100, 200]
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self):
+        """Test that the next page is requested before the current one is consumed."""
+        offsets = []
+
+        def handler(request):
+            offsets.append(int(request.url.params["offset"]))
+            return _list_users(request)
+
+        async with _client(handler) as client:
+            async for _ in client.users.iterate(page_size=100):
+                await asyncio.sleep(0)
+                break
+
+        assert offsets == [0, 100]
+
+    @pytest.mark.asyncio
+    async def test_paginate_forwards_arguments(self):
+        """Test paginate() for list methods with positional arguments."""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"items": [], "total": 0, "limit": 50, "offset": 0})
+
+        async with _client(handler) as client:
+            members = await client.organizations.paginate("list_members", "org-1").to_list()
+
+        assert members == []
+        assert paths == ["/organizations/org-1/members"]
+
+
+class TestGather:
+    """Test bounded-concurrency gather."""
+
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency_and_keeps_order(self):
+        """Test that no more than `concurrency` calls run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def call(value):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return value
+
+        results = await gather((call(i) for i in range(50)), concurrency=5)
+
+        assert results == list(range(50))
+        assert peak == 5
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions(self):
+        """Test that failures can be returned in place."""
+        async def call(value):
+            if value == 2:
+                raise NotFoundError("missing")
+            return value
+
+        results = await gather((call(i) for i in range(4)), return_exceptions=True)
+
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], NotFoundError)
+
+    @pytest.mark.asyncio
+    async def test_bulk_lookups_through_client(self):
+        """Test client.gather() for mass user lookups."""
+        by_id = {user["id"]: user for user in USERS}
+
+        def handler(request):
+            return httpx.Response(200, json=by_id[request.url.path.rsplit("/", 1)[1]])
+
+        async with _client(handler) as client:
+            users = await client.gather(client.users.get(u["id"]) for u in USERS[:30])
+
+        assert [str(u.id) for u in users] == [u["id"] for u in USERS[:30]]
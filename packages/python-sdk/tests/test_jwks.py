@@ -0,0 +1,299 @@
+"""Tests for JWKS-based offline token verification and middleware."""
+
+import json
+import threading
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from janua import JanuaASGIMiddleware, JanuaWSGIMiddleware, JWKSTokenValidator
+from janua.exceptions import AuthenticationError, InvalidTokenError, TokenExpiredError
+
+ISSUER = "https://auth.test"
+
+
+def _keypair(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+KEY_A, JWK_A = _keypair("key-a")
+KEY_B, JWK_B = _keypair("key-b")
+
+
+def _token(private_key=KEY_A, kid="key-a", **claims) -> str:
+    payload = {"sub": "user-1", "iss": ISSUER, "aud": "api", "exp": int(time.time()) + 300}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeIssuer:
+    """Serves discovery and a mutable JWKS, counting requests."""
+
+    def __init__(self, *jwks):
+        self.jwks = list(jwks)
+        self.jwks_requests = 0
+        self.discovery_requests = 0
+        self.failed_requests = 0
+        self.delay = 0.0
+        self.down = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            self.failed_requests += 1
+            return httpx.Response(503)
+        if request.url.path == "/.well-known/openid-configuration":
+            self.discovery_requests += 1
+            return httpx.Response(200, json={"issuer": ISSUER, "jwks_uri": f"{ISSUER}/.well-known/jwks.json"})
+        self.jwks_requests += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return httpx.Response(200, json={"keys": list(self.jwks)})
+
+
+def _validator(issuer: FakeIssuer, **kwargs) -> JWKSTokenValidator:
+    kwargs.setdefault("audience", "api")
+    return JWKSTokenValidator(
+        ISSUER, http_client=httpx.Client(transport=httpx.MockTransport(issuer)), **kwargs
+    )
+
+
+class TestJWKSTokenValidator:
+    """Test the JWKSTokenValidator class."""
+
+    def test_discovers_keys_and_validates(self):
+        """Test that jwks_uri is discovered and the token verified."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer)
+
+        claims = validator.validate(_token())
+
+        assert claims["sub"] == "user-1"
+        assert issuer.discovery_requests == 1
+        assert issuer.jwks_requests == 1
+
+    def test_claims_are_cached_by_token(self):
+        """Test that a repeated token is not fetched or verified again."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer)
+        token = _token()
+
+        first = validator.validate(token)
+        validator._verify = None  # Any further verification would fail
+        second = validator.validate(token)
+
+        assert first is second
+        assert issuer.jwks_requests == 1
+
+    def test_cached_claims_expire_with_token(self):
+        """Test that a cached token is rejected once exp has passed."""
+        validator = _validator(FakeIssuer(JWK_A))
+        token = _token(exp=int(time.time()) + 1)
+        validator.validate(token)
+
+        digest = validator._digest(token)
+        claims, _ = validator._claims[digest]
+        validator._claims[digest] = (claims, time.time() - 1)
+
+        with pytest.raises(TokenExpiredError):
+            validator.validate(token)
+        assert digest not in validator._claims
+
+    def test_rejects_bad_tokens(self):
+        """Test expiry, audience, signature and algorithm failures."""
+        validator = _validator(FakeIssuer(JWK_A))
+
+        with pytest.raises(TokenExpiredError):
+            validator.validate(_token(exp=int(time.time()) - 10))
+        with pytest.raises(InvalidTokenError):
+            validator.validate(_token(aud="other"))
+        with pytest.raises(InvalidTokenError):
+            validator.validate(_token(private_key=KEY_B))
+        with pytest.raises(InvalidTokenError):
+            validator.validate(jwt.encode({"sub": "x"}, "secret" * 6, algorithm="HS256"))
+        with pytest.raises(InvalidTokenError):
+            validator.validate("not-a-token")
+
+    def test_unknown_kid_refetches_after_rotation(self):
+        """Test that a rotated key is picked up with one refetch."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer, min_refresh_interval=0)
+        validator.validate(_token())
+
+        issuer.jwks.append(JWK_B)
+        claims = validator.validate(_token(private_key=KEY_B, kid="key-b"))
+
+        assert claims["sub"] == "user-1"
+        assert issuer.jwks_requests == 2
+
+    def test_unknown_kid_refetch_is_rate_limited(self):
+        """Test that garbage kids cannot force a fetch per request."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer)
+        validator.validate(_token())
+
+        for i in range(5):
+            with pytest.raises(InvalidTokenError):
+                validator.validate(_token(kid=f"bogus-{i}"))
+
+        assert issuer.jwks_requests == 1
+
+    def test_concurrent_unknown_kid_is_single_flight(self):
+        """Test that concurrent misses share one JWKS fetch."""
+        issuer = FakeIssuer(JWK_A, JWK_B)
+        issuer.delay = 0.05
+        validator = _validator(issuer)
+        results = []
+
+        def worker(i):
+            results.append(validator.validate(_token(private_key=KEY_B, kid="key-b", n=i)))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 10
+        assert issuer.jwks_requests == 1
+
+    def test_outage_without_keys_is_an_authentication_error(self):
+        """Test that an unreachable issuer is retried at most once per min_refresh_interval."""
+        issuer = FakeIssuer(JWK_A)
+        issuer.down = True
+        validator = _validator(issuer)
+
+        for _ in range(5):
+            with pytest.raises(AuthenticationError):
+                validator.validate(_token())
+
+        assert issuer.failed_requests == 1
+
+    def test_outage_keeps_serving_current_keys(self):
+        """Test that a failed refetch for an unknown kid keeps the keys already fetched."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer, min_refresh_interval=0)
+        validator.validate(_token())
+        issuer.down = True
+
+        with pytest.raises(InvalidTokenError):
+            validator.validate(_token(private_key=KEY_B, kid="key-b"))
+        assert validator.validate(_token(n=2))["sub"] == "user-1"
+        assert issuer.failed_requests == 1
+
+    def test_stale_keys_refresh_in_background(self):
+        """Test that stale keys keep serving while a refresh runs."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer, refresh_interval=0)
+        validator.validate(_token())
+
+        validator.validate(_token(n=2))
+        validator._background.join(timeout=5)
+
+        assert issuer.jwks_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_avalidate(self):
+        """Test the async variant fetches keys off the event loop."""
+        issuer = FakeIssuer(JWK_A)
+        validator = _validator(issuer)
+
+        claims = await validator.avalidate(_token())
+
+        assert claims["sub"] == "user-1"
+        with pytest.raises(TokenExpiredError):
+            await validator.avalidate(_token(exp=int(time.time()) - 10))
+
+
+async def _asgi_call(app, headers=(), path="/me"):
+    scope = {"type": "http", "path": path, "headers": list(headers)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return scope, sent
+
+
+class TestMiddleware:
+    """Test the ASGI and WSGI middleware."""
+
+    @pytest.mark.asyncio
+    async def test_asgi_sets_claims(self):
+        """Test that verified claims reach the app via scope state."""
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen.update(scope["state"])
+
+        middleware = JanuaASGIMiddleware(app, validator=_validator(FakeIssuer(JWK_A)))
+        await _asgi_call(middleware, [(b"authorization", f"Bearer {_token()}".encode())])
+
+        assert seen["janua_claims"]["sub"] == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_asgi_rejects_and_excludes(self):
+        """Test 401 responses and excluded paths."""
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope["path"])
+
+        middleware = JanuaASGIMiddleware(
+            app, validator=_validator(FakeIssuer(JWK_A)), exclude_paths=["/health"]
+        )
+
+        _, sent = await _asgi_call(middleware)
+        assert sent[0]["status"] == 401
+        assert json.loads(sent[1]["body"])["error"] == "invalid_request"
+
+        expired = _token(exp=int(time.time()) - 10)
+        _, sent = await _asgi_call(middleware, [(b"authorization", f"Bearer {expired}".encode())])
+        assert json.loads(sent[1]["body"])["error_description"] == "Token has expired"
+
+        await _asgi_call(middleware, path="/health/live")
+        assert calls == ["/health/live"]
+
+    def test_wsgi(self):
+        """Test that the WSGI middleware sets environ claims or returns 401."""
+        seen = {}
+
+        def app(environ, start_response):
+            seen["claims"] = environ["janua.claims"]
+            start_response("200 OK", [])
+            return [b"ok"]
+
+        middleware = JanuaWSGIMiddleware(app, validator=_validator(FakeIssuer(JWK_A)))
+        statuses = []
+
+        def start_response(status, headers):
+            statuses.append(status)
+
+        body = middleware({"PATH_INFO": "/me", "HTTP_AUTHORIZATION": f"Bearer {_token()}"}, start_response)
+        assert body == [b"ok"]
+        assert seen["claims"]["sub"] == "user-1"
+
+        middleware({"PATH_INFO": "/me", "HTTP_AUTHORIZATION": "Bearer junk"}, start_response)
+        assert statuses == ["200 OK", "401 Unauthorized"]
+
+    def test_optional_lets_anonymous_requests_through(self):
+        """Test optional mode passes requests without a token."""
+        seen = {}
+
+        def app(environ, start_response):
+            seen["claims"] = environ["janua.claims"]
+            return []
+
+        middleware = JanuaWSGIMiddleware(app, validator=_validator(FakeIssuer(JWK_A)), optional=True)
+        middleware({"PATH_INFO": "/"}, lambda status, headers: None)
+
+        assert seen == {"claims": None}